@@ -0,0 +1,68 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# author        : Seongcheol Jeon
+# created date  : 2026.10.19
+# modified date : 2026.10.19
+# description   : binary heap vs hierarchical timing wheel 처리량 비교
+#                 python -m benchmarks.bench_scheduler [-n 10000 100000 1000000]
+
+import sys
+import time
+import random
+import argparse
+
+from core.scheduler import HeapScheduler, TimingWheel
+
+
+def make_deadlines(n: int, now: float, seed: int = 0):
+    # 초 ~ 일 단위가 섞인 스케줄
+    rnd = random.Random(seed)
+    spans = (60.0, 3600.0, 86400.0, 7 * 86400.0)
+    return [now + rnd.random() * rnd.choice(spans) for _ in range(n)]
+
+
+def bench(factory, deadlines, now: float):
+    result = dict()
+    n = len(deadlines)
+
+    sched = factory()
+    t = time.perf_counter()
+    entries = [sched.push(d, i) for i, d in enumerate(deadlines)]
+    result['insert'] = n / (time.perf_counter() - t)
+
+    t = time.perf_counter()
+    for entry in entries[::2]:
+        sched.cancel(entry)
+    result['cancel'] = (n // 2 + n % 2) / (time.perf_counter() - t)
+
+    # 남은 절반을 1분 간격으로 모두 만료시킨다.
+    end = max(deadlines)
+    expired = 0
+    t = time.perf_counter()
+    clock = now
+    while len(sched):
+        clock = min(clock + 60.0, end)
+        expired += len(sched.pop_due(clock))
+    result['expire'] = expired / (time.perf_counter() - t)
+    return result
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.bench_scheduler')
+    parser.add_argument('-n', type=int, nargs='+', default=[10 ** 4, 10 ** 5, 10 ** 6])
+    args = parser.parse_args(argv)
+
+    now = 1000.0
+    factories = (('heap', HeapScheduler), ('wheel', lambda: TimingWheel(1.0, (60, 60, 24, 365))))
+    sys.stdout.write(f'{"timers":>10} {"scheduler":>9} {"insert/s":>12} {"cancel/s":>12} {"expire/s":>12}\n')
+    for n in args.n:
+        deadlines = make_deadlines(n, now)
+        for name, factory in factories:
+            r = bench(factory, deadlines, now)
+            sys.stdout.write(f'{n:>10} {name:>9} {r["insert"]:>12,.0f} {r["cancel"]:>12,.0f} {r["expire"]:>12,.0f}\n')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,60 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# author        : Seongcheol Jeon
+# created date  : 2026.10.19
+# modified date : 2026.10.19
+# description   : ShardedEngine 의 워커 수별 생성/만료 처리량 (1, 2, 4, 8 프로세스)
+#                 python -m benchmarks.bench_shards [-n 1000000] [-s 5] [-p 1 2 4 8]
+
+import sys
+import time
+import argparse
+
+from core.shard import ShardedEngine
+
+
+def run(count: int, shards: int, lead: float, spread: float):
+    engine = ShardedEngine(shards)
+    try:
+        engine.sync()
+        begin = time.perf_counter()
+        # 만료 시각을 lead 초 뒤부터 spread 초 동안 고르게 흩뜨린다. tick 하나짜리라 만료 때만 깨어난다.
+        items = [(lead + spread * i / count, lead + spread) for i in range(count)]
+        jids = engine.create_many(items, start=False)
+        engine.sync()
+        created = time.perf_counter()
+        # 생성과 시작을 나눠서 모든 타이머의 기준 시각을 거의 같게 맞춘다.
+        engine.start_many(jids)
+        engine.sync()
+        started = time.perf_counter()
+        while engine.active():
+            engine.poll(0.01)
+        engine.sync()
+        done = time.perf_counter()
+        status = engine.status()
+    finally:
+        engine.close()
+    first_due = created + lead
+    last_due = started + lead + spread
+    return dict(create=count / (created - begin), expire=count / max(done - first_due, 1e-9),
+                lag=(done - last_due) * 1000, late=status.late_max_ms)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.bench_shards')
+    parser.add_argument('-n', type=int, default=200_000, help='number of timers (1000000 needs a few GB of RAM)')
+    parser.add_argument('-s', type=float, default=5.0, help='seconds over which the timers expire')
+    parser.add_argument('-p', type=int, nargs='+', default=[1, 2, 4, 8], help='worker process counts')
+    args = parser.parse_args(argv)
+    # 생성이 끝나기 전에 만료가 시작되지 않도록 여유를 둔다.
+    lead = max(2.0, args.n / 100_000)
+    sys.stdout.write(f'{"procs":>6} {"create/s":>10} {"expire/s":>10} {"lag ms":>8} {"late ms":>8}\n')
+    for shards in args.p:
+        r = run(args.n, shards, lead, args.s)
+        sys.stdout.write(f'{shards:>6} {r["create"]:>10.0f} {r["expire"]:>10.0f} {r["lag"]:>8.1f} {r["late"]:>8.1f}\n')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,139 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# author        : Seongcheol Jeon
+# created date  : 2026.10.19
+# modified date : 2026.10.19
+# description   : 깨어나는 시각의 지연(목표 시각 대비) 비교: time.sleep, QThread.usleep, timerfd, 엔진 드라이버
+#                 python -m benchmarks.bench_timerfd [-n 2000] [-i 2.0] [-k 20] [-s 3]
+
+import sys
+import time
+import random
+import argparse
+import selectors
+
+from core.engine import TimerEngine, NSEC_PER_SEC, NSEC_PER_MSEC
+from core.states import Constant
+from core import timerfd
+
+try:
+    from PySide2 import QtCore
+except ImportError:
+    QtCore = None
+
+
+def targets(count: int, interval_ms: float, seed: int = 0):
+    # interval 의 절반 ~ 1.5 배 간격으로 흩뜨린 절대 목표 시각 (monotonic ns)
+    rnd = random.Random(seed)
+    at = time.monotonic_ns() + 10 * NSEC_PER_MSEC
+    result = list()
+    for _ in range(count):
+        at += int(interval_ms * NSEC_PER_MSEC * (0.5 + rnd.random()))
+        result.append(at)
+    return result
+
+
+def loop_sleep(deadlines):
+    late = list()
+    for at in deadlines:
+        delay = at - time.monotonic_ns()
+        if delay > 0:
+            time.sleep(delay / NSEC_PER_SEC)
+        late.append(time.monotonic_ns() - at)
+    return late
+
+
+def loop_qthread(deadlines):
+    late = list()
+    for at in deadlines:
+        delay = at - time.monotonic_ns()
+        if delay > 0:
+            QtCore.QThread.usleep(-(-delay // 1000))
+        late.append(time.monotonic_ns() - at)
+    return late
+
+
+def loop_timerfd(deadlines):
+    late = list()
+    fd = timerfd.TimerFd(time.CLOCK_MONOTONIC)
+    selector = selectors.DefaultSelector()
+    selector.register(fd.fileno(), selectors.EVENT_READ)
+    try:
+        for at in deadlines:
+            fd.arm_at(at)
+            selector.select()
+            while not fd.read():
+                selector.select()
+            late.append(time.monotonic_ns() - at)
+    finally:
+        selector.close()
+        fd.close()
+    return late
+
+
+def engine_run(count: int, seconds: float, use_timerfd: bool, seed: int = 0):
+    # tick 이 서로 다른 타이머 count 개의 tick 마다 (깨어난 시각 - 그 tick 의 deadline)
+    engine = TimerEngine()
+    rnd = random.Random(seed)
+    late = list()
+
+    def on_data(data) -> None:
+        if data.ste != Constant.RUNNING:
+            return
+        timer = engine.get(data.jid)
+        late.append(engine.clock() - (timer.origin + timer.elapsed()))
+
+    engine.subscribe(on_data)
+    for _ in range(count):
+        engine.create_timer(seconds, tick=0.005 + rnd.random() * 0.045)
+    if use_timerfd:
+        driver = timerfd.TimerFdDriver(engine, watch_clock=False)
+        try:
+            driver.run_forever()
+        finally:
+            driver.close()
+    else:
+        engine.run_forever()
+    return late
+
+
+def stats(late) -> str:
+    late = sorted(late)
+    if not late:
+        return f'{"-":>9} {"-":>9} {"-":>9} {0:>7}'
+    p50 = late[len(late) // 2] / 1000
+    p99 = late[min(len(late) - 1, len(late) * 99 // 100)] / 1000
+    return f'{p50:>9.1f} {p99:>9.1f} {late[-1] / 1000:>9.1f} {len(late):>7}'
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.bench_timerfd')
+    parser.add_argument('-n', type=int, default=2000, help='wakeups per raw loop')
+    parser.add_argument('-i', type=float, default=2.0, help='mean interval between raw wakeups (ms)')
+    parser.add_argument('-k', type=int, default=20, help='timers driven by the engine')
+    parser.add_argument('-s', type=float, default=3.0, help='engine run length (s)')
+    args = parser.parse_args(argv)
+    if not timerfd.available():
+        sys.stderr.write('timerfd is not available on this platform\n')
+        return 1
+
+    sys.stdout.write(f'{"mode":>16} {"p50 us":>9} {"p99 us":>9} {"max us":>9} {"wakeups":>7} {"cpu us":>7}\n')
+    modes = [('time.sleep', lambda: loop_sleep(targets(args.n, args.i))),
+             ('QThread.usleep', lambda: loop_qthread(targets(args.n, args.i)) if QtCore is not None else None),
+             ('timerfd', lambda: loop_timerfd(targets(args.n, args.i))),
+             ('engine+sleep', lambda: engine_run(args.k, args.s, False)),
+             ('engine+timerfd', lambda: engine_run(args.k, args.s, True))]
+    for name, run in modes:
+        cpu = time.process_time_ns()
+        late = run()
+        cpu = time.process_time_ns() - cpu
+        if late is None:
+            sys.stdout.write(f'{name:>16} (PySide2 is not installed)\n')
+            continue
+        sys.stdout.write(f'{name:>16} {stats(late)} {cpu / max(1, len(late)) / 1000:>7.1f}\n')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
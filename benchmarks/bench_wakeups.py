@@ -0,0 +1,71 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# author        : Seongcheol Jeon
+# created date  : 2026.10.19
+# modified date : 2026.10.19
+# description   : 타이머 N 개를 서로 다른 위상으로 돌렸을 때의 초당 wakeup 수 (정렬 on/off)
+#                 python -m benchmarks.bench_wakeups [-n 100] [-s 5]
+
+import sys
+import time
+import random
+import argparse
+
+from core.engine import TimerEngine, NSEC_PER_SEC
+
+
+def ctx_switches() -> int:
+    # /proc/self/status 의 voluntary_ctxt_switches (sleep 에서 깨어난 횟수)
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('voluntary_ctxt_switches'):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return -1
+
+
+def run(count: int, seconds: float, align: float, seed: int = 0):
+    engine = TimerEngine(align=align)
+    rnd = random.Random(seed)
+    # 시작 위상을 흩뜨린다.
+    start_at = sorted(time.monotonic_ns() + int(rnd.random() * NSEC_PER_SEC) for _ in range(count))
+    for at in start_at:
+        while time.monotonic_ns() < at:
+            time.sleep((at - time.monotonic_ns()) / NSEC_PER_SEC)
+        engine.create_timer(3600)
+
+    wakeups = 0
+    begin_ctx = ctx_switches()
+    begin = time.monotonic_ns()
+    end = begin + int(seconds * NSEC_PER_SEC)
+    while True:
+        deadline = engine.next_deadline()
+        if deadline is None or deadline > end:
+            break
+        delay = deadline - time.monotonic_ns()
+        if delay > 0:
+            time.sleep(delay / NSEC_PER_SEC)
+        engine.advance()
+        wakeups += 1
+    elapsed = (time.monotonic_ns() - begin) / NSEC_PER_SEC
+    engine.stop_all()
+    return wakeups / elapsed, (ctx_switches() - begin_ctx) / elapsed
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.bench_wakeups')
+    parser.add_argument('-n', type=int, default=100, help='number of timers')
+    parser.add_argument('-s', type=float, default=5.0, help='seconds to measure')
+    args = parser.parse_args(argv)
+    sys.stdout.write(f'{"mode":>10} {"wakeups/s":>10} {"ctxsw/s":>10}\n')
+    for name, align in (('scattered', 0.0), ('aligned', 1.0)):
+        wakeups, ctx = run(args.n, args.s, align)
+        sys.stdout.write(f'{name:>10} {wakeups:>10.1f} {ctx:>10.1f}\n')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -3,27 +3,12 @@
 
 # author        : seongcheol jeon
 # created date  : 2024.03.01
-# modified date : 2024.03.01
+# modified date : 2026.10.19
 # description   : 
 
-import typing
-
 from PySide2 import QtWidgets
 
-
-class Constant:
-    # read-only로 만들기 위함.
-    __slots__ = ()
-    # bit index
-    RUNNING:    typing.Final[int] = 0x01
-    WAITING:    typing.Final[int] = 0x02
-    STOPPED:    typing.Final[int] = 0x04
-    ERROR:      typing.Final[int] = 0x08
-    STARTED:    typing.Final[int] = 0x10
-    FINISHED:   typing.Final[int] = 0x20
-
-
-Constant = Constant()
+from core.states import Constant
 
 
 class Color:
@@ -0,0 +1,11 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# author        : Seongcheol Jeon
+# created date  : 2026.10.19
+# modified date : 2026.10.19
+# description   : Qt 에 의존하지 않는 타이머 코어
+
+
+if __name__ == '__main__':
+    pass
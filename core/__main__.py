@@ -0,0 +1,181 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# author        : Seongcheol Jeon
+# created date  : 2026.10.19
+# modified date : 2026.10.19
+# description   : GUI 없이 타이머를 돌리는 CLI (python -m core 10 30 ...)
+
+import os
+import sys
+import asyncio
+import argparse
+
+from core.engine import TimerEngine, NSEC_PER_SEC
+from core.aio import AsyncTimerEngine
+from core.rpc import ControlServer
+from core.stream import EventStream
+from core.scheduler import TimingWheel
+from core.events import Data, Kind
+from core.eventlog import EventLog
+from core.history import HistoryRecorder, HistoryStore
+from core.persist import TimerJournal
+from core.statetable import StateTable
+from core.shard import ShardedEngine
+from core.clocks import boottime_ns, parse_wall_time
+from core import timerfd
+from core.recur import Every, Cron
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m core', description='Headless countdown timers')
+    parser.add_argument('durations', metavar='SEC', type=float, nargs='*', help='timer durations in seconds')
+    parser.add_argument('--at', metavar='TIME', action='append', default=[],
+                        help='alarm at a wall-clock time (HH:MM[:SS] or ISO 8601), may be repeated')
+    parser.add_argument('--every', metavar='SEC', type=float, action='append', default=[],
+                        help='recurring timer firing every SEC seconds, may be repeated')
+    parser.add_argument('--cron', metavar='EXPR', action='append', default=[],
+                        help='recurring timer on a 5-field cron expression (local time), may be repeated')
+    parser.add_argument('-t', '--tick', type=float, default=1.0, help='tick granularity in seconds (e.g. 0.05)')
+    parser.add_argument('-q', '--quiet', action='store_true', help='print only state changes')
+    parser.add_argument('--adaptive', action='store_true', help='coarse updates far from expiry')
+    parser.add_argument('--align', type=float, default=0.0, metavar='SEC',
+                        help='align intermediate ticks of all timers to shared wall-clock boundaries')
+    parser.add_argument('--clock-check', type=float, default=1.0, metavar='SEC',
+                        help='interval for detecting wall-clock jumps and resume from suspend (0 disables)')
+    parser.add_argument('--timerfd', action='store_true', help='wake the engine with a Linux timerfd (epoll)')
+    parser.add_argument('--wheel', action='store_true', help='schedule on a hierarchical timing wheel')
+    parser.add_argument('--event-log', metavar='PATH', help='append state changes to a rotating JSON lines log')
+    parser.add_argument('--history', metavar='DIR', help='append finished timers to a columnar history store')
+    parser.add_argument('--journal', metavar='DIR', help='persist timers and resume the ones left running')
+    parser.add_argument('--state-table', metavar='PATH',
+                        help='publish timer state to a shared mmap table (e.g. /dev/shm/timers)')
+    parser.add_argument('--serve', metavar='SOCKET', help='serve the JSON-RPC control API on a Unix socket')
+    parser.add_argument('--stream', metavar='SOCKET', help='push binary state deltas to subscribers on a Unix socket')
+    parser.add_argument('--cpu', type=int, metavar='N', help='pin the engine process to CPU N')
+    parser.add_argument('--shards', type=int, metavar='N', help='spread timers over N worker processes by jid hash')
+    args = parser.parse_args(argv)
+    try:
+        alarms = [parse_wall_time(text) / NSEC_PER_SEC for text in args.at]
+    except ValueError as err:
+        parser.error(f'--at: {err}')
+    try:
+        rules = [Every(sec) for sec in args.every] + [Cron(expr) for expr in args.cron]
+    except ValueError as err:
+        parser.error(f'--every/--cron: {err}')
+
+    if args.cpu is not None:
+        # GUI 와 떨어진 엔진 프로세스를 코어 하나에 고정해서 tick 지터를 줄인다.
+        if not hasattr(os, 'sched_setaffinity'):
+            parser.error('--cpu is not supported on this platform')
+        os.sched_setaffinity(0, {args.cpu})
+
+    def on_data(data: Data) -> None:
+        if args.quiet and data.kind == Kind.TICK:
+            return
+        sys.stdout.write(f'{data.jid} {data.msg} {data.msec}ms {int(data.ratio)}%\n')
+
+    if args.timerfd and not timerfd.available():
+        parser.error('--timerfd is not supported on this platform')
+    if args.shards:
+        if args.serve or args.stream or args.journal or args.wheel or alarms or rules or args.timerfd:
+            parser.error('--shards cannot be combined with --serve, --stream, --journal, --wheel, --at, '
+                         '--every, --cron or --timerfd')
+        return run_sharded(args, on_data)
+
+    scheduler = TimingWheel(NSEC_PER_SEC) if args.wheel else None
+    loop = None
+    if args.serve or args.stream:
+        # 제어 API 와 스트림은 asyncio 루프 위에서 엔진과 함께 돈다.
+        loop = asyncio.new_event_loop()
+        engine = AsyncTimerEngine(loop=loop, scheduler=scheduler, adaptive=args.adaptive, align=args.align,
+                                  clock_check=args.clock_check, timerfd=args.timerfd)
+    else:
+        # 절전 중에도 카운트다운이 흐르도록 CLOCK_BOOTTIME 으로 잰다. CLOCK_BOOTTIME timerfd 는 깨어나자마자
+        # 만료되고 벽시계 변경도 바로 알려 주므로 주기적으로 확인할 필요가 없다.
+        engine = TimerEngine(clock=boottime_ns, scheduler=scheduler, adaptive=args.adaptive, align=args.align,
+                             clock_check=0.0 if args.timerfd else args.clock_check)
+    engine.subscribe(on_data)
+    state_table = StateTable(args.state_table) if args.state_table else None
+    if state_table is not None:
+        state_table.attach(engine)
+    journal = TimerJournal(args.journal) if args.journal else None
+    if journal is not None:
+        journal.restore_engine(engine)
+        journal.attach(engine)
+    event_log = EventLog(args.event_log) if args.event_log else None
+    if event_log is not None:
+        event_log.attach(engine)
+    history = HistoryRecorder(HistoryStore(args.history)) if args.history else None
+    if history is not None:
+        history.attach(engine)
+    for sec in args.durations:
+        engine.create_timer(sec, tick=args.tick)
+    for at in alarms:
+        engine.create_alarm(at, tick=args.tick)
+    for rule in rules:
+        # 보는 사람이 없으니 실행 시각에만 깨어난다.
+        engine.set_observed(engine.create_recurring(rule, tick=args.tick).jid, not args.quiet)
+    server = None
+    stream = None
+    try:
+        if loop is not None:
+            if args.serve:
+                server = ControlServer(engine, args.serve)
+                loop.run_until_complete(server.start())
+            if args.stream:
+                stream = EventStream(engine, args.stream)
+                loop.run_until_complete(stream.start())
+            loop.run_forever()
+        elif args.timerfd:
+            driver = timerfd.TimerFdDriver(engine)
+            try:
+                driver.run_forever()
+            finally:
+                driver.close()
+        else:
+            engine.run_forever()
+    except KeyboardInterrupt:
+        engine.stop_all()
+    finally:
+        if server is not None:
+            server.close()
+        if stream is not None:
+            stream.close()
+        if event_log is not None:
+            event_log.close()
+        if history is not None:
+            history.store.flush()
+        if journal is not None:
+            journal.close()
+        if state_table is not None:
+            state_table.close()
+    return 0
+
+
+def run_sharded(args: argparse.Namespace, on_data) -> int:
+    engine = ShardedEngine(args.shards, adaptive=args.adaptive, align=args.align)
+    engine.subscribe(on_data)
+    event_log = EventLog(args.event_log) if args.event_log else None
+    if event_log is not None:
+        engine.subscribe(event_log.record_data)
+    try:
+        # quiet 이면 워커는 만료 시각에만 깨어난다.
+        engine.create_many([(sec, args.tick) for sec in args.durations], observed=not args.quiet)
+        engine.sync()
+        while engine.active():
+            engine.poll(0.1)
+        engine.sync()
+        status = engine.status()
+        sys.stderr.write(f'{status.total} timers on {status.shards} shards, late max {status.late_max_ms:.1f}ms\n')
+    except KeyboardInterrupt:
+        pass
+    finally:
+        engine.close()
+        if event_log is not None:
+            event_log.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
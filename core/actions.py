@@ -0,0 +1,244 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# author        : Seongcheol Jeon
+# created date  : 2026.10.19
+# modified date : 2026.10.19
+# description   : 만료 시 실행하는 명령을 한 번만 실행하도록 남기는 action journal
+
+import os
+import sys
+import json
+import time
+import shlex
+import typing
+import pathlib
+import threading
+import subprocess
+import collections
+
+from core.eventlog import EventLog
+
+
+def spawn(cmd: str) -> int:
+    """
+    기본 launcher. 프로세스를 띄우기만 하고 끝나기를 기다리지 않는다.
+    :param cmd:
+    :return: pid
+    """
+    proc = subprocess.Popen(shlex.split(cmd), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                            start_new_session=True)
+    return proc.pid
+
+
+class Action:
+    __slots__ = ('jid', 'run', 'commands', 'launched', 'completed', 'due_at')
+
+    def __init__(self, jid: str, run: int, commands: typing.Sequence[str], due_at: int = 0):
+        self.jid: str = jid
+        self.run: int = run
+        self.commands: typing.List[str] = list(commands)
+        self.launched: typing.Set[int] = set()
+        self.completed: typing.Dict[int, typing.Any] = dict()
+        self.due_at: int = due_at
+
+    @property
+    def key(self) -> typing.Tuple[str, int]:
+        return self.jid, self.run
+
+    def is_done(self) -> bool:
+        return len(self.completed) == len(self.commands)
+
+
+class ActionJournal:
+    """
+    (jid, run) 만료 하나마다 실행할 명령들의 due / launched / completed 를 actions.jsonl 에 남긴다.
+    run 은 그 실행을 처음 시작한 벽시계 시각(ns)이라 복원해서 이어 돌린 타이머도 같은 키를 가진다.
+
+    - due() 는 큐에 넣기만 한다. 같은 키의 due 는 한 번만 받는다(idempotent).
+    - due 가 fsync 된 뒤 writer 스레드가 명령마다 launched 를 남기고,
+      launched 가 fsync 된 뒤에 launcher 로 실행한 다음 completed 를 남긴다.
+      만료가 한꺼번에 몰려도 같은 commit 에 묶이므로 fsync 는 배치마다 한 번이다.
+    - 다시 열 때 due 만 있고 launched 가 없는 명령은 놓친 것이므로 한 번 실행한다.
+      launched 만 있고 completed 가 없는 명령은 실행 직전/직후에 끊긴 것이라 알 수 없으므로
+      relaunch_uncertain 이 True 일 때만 다시 실행한다.
+    - 다시 열 때 끝나지 않은 항목과 retention 초 안에 끝난 항목만 남기고 파일을 다시 쓴다.
+    """
+    FILE = 'actions.jsonl'
+
+    def __init__(self, path: typing.Union[str, pathlib.Path], launcher: typing.Callable[[str], typing.Any] = spawn,
+                 retention: float = 86400.0, relaunch_uncertain: bool = False, commit_interval: float = 0.05):
+        self.__path = pathlib.Path(path)
+        self.__path.mkdir(parents=True, exist_ok=True)
+        self.__launcher = launcher
+        self.__retention: float = retention
+        self.__actions: typing.Dict[typing.Tuple[str, int], Action] = dict()
+        self.__lock = threading.Lock()
+        # 레코드 순번과 그 레코드가 fsync 된 뒤에 부를 콜백 (순번 오름차순)
+        self.__seq: int = 0
+        # fsync 까지 끝난 마지막 레코드 순번
+        self.__durable: int = 0
+        self.__waits: collections.deque = collections.deque()
+        self.__uncertain: typing.List[typing.Tuple[Action, int]] = list()
+
+        self.__compact(relaunch_uncertain)
+        self.__log = EventLog(self.__path / ActionJournal.FILE, max_bytes=0, backups=0,
+                              commit_interval=commit_interval)
+        self.__log.add_commit_listener(self.__on_commit)
+        # 놓친 명령은 due 가 이미 디스크에 있으므로 바로 launched 단계로 간다.
+        for action in self.__actions.values():
+            for idx in range(len(action.commands)):
+                if idx not in action.launched:
+                    self.__launch(action, idx)
+
+    @property
+    def path(self) -> pathlib.Path:
+        return self.__path
+
+    @property
+    def uncertain(self) -> typing.List[typing.Tuple[Action, int]]:
+        """
+        지난 실행에서 launched 뒤 completed 가 남지 않은 (action, 명령 번호)
+        :return:
+        """
+        return self.__uncertain
+
+    def get(self, jid: str, run: int) -> typing.Optional[Action]:
+        return self.__actions.get((jid, run))
+
+    def pending(self) -> typing.List[Action]:
+        with self.__lock:
+            return [action for action in self.__actions.values() if not action.is_done()]
+
+    def due(self, jid: str, run: int, commands: typing.Sequence[str],
+            on_durable: typing.Optional[typing.Callable[[], None]] = None) -> bool:
+        """
+        :param jid:
+        :param run: 실행 시작 시각 (벽시계 ns)
+        :param commands:
+        :param on_durable: 이 만료의 due 가 디스크에 남은 뒤 부른다 (writer 스레드, 남길 것이 없으면 바로).
+                           타이머 journal 의 end 는 여기서 남겨야 due 보다 먼저 디스크에 가지 않는다.
+        :return: 새로 받았으면 True, 이미 받은 만료면 False
+        """
+        key = (jid, run)
+        with self.__lock:
+            action = self.__actions.get(key)
+            if action is not None:
+                fresh = False
+                # 먼저 받은 due 는 지금까지 남긴 레코드 안에 있다.
+                ready = on_durable is None or not action.commands or self.__durable >= self.__seq
+                if not ready:
+                    self.__waits.append((self.__seq, on_durable))
+            else:
+                fresh = True
+                action = Action(jid, run, commands, time.time_ns())
+                self.__actions[key] = action
+                ready = on_durable is None or not action.commands
+                if action.commands:
+                    self.__record_locked('due', action, lambda: self.__on_due(action, on_durable),
+                                         commands=action.commands)
+        if ready and on_durable is not None:
+            on_durable()
+        return fresh
+
+    def __on_due(self, action: Action, on_durable: typing.Optional[typing.Callable[[], None]]) -> None:
+        self.__launch_all(action)
+        if on_durable is not None:
+            on_durable()
+
+    def close(self) -> None:
+        self.__log.close()
+
+    def __record_locked(self, kind: str, action: Action, on_durable: typing.Optional[typing.Callable[[], None]],
+                        **fields) -> None:
+        self.__seq += 1
+        self.__log.record(kind, action.jid, run=action.run, **fields)
+        if on_durable is not None:
+            self.__waits.append((self.__seq, on_durable))
+
+    def __on_commit(self, written: int) -> None:
+        # writer 스레드에서 불린다.
+        ready = list()
+        with self.__lock:
+            self.__durable = max(self.__durable, written)
+            while self.__waits and self.__waits[0][0] <= written:
+                ready.append(self.__waits.popleft()[1])
+        for callback in ready:
+            callback()
+
+    def __launch_all(self, action: Action) -> None:
+        for idx in range(len(action.commands)):
+            self.__launch(action, idx)
+
+    def __launch(self, action: Action, idx: int) -> None:
+        with self.__lock:
+            if idx in action.launched:
+                return
+            action.launched.add(idx)
+            self.__record_locked('launched', action, lambda: self.__execute(action, idx), idx=idx)
+
+    def __execute(self, action: Action, idx: int) -> None:
+        try:
+            result = self.__launcher(action.commands[idx])
+        except Exception as err:
+            sys.stderr.write(f'[ActionJournal] {action.commands[idx]}: {err}\n')
+            result = f'error: {err}'
+        with self.__lock:
+            action.completed[idx] = result
+            self.__record_locked('completed', action, None, idx=idx, result=result)
+
+    def __compact(self, relaunch_uncertain: bool) -> None:
+        path = self.__path / ActionJournal.FILE
+        if not path.exists():
+            return
+        try:
+            for record in EventLog.read(path):
+                self.__apply(record)
+        except ValueError:
+            # 비정상 종료로 잘린 마지막 줄은 버린다.
+            sys.stderr.write(f'[ActionJournal] truncated journal: {path}\n')
+        horizon = time.time_ns() - int(self.__retention * 1_000_000_000)
+        for key, action in list(self.__actions.items()):
+            if action.is_done() and action.due_at < horizon:
+                del self.__actions[key]
+                continue
+            for idx in sorted(action.launched - set(action.completed)):
+                self.__uncertain.append((action, idx))
+                if relaunch_uncertain:
+                    action.launched.discard(idx)
+        if self.__uncertain:
+            sys.stderr.write(f'[ActionJournal] {len(self.__uncertain)} launch(es) with unknown outcome\n')
+        tmp = path.with_name(path.name + '.tmp')
+        with open(tmp, 'w', encoding='utf8') as f:
+            for action in self.__actions.values():
+                for record in self.__records(action):
+                    f.write(json.dumps(record, separators=(',', ':'), ensure_ascii=False) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+
+    @staticmethod
+    def __records(action: Action) -> typing.Iterator[dict]:
+        base = dict(jid=action.jid, run=action.run)
+        yield dict(ts=action.due_at, kind='due', commands=action.commands, **base)
+        for idx in sorted(action.launched):
+            yield dict(ts=action.due_at, kind='launched', idx=idx, **base)
+        for idx, result in sorted(action.completed.items()):
+            yield dict(ts=action.due_at, kind='completed', idx=idx, result=result, **base)
+
+    def __apply(self, record: dict) -> None:
+        key = (record['jid'], record['run'])
+        if record['kind'] == 'due':
+            self.__actions.setdefault(key, Action(record['jid'], record['run'], record['commands'], record['ts']))
+            return
+        action = self.__actions.get(key)
+        if action is None:
+            return
+        if record['kind'] == 'launched':
+            action.launched.add(record['idx'])
+        elif record['kind'] == 'completed':
+            action.completed[record['idx']] = record.get('result')
+
+
+if __name__ == '__main__':
+    pass
@@ -0,0 +1,111 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# author        : Seongcheol Jeon
+# created date  : 2026.10.19
+# modified date : 2026.10.19
+# description   : asyncio 기반 타이머 엔진
+
+import typing
+import asyncio
+
+from core.states import Constant
+from core.events import Data
+from core.engine import Timer, TimerEngine, NSEC_PER_SEC
+from core.timerfd import TimerFdDriver
+
+
+class AsyncTimer(Timer):
+    """
+    AsyncTimerEngine 이 관리하는 타이머 하나. await 하면 종료될 때까지 기다린다.
+    """
+    def __init__(self, engine: 'AsyncTimerEngine', jid: str, duration: int, tick: int = NSEC_PER_SEC,
+                 adaptive: bool = False):
+        super().__init__(engine, jid, duration, tick, adaptive)
+        self.__future: asyncio.Future = engine.loop.create_future()
+
+    def __await__(self):
+        return asyncio.shield(self.__future).__await__()
+
+    @property
+    def future(self) -> asyncio.Future:
+        return self.__future
+
+    def renew_future(self) -> None:
+        if self.__future.done():
+            self.__future = self.engine.loop.create_future()
+
+
+class AsyncTimerEngine(TimerEngine):
+    """
+    모든 타이머의 deadline 을 힙 하나에 두고, 가장 이른 deadline 에 대해서만
+    loop.call_at 핸들 하나를 유지한다. tick 마다 task 를 만들지 않는다.
+    timerfd=True 면 call_at 대신 루프의 epoll 에 올린 timerfd 하나로 깨어난다 (리눅스).
+    """
+    timer_class = AsyncTimer
+
+    def __init__(self, loop: typing.Optional[asyncio.AbstractEventLoop] = None, scheduler=None,
+                 display_interval: float = 0.0, adaptive: bool = False, align: float = 0.0,
+                 slack: typing.Optional[float] = None, clock_check: float = 0.0, jump_threshold: float = 0.05,
+                 timerfd: bool = False):
+        self.__loop = loop or asyncio.get_event_loop()
+        self.__handle: typing.Optional[asyncio.TimerHandle] = None
+        self.__driver: typing.Optional[TimerFdDriver] = None
+        super().__init__(clock=self.__clock_ns, scheduler=scheduler, display_interval=display_interval,
+                         adaptive=adaptive, align=align, slack=slack, clock_check=clock_check,
+                         jump_threshold=jump_threshold)
+        self.subscribe(self.__resolve)
+        if timerfd:
+            # loop.time() 은 CLOCK_MONOTONIC 이므로 같은 시계의 timerfd 를 건다.
+            self.__driver = TimerFdDriver(self)
+            self.__driver.attach(self.__loop)
+        else:
+            self.set_waker(self.__rearm)
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        return self.__loop
+
+    @property
+    def driver(self) -> typing.Optional[TimerFdDriver]:
+        return self.__driver
+
+    def close(self) -> None:
+        if self.__driver is not None:
+            self.__driver.close()
+            self.__driver = None
+        self.__rearm(None)
+
+    def __clock_ns(self) -> int:
+        return int(self.__loop.time() * NSEC_PER_SEC)
+
+    def __rearm(self, deadline: typing.Optional[int]) -> None:
+        if self.__handle is not None:
+            self.__handle.cancel()
+            self.__handle = None
+        if deadline is None:
+            return
+        self.__handle = self.__loop.call_at(deadline / NSEC_PER_SEC, self.__on_deadline)
+
+    def __on_deadline(self) -> None:
+        self.__handle = None
+        self.advance()
+
+    def __resolve(self, data: Data) -> None:
+        if data.ste == Constant.STARTED:
+            # 엔진이 직접 시작한 타이머 (반복, 의존 관계) 도 새 실행의 future 를 받는다.
+            self.get(data.jid).renew_future()
+            return
+        if not data.ste & (Constant.FINISHED | Constant.STOPPED | Constant.ERROR):
+            return
+        timer: AsyncTimer = self.get(data.jid)
+        if timer.future.done():
+            return
+        if data.ste == Constant.FINISHED:
+            timer.future.set_result(data)
+        else:
+            timer.future.cancel()
+
+
+if __name__ == '__main__':
+    pass
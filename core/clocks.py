@@ -0,0 +1,89 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# author        : Seongcheol Jeon
+# created date  : 2026.10.19
+# modified date : 2026.10.19
+# description   : 시계 (CLOCK_BOOTTIME, 벽시계 알람 시각)
+
+import time
+import typing
+import datetime
+
+
+CLOCK_BOOTTIME: typing.Optional[int] = getattr(time, 'CLOCK_BOOTTIME', None)
+
+
+def boot_id() -> str:
+    # 재부팅 여부 판별용. 리눅스가 아니면 빈 문자열
+    try:
+        with open('/proc/sys/kernel/random/boot_id') as f:
+            return f.read().strip()
+    except OSError:
+        return ''
+
+
+def boottime_ns() -> int:
+    # 절전 중에도 흐르는 단조 시계 (CLOCK_BOOTTIME). 없으면 monotonic
+    if CLOCK_BOOTTIME is None:
+        return time.monotonic_ns()
+    return time.clock_gettime_ns(CLOCK_BOOTTIME)
+
+
+def local_to_ns(local: datetime.datetime) -> int:
+    """
+    tzinfo 없는 로컬 시각을 그날의 UTC 오프셋(서머타임)으로 epoch ns 로 바꾼다.
+    되풀이되는 시간이면 local.fold 를 따르고, 건너뛴 시간이면 건너뛴 만큼 뒤로 민다.
+    :param local:
+    :return:
+    """
+    aware = local.astimezone()
+    if aware.replace(tzinfo=None) != local:
+        # 없는 시각은 두 해석 중 뒤쪽
+        aware = max(aware, local.replace(fold=1 - local.fold).astimezone())
+    return int(aware.timestamp()) * 1_000_000_000 + aware.microsecond * 1000
+
+
+def next_wall_time(hour: int, minute: int, second: int = 0, msec: int = 0,
+                   now: typing.Optional[datetime.datetime] = None) -> int:
+    """
+    지금 이후로 처음 돌아오는 로컬 시각 hh:mm:ss.zzz (epoch ns). 이미 지났으면 내일 같은 시각.
+    날짜를 로컬 달력으로 정한 뒤 그날의 UTC 오프셋을 쓰므로 서머타임이 바뀌는 날에도 벽시계 시각이 맞는다.
+    :param hour:
+    :param minute:
+    :param second:
+    :param msec:
+    :param now: 기준 시각 (기본값 현재 로컬 시각). tzinfo 가 있으면 로컬 시각으로 옮겨서 쓴다
+    :return:
+    """
+    now = datetime.datetime.now() if now is None else now
+    if now.tzinfo is not None:
+        now = now.astimezone().replace(tzinfo=None)
+    now_ns = local_to_ns(now)
+    at = now.replace(hour=hour, minute=minute, second=second, microsecond=msec * 1000, fold=0)
+    while True:
+        at_ns = local_to_ns(at)
+        if at_ns > now_ns:
+            return at_ns
+        at += datetime.timedelta(days=1)
+
+
+def parse_wall_time(text: str) -> int:
+    """
+    'HH:MM[:SS]' (다음에 돌아오는 그 시각) 또는 ISO 8601 날짜시각을 epoch ns 로 바꾼다.
+    :param text:
+    :return:
+    :raise ValueError: 형식이 맞지 않을 때
+    """
+    try:
+        clock = datetime.time.fromisoformat(text)
+    except ValueError:
+        at = datetime.datetime.fromisoformat(text)
+        if at.tzinfo is None:
+            return local_to_ns(at)
+        return int(at.timestamp()) * 1_000_000_000 + at.microsecond * 1000
+    return next_wall_time(clock.hour, clock.minute, clock.second, clock.microsecond // 1000)
+
+
+if __name__ == '__main__':
+    pass
@@ -0,0 +1,911 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# author        : Seongcheol Jeon
+# created date  : 2026.10.19
+# modified date : 2026.10.19
+# description   : 여러 엔진 노드가 복제 journal 과 shard lease 로 타이머를 나눠 맡는 클러스터 모드
+
+import os
+import sys
+import json
+import random
+import uuid
+import typing
+import asyncio
+import pathlib
+import argparse
+import itertools
+import collections
+
+from core.aio import AsyncTimerEngine
+from core.engine import NSEC_PER_SEC
+from core.events import Data
+from core.states import Constant
+from core.eventlog import EventLog
+from core.persist import Entry, Stamp
+from core.actions import Action, spawn
+from core.shard import jump_hash
+
+
+class ClusterError(Exception): ...
+
+
+class NotHolderError(ClusterError):
+    """
+    lease 가 넘어가는 중이라 이 노드가 shard 를 맡고 있지 않다. 잠시 뒤 주인을 다시 찾으면 된다.
+    """
+    ...
+
+
+# --- transport ---
+class Transport:
+    """
+    노드 사이의 메시지 전달. 메시지는 JSON 으로 직렬화할 수 있는 dict 이고 순서는 연결마다 보장되지만
+    잃어버릴 수 있다(best effort). 재시도와 중복 처리는 프로토콜이 맡는다.
+    """
+    async def start(self, node_id: str, on_message: typing.Callable[[dict], None]) -> None:
+        raise NotImplementedError
+
+    def send(self, node_id: str, message: dict) -> None:
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        raise NotImplementedError
+
+
+class StreamTransport(Transport):
+    """
+    Unix 소켓 또는 TCP 로 한 줄에 메시지 하나씩 보낸다. 주소는 'unix:/tmp/n1.sock', 'tcp:127.0.0.1:7001'
+    보내는 연결은 처음 보낼 때 만들고, 실패하면 RETRY_DELAY 초 동안 그 노드로 가는 메시지를 버린다.
+    """
+    RETRY_DELAY = 0.5
+    # 상대가 읽지 않아 쌓인 송신 버퍼가 이보다 크면 새 메시지는 버린다.
+    MAX_BUFFER = 4 * 1024 * 1024
+
+    def __init__(self, addresses: typing.Dict[str, str]):
+        self.__addresses: typing.Dict[str, str] = dict(addresses)
+        self.__on_message: typing.Optional[typing.Callable[[dict], None]] = None
+        self.__server: typing.Optional[asyncio.AbstractServer] = None
+        self.__writers: typing.Dict[str, asyncio.StreamWriter] = dict()
+        self.__connecting: typing.Dict[str, typing.List[bytes]] = dict()
+        self.__down_until: typing.Dict[str, float] = dict()
+        self.__tasks: typing.Set[asyncio.Task] = set()
+        self.__unix_path: typing.Optional[pathlib.Path] = None
+
+    @staticmethod
+    def parse(address: str) -> typing.Tuple[str, typing.Any]:
+        scheme, _, rest = address.partition(':')
+        if scheme == 'unix':
+            return scheme, rest
+        if scheme == 'tcp':
+            host, _, port = rest.rpartition(':')
+            return scheme, (host, int(port))
+        raise ValueError(f'unknown address: {address}')
+
+    async def start(self, node_id: str, on_message: typing.Callable[[dict], None]) -> None:
+        self.__on_message = on_message
+        scheme, where = StreamTransport.parse(self.__addresses[node_id])
+        if scheme == 'unix':
+            self.__unix_path = pathlib.Path(where)
+            self.__unix_path.unlink(missing_ok=True)
+            self.__server = await asyncio.start_unix_server(self.__handle, path=where)
+            os.chmod(where, 0o600)
+        else:
+            self.__server = await asyncio.start_server(self.__handle, *where)
+
+    def send(self, node_id: str, message: dict) -> None:
+        data = json.dumps(message, separators=(',', ':')).encode('utf8') + b'\n'
+        writer = self.__writers.get(node_id)
+        if writer is not None:
+            if writer.is_closing():
+                del self.__writers[node_id]
+            else:
+                if writer.transport.get_write_buffer_size() <= StreamTransport.MAX_BUFFER:
+                    writer.write(data)
+                return
+        pending = self.__connecting.get(node_id)
+        if pending is not None:
+            pending.append(data)
+            return
+        loop = asyncio.get_event_loop()
+        if loop.time() < self.__down_until.get(node_id, 0.0):
+            return
+        self.__connecting[node_id] = [data]
+        self.__spawn(self.__connect(node_id))
+
+    def __spawn(self, coro) -> None:
+        task = asyncio.ensure_future(coro)
+        self.__tasks.add(task)
+        task.add_done_callback(self.__tasks.discard)
+
+    async def __connect(self, node_id: str) -> None:
+        scheme, where = StreamTransport.parse(self.__addresses[node_id])
+        try:
+            if scheme == 'unix':
+                reader, writer = await asyncio.open_unix_connection(where)
+            else:
+                reader, writer = await asyncio.open_connection(*where)
+        except OSError:
+            self.__connecting.pop(node_id, None)
+            self.__down_until[node_id] = asyncio.get_event_loop().time() + StreamTransport.RETRY_DELAY
+            return
+        for data in self.__connecting.pop(node_id, ()):
+            writer.write(data)
+        self.__writers[node_id] = writer
+        # 보내기만 하는 연결이라 읽기는 끊김 감지용이다.
+        await reader.read()
+        writer.close()
+        if self.__writers.get(node_id) is writer:
+            del self.__writers[node_id]
+
+    async def __handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    message = json.loads(line)
+                except ValueError:
+                    continue
+                self.__on_message(message)
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def close(self) -> None:
+        for writer in self.__writers.values():
+            writer.close()
+        self.__writers.clear()
+        for task in list(self.__tasks):
+            task.cancel()
+        if self.__server is not None:
+            self.__server.close()
+            self.__server = None
+        if self.__unix_path is not None:
+            self.__unix_path.unlink(missing_ok=True)
+
+
+class MemoryHub:
+    """
+    한 프로세스, 한 루프 안의 노드들을 잇는다. down 에 넣은 노드로 가거나 그 노드에서 오는 메시지는 버린다.
+    """
+    def __init__(self):
+        self.handlers: typing.Dict[str, typing.Callable[[dict], None]] = dict()
+        self.down: typing.Set[str] = set()
+
+
+class MemoryTransport(Transport):
+    def __init__(self, hub: MemoryHub):
+        self.__hub = hub
+        self.__node_id: str = ''
+
+    async def start(self, node_id: str, on_message: typing.Callable[[dict], None]) -> None:
+        self.__node_id = node_id
+        self.__hub.handlers[node_id] = on_message
+
+    def send(self, node_id: str, message: dict) -> None:
+        hub = self.__hub
+        if node_id in hub.down or self.__node_id in hub.down or node_id not in hub.handlers:
+            return
+        # 실제 전송처럼 복사본을 다음 루프 차례에 넘긴다.
+        asyncio.get_event_loop().call_soon(hub.handlers[node_id], json.loads(json.dumps(message)))
+
+    async def close(self) -> None:
+        self.__hub.handlers.pop(self.__node_id, None)
+
+
+# --- replicated shard state ---
+class ShardReplica:
+    """
+    shard 하나의 복제 상태. 모든 노드가 같은 레코드를 같은 순서로 적용해서 같은 상태를 갖는다.
+    term 은 lease 세대, seq 는 shard 안의 레코드 번호다.
+    """
+    __slots__ = ('shard', 'term', 'seq', 'entries', 'actions')
+
+    def __init__(self, shard: int):
+        self.shard: int = shard
+        self.term: int = 0
+        self.seq: int = 0
+        self.entries: typing.Dict[str, Entry] = dict()
+        self.actions: typing.Dict[typing.Tuple[str, int], Action] = dict()
+
+    @property
+    def position(self) -> typing.Tuple[int, int]:
+        return self.term, self.seq
+
+    def apply(self, record: dict) -> None:
+        self.term, self.seq = max(self.term, record['term']), record['seq']
+        kind, jid = record['kind'], record.get('jid', '')
+        stamp = Stamp(*record['stamp'])
+        if kind == 'create':
+            entry = Entry(jid, record['duration'], record['tick'], record.get('group', ''), record.get('commands', ()))
+            if record.get('start'):
+                entry.state, entry.stamp, entry.run = Entry.RUNNING, stamp, stamp.wall
+            self.entries[jid] = entry
+            return
+        if kind in ('launched', 'completed'):
+            action = self.actions.get((jid, record['run']))
+            if action is None:
+                return
+            if kind == 'launched':
+                action.launched.add(record['idx'])
+            else:
+                action.completed[record['idx']] = record.get('result')
+            return
+        entry = self.entries.get(jid)
+        if entry is None:
+            return
+        if kind == 'pause' and entry.state == Entry.RUNNING:
+            entry.elapsed, entry.state, entry.stamp = entry.elapsed_at(stamp), Entry.PAUSED, stamp
+        elif kind == 'resume' and entry.state == Entry.PAUSED:
+            entry.state, entry.stamp = Entry.RUNNING, stamp
+        elif kind == 'remove':
+            del self.entries[jid]
+        elif kind == 'expire':
+            del self.entries[jid]
+            key = (jid, entry.run)
+            if key not in self.actions:
+                self.actions[key] = Action(jid, entry.run, entry.commands, stamp.wall)
+
+    def snapshot(self) -> dict:
+        actions = [dict(jid=a.jid, run=a.run, commands=a.commands, due_at=a.due_at, launched=sorted(a.launched),
+                        completed=sorted(a.completed.items())) for a in self.actions.values()]
+        return dict(shard=self.shard, term=self.term, seq=self.seq,
+                    entries=[entry.to_dict() for entry in self.entries.values()], actions=actions)
+
+    def install(self, state: dict) -> None:
+        self.term, self.seq = state['term'], state['seq']
+        self.entries = {item['jid']: Entry.from_dict(item) for item in state['entries']}
+        self.actions = dict()
+        for item in state['actions']:
+            action = Action(item['jid'], item['run'], item['commands'], item['due_at'])
+            action.launched = set(item['launched'])
+            action.completed = {idx: result for idx, result in item['completed']}
+            self.actions[action.key] = action
+
+    def prune(self, horizon: int) -> None:
+        # horizon(벽시계 ns) 전에 끝난 만료 명령 기록은 버린다.
+        for key in [key for key, action in self.actions.items() if action.is_done() and action.due_at < horizon]:
+            del self.actions[key]
+
+
+class Lease(typing.NamedTuple):
+    holder: str
+    term: int
+    # 이 노드의 loop.time() 기준 만료 시각
+    expires: float
+
+
+# --- node ---
+class ClusterNode:
+    """
+    클러스터의 엔진 노드 하나. jid 는 jump_hash 로 shards 개의 shard 에 나뉘고, shard 마다 한 노드가
+    lease 를 잡고 그 shard 의 타이머를 자기 AsyncTimerEngine 에서 돌린다.
+
+    lease
+        과반수 노드가 허락해야 잡는다. 허락한 노드는 받은 시각부터 lease 초 동안 다른 노드에 허락하지 않고,
+        잡은 노드는 요청을 보낸 시각부터 lease * (1 - DRIFT) 초까지만 자기 것으로 본다. 그래서 두 노드가
+        같은 shard 를 동시에 가졌다고 믿는 구간이 없다. lease / 3 마다 갱신한다.
+        다시 뜬 노드는 자기가 준 허락을 잊었으므로 lease 초 동안은 허락하지 않는다.
+    복제 journal
+        lease 를 가진 노드만 그 shard 의 레코드를 쓴다. 레코드는 (term, seq) 를 달고 모든 노드로 보내서
+        과반수가 fsync 한 뒤에 완료로 본다. 순서가 빠진 노드에는 shard 상태 전체를 보내서 맞춘다.
+        더 낮은 term 의 레코드는 거절하므로 lease 를 잃은 노드의 쓰기는 과반수를 얻지 못한다.
+    넘겨받기
+        lease 를 새로 잡으면 허락한 노드 중 (term, seq) 가 가장 앞선 노드의 상태를 받아 온다. 완료된 레코드는
+        과반수에 있고 허락한 과반수와 반드시 겹치므로 빠지는 것이 없다. 그 뒤 타이머를 남은 시간으로 다시 돌리고,
+        due 만 있고 launched 가 없는 만료 명령을 실행한다.
+    만료 명령
+        expire 와 launched 를 과반수에 남긴 뒤에만 실행하므로 넘겨받은 노드가 같은 명령을 다시 실행하지 않는다.
+        launched 뒤 completed 가 없는 명령은 결과를 알 수 없으므로 relaunch_uncertain 일 때만 다시 실행한다.
+    """
+    DRIFT = 0.1
+    RETENTION = 86400.0
+
+    def __init__(self, node_id: str, peers: typing.Dict[str, str], path: typing.Union[str, pathlib.Path],
+                 transport: typing.Optional[Transport] = None, shards: int = 16, lease: float = 3.0,
+                 launcher: typing.Callable[[str], typing.Any] = spawn, relaunch_uncertain: bool = False,
+                 loop: typing.Optional[asyncio.AbstractEventLoop] = None):
+        """
+        :param node_id:
+        :param peers: 자기 자신을 포함한 모든 노드의 id -> 주소
+        :param path: journal 디렉토리
+        :param transport: None 이면 StreamTransport(peers)
+        :param shards: 클러스터 전체가 같은 값을 써야 한다.
+        :param lease: 초
+        :param launcher:
+        :param relaunch_uncertain:
+        :param loop:
+        """
+        self.__id: str = node_id
+        self.__members: typing.List[str] = sorted(peers)
+        self.__quorum: int = len(self.__members) // 2 + 1
+        self.__transport: Transport = transport or StreamTransport(peers)
+        self.__loop = loop or asyncio.get_event_loop()
+        self.__engine = AsyncTimerEngine(self.__loop)
+        self.__shards: int = shards
+        self.__lease: float = lease
+        self.__launcher = launcher
+        self.__relaunch_uncertain: bool = relaunch_uncertain
+        self.__replicas: typing.List[ShardReplica] = [ShardReplica(s) for s in range(shards)]
+        self.__leases: typing.Dict[int, Lease] = dict()
+        self.__promised: typing.Dict[int, int] = dict()
+        # 내가 가진 shard -> 내 기준 만료 시각, 잡은 term
+        self.__owned: typing.Dict[int, float] = dict()
+        self.__terms: typing.Dict[int, int] = dict()
+        # shard 마다 한 번에 레코드 하나만 복제한다 (seq 가 겹치지 않게).
+        self.__appending: typing.Dict[int, asyncio.Lock] = dict()
+        # 실행 중인 만료 명령 (jid, run)
+        self.__firing: typing.Set[typing.Tuple[str, int]] = set()
+        self.__busy: typing.Set[int] = set()
+        self.__ids = itertools.count(1)
+        self.__pending: typing.Dict[int, asyncio.Future] = dict()
+        self.__listeners: typing.List[typing.Callable[[str, dict], None]] = list()
+        self.__tasks: typing.Set[asyncio.Task] = set()
+        self.__grace_until: float = 0.0
+        self.__lease_task: typing.Optional[asyncio.Task] = None
+
+        path = pathlib.Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+        self.__load(path / f'{node_id}.jsonl')
+        self.__log = EventLog(path / f'{node_id}.jsonl', max_bytes=0, backups=0, commit_interval=0.002)
+        # 로컬 fsync 를 기다리는 레코드 순번과 future (ActionJournal 과 같은 방식)
+        self.__seq: int = 0
+        self.__durable: collections.deque = collections.deque()
+        self.__log.add_commit_listener(
+            lambda written: self.__loop.call_soon_threadsafe(self.__on_commit, written))
+        self.__engine.subscribe(self.__on_data)
+
+    @property
+    def id(self) -> str:
+        return self.__id
+
+    @property
+    def engine(self) -> AsyncTimerEngine:
+        return self.__engine
+
+    @property
+    def replicas(self) -> typing.List[ShardReplica]:
+        return self.__replicas
+
+    def shard_of(self, jid: str) -> int:
+        return jump_hash(jid, self.__shards)
+
+    def owned(self) -> typing.List[int]:
+        return sorted(self.__owned)
+
+    def holder(self, shard: int) -> typing.Optional[str]:
+        if shard in self.__owned:
+            return self.__id
+        lease = self.__leases.get(shard)
+        if lease is None or lease.expires <= self.__loop.time() or lease.holder == self.__id:
+            return None
+        return lease.holder
+
+    def subscribe(self, callback: typing.Callable[[str, dict], None]) -> None:
+        # (kind, fields). kind: acquired, lost, expired, launched
+        self.__listeners.append(callback)
+
+    def __emit(self, kind: str, **fields) -> None:
+        for callback in self.__listeners:
+            callback(kind, fields)
+
+    def __spawn(self, coro) -> asyncio.Task:
+        task = self.__loop.create_task(coro)
+        self.__tasks.add(task)
+        task.add_done_callback(self.__tasks.discard)
+        return task
+
+    # --- 시작/종료 ---
+    async def start(self) -> None:
+        self.__grace_until = self.__loop.time() + self.__lease
+        await self.__transport.start(self.__id, self.__on_message)
+        self.__lease_task = self.__spawn(self.__lease_loop())
+
+    async def close(self) -> None:
+        if self.__lease_task is not None:
+            self.__lease_task.cancel()
+        for task in list(self.__tasks):
+            task.cancel()
+        for shard in list(self.__owned):
+            self.__lose(shard)
+        await self.__transport.close()
+        self.__log.close()
+
+    # --- 로컬 journal ---
+    def __load(self, path: pathlib.Path) -> None:
+        if not path.exists():
+            return
+        try:
+            for record in EventLog.read(path):
+                if record['kind'] == 'install':
+                    self.__replicas[record['shard']].install(record['state'])
+                else:
+                    self.__replicas[record['shard']].apply(record)
+        except ValueError:
+            sys.stderr.write(f'[ClusterNode] truncated journal: {path}\n')
+        # shard 마다 상태 하나로 줄여서 다시 쓴다.
+        horizon = Stamp.now().wall - int(ClusterNode.RETENTION * NSEC_PER_SEC)
+        tmp = path.with_name(path.name + '.tmp')
+        with open(tmp, 'w', encoding='utf8') as f:
+            for replica in self.__replicas:
+                replica.prune(horizon)
+                if replica.seq:
+                    record = dict(ts=0, kind='install', jid='', shard=replica.shard, state=replica.snapshot())
+                    f.write(json.dumps(record, separators=(',', ':'), ensure_ascii=False) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+
+    def __persist(self, kind: str, jid: str = '', **fields) -> asyncio.Future:
+        future = self.__loop.create_future()
+        self.__seq += 1
+        self.__log.record(kind, jid, **fields)
+        self.__durable.append((self.__seq, future))
+        return future
+
+    def __on_commit(self, written: int) -> None:
+        while self.__durable and self.__durable[0][0] <= written:
+            future = self.__durable.popleft()[1]
+            if not future.done():
+                future.set_result(True)
+
+    # --- 메시지 ---
+    def __on_message(self, message: dict) -> None:
+        if message.get('type') == 'reply':
+            future = self.__pending.get(message.get('re'))
+            if future is not None and not future.done():
+                future.set_result(message)
+            return
+        self.__spawn(self.__serve(message))
+
+    async def __serve(self, message: dict) -> None:
+        reply = await self.__handle(message)
+        self.__transport.send(message['src'], dict(reply, type='reply', re=message['id'], src=self.__id))
+
+    async def __handle(self, message: dict) -> dict:
+        handler = getattr(self, f'_ClusterNode__on_{message["type"]}', None)
+        if handler is None:
+            return dict(ok=False, error=f'unknown message: {message["type"]}')
+        try:
+            return await handler(message)
+        except (ClusterError, KeyError, ValueError) as err:
+            return dict(ok=False, error=str(err))
+
+    async def __request(self, node_id: str, message: dict, timeout: float) -> typing.Optional[dict]:
+        if node_id == self.__id:
+            return await self.__handle(dict(message, src=self.__id))
+        req_id = next(self.__ids)
+        future = self.__loop.create_future()
+        self.__pending[req_id] = future
+        self.__transport.send(node_id, dict(message, id=req_id, src=self.__id))
+        try:
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            return None
+        finally:
+            self.__pending.pop(req_id, None)
+
+    async def __gather(self, coros: typing.Iterable[typing.Awaitable], timeout: float) -> typing.Optional[list]:
+        """
+        과반수가 참인 결과를 돌려줄 때까지 기다린다. 못 모으면 None. 남은 요청은 그대로 끝까지 간다.
+        """
+        results = list()
+        try:
+            for future in asyncio.as_completed([asyncio.ensure_future(coro) for coro in coros], timeout=timeout):
+                result = await future
+                if result:
+                    results.append(result)
+                    if len(results) >= self.__quorum:
+                        return results
+        except asyncio.TimeoutError:
+            pass
+        return None
+
+    # --- lease ---
+    async def __lease_loop(self) -> None:
+        interval = self.__lease / 3
+        expired_at: typing.Dict[int, float] = dict()
+        while True:
+            now = self.__loop.time()
+            for shard in range(self.__shards):
+                if shard in self.__busy:
+                    continue
+                if shard in self.__owned:
+                    if now >= self.__owned[shard]:
+                        self.__lose(shard)
+                    else:
+                        self.__busy.add(shard)
+                        self.__spawn(self.__acquire(shard, renew=True))
+                    continue
+                if self.holder(shard) is not None:
+                    expired_at.pop(shard, None)
+                    continue
+                if now < self.__grace_until:
+                    continue
+                # 자기 몫(home)이 아닌 shard 는 lease 한 번만큼 더 기다려서 원래 주인이 먼저 잡게 한다.
+                home = self.__members[shard % len(self.__members)]
+                due = expired_at.setdefault(shard, now if home == self.__id else now + self.__lease)
+                if now >= due:
+                    # 실패하면 다시 시도할 시각. 여러 노드가 같은 term 으로 맞부딪히면 서로 거절하므로 흩뜨린다.
+                    expired_at[shard] = now + random.uniform(interval, self.__lease)
+                    self.__busy.add(shard)
+                    self.__spawn(self.__acquire(shard))
+            await asyncio.sleep(interval)
+
+    async def __on_lease(self, message: dict) -> dict:
+        shard, term, holder = message['shard'], message['term'], message['holder']
+        now = self.__loop.time()
+        if now < self.__grace_until:
+            return dict(ok=False, error='grace period')
+        promised = self.__promised.get(shard, 0)
+        lease = self.__leases.get(shard)
+        # 같은 term 은 한 노드에게만 준다 (갱신은 같은 노드, 같은 term).
+        same = lease is not None and lease.holder == holder and lease.term == term
+        if term < promised or (term == promised and not same):
+            return dict(ok=False, error='stale term', promised=promised)
+        if lease is not None and lease.expires > now and lease.holder != holder:
+            return dict(ok=False, error=f'held by {lease.holder}', promised=promised)
+        self.__promised[shard] = term
+        self.__leases[shard] = Lease(holder, term, now + self.__lease)
+        replica = self.__replicas[shard]
+        return dict(ok=True, node=self.__id, term=replica.term, seq=replica.seq)
+
+    async def __acquire(self, shard: int, renew: bool = False) -> None:
+        try:
+            if renew:
+                term = self.__terms[shard]
+            else:
+                term = max(self.__promised.get(shard, 0), self.__replicas[shard].term) + 1
+            sent_at = self.__loop.time()
+            message = dict(type='lease', shard=shard, term=term, holder=self.__id)
+            grants = await self.__gather((self.__granted(node, message) for node in self.__members),
+                                         self.__lease / 3)
+            if grants is None:
+                if renew and self.__loop.time() >= self.__owned.get(shard, 0.0):
+                    self.__lose(shard)
+                if not renew:
+                    # 과반수를 못 얻었으면 자기에게 준 lease 는 거둔다. 안 그러면 다른 후보를 lease 한 번 동안 막는다.
+                    lease = self.__leases.get(shard)
+                    if lease is not None and lease.holder == self.__id and lease.term == term:
+                        del self.__leases[shard]
+                return
+            until = sent_at + self.__lease * (1 - ClusterNode.DRIFT)
+            if renew:
+                if shard in self.__owned:
+                    self.__owned[shard] = until
+                return
+            await self.__take_over(shard, term, until, grants)
+        finally:
+            self.__busy.discard(shard)
+
+    async def __granted(self, node_id: str, message: dict) -> typing.Optional[dict]:
+        reply = await self.__request(node_id, message, self.__lease / 3)
+        if reply is None or not reply.get('ok'):
+            if reply is not None and reply.get('promised', 0) > self.__promised.get(message['shard'], 0):
+                # 다음 시도는 더 높은 term 으로 한다.
+                self.__promised[message['shard']] = reply['promised']
+            return None
+        return reply
+
+    async def __take_over(self, shard: int, term: int, until: float, grants: typing.List[dict]) -> None:
+        replica = self.__replicas[shard]
+        best = max(grants, key=lambda grant: (grant['term'], grant['seq']))
+        if (best['term'], best['seq']) > replica.position:
+            reply = await self.__request(best['node'], dict(type='fetch', shard=shard), self.__lease / 3)
+            if not reply or not reply.get('ok'):
+                return
+            replica.install(reply['state'])
+            await self.__persist('install', shard=shard, state=reply['state'])
+        self.__owned[shard] = until
+        self.__terms[shard] = term
+        # 새 term 의 첫 레코드. 과반수가 이 노드의 상태를 갖게 되고 이전 term 의 쓰기는 막힌다.
+        try:
+            await self.__append(shard, 'lease')
+        except ClusterError:
+            self.__owned.pop(shard, None)
+            self.__terms.pop(shard, None)
+            return
+        self.__emit('acquired', shard=shard, term=term, timers=len(replica.entries))
+        stamp = Stamp.now()
+        for entry in list(replica.entries.values()):
+            self.__run_entry(entry, stamp)
+        for action in list(replica.actions.values()):
+            self.__spawn(self.__fire(shard, action, uncertain=True))
+
+    def __run_entry(self, entry: Entry, stamp: Stamp) -> None:
+        engine = self.__engine
+        # 넘겨받는 중에 들어온 create 가 먼저 돌렸을 수 있다.
+        if entry.jid in engine.timers and engine.timers[entry.jid].is_active():
+            return
+        engine.create_timer(entry.duration / NSEC_PER_SEC, jid=entry.jid, tick=entry.tick / NSEC_PER_SEC,
+                            start=False)
+        if entry.state == Entry.IDLE:
+            return
+        engine.start(entry.jid, min(entry.duration, entry.elapsed_at(stamp)))
+        if entry.state == Entry.PAUSED:
+            engine.pause(entry.jid)
+
+    def __lose(self, shard: int) -> None:
+        if self.__owned.pop(shard, None) is None:
+            return
+        self.__terms.pop(shard, None)
+        for jid in list(self.__replicas[shard].entries):
+            if jid in self.__engine.timers:
+                self.__engine.remove(jid)
+        self.__emit('lost', shard=shard)
+
+    def __valid(self, shard: int) -> bool:
+        return self.__loop.time() < self.__owned.get(shard, 0.0)
+
+    # --- 복제 ---
+    async def __append(self, shard: int, kind: str, jid: str = '', **fields) -> None:
+        """
+        레코드를 로컬과 다른 노드에 남기고 과반수가 fsync 한 뒤에야 이 노드의 replica 에 적용한다.
+        과반수를 얻지 못한 레코드는 일부 노드에만 남았을 수 있어서 같은 seq 로 다시 쓸 수 없으므로
+        shard 를 내려놓는다. 다음 lease 를 잡는 노드가 과반수의 상태로 다시 맞춘다.
+        :raise ClusterError: lease 가 없거나 과반수를 얻지 못했을 때
+        """
+        if not self.__valid(shard):
+            raise NotHolderError(f'shard {shard} is not held by {self.__id}')
+        lock = self.__appending.setdefault(shard, asyncio.Lock())
+        async with lock:
+            if not self.__valid(shard):
+                raise NotHolderError(f'shard {shard} is not held by {self.__id}')
+            replica = self.__replicas[shard]
+            record = dict(kind=kind, jid=jid, shard=shard, term=self.__terms[shard],
+                          seq=replica.seq + 1, stamp=list(Stamp.now()), **fields)
+            local = self.__persist(**record)
+
+            async def to_local():
+                return await local
+
+            async def to_peer(node):
+                message = dict(type='append', record=record)
+                reply = await self.__request(node, message, self.__lease / 3)
+                if reply is not None and reply.get('gap'):
+                    # 빠진 노드는 적용된 상태까지 맞춘 뒤에 이 레코드를 다시 받는다.
+                    reply = await self.__request(node, dict(type='install', shard=shard, term=record['term'],
+                                                            state=replica.snapshot()), self.__lease / 3)
+                    if reply is not None and reply.get('ok'):
+                        reply = await self.__request(node, message, self.__lease / 3)
+                return reply is not None and reply.get('ok')
+
+            coros = [to_local()] + [to_peer(node) for node in self.__members if node != self.__id]
+            if await self.__gather(coros, self.__lease / 2) is None:
+                self.__lose(shard)
+                raise ClusterError(f'shard {shard}: {kind} was not replicated to a quorum')
+            replica.apply(record)
+
+    async def __on_append(self, message: dict) -> dict:
+        record = message['record']
+        shard = record['shard']
+        replica = self.__replicas[shard]
+        if record['term'] < self.__promised.get(shard, 0):
+            return dict(ok=False, error='stale term')
+        if record['term'] == replica.term and record['seq'] <= replica.seq:
+            return dict(ok=True)
+        if record['term'] < replica.term or record['seq'] != replica.seq + 1:
+            return dict(ok=False, gap=True)
+        replica.apply(record)
+        await self.__persist(**record)
+        return dict(ok=True)
+
+    async def __on_install(self, message: dict) -> dict:
+        shard = message['shard']
+        if message['term'] < self.__promised.get(shard, 0):
+            return dict(ok=False, error='stale term')
+        self.__replicas[shard].install(message['state'])
+        await self.__persist('install', shard=shard, state=message['state'])
+        return dict(ok=True)
+
+    async def __on_fetch(self, message: dict) -> dict:
+        return dict(ok=True, state=self.__replicas[message['shard']].snapshot())
+
+    # --- 만료 명령 ---
+    def __on_data(self, data: Data) -> None:
+        if data.ste == Constant.FINISHED:
+            self.__spawn(self.__expire(data.jid))
+
+    async def __expire(self, jid: str) -> None:
+        shard = self.shard_of(jid)
+        replica = self.__replicas[shard]
+        entry = replica.entries.get(jid)
+        if entry is None or not self.__valid(shard):
+            return
+        try:
+            await self.__append(shard, 'expire', jid)
+        except ClusterError as err:
+            sys.stderr.write(f'[ClusterNode] {err}\n')
+            return
+        self.__emit('expired', jid=jid, shard=shard)
+        action = replica.actions.get((jid, entry.run))
+        if action is not None:
+            await self.__fire(shard, action)
+
+    async def __fire(self, shard: int, action: Action, uncertain: bool = False) -> None:
+        if action.key in self.__firing:
+            return
+        self.__firing.add(action.key)
+        try:
+            await self.__fire_commands(shard, action, uncertain)
+        finally:
+            self.__firing.discard(action.key)
+
+    async def __fire_commands(self, shard: int, action: Action, uncertain: bool) -> None:
+        for idx, cmd in enumerate(action.commands):
+            if idx in action.completed:
+                continue
+            if idx in action.launched:
+                # 넘겨받기 전에 실행했는지 알 수 없는 명령
+                if not (uncertain and self.__relaunch_uncertain):
+                    continue
+            try:
+                await self.__append(shard, 'launched', action.jid, run=action.run, idx=idx)
+            except ClusterError as err:
+                sys.stderr.write(f'[ClusterNode] {err}\n')
+                return
+            if not self.__valid(shard):
+                return
+            try:
+                result = self.__launcher(cmd)
+            except Exception as err:
+                result = f'error: {err}'
+            self.__emit('launched', jid=action.jid, run=action.run, cmd=cmd, result=result)
+            try:
+                await self.__append(shard, 'completed', action.jid, run=action.run, idx=idx, result=result)
+            except ClusterError as err:
+                sys.stderr.write(f'[ClusterNode] {err}\n')
+                return
+
+    # --- 타이머 조작 (주인 노드로 전달) ---
+    async def __on_op(self, message: dict) -> dict:
+        op, params = message['op'], message['params']
+        try:
+            return dict(ok=True, result=await getattr(self, f'_ClusterNode__op_{op}')(**params))
+        except NotHolderError as err:
+            return dict(ok=False, error=str(err), retry=True)
+
+    async def __call(self, jid: str, op: str, **params):
+        """
+        shard 주인에게 op 를 보낸다. lease 가 넘어가는 중이면 lease 한 번 동안 주인을 다시 찾아서 재시도한다.
+        """
+        shard = self.shard_of(jid)
+        deadline = self.__loop.time() + self.__lease
+        while True:
+            try:
+                return await self.__call_once(shard, jid, op, **params)
+            except NotHolderError:
+                if self.__loop.time() >= deadline:
+                    raise
+            await asyncio.sleep(self.__lease / 6)
+
+    async def __call_once(self, shard: int, jid: str, op: str, **params):
+        holder = self.holder(shard)
+        if holder is None:
+            raise NotHolderError(f'shard {shard} has no lease holder')
+        if holder == self.__id:
+            return await getattr(self, f'_ClusterNode__op_{op}')(jid=jid, **params)
+        reply = await self.__request(holder, dict(type='op', op=op, params=dict(jid=jid, **params)), self.__lease)
+        if reply is None:
+            raise NotHolderError(f'{holder} did not answer')
+        if not reply.get('ok'):
+            raise (NotHolderError if reply.get('retry') else ClusterError)(reply.get('error', 'failed'))
+        return reply['result']
+
+    async def create_timer(self, duration: float, jid: typing.Optional[str] = None, tick: float = 1.0,
+                           commands: typing.Sequence[str] = (), group: str = '', start: bool = True) -> str:
+        """
+        :param duration: 초
+        :param jid:
+        :param tick: 초
+        :param commands: 만료 때 한 번 실행할 명령
+        :param group:
+        :param start:
+        :return: jid
+        """
+        jid = jid or uuid.uuid4().hex
+        return await self.__call(jid, 'create', duration=duration, tick=tick, commands=list(commands), group=group,
+                                 start=start)
+
+    async def pause(self, jid: str) -> bool:
+        return await self.__call(jid, 'pause')
+
+    async def resume(self, jid: str) -> bool:
+        return await self.__call(jid, 'resume')
+
+    async def stop(self, jid: str) -> bool:
+        return await self.__call(jid, 'stop')
+
+    async def __op_create(self, jid: str, duration: float, tick: float, commands: typing.List[str], group: str,
+                          start: bool) -> str:
+        shard = self.shard_of(jid)
+        if jid in self.__replicas[shard].entries:
+            raise ClusterError(f'[{jid}] timer exists')
+        await self.__append(shard, 'create', jid, duration=int(duration * NSEC_PER_SEC),
+                            tick=int(tick * NSEC_PER_SEC), commands=commands, group=group, start=start)
+        self.__run_entry(self.__replicas[shard].entries[jid], Stamp.now())
+        return jid
+
+    async def __op_pause(self, jid: str) -> bool:
+        shard = self.shard_of(jid)
+        entry = self.__replicas[shard].entries.get(jid)
+        if entry is None or entry.state != Entry.RUNNING:
+            return False
+        # 과반수에 남은 뒤에만 로컬 엔진을 바꾼다. 실패하면 엔진도 replica 도 그대로다.
+        await self.__append(shard, 'pause', jid)
+        if jid in self.__engine.timers:
+            self.__engine.pause(jid)
+        return True
+
+    async def __op_resume(self, jid: str) -> bool:
+        shard = self.shard_of(jid)
+        entry = self.__replicas[shard].entries.get(jid)
+        if entry is None or entry.state != Entry.PAUSED:
+            return False
+        await self.__append(shard, 'resume', jid)
+        if jid in self.__engine.timers:
+            self.__engine.resume(jid)
+        return True
+
+    async def __op_stop(self, jid: str) -> bool:
+        shard = self.shard_of(jid)
+        if jid not in self.__replicas[shard].entries:
+            return False
+        await self.__append(shard, 'remove', jid)
+        if jid in self.__engine.timers:
+            self.__engine.remove(jid)
+        return True
+
+    def timers(self) -> typing.List[typing.Tuple[int, Entry]]:
+        # 이 노드가 가진 shard 의 타이머
+        return [(shard, entry) for shard in self.owned() for entry in self.__replicas[shard].entries.values()]
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m core.cluster', description='Clustered timer engine node')
+    parser.add_argument('--id', required=True, help='this node id')
+    parser.add_argument('--peer', action='append', default=[], metavar='ID=ADDR',
+                        help='every node including this one, e.g. n1=unix:/tmp/n1.sock or n2=tcp:127.0.0.1:7002')
+    parser.add_argument('--data', required=True, metavar='DIR', help='journal directory')
+    parser.add_argument('--shards', type=int, default=16)
+    parser.add_argument('--lease', type=float, default=3.0, help='lease duration in seconds')
+    parser.add_argument('--timer', action='append', default=[], metavar='SEC[:CMD]',
+                        help='create a timer once every shard has a holder')
+    args = parser.parse_args(argv)
+    peers = dict(peer.split('=', 1) for peer in args.peer)
+    if args.id not in peers:
+        parser.error(f'--peer {args.id}=ADDR is required')
+
+    def on_event(kind: str, fields: dict) -> None:
+        sys.stdout.write(f'[{args.id}] {kind} ' + ' '.join(f'{k}={v}' for k, v in fields.items()) + '\n')
+        sys.stdout.flush()
+
+    async def run() -> None:
+        node = ClusterNode(args.id, peers, args.data, shards=args.shards, lease=args.lease)
+        node.subscribe(on_event)
+        await node.start()
+        try:
+            if args.timer:
+                while any(node.holder(shard) is None for shard in range(args.shards)):
+                    await asyncio.sleep(0.1)
+                for spec in args.timer:
+                    sec, _, cmd = spec.partition(':')
+                    jid = await node.create_timer(float(sec), commands=[cmd] if cmd else ())
+                    on_event('created', dict(jid=jid, sec=sec))
+            await asyncio.Event().wait()
+        finally:
+            await node.close()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,184 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# author        : Seongcheol Jeon
+# created date  : 2026.10.19
+# modified date : 2026.10.19
+# description   : 타이머 의존 관계 DAG (점진적 위상 정렬)
+
+import typing
+
+
+ON_FINISH: typing.Final[str] = 'finish'
+ON_ERROR: typing.Final[str] = 'error'
+CONDITIONS: typing.Final[typing.Tuple[str, ...]] = (ON_FINISH, ON_ERROR)
+
+
+class CycleError(ValueError):
+    def __init__(self, src: str, dst: str, path: typing.List[str]):
+        super().__init__(f'{src} -> {dst} makes a cycle: {" -> ".join(path)}')
+        self.path: typing.List[str] = path
+
+
+class Dependency:
+    """
+    src 가 on('finish', 'error') 이 되면 delay(ns) 뒤에 dst 를 시작한다.
+    """
+    __slots__ = ('src', 'dst', 'on', 'delay')
+
+    def __init__(self, src: str, dst: str, on: str = ON_FINISH, delay: int = 0):
+        self.src: str = src
+        self.dst: str = dst
+        self.on: str = on
+        self.delay: int = delay
+
+    def to_dict(self) -> dict:
+        return dict(src=self.src, dst=self.dst, on=self.on, delay=self.delay / 1_000_000_000)
+
+
+class DependencyGraph:
+    """
+    jid 사이의 의존 간선들. 노드마다 위상 순서 번호(ord)를 들고 있고, 간선을 넣을 때
+    순서가 어긋난 구간(ord[dst] .. ord[src])의 노드들만 다시 번호를 매긴다 (Pearce-Kelly).
+    대부분의 간선 추가는 O(1) 이고, 순환은 그 구간을 훑는 동안 바로 찾아낸다.
+    """
+    def __init__(self):
+        self.__ord: typing.Dict[str, int] = dict()
+        self.__next_ord: int = 0
+        self.__out: typing.Dict[str, typing.Dict[str, Dependency]] = dict()
+        self.__in: typing.Dict[str, typing.Dict[str, Dependency]] = dict()
+        # ord 순으로 정렬한 successor 목록 캐시 (순서가 바뀌면 버린다)
+        self.__sorted: typing.Dict[str, typing.List[Dependency]] = dict()
+
+    def __len__(self):
+        return len(self.__ord)
+
+    def __contains__(self, jid: str) -> bool:
+        return jid in self.__ord
+
+    def __add_node(self, jid: str) -> None:
+        if jid in self.__ord:
+            return
+        self.__ord[jid] = self.__next_ord
+        self.__next_ord += 1
+        self.__out[jid] = dict()
+        self.__in[jid] = dict()
+
+    def remove(self, jid: str) -> None:
+        # jid 와 이어진 간선을 모두 지운다.
+        if jid not in self.__ord:
+            return
+        for src in list(self.__in[jid]):
+            del self.__out[src][jid]
+            self.__sorted.pop(src, None)
+        for dst in list(self.__out[jid]):
+            del self.__in[dst][jid]
+        del self.__ord[jid], self.__out[jid], self.__in[jid]
+        self.__sorted.pop(jid, None)
+
+    def add(self, src: str, dst: str, on: str = ON_FINISH, delay: int = 0) -> Dependency:
+        """
+        :param src: 선행 타이머
+        :param dst: 후행 타이머
+        :param on: 'finish' 또는 'error'
+        :param delay: src 가 on 이 된 뒤 dst 를 시작하기까지 (ns)
+        :return:
+        :raise CycleError: 간선을 넣으면 순환이 생길 때
+        :raise ValueError:
+        """
+        if on not in CONDITIONS:
+            raise ValueError(f'unknown condition: {on!r} (expected one of {", ".join(CONDITIONS)})')
+        if delay < 0:
+            raise ValueError(f'delay must not be negative: {delay}')
+        if src == dst:
+            raise CycleError(src, dst, [src, dst])
+        self.__add_node(src)
+        self.__add_node(dst)
+        edge = self.__out[src].get(dst)
+        if edge is None:
+            if self.__ord[src] > self.__ord[dst]:
+                self.__reorder(src, dst)
+            edge = Dependency(src, dst, on, delay)
+            self.__out[src][dst] = edge
+            self.__in[dst][src] = edge
+            self.__sorted.pop(src, None)
+        else:
+            edge.on, edge.delay = on, delay
+        return edge
+
+    def discard(self, src: str, dst: str) -> bool:
+        edge = self.__out.get(src, dict()).pop(dst, None)
+        if edge is None:
+            return False
+        del self.__in[dst][src]
+        self.__sorted.pop(src, None)
+        return True
+
+    def __reorder(self, src: str, dst: str) -> None:
+        # ord[dst] < ord[src] 인 간선 src -> dst. dst 에서 앞으로 닿는 노드 중 ord 가 ord[src] 이하인 것(forward)과
+        # src 로 거꾸로 닿는 노드 중 ord 가 ord[dst] 이상인 것(backward)만 번호를 서로 바꾼다.
+        order = self.__ord
+        lower, upper = order[dst], order[src]
+        forward = self.__search(dst, self.__out, lambda node: order[node] <= upper, src)
+        backward = self.__search(src, self.__in, lambda node: order[node] >= lower, None)
+        forward.sort(key=order.__getitem__)
+        backward.sort(key=order.__getitem__)
+        moved = backward + forward
+        slots = sorted(order[node] for node in moved)
+        for node, slot in zip(moved, slots):
+            order[node] = slot
+            # 이 노드를 successor 로 가진 목록은 다시 정렬해야 한다.
+            for pred in self.__in[node]:
+                self.__sorted.pop(pred, None)
+
+    def __search(self, start: str, edges: typing.Dict[str, typing.Dict[str, Dependency]],
+                 inside: typing.Callable[[str], bool], target: typing.Optional[str]) -> typing.List[str]:
+        # 반복 DFS. target 에 닿으면 순환이다.
+        parent: typing.Dict[str, typing.Optional[str]] = {start: None}
+        stack = [start]
+        while stack:
+            node = stack.pop()
+            for nxt in edges[node]:
+                if nxt == target:
+                    path = [nxt, node]
+                    while parent[path[-1]] is not None:
+                        path.append(parent[path[-1]])
+                    path.reverse()
+                    raise CycleError(target, start, [target] + path)
+                if nxt not in parent and inside(nxt):
+                    parent[nxt] = node
+                    stack.append(nxt)
+        return list(parent)
+
+    def successors(self, jid: str) -> typing.List[Dependency]:
+        """
+        :param jid:
+        :return: jid 에서 나가는 간선들 (dst 의 위상 순서대로)
+        """
+        edges = self.__sorted.get(jid)
+        if edges is None:
+            out = self.__out.get(jid)
+            if not out:
+                return list()
+            edges = self.__sorted[jid] = sorted(out.values(), key=lambda edge: self.__ord[edge.dst])
+        return edges
+
+    def predecessors(self, jid: str) -> typing.List[Dependency]:
+        return list(self.__in.get(jid, dict()).values())
+
+    def has_successors(self, jid: str) -> bool:
+        return bool(self.__out.get(jid))
+
+    def edges(self) -> typing.List[Dependency]:
+        return [edge for jid in self.order() for edge in self.successors(jid)]
+
+    def order(self) -> typing.List[str]:
+        # 위상 순서의 jid 들
+        return sorted(self.__ord, key=self.__ord.__getitem__)
+
+    def rank(self, jid: str) -> int:
+        return self.__ord[jid]
+
+
+if __name__ == '__main__':
+    pass
@@ -0,0 +1,751 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# author        : Seongcheol Jeon
+# created date  : 2026.10.19
+# modified date : 2026.10.19
+# description   : Qt 에 의존하지 않는 타이머 엔진
+
+import time
+import uuid
+import typing
+import contextlib
+
+from libs.algorithm.library import BitMask
+from core.states import Constant, StateMixin
+from core.events import Data, Kind
+from core.scheduler import HeapScheduler
+from core.clocks import boottime_ns
+from core.deps import DependencyGraph, Dependency, ON_FINISH, ON_ERROR
+
+
+Listener = typing.Callable[[Data], None]
+
+# 엔진 내부 시각/기간은 모두 정수 나노초
+NSEC_PER_SEC: typing.Final[int] = 1_000_000_000
+NSEC_PER_MSEC: typing.Final[int] = 1_000_000
+# 가장 짧은 tick. 이보다 짧으면 Running 이벤트만으로 루프가 바빠진다.
+MIN_TICK: typing.Final[int] = 10 * NSEC_PER_MSEC
+
+
+def to_ns(sec: float) -> int:
+    return int(round(sec * NSEC_PER_SEC))
+
+
+def adaptive_cadence(timer: 'Timer') -> int:
+    """
+    남은 시간에 맞춘 Running 이벤트 간격(나노초). 만료가 가까울수록 촘촘하고
+    멀수록 성기다. 진행률이 1% 보다 크게 변하지 않도록 duration / 100 을 넘지 않는다.
+    12시간 타이머는 처음 7분 남짓 간격에서 시작해 마지막 1분은 tick 마다 깨어난다.
+    """
+    remaining = timer.duration - timer.elapsed()
+    return max(timer.tick, min(remaining // 60, timer.duration // 100))
+
+
+class Timer(StateMixin):
+    """
+    TimerEngine 이 관리하는 카운트다운 하나. duration/tick 은 나노초이고,
+    tick 마다 Running 이벤트를 내며 마지막 tick 은 정확히 duration 에 맞춘다.
+    """
+    def __init__(self, engine: 'TimerEngine', jid: str, duration: int, tick: int = NSEC_PER_SEC,
+                 adaptive: bool = False):
+        self.__engine = engine
+        self.__jid: str = jid
+        self.__bitfield: BitMask = BitMask()
+        self.duration: int = duration
+        self.tick: int = max(MIN_TICK, tick)
+        self.total_num: int = -(-duration // self.tick)
+        self.num: int = 0
+        # 벽시계 알람이면 만료될 벽시계 시각 (epoch ns). 시작할 때 duration 을 이 시각까지로 다시 맞춘다.
+        self.alarm_at: typing.Optional[int] = None
+        # 반복 타이머의 규칙 (next_after(epoch ns) -> epoch ns, core.recur). 만료되면 다음 시각으로 다시 건다.
+        self.rule: typing.Any = None
+        self.fires: int = 0
+        self.missed: int = 0
+        self.origin: int = 0
+        self.paused_at: typing.Optional[int] = None
+        # 이번 실행에서 일시정지로 보낸 시간 (ns) 과 횟수. origin 은 rebase() 나 반복 타이머의 재개가 옮기므로 따로 센다.
+        self.paused_total: int = 0
+        self.pauses: int = 0
+        # 마지막으로 Running 이벤트를 내보낸 시각 (표시 주기 병합용)
+        self.emitted_at: typing.Optional[int] = None
+        # adaptive 면 남은 시간에 따라 tick 을 건너뛰고, observed 가 아니면 만료 시각에만 깨어난다.
+        self.adaptive: bool = adaptive
+        self.observed: bool = True
+        # 스케줄러에 올라가 있는 다음 tick 항목
+        self.entry: typing.Any = None
+
+        # init
+        self.__bitfield.activate(Constant.STOPPED)
+
+    @property
+    def engine(self) -> 'TimerEngine':
+        return self.__engine
+
+    @property
+    def jid(self) -> str:
+        return self.__jid
+
+    @property
+    def bitfield(self) -> BitMask:
+        return self.__bitfield
+
+    def is_active(self) -> bool:
+        return self.bitfield.confirm(Constant.RUNNING | Constant.WAITING)
+
+    def elapsed(self) -> int:
+        return min(self.num * self.tick, self.duration)
+
+    def end_pause(self, now: int) -> None:
+        # 일시정지 중이었으면 그 시간을 paused_total 에 더하고 일시정지를 끝낸다.
+        if self.paused_at is not None:
+            self.paused_total += max(0, now - self.paused_at)
+            self.paused_at = None
+
+    def set_duration(self, duration: int) -> None:
+        self.duration = max(0, duration)
+        self.total_num = -(-self.duration // self.tick)
+
+    def deadline(self) -> int:
+        # num 번째 tick 의 시각
+        return self.origin + self.elapsed()
+
+    def make_data(self, ste: int, msg: str, kind: str = '') -> Data:
+        elapsed = self.elapsed()
+        remaining = self.duration - elapsed
+        try:
+            ratio = int(elapsed * 100 // self.duration)
+        except ZeroDivisionError:
+            ratio = 0
+        return Data(sec=-(-remaining // NSEC_PER_SEC), ste=ste, accum_num=self.num, ratio=ratio, jid=self.__jid,
+                    msg=msg, msec=-(-remaining // NSEC_PER_MSEC), kind=kind)
+
+    def start(self, elapsed: int = 0):
+        self.__engine.start(self.__jid, elapsed)
+
+    def pause(self):
+        self.__engine.pause(self.__jid)
+
+    def resume(self):
+        self.__engine.resume(self.__jid)
+
+    def stop(self):
+        self.__engine.stop(self.__jid)
+
+
+class PendingStart:
+    """
+    의존 관계의 delay 가 끝나면 시작할 타이머 (스케줄러 항목)
+    """
+    __slots__ = ('jid', 'at', 'entry')
+
+    def __init__(self, jid: str, at: int):
+        self.jid: str = jid
+        self.at: int = at
+        self.entry: typing.Any = None
+
+
+class TimerEngine:
+    """
+    모든 타이머의 다음 tick 을 스케줄러 하나(기본 binary heap, 또는 TimingWheel)에 두는 엔진.
+    스스로 잠들거나 스레드를 만들지 않고, 드라이버(QTimer, asyncio, sleep 루프)가
+    waker 로 받은 가장 이른 deadline 에 advance() 를 호출한다.
+    """
+    timer_class = Timer
+    # 반복 타이머가 한 번에 건너뛴 실행을 세는 한도. 넘으면 세지 않고 지금 이후로 곧바로 옮긴다.
+    MAX_SKIPPED = 1000
+
+    def __init__(self, clock: typing.Callable[[], int] = time.monotonic_ns, scheduler=None,
+                 display_interval: float = 0.0, adaptive: bool = False,
+                 cadence: typing.Callable[[Timer], int] = adaptive_cadence,
+                 align: float = 0.0, slack: typing.Optional[float] = None, clock_check: float = 0.0,
+                 jump_threshold: float = 0.05):
+        """
+        :param clock: 나노초 단위 단조 시계. clocks.boottime_ns 면 절전 중에도 카운트다운이 흐른다.
+        :param scheduler: HeapScheduler(기본) 또는 TimingWheel(resolution 도 나노초). CPython 에서는 C 로 된
+                          heapq 가 바퀴보다 약 2 배 빨라서 힙을 기본으로 둔다. 바퀴는 타이머 수가 늘어도
+                          연산마다 비용이 일정한 것이 장점이라 골라서 쓴다 (python -m core --wheel).
+        :param display_interval: 초. 0 보다 크면 타이머마다 이 간격보다 촘촘한 Running 이벤트는
+                                 건너뛴다 (tick 과 만료 시각은 그대로)
+        :param adaptive: create_timer 의 adaptive 기본값
+        :param cadence: adaptive 타이머의 다음 깨어날 간격을 고르는 함수
+        :param align: 초. 0 보다 크면 tick 이 align 이상인 타이머들의 중간 tick 을 벽시계 기준
+                      align 경계로 미뤄서 프로세스 전체가 경계마다 한 번만 깨어나게 한다.
+                      만료(마지막 tick)는 정렬하지 않는다.
+        :param slack: 초. 경계까지 이보다 더 미뤄야 하면 정렬하지 않는다 (기본값 align)
+        :param clock_check: 초. 0 보다 크면 돌고 있는 타이머가 있는 동안 이 간격마다 깨어나서
+                            벽시계 이동과 절전 복귀를 확인하고 rebase() 한다
+        :param jump_threshold: 초. 시계 사이의 어긋남이 이보다 작으면 이동으로 보지 않는다 (NTP slew 등)
+        """
+        self.__clock = clock
+        self.__align: int = to_ns(align)
+        self.__slack: int = self.__align if slack is None else to_ns(slack)
+        # 엔진 시계에서 벽시계 정각이 되는 위상
+        self.__align_phase: int = (clock() - time.time_ns()) % self.__align if self.__align else 0
+        self.__adaptive: bool = adaptive
+        self.__cadence = cadence
+        self.__display_interval: int = to_ns(display_interval)
+        self.__timers: typing.Dict[str, Timer] = dict()
+        self.__scheduler = HeapScheduler() if scheduler is None else scheduler
+        self.__clock_check: int = to_ns(clock_check)
+        self.__jump_threshold: int = to_ns(jump_threshold)
+        self.__check_at: int = 0
+        # 엔진 시계에서 벽시계, boottime 까지의 거리. 이 값이 바뀌면 시계가 건너뛰었거나 절전했다가 깨어난 것이다.
+        now = clock()
+        self.__wall_offset: int = time.time_ns() - now
+        self.__boot_offset: int = boottime_ns() - now
+        self.__waker: typing.Optional[typing.Callable[[typing.Optional[int]], None]] = None
+        self.__armed: typing.Optional[int] = None
+        self.__dispatching: bool = False
+        self.__deps: DependencyGraph = DependencyGraph()
+        # 후행 jid 별로 끝난 on-finish 선행 jid 와 그 간선이 시작을 허락하는 시각
+        self.__met: typing.Dict[str, typing.Dict[str, int]] = dict()
+        # delay 를 기다리는 후행 타이머의 스케줄러 항목
+        self.__pending: typing.Dict[str, PendingStart] = dict()
+        # group() 안에서 모든 명령이 함께 쓰는 시각 (엔진 시계)
+        self.__instant: typing.Optional[int] = None
+        # jid 별 리스너, None 키는 모든 타이머의 이벤트를 받는다.
+        self.__listeners: typing.Dict[typing.Optional[str], typing.List[Listener]] = dict()
+
+    def __len__(self):
+        return len(self.__timers)
+
+    @property
+    def clock(self) -> typing.Callable[[], int]:
+        return self.__clock
+
+    @property
+    def timers(self) -> typing.Dict[str, Timer]:
+        return self.__timers
+
+    @property
+    def scheduler(self):
+        return self.__scheduler
+
+    @property
+    def dependencies(self) -> DependencyGraph:
+        return self.__deps
+
+    def pending(self) -> typing.Dict[str, int]:
+        """
+        :return: delay 를 기다리는 후행 jid 와 시작할 시각 (엔진 시계 ns)
+        """
+        return {jid: pending.at for jid, pending in self.__pending.items()}
+
+    def set_waker(self, waker: typing.Optional[typing.Callable[[typing.Optional[int]], None]]) -> None:
+        """
+        가장 이른 deadline 이 바뀔 때마다 호출될 콜백. None 이면 예약할 것이 없다.
+        :param waker:
+        :return:
+        """
+        self.__waker = waker
+        self.__armed = None
+        self.__notify()
+
+    def subscribe(self, callback: Listener, jid: typing.Optional[str] = None) -> None:
+        self.__listeners.setdefault(jid, list()).append(callback)
+
+    def unsubscribe(self, callback: Listener, jid: typing.Optional[str] = None) -> None:
+        callbacks = self.__listeners.get(jid, list())
+        if callback in callbacks:
+            callbacks.remove(callback)
+
+    def emit(self, data: Data) -> None:
+        for callback in tuple(self.__listeners.get(data.jid, ())):
+            callback(data)
+        for callback in tuple(self.__listeners.get(None, ())):
+            callback(data)
+
+    def create_timer(self, duration: float, jid: typing.Optional[str] = None, start: bool = True,
+                     tick: float = 1.0, adaptive: typing.Optional[bool] = None) -> Timer:
+        """
+        :param duration: 초 (소수 가능)
+        :param jid:
+        :param start:
+        :param tick: Running 이벤트 간격(초). MIN_TICK (10 ms) 보다 짧으면 MIN_TICK 으로 올린다.
+        :param adaptive: None 이면 엔진 기본값
+        :return:
+        """
+        jid = jid or uuid.uuid4().hex
+        if jid in self.__timers and self.__timers[jid].is_active():
+            raise ValueError(f'[{jid}] timer is running...')
+        timer = self.timer_class(self, jid, to_ns(duration), to_ns(tick),
+                                 self.__adaptive if adaptive is None else adaptive)
+        self.__timers[jid] = timer
+        if start:
+            self.start(jid)
+        return timer
+
+    def create_alarm(self, at: float, jid: typing.Optional[str] = None, start: bool = True, tick: float = 1.0,
+                     adaptive: typing.Optional[bool] = None) -> Timer:
+        """
+        벽시계 시각에 만료되는 타이머. 벽시계가 옮겨지면(NTP, 수동 변경) rebase() 가 만료 시각을 따라 옮긴다.
+        :param at: 만료 시각 (epoch 초)
+        :param jid:
+        :param start:
+        :param tick: 초
+        :param adaptive:
+        :return:
+        """
+        timer = self.create_timer(max(0.0, at - time.time()), jid=jid, start=False, tick=tick, adaptive=adaptive)
+        timer.alarm_at = to_ns(at)
+        if start:
+            self.start(timer.jid)
+        return timer
+
+    def create_recurring(self, rule, jid: typing.Optional[str] = None, start: bool = True, tick: float = 1.0,
+                         adaptive: typing.Optional[bool] = None) -> Timer:
+        """
+        규칙(core.recur.Every, Cron)의 시각마다 만료되는 타이머. 만료되면 Finished 를 내고 같은 jid 로 다음 시각에
+        다시 걸리므로 규칙 하나가 스케줄러 항목 하나만 차지한다.
+        :param rule: next_after(epoch ns) -> epoch ns
+        :param jid:
+        :param start:
+        :param tick: 초
+        :param adaptive:
+        :return:
+        """
+        timer = self.create_timer(0, jid=jid, start=False, tick=tick, adaptive=adaptive)
+        timer.rule = rule
+        if start:
+            self.start(timer.jid)
+        return timer
+
+    def get(self, jid: str) -> Timer:
+        return self.__timers[jid]
+
+    def remove(self, jid: str) -> None:
+        # jid 리스너는 먼저 떼어내서 제거 중의 Stopped 이벤트가 사라진 뷰로 가지 않게 한다.
+        self.__listeners.pop(jid, None)
+        self.__deps.remove(jid)
+        self.__met.pop(jid, None)
+        self.__cancel_pending(jid)
+        if jid not in self.__timers:
+            return
+        self.stop(jid)
+        del self.__timers[jid]
+
+    def add_dependency(self, src: str, dst: str, on: str = ON_FINISH, delay: float = 0.0) -> Dependency:
+        """
+        src 가 on 이 되면 (delay 초 뒤에) dst 를 시작한다. 만료를 처리하는 같은 advance() 안에서 시작하고,
+        dst 의 기준 시각은 src 가 만료된 예정 시각(+ delay)이라 사슬이 길어져도 깨어나는 지연이 쌓이지 않는다.
+
+        on-finish 선행이 여럿이면 모두 끝나야 시작하고 (dst 가 마지막으로 시작한 뒤로), on-error 선행은
+        하나만 실패해도 시작한다. 이미 돌고 있는 dst 는 다시 시작하지 않는다.
+        :param src:
+        :param dst: 보통 start=False 로 만든 타이머
+        :param on: 'finish' 또는 'error'
+        :param delay: 초
+        :return:
+        :raise KeyError: 모르는 jid
+        :raise core.deps.CycleError: 순환이 생길 때
+        """
+        for jid in (src, dst):
+            if jid not in self.__timers:
+                raise KeyError(jid)
+        return self.__deps.add(src, dst, on, to_ns(delay))
+
+    def remove_dependency(self, src: str, dst: str) -> bool:
+        return self.__deps.discard(src, dst)
+
+    def start(self, jid: str, elapsed: int = 0) -> None:
+        """
+        :param jid:
+        :param elapsed: 이미 지난 시간(ns). 복원한 타이머를 이어서 돌릴 때 쓴다.
+        :return:
+        """
+        self.__start(self.__timers[jid], elapsed, None)
+
+    def __start(self, timer: Timer, elapsed: int, at: typing.Optional[int]) -> None:
+        # at: 시작 시각 (엔진 시계). None 이면 지금
+        if timer.is_active():
+            return
+        if self.__clock_check and self.__instant is None:
+            # 새 기준 시각을 잡기 전에 그동안의 시계 이동을 먼저 반영해 둔다.
+            self.rebase()
+        jid = timer.jid
+        now = self.__now() if at is None else at
+        self.__cancel_pending(jid)
+        self.__met.pop(jid, None)
+        timer.set_ste_started()
+        timer.set_ste_running()
+        if timer.rule is not None:
+            wall_now = now + self.__wall_offset
+            # 멈췄다가 다시 시작한 반복 타이머는 지나간 시각을 건너뛰고 지금 이후의 시각부터 돈다.
+            if timer.alarm_at is None or timer.alarm_at <= wall_now:
+                timer.alarm_at = timer.rule.next_after(wall_now)
+        if timer.alarm_at is not None:
+            # 알람은 지난 시간과 상관없이 지금부터 알람 시각까지다.
+            timer.set_duration(timer.alarm_at - (now + self.__wall_offset))
+            elapsed = 0
+        elapsed = min(max(0, elapsed), timer.duration)
+        timer.num = elapsed // timer.tick
+        timer.paused_at = None
+        timer.paused_total = 0
+        timer.pauses = 0
+        timer.emitted_at = None
+        timer.origin = now - elapsed
+        self.emit(Data(sec=-1, ste=Constant.STARTED, accum_num=-1, ratio=-1, jid=jid, msg='Started...'))
+        self.__schedule(timer, timer.origin)
+        self.__notify()
+
+    def pause(self, jid: str) -> None:
+        timer = self.__timers[jid]
+        if not timer.bitfield.confirm(Constant.RUNNING):
+            return
+        timer.set_ste_waiting()
+        self.__cancel(timer)
+        timer.paused_at = self.__now()
+        timer.pauses += 1
+        self.emit(timer.make_data(Constant.RUNNING, 'Waiting...', Kind.PAUSE))
+
+    def resume(self, jid: str) -> None:
+        timer = self.__timers[jid]
+        if not timer.bitfield.confirm(Constant.WAITING) or timer.paused_at is None:
+            return
+        if self.__clock_check and self.__instant is None:
+            self.rebase()
+        timer.set_ste_running()
+        now = self.__now()
+        if timer.rule is not None:
+            # 반복 타이머는 밀지 않고 규칙의 다음 시각부터 다시 센다. 그래야 격자에서 벗어나지 않는다.
+            wall_now = now + self.__wall_offset
+            timer.alarm_at = timer.rule.next_after(wall_now)
+            timer.set_duration(timer.alarm_at - wall_now)
+            timer.num = 0
+            timer.emitted_at = None
+            timer.origin = now
+        else:
+            # 일시정지 되었던 시간만큼 기준 시각을 뒤로 민다. 알람 시각도 같이 밀린다.
+            paused = now - timer.paused_at
+            timer.origin += paused
+            if timer.alarm_at is not None:
+                timer.alarm_at += paused
+        timer.end_pause(now)
+        self.__schedule(timer, self.__tick_deadline(timer))
+        self.emit(timer.make_data(Constant.RUNNING, 'Resumed...', Kind.RESUME))
+        self.__notify()
+
+    def stop(self, jid: str) -> None:
+        timer = self.__timers[jid]
+        self.__cancel_pending(jid)
+        if not timer.is_active():
+            return
+        self.__cancel(timer)
+        timer.end_pause(self.__now())
+        timer.set_ste_stopped()
+        self.emit(timer.make_data(Constant.STOPPED, 'Stopped...'))
+
+    def fail(self, jid: str, msg: str = 'Error...') -> None:
+        """
+        타이머가 맡은 작업이 실패했음을 알린다. Error 상태가 되고 on-error 후행 타이머들이 시작된다.
+        :param jid:
+        :param msg:
+        :return:
+        """
+        timer = self.__timers[jid]
+        self.__cancel(timer)
+        self.__cancel_pending(jid)
+        timer.end_pause(self.__now())
+        timer.set_ste_error()
+        self.emit(timer.make_data(Constant.ERROR, msg))
+        self.__resolve(timer, ON_ERROR, self.__now())
+        self.__notify()
+
+    def set_observed(self, jid: str, observed: bool) -> None:
+        """
+        아무도 보고 있지 않은 타이머는 만료 시각에만 깨운다.
+        다시 보이면 현재 위치의 tick 을 곧바로 내보낸다.
+        :param jid:
+        :param observed:
+        :return:
+        """
+        timer = self.__timers[jid]
+        if timer.observed == observed:
+            return
+        timer.observed = observed
+        if not timer.bitfield.confirm(Constant.RUNNING) or timer.entry is None:
+            return
+        self.__reposition(timer, self.__clock())
+        self.__notify()
+
+    def rebase(self) -> int:
+        """
+        벽시계 이동과 절전 복귀를 확인하고, 있었으면 영향받는 타이머의 deadline 을 한 번에 다시 계산한다.
+        알람은 벽시계를 따라가고, 엔진 시계가 절전 중에 멈춰 있었으면 (monotonic) 돌고 있던 카운트다운을
+        잠든 시간만큼 앞당긴다. 드라이버가 예약해 둔 깨우기도 새 deadline 으로 다시 맞춘다.
+        :return: 옮긴 타이머 수
+        """
+        now = self.__clock()
+        wall = time.time_ns() - now - self.__wall_offset
+        suspend = boottime_ns() - now - self.__boot_offset
+        threshold = self.__jump_threshold
+        if abs(wall) < threshold:
+            wall = 0
+        if suspend < threshold:
+            suspend = 0
+        if not wall and not suspend:
+            return 0
+        self.__wall_offset += wall
+        self.__boot_offset += suspend
+        moved = 0
+        for timer in self.__timers.values():
+            if not timer.is_active():
+                continue
+            if timer.alarm_at is not None:
+                shift = wall
+            elif timer.bitfield.confirm(Constant.RUNNING):
+                # 일시정지 중인 카운트다운은 잠든 동안에도 멈춰 있어야 한다.
+                shift = suspend
+            else:
+                shift = 0
+            if not shift:
+                continue
+            timer.origin -= shift
+            if timer.bitfield.confirm(Constant.RUNNING) and timer.entry is not None:
+                self.__reposition(timer, now)
+            moved += 1
+        self.__armed = None
+        self.__notify()
+        return moved
+
+    def stop_all(self) -> None:
+        self.stop_group(tuple(self.__timers))
+
+    @contextlib.contextmanager
+    def group(self) -> typing.Iterator[int]:
+        """
+        안에서 부르는 start/pause/resume/stop 이 모두 들어올 때 한 번 읽은 시각을 쓴다. 같은 길이의 타이머들은
+        기준 시각과 deadline 이 정확히 같아져서 같은 advance() 에서 함께 tick 하고, 함께 멈췄다가 다시 돌면
+        밀리는 시간도 같다. 드라이버는 나갈 때 한 번만 다시 예약한다. 중첩하면 바깥 시각을 쓴다.
+
+            with engine.group():
+                for jid in jids:
+                    engine.start(jid)
+        :return: 공유하는 시각 (엔진 시계 ns)
+        """
+        if self.__instant is not None:
+            yield self.__instant
+            return
+        if self.__clock_check:
+            self.rebase()
+        self.__instant = self.__clock()
+        try:
+            yield self.__instant
+        finally:
+            self.__instant = None
+            self.__notify()
+
+    def start_group(self, jids: typing.Iterable[str], elapsed: int = 0) -> None:
+        with self.group():
+            for jid in jids:
+                self.start(jid, elapsed)
+
+    def pause_group(self, jids: typing.Iterable[str]) -> None:
+        with self.group():
+            for jid in jids:
+                self.pause(jid)
+
+    def resume_group(self, jids: typing.Iterable[str]) -> None:
+        with self.group():
+            for jid in jids:
+                self.resume(jid)
+
+    def stop_group(self, jids: typing.Iterable[str]) -> None:
+        with self.group():
+            for jid in jids:
+                self.stop(jid)
+
+    def __now(self) -> int:
+        return self.__clock() if self.__instant is None else self.__instant
+
+    def next_deadline(self) -> typing.Optional[int]:
+        deadline = self.__scheduler.peek()
+        if deadline is None or not self.__clock_check:
+            return deadline
+        # 드라이버의 sleep 은 절전 시간을 세지 않으므로 오래 잠들지 않게 확인 시각에 한 번씩 깨운다.
+        return min(deadline, self.__check_at)
+
+    def advance(self, now: typing.Optional[int] = None) -> int:
+        """
+        now 까지 도래한 tick 을 모두 처리한다.
+        :param now: None 이면 엔진 시계
+        :return: 처리한 tick 수
+        """
+        if now is None:
+            now = self.__clock()
+        if self.__clock_check and now >= self.__check_at:
+            self.__check_at = now + self.__clock_check
+            self.rebase()
+        due = self.__scheduler.pop_due(now)
+        count = 0
+        self.__dispatching = True
+        try:
+            while due:
+                for item in due:
+                    if type(item) is PendingStart:
+                        self.__fire(item)
+                    else:
+                        self.__tick(item, now)
+                count += len(due)
+                # 이번에 시작된 후행 타이머의 첫 tick (0초 타이머면 만료까지) 도 같은 advance() 에서 처리한다.
+                due = self.__scheduler.pop_due(now)
+        finally:
+            self.__dispatching = False
+        # advance() 는 드라이버가 깨어났을 때 호출되므로 예약해 둔 deadline 은 소진된 것으로 본다.
+        self.__armed = None
+        self.__notify()
+        return count
+
+    def __tick(self, timer: Timer, now: int) -> None:
+        timer.entry = None
+        last = timer.num >= timer.total_num
+        if last or timer.emitted_at is None or now - timer.emitted_at >= self.__display_interval:
+            timer.emitted_at = now
+            self.emit(timer.make_data(Constant.RUNNING, 'Running...', Kind.TICK))
+        if last:
+            timer.set_ste_finished()
+            self.emit(timer.make_data(Constant.FINISHED, 'Finished...'))
+            if self.__deps.has_successors(timer.jid):
+                # 실제로 깨어난 시각이 아니라 예정된 만료 시각
+                self.__resolve(timer, ON_FINISH, timer.origin + timer.duration)
+            # 리스너가 지우거나 다시 시작하지 않았으면 반복 타이머를 다음 시각에 건다.
+            if timer.rule is not None and self.__timers.get(timer.jid) is timer and not timer.is_active():
+                self.__recur(timer, now)
+            return
+        timer.num = self.__next_num(timer, now)
+        self.__schedule(timer, self.__tick_deadline(timer))
+
+    def __recur(self, timer: Timer, now: int) -> None:
+        # 다음 시각은 실제로 깨어난 시각이 아니라 예정 시각에서 계산해서 늦게 깨어나도 밀리지 않는다.
+        rule = timer.rule
+        wall_now = now + self.__wall_offset
+        next_at = rule.next_after(timer.alarm_at)
+        # 바쁘거나 절전해서 이미 지나간 시각들은 몰아서 내지 않고 건너뛴다.
+        skipped = 0
+        while next_at <= wall_now and skipped < TimerEngine.MAX_SKIPPED:
+            next_at = rule.next_after(next_at)
+            skipped += 1
+        if next_at <= wall_now:
+            next_at = rule.next_after(wall_now)
+        timer.fires += 1
+        timer.missed += skipped
+        timer.alarm_at = next_at
+        self.start(timer.jid)
+
+    def __resolve(self, timer: Timer, on: str, at: int) -> None:
+        # timer 가 on 이 된 시각 at 에 시작 조건을 채운 후행 타이머들을 위상 순서대로 시작한다.
+        for edge in self.__deps.successors(timer.jid):
+            if edge.on != on:
+                continue
+            dst = self.__timers.get(edge.dst)
+            if dst is None:
+                continue
+            if on == ON_FINISH:
+                met = self.__met.setdefault(edge.dst, dict())
+                met[timer.jid] = at + edge.delay
+                ready = 0
+                for pred in self.__deps.predecessors(edge.dst):
+                    if pred.on != ON_FINISH:
+                        continue
+                    if pred.src not in met:
+                        break
+                    ready = max(ready, met[pred.src])
+                else:
+                    self.__trigger(dst, ready)
+            else:
+                self.__trigger(dst, at + edge.delay)
+
+    def __trigger(self, timer: Timer, at: int) -> None:
+        self.__met.pop(timer.jid, None)
+        if timer.is_active():
+            return
+        if at <= self.__clock():
+            self.__start(timer, 0, at)
+            return
+        self.__cancel_pending(timer.jid)
+        pending = self.__pending[timer.jid] = PendingStart(timer.jid, at)
+        pending.entry = self.__scheduler.push(at, pending)
+
+    def __fire(self, pending: PendingStart) -> None:
+        self.__pending.pop(pending.jid, None)
+        timer = self.__timers.get(pending.jid)
+        if timer is not None:
+            self.__start(timer, 0, pending.at)
+
+    def __cancel_pending(self, jid: str) -> None:
+        pending = self.__pending.pop(jid, None)
+        if pending is not None:
+            self.__scheduler.cancel(pending.entry)
+
+    def __tick_deadline(self, timer: Timer) -> int:
+        deadline = timer.deadline()
+        align = self.__align
+        if not align or timer.num >= timer.total_num or timer.tick < align:
+            return deadline
+        phase = self.__align_phase
+        aligned = -(-(deadline - phase) // align) * align + phase
+        if aligned - deadline > self.__slack:
+            return deadline
+        # 정렬 때문에 만료보다 늦어지지는 않는다.
+        return min(aligned, timer.origin + timer.duration)
+
+    def __next_num(self, timer: Timer, now: int) -> int:
+        if not timer.observed:
+            return timer.total_num
+        step = 1
+        if timer.adaptive:
+            step = max(1, self.__cadence(timer) // timer.tick)
+        # 늦게 깨어났으면 밀린 tick 들을 몰아서 내보내지 않고 현재 위치로 건너뛴다.
+        behind = (now - timer.origin) // timer.tick + 1
+        # 마지막은 항상 total_num 이므로 만료는 정확히 duration 에 맞는다.
+        return min(timer.total_num, max(timer.num + step, behind))
+
+    def __reposition(self, timer: Timer, now: int) -> None:
+        # 기준 시각이나 observed 가 바뀐 타이머를 현재 위치의 tick 에서 다시 예약한다.
+        if timer.observed:
+            timer.num = min(timer.total_num, max(0, (now - timer.origin) // timer.tick))
+            timer.emitted_at = None
+        else:
+            timer.num = timer.total_num
+        self.__schedule(timer, timer.deadline())
+
+    def __schedule(self, timer: Timer, deadline: int) -> None:
+        self.__cancel(timer)
+        timer.entry = self.__scheduler.push(deadline, timer)
+
+    def __cancel(self, timer: Timer) -> None:
+        if timer.entry is not None:
+            self.__scheduler.cancel(timer.entry)
+            timer.entry = None
+
+    def __notify(self) -> None:
+        if self.__dispatching or self.__instant is not None or self.__waker is None:
+            return
+        deadline = self.next_deadline()
+        if deadline == self.__armed:
+            return
+        self.__armed = deadline
+        self.__waker(deadline)
+
+    def run_forever(self, until_idle: bool = True) -> None:
+        """
+        Qt/asyncio 없이 sleep 으로 엔진을 돌린다. (CLI, 서버용)
+        :param until_idle: True 면 남은 tick 이 없을 때 반환
+        :return:
+        """
+        while True:
+            deadline = self.next_deadline()
+            if deadline is None:
+                if until_idle:
+                    return
+                time.sleep(0.1)
+                continue
+            delay = deadline - self.__clock()
+            if delay > 0:
+                time.sleep(delay / NSEC_PER_SEC)
+            self.advance()
+
+
+if __name__ == '__main__':
+    pass
@@ -0,0 +1,248 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# author        : Seongcheol Jeon
+# created date  : 2026.10.19
+# modified date : 2026.10.19
+# description   : 타이머 이벤트를 남기는 비동기 로테이팅 이벤트 로그 (JSON lines / binary)
+
+import os
+import sys
+import gzip
+import json
+import time
+import shutil
+import struct
+import typing
+import pathlib
+import threading
+import collections
+
+from core.states import Constant, state_name
+from core.events import Data, Kind
+
+
+class EventLog:
+    """
+    상태 전이, 만료, 명령 실행을 구조화된 레코드로 남긴다.
+    record() 는 큐에 넣기만 하고, 백그라운드 writer 스레드가 commit_interval 동안 모인
+    레코드를 한 번에 쓰고 fsync 도 한 번만 한다(group commit).
+    파일이 max_bytes 를 넘거나 max_age 초가 지나면 path.1, path.2 ... 로 밀어내고(필요하면 gzip),
+    backups 개를 넘는 오래된 파일은 지운다.
+    쓰기나 fsync 가 실패하면(ENOSPC, EIO ...) 그 batch 를 버리지 않고 쓰다 만 부분을 잘라낸 뒤
+    RETRY_MIN ~ RETRY_MAX 초 간격으로 다시 쓴다. commit listener 는 실제로 디스크에 남은 레코드 수만 받는다.
+
+    - jsonl : 한 줄에 JSON 하나
+    - binary: 레코드마다 struct '<IQ' (payload 길이, 벽시계 ns) + JSON payload
+    """
+    FORMATS = ('jsonl', 'binary')
+    HEADER = struct.Struct('<IQ')
+    RETRY_MIN = 0.05
+    RETRY_MAX = 1.0
+
+    def __init__(self, path: typing.Union[str, pathlib.Path], fmt: str = 'jsonl',
+                 max_bytes: int = 64 * 1024 * 1024, max_age: float = 0.0, backups: int = 5,
+                 compress: bool = False, commit_interval: float = 0.05, fsync: bool = True):
+        assert fmt in EventLog.FORMATS
+        self.__path = pathlib.Path(path)
+        self.__fmt: str = fmt
+        self.__max_bytes: int = max_bytes
+        self.__max_age: float = max_age
+        self.__backups: int = backups
+        self.__compress: bool = compress
+        self.__commit_interval: float = commit_interval
+        self.__fsync: bool = fsync
+        self.__queue: collections.deque = collections.deque()
+        self.__wakeup = threading.Event()
+        self.__closed: bool = False
+        self.__commits: int = 0
+        self.__written: int = 0
+        self.__failures: int = 0
+        self.__listeners: typing.List[typing.Callable[[int], None]] = list()
+
+        self.__path.parent.mkdir(parents=True, exist_ok=True)
+        self.__file = None
+        self.__opened_at: float = 0.0
+        self.__open()
+        self.__thread = threading.Thread(target=self.__run, name='EventLogWriter', daemon=True)
+        self.__thread.start()
+
+    @property
+    def path(self) -> pathlib.Path:
+        return self.__path
+
+    @property
+    def commits(self) -> int:
+        return self.__commits
+
+    @property
+    def written(self) -> int:
+        return self.__written
+
+    @property
+    def failures(self) -> int:
+        # 실패해서 다시 쓴 commit 수
+        return self.__failures
+
+    def add_commit_listener(self, callback: typing.Callable[[int], None]) -> None:
+        """
+        writer 스레드에서 commit(fsync) 이 끝날 때마다 지금까지 쓴 레코드 수로 불린다.
+        :param callback:
+        :return:
+        """
+        self.__listeners.append(callback)
+
+    def record(self, kind: str, jid: str = '', **fields) -> None:
+        # 부르는 스레드에서는 직렬화도 하지 않는다.
+        self.__queue.append((time.time_ns(), kind, jid, fields))
+        self.__wakeup.set()
+
+    def record_data(self, data: Data) -> None:
+        # tick 마다의 Running 은 남기지 않는다.
+        if data.kind == Kind.TICK:
+            return
+        kind = 'expired' if data.ste == Constant.FINISHED else 'state'
+        self.record(kind, data.jid, state=state_name(data.ste), sec=data.sec, msec=data.msec,
+                    ratio=data.ratio, msg=data.msg)
+
+    def attach(self, engine) -> None:
+        engine.subscribe(self.record_data)
+
+    def detach(self, engine) -> None:
+        engine.unsubscribe(self.record_data)
+
+    def close(self, timeout: float = 5.0) -> None:
+        if self.__closed:
+            return
+        self.__closed = True
+        self.__wakeup.set()
+        self.__thread.join(timeout)
+
+    def __open(self) -> None:
+        self.__file = open(self.__path, 'ab')
+        self.__opened_at = time.time()
+
+    def __encode(self, item) -> bytes:
+        ts, kind, jid, fields = item
+        if self.__fmt == 'jsonl':
+            payload = dict(ts=ts, kind=kind, jid=jid, **fields)
+            return json.dumps(payload, separators=(',', ':'), ensure_ascii=False).encode('utf8') + b'\n'
+        payload = json.dumps(dict(kind=kind, jid=jid, **fields), separators=(',', ':'),
+                             ensure_ascii=False).encode('utf8')
+        return EventLog.HEADER.pack(len(payload), ts) + payload
+
+    def __run(self) -> None:
+        queue = self.__queue
+        retry = 0.0
+        while True:
+            if retry:
+                # 실패한 batch 를 잠깐 뒤에 (그 사이에 들어온 레코드와 함께) 다시 쓴다.
+                time.sleep(retry)
+            else:
+                self.__wakeup.wait()
+                if not self.__closed:
+                    # 잠깐 더 모아서 한 번에 쓴다.
+                    time.sleep(self.__commit_interval)
+            self.__wakeup.clear()
+            batch = list()
+            while queue:
+                batch.append(queue.popleft())
+            if batch and not self.__commit(batch):
+                queue.extendleft(reversed(batch))
+                retry = min(EventLog.RETRY_MAX, retry * 2 or EventLog.RETRY_MIN)
+                continue
+            retry = 0.0
+            if self.__closed and not queue:
+                break
+        self.__file.close()
+
+    def __commit(self, batch: list) -> bool:
+        start = self.__file.tell()
+        try:
+            self.__file.write(b''.join(self.__encode(item) for item in batch))
+            self.__file.flush()
+            if self.__fsync:
+                os.fsync(self.__file.fileno())
+        except OSError as err:
+            self.__failures += 1
+            sys.stderr.write(f'[EventLog] {err} (retrying {len(batch)} records)\n')
+            self.__discard(start)
+            return False
+        self.__commits += 1
+        self.__written += len(batch)
+        for callback in tuple(self.__listeners):
+            callback(self.__written)
+        if self.__should_rotate():
+            self.__rotate()
+        return True
+
+    def __discard(self, start: int) -> None:
+        # 버퍼에 남은 것까지 버리고 파일을 batch 앞으로 잘라서, 다시 쓸 때 반쪽 레코드가 남지 않게 한다.
+        try:
+            self.__file.close()
+        except OSError:
+            pass
+        try:
+            os.truncate(self.__path, start)
+        except OSError as err:
+            sys.stderr.write(f'[EventLog] {err}\n')
+        self.__file = open(self.__path, 'ab')
+
+    def __should_rotate(self) -> bool:
+        if self.__max_bytes and self.__file.tell() >= self.__max_bytes:
+            return True
+        return bool(self.__max_age) and time.time() - self.__opened_at >= self.__max_age
+
+    def __rotated(self, num: int) -> pathlib.Path:
+        suffix = '.gz' if self.__compress else ''
+        return self.__path.with_name(f'{self.__path.name}.{num}{suffix}')
+
+    def __rotate(self) -> None:
+        self.__file.close()
+        oldest = self.__rotated(self.__backups)
+        if oldest.exists():
+            oldest.unlink()
+        for num in range(self.__backups - 1, 0, -1):
+            src = self.__rotated(num)
+            if src.exists():
+                src.rename(self.__rotated(num + 1))
+        if self.__backups > 0:
+            if self.__compress:
+                with open(self.__path, 'rb') as src, gzip.open(self.__rotated(1), 'wb') as dst:
+                    shutil.copyfileobj(src, dst)
+                self.__path.unlink()
+            else:
+                self.__path.rename(self.__rotated(1))
+        else:
+            self.__path.unlink()
+        self.__open()
+
+    @staticmethod
+    def read(path: typing.Union[str, pathlib.Path], fmt: str = 'jsonl') -> typing.Iterator[dict]:
+        """
+        로테이트된 .gz 파일도 읽는다.
+        :param path:
+        :param fmt:
+        :return:
+        """
+        path = pathlib.Path(path)
+        opener = gzip.open if path.suffix == '.gz' else open
+        with opener(path, 'rb') as f:
+            if fmt == 'jsonl':
+                for line in f:
+                    if line.strip():
+                        yield json.loads(line)
+                return
+            header = EventLog.HEADER
+            while True:
+                head = f.read(header.size)
+                if len(head) < header.size:
+                    return
+                size, ts = header.unpack(head)
+                payload = json.loads(f.read(size))
+                payload['ts'] = ts
+                yield payload
+
+
+if __name__ == '__main__':
+    pass
@@ -0,0 +1,55 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# author        : Seongcheol Jeon
+# created date  : 2026.10.19
+# modified date : 2026.10.19
+# description   : 타이머 백엔드가 UI 로 보내는 이벤트
+
+import typing
+
+
+class Kind:
+    # Data.kind. 같은 ste 로 오는 이벤트들을 구분한다. 상태 전이 이벤트는 빈 문자열이다.
+    __slots__ = ()
+    TICK:   typing.Final[str] = 'tick'
+    PAUSE:  typing.Final[str] = 'pause'
+    RESUME: typing.Final[str] = 'resume'
+
+
+Kind = Kind()
+
+
+# data class
+class Data:
+    # 초당 수천 개가 만들어지므로 pydantic 대신 __slots__ 클래스를 쓴다.
+    __slots__ = ('sec', 'ste', 'accum_num', 'ratio', 'jid', 'msg', 'msec', 'kind')
+
+    def __init__(self, sec: int, ste: int, accum_num: int, ratio: float, jid: str, msg: str = '', msec: int = -1,
+                 kind: str = ''):
+        # 남은 시간 (초, 올림). msec 은 같은 값의 밀리초 표현, 모르면 -1
+        self.sec: int = sec
+        self.msec: int = msec
+        self.ste: int = ste
+        self.accum_num: int = accum_num
+        self.ratio: float = ratio
+        self.jid: str = jid
+        # 화면에 보여 주는 문구. 이벤트를 구분할 때는 kind 를 본다.
+        self.msg: str = msg
+        self.kind: str = kind
+
+    def __repr__(self):
+        fields = ', '.join(f'{name}={getattr(self, name)!r}' for name in Data.__slots__)
+        return f'Data({fields})'
+
+    def __eq__(self, other):
+        if not isinstance(other, Data):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in Data.__slots__)
+
+    def to_dict(self) -> dict:
+        return {name: getattr(self, name) for name in Data.__slots__}
+
+
+if __name__ == '__main__':
+    pass
@@ -0,0 +1,346 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# author        : Seongcheol Jeon
+# created date  : 2026.10.19
+# modified date : 2026.10.19
+# description   : 끝난 타이머를 쌓아 두는 컬럼 저장소와 분석 API
+
+import sys
+import json
+import mmap
+import time
+import array
+import bisect
+import typing
+import pathlib
+
+from core.states import Constant
+from core.events import Data, Kind
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+class HistoryStore:
+    """
+    끝난(FINISHED / STOPPED / ERROR) 타이머 한 개가 한 행이다.
+    컬럼마다 고정 폭 little-endian 배열 파일(<chunk>/<column>.bin)로 쓰고, 읽을 때는 mmap 한다.
+    문자열(jid, 링크 그룹, 실행 명령)은 strings.txt 의 번호로 저장한다(dictionary encoding).
+
+    append() 는 메모리 버퍼에만 넣고, CHUNK_ROWS 행이 모이거나 flush() 할 때 청크 하나를 쓴다.
+    쓰여진 청크는 바뀌지 않는다.
+    """
+    CHUNK_ROWS = 65536
+
+    # 컬럼 이름: array typecode
+    COLUMNS: typing.Final[typing.Dict[str, str]] = {
+        'jid':          'i',
+        'group':        'i',
+        'state':        'B',
+        'planned':      'q',    # 설정한 시간 (ns)
+        'actual':       'q',    # 시작부터 끝까지 걸린 시간, 일시정지 포함 (ns)
+        'paused':       'q',    # 일시정지로 보낸 시간 (ns)
+        'pauses':       'i',    # 일시정지 횟수
+        'lateness':     'q',    # 만료 예정 시각보다 늦은 시간 (ns), FINISHED 가 아니면 0
+        'commands':     'i',    # 실행한 명령들 ('\n' 으로 이어 붙인 문자열 번호, 없으면 -1)
+        'ended_at':     'q',    # 끝난 벽시계 시각 (ns)
+    }
+
+    def __init__(self, path: typing.Union[str, pathlib.Path]):
+        self.__path = pathlib.Path(path)
+        self.__path.mkdir(parents=True, exist_ok=True)
+        self.__strings_path = self.__path / 'strings.txt'
+        self.__strings: typing.List[str] = list()
+        self.__codes: typing.Dict[str, int] = dict()
+        self.__flushed_strings: int = 0
+        if self.__strings_path.exists():
+            with open(self.__strings_path, encoding='utf8') as f:
+                for line in f:
+                    self.__intern(json.loads(line))
+            self.__flushed_strings = len(self.__strings)
+        self.__chunks: typing.List[pathlib.Path] = sorted(self.__path.glob('chunk-*'))
+        self.__buffer: typing.Dict[str, array.array] = HistoryStore.__new_buffer()
+
+    @staticmethod
+    def __new_buffer() -> typing.Dict[str, array.array]:
+        return {name: array.array(code) for name, code in HistoryStore.COLUMNS.items()}
+
+    @property
+    def path(self) -> pathlib.Path:
+        return self.__path
+
+    @property
+    def strings(self) -> typing.List[str]:
+        return self.__strings
+
+    def __len__(self):
+        return sum(self.__chunk_rows(chunk) for chunk in self.__chunks) + len(self.__buffer['jid'])
+
+    def __intern(self, text: str) -> int:
+        code = self.__codes.get(text)
+        if code is None:
+            code = len(self.__strings)
+            self.__strings.append(text)
+            self.__codes[text] = code
+        return code
+
+    def append(self, jid: str, state: int, planned: int, actual: int, paused: int = 0, pauses: int = 0,
+               lateness: int = 0, group: str = '', commands: typing.Sequence[str] = (),
+               ended_at: typing.Optional[int] = None) -> None:
+        buf = self.__buffer
+        buf['jid'].append(self.__intern(jid))
+        buf['group'].append(self.__intern(group) if group else -1)
+        buf['state'].append(state)
+        buf['planned'].append(planned)
+        buf['actual'].append(actual)
+        buf['paused'].append(paused)
+        buf['pauses'].append(pauses)
+        buf['lateness'].append(lateness)
+        buf['commands'].append(self.__intern('\n'.join(commands)) if commands else -1)
+        buf['ended_at'].append(time.time_ns() if ended_at is None else ended_at)
+        if len(buf['jid']) >= HistoryStore.CHUNK_ROWS:
+            self.flush()
+
+    def flush(self) -> None:
+        # 문자열 표를 먼저 써야 청크의 번호가 항상 풀린다.
+        if self.__flushed_strings < len(self.__strings):
+            with open(self.__strings_path, 'a', encoding='utf8') as f:
+                for text in self.__strings[self.__flushed_strings:]:
+                    f.write(json.dumps(text, ensure_ascii=False) + '\n')
+            self.__flushed_strings = len(self.__strings)
+        if not len(self.__buffer['jid']):
+            return
+        chunk = self.__path / f'chunk-{len(self.__chunks):06d}'
+        tmp = chunk.with_name(chunk.name + '.tmp')
+        tmp.mkdir(exist_ok=True)
+        for name, column in self.__buffer.items():
+            if sys.byteorder != 'little':
+                column = array.array(column.typecode, column)
+                column.byteswap()
+            with open(tmp / f'{name}.bin', 'wb') as f:
+                column.tofile(f)
+        tmp.rename(chunk)
+        self.__chunks.append(chunk)
+        self.__buffer = HistoryStore.__new_buffer()
+
+    @staticmethod
+    def __chunk_rows(chunk: pathlib.Path) -> int:
+        return (chunk / 'jid.bin').stat().st_size // array.array('i').itemsize
+
+    def __map_column(self, chunk: pathlib.Path, name: str):
+        code = HistoryStore.COLUMNS[name]
+        path = chunk / f'{name}.bin'
+        if not path.stat().st_size:
+            return array.array(code)
+        if numpy is not None:
+            return numpy.memmap(path, dtype=numpy.dtype(code).newbyteorder('<'), mode='r')
+        with open(path, 'rb') as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if sys.byteorder == 'little':
+            # 복사 없이 mmap 위에서 바로 읽는다.
+            return memoryview(mapped).cast(code)
+        column = array.array(code, mapped)
+        column.byteswap()
+        return column
+
+    def column(self, name: str):
+        """
+        청크와 버퍼를 이어 붙인 컬럼 하나. numpy 가 있으면 ndarray, 없으면 array.array
+        :param name:
+        :return:
+        """
+        parts = [self.__map_column(chunk, name) for chunk in self.__chunks]
+        parts.append(self.__buffer[name])
+        if numpy is not None:
+            return numpy.concatenate([numpy.asarray(part, dtype=HistoryStore.COLUMNS[name]) for part in parts])
+        column = array.array(HistoryStore.COLUMNS[name])
+        for part in parts:
+            column.extend(part)
+        return column
+
+
+class History:
+    """
+    HistoryStore 위의 분석 API. numpy 가 있으면 모두 벡터 연산으로 처리한다.
+    state 를 주면 해당 상태(Constant.FINISHED 등)의 행만 쓴다.
+    """
+    def __init__(self, store: HistoryStore):
+        self.__store = store
+
+    @property
+    def store(self) -> HistoryStore:
+        return self.__store
+
+    def __values(self, column: str, state: typing.Optional[int]):
+        values = self.__store.column(column)
+        if state is None:
+            return values
+        states = self.__store.column('state')
+        if numpy is not None:
+            return values[states == state]
+        return array.array(values.typecode, (v for v, s in zip(values, states) if s == state))
+
+    def percentiles(self, column: str = 'actual', qs: typing.Sequence[float] = (50, 90, 99),
+                    state: typing.Optional[int] = None) -> typing.Dict[float, float]:
+        values = self.__values(column, state)
+        if not len(values):
+            return {q: float('nan') for q in qs}
+        if numpy is not None:
+            return dict(zip(qs, numpy.percentile(values, qs).tolist()))
+        ordered = sorted(values)
+        last = len(ordered) - 1
+        result = dict()
+        # numpy 의 기본(linear) 보간과 같은 값
+        for q in qs:
+            pos = last * q / 100
+            lo = int(pos)
+            hi = min(lo + 1, last)
+            result[q] = ordered[lo] + (ordered[hi] - ordered[lo]) * (pos - lo)
+        return result
+
+    def group_totals(self, column: str = 'actual',
+                     state: typing.Optional[int] = None) -> typing.Dict[str, typing.Tuple[int, int]]:
+        """
+        링크 그룹별 (행 수, column 합계). 그룹이 없는 행은 '' 로 모은다.
+        :param column:
+        :param state:
+        :return:
+        """
+        groups = self.__values('group', state)
+        values = self.__values(column, state)
+        strings = self.__store.strings
+        if numpy is not None:
+            # -1 (그룹 없음) 을 0 번으로 밀어서 센다. 합계는 float64 로 더하면 2^53 ns 를 넘을 때 값이 틀어지므로
+            # bincount(weights=) 대신 int64 배열에 add.at 으로 더한다.
+            shifted = groups.astype(numpy.int64) + 1
+            counts = numpy.bincount(shifted)
+            sums = numpy.zeros(len(counts), dtype=numpy.int64)
+            numpy.add.at(sums, shifted, values.astype(numpy.int64))
+            return {(strings[code - 1] if code else ''): (int(counts[code]), int(sums[code]))
+                    for code in numpy.nonzero(counts)[0].tolist()}
+        totals: typing.Dict[str, typing.List[int]] = dict()
+        for code, value in zip(groups, values):
+            total = totals.setdefault(strings[code] if code >= 0 else '', [0, 0])
+            total[0] += 1
+            total[1] += value
+        return {group: (cnt, value) for group, (cnt, value) in totals.items()}
+
+    def lateness_histogram(self, edges: typing.Sequence[int] = (0, 1_000_000, 5_000_000, 20_000_000, 100_000_000,
+                                                                1_000_000_000)) -> typing.Tuple[list, list]:
+        """
+        FINISHED 행의 만료 지연(ns) 분포. 마지막 구간은 edges[-1] 이상을 모두 담는다.
+        :param edges: 오름차순 구간 경계 (ns)
+        :return: (counts, edges)
+        """
+        values = self.__values('lateness', Constant.FINISHED)
+        edges = list(edges)
+        if numpy is not None:
+            idx = numpy.searchsorted(numpy.asarray(edges), values, side='right') - 1
+            counts = numpy.bincount(idx[idx >= 0], minlength=len(edges))
+            return counts.tolist(), edges
+        counts = [0] * len(edges)
+        for value in values:
+            idx = bisect.bisect_right(edges, value) - 1
+            if idx >= 0:
+                counts[idx] += 1
+        return counts, edges
+
+
+class HistoryRecorder:
+    """
+    타이머의 시작, 일시정지, 재개, 종료를 받아 HistoryStore 에 한 행으로 남긴다.
+    시각은 time.monotonic_ns 기준이라 lateness 에는 UI 로 이벤트가 전달되는 지연도 포함된다.
+    """
+    def __init__(self, store: HistoryStore, clock: typing.Callable[[], int] = time.monotonic_ns):
+        self.__store = store
+        self.__clock = clock
+        self.__engine = None
+        # jid: [started_at, planned, group, paused_at, paused, pauses, commands]
+        self.__open: typing.Dict[str, list] = dict()
+
+    @property
+    def store(self) -> HistoryStore:
+        return self.__store
+
+    def begin(self, jid: str, planned: int, group: str = '') -> None:
+        self.__open[jid] = [self.__clock(), planned, group, None, 0, 0, list()]
+
+    def pause(self, jid: str) -> None:
+        row = self.__open.get(jid)
+        if row is not None and row[3] is None:
+            row[3] = self.__clock()
+            row[5] += 1
+
+    def resume(self, jid: str) -> None:
+        row = self.__open.get(jid)
+        if row is not None and row[3] is not None:
+            row[4] += self.__clock() - row[3]
+            row[3] = None
+
+    def add_command(self, jid: str, cmd: str) -> None:
+        row = self.__open.get(jid)
+        if row is not None:
+            row[6].append(cmd)
+
+    def end(self, jid: str, state: int, paused: typing.Optional[int] = None,
+            pauses: typing.Optional[int] = None) -> None:
+        """
+        :param jid:
+        :param state:
+        :param paused: 일시정지로 보낸 시간을 정확히 알면 (ns) 넘긴다.
+        :param pauses: 일시정지 횟수를 정확히 알면 넘긴다.
+        :return:
+        """
+        row = self.__open.pop(jid, None)
+        if row is None:
+            return
+        started_at, planned, group, paused_at, counted, counted_pauses, commands = row
+        now = self.__clock()
+        if paused is None:
+            paused = counted + (now - paused_at if paused_at is not None else 0)
+        if pauses is None:
+            pauses = counted_pauses
+        actual = now - started_at
+        lateness = max(0, actual - paused - planned) if state == Constant.FINISHED else 0
+        self.__store.append(jid, state, planned, actual, paused, pauses, lateness, group, commands)
+
+    def record_data(self, data: Data) -> None:
+        """
+        엔진 리스너. begin() 하지 않은 타이머는 붙어 있는 엔진에서 설정 시간을 읽는다.
+        일시정지 시간과 횟수는 엔진이 타이머마다 센 값(paused_total, pauses)을 쓴다. 기준 시각(origin)은
+        rebase() 나 반복 타이머의 재개가 옮기므로 쓰지 않는다.
+        :param data:
+        :return:
+        """
+        engine = self.__engine
+        if data.ste == Constant.STARTED:
+            if data.jid not in self.__open and engine is not None:
+                timer = engine.get(data.jid)
+                self.begin(data.jid, timer.duration)
+                self.__open[data.jid][0] = timer.origin
+        elif data.kind == Kind.PAUSE:
+            self.pause(data.jid)
+        elif data.kind == Kind.RESUME:
+            self.resume(data.jid)
+        elif data.ste & (Constant.FINISHED | Constant.STOPPED | Constant.ERROR):
+            paused = pauses = None
+            if engine is not None and data.jid in engine.timers:
+                timer = engine.get(data.jid)
+                paused, pauses = timer.paused_total, timer.pauses
+            self.end(data.jid, data.ste, paused, pauses)
+
+    def attach(self, engine) -> None:
+        self.__engine = engine
+        self.__clock = engine.clock
+        engine.subscribe(self.record_data)
+
+    def detach(self, engine) -> None:
+        engine.unsubscribe(self.record_data)
+        self.__engine = None
+
+
+if __name__ == '__main__':
+    pass
@@ -0,0 +1,68 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# author        : Seongcheol Jeon
+# created date  : 2026.10.19
+# modified date : 2026.10.19
+# description   : 타이머 링크 그룹 (comboBox__link)
+
+import typing
+
+
+class LinkGroups:
+    """
+    jid 를 링크 키(comboBox__link 의 인덱스 등)에 묶는다.
+    구성원이 둘 이상인 그룹만 실제로 링크된 것으로 본다.
+    """
+    def __init__(self):
+        self.__key_by_jid: typing.Dict[str, typing.Hashable] = dict()
+        self.__members: typing.Dict[typing.Hashable, typing.List[str]] = dict()
+
+    def __contains__(self, jid: str) -> bool:
+        return jid in self.__key_by_jid
+
+    def set(self, jid: str, key: typing.Hashable) -> None:
+        self.discard(jid)
+        self.__key_by_jid[jid] = key
+        self.__members.setdefault(key, list()).append(jid)
+
+    def discard(self, jid: str) -> None:
+        key = self.__key_by_jid.pop(jid, None)
+        if key is None:
+            return
+        members = self.__members[key]
+        members.remove(jid)
+        if not members:
+            del self.__members[key]
+
+    def clear(self) -> None:
+        self.__key_by_jid.clear()
+        self.__members.clear()
+
+    def key_of(self, jid: str) -> typing.Optional[typing.Hashable]:
+        return self.__key_by_jid.get(jid)
+
+    def members(self, key: typing.Hashable) -> typing.List[str]:
+        return list(self.__members.get(key, ()))
+
+    def is_linked(self, jid: str) -> bool:
+        key = self.__key_by_jid.get(jid)
+        return key is not None and len(self.__members[key]) > 1
+
+    def linked(self, jid: str) -> typing.List[str]:
+        """
+        jid 와 같은 그룹에 묶인 다른 jid 들
+        :param jid:
+        :return:
+        """
+        if not self.is_linked(jid):
+            return list()
+        return [other for other in self.__members[self.__key_by_jid[jid]] if other != jid]
+
+    def filtered(self) -> typing.Dict[str, typing.Hashable]:
+        # 실제로 링크된 jid 만 추린다.
+        return {jid: key for jid, key in self.__key_by_jid.items() if len(self.__members[key]) > 1}
+
+
+if __name__ == '__main__':
+    pass
@@ -0,0 +1,355 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# author        : Seongcheol Jeon
+# created date  : 2026.10.19
+# modified date : 2026.10.19
+# description   : 실행 중인 타이머의 스냅샷 + write-ahead journal, 재시작 시 복원
+
+import os
+import sys
+import json
+import time
+import typing
+import pathlib
+import threading
+
+from core.states import Constant
+from core.events import Data, Kind
+from core.eventlog import EventLog
+from core.clocks import boot_id, boottime_ns
+from core.recur import rule_from_dict
+
+
+class Stamp(typing.NamedTuple):
+    wall: int
+    boot: int
+    boot_id: str
+
+    @staticmethod
+    def now() -> 'Stamp':
+        return Stamp(time.time_ns(), boottime_ns(), _BOOT_ID)
+
+    def since(self, earlier: 'Stamp') -> int:
+        """
+        earlier 부터 지난 시간(ns). 같은 부팅 안이면 벽시계 변경에 영향받지 않는 boottime 차이를,
+        재부팅을 건넜으면 벽시계 차이를 쓴다.
+        """
+        if self.boot_id and self.boot_id == earlier.boot_id:
+            return max(0, self.boot - earlier.boot)
+        return max(0, self.wall - earlier.wall)
+
+
+_BOOT_ID: str = boot_id()
+
+
+class Entry:
+    __slots__ = ('jid', 'duration', 'tick', 'group', 'commands', 'state', 'elapsed', 'stamp', 'run', 'alarm_at',
+                 'rule')
+
+    IDLE = 'idle'
+    RUNNING = 'running'
+    PAUSED = 'paused'
+
+    def __init__(self, jid: str, duration: int, tick: int, group: str = '',
+                 commands: typing.Sequence[str] = (), state: str = 'idle', elapsed: int = 0,
+                 stamp: typing.Optional[Stamp] = None, run: int = 0, alarm_at: typing.Optional[int] = None,
+                 rule: typing.Optional[dict] = None):
+        self.jid: str = jid
+        self.duration: int = duration
+        self.tick: int = tick
+        self.group: str = group
+        self.commands: typing.List[str] = list(commands)
+        self.state: str = state
+        # stamp 시점까지 지난 시간 (ns). RUNNING 이면 그 뒤로도 계속 흐른다.
+        self.elapsed: int = elapsed
+        self.stamp: typing.Optional[Stamp] = stamp
+        # 이 실행을 처음 시작한 벽시계 시각 (ns). 이어서 돌려도 바뀌지 않는다.
+        self.run: int = run
+        # 벽시계 알람이면 만료 시각 (epoch ns). 반복 타이머면 다음 실행 시각
+        self.alarm_at: typing.Optional[int] = alarm_at
+        # 반복 타이머의 규칙 (core.recur 의 to_dict())
+        self.rule: typing.Optional[dict] = rule
+
+    def __repr__(self):
+        fields = ', '.join(f'{name}={getattr(self, name)!r}' for name in Entry.__slots__)
+        return f'Entry({fields})'
+
+    def elapsed_at(self, stamp: Stamp) -> int:
+        if self.state != Entry.RUNNING or self.stamp is None:
+            return self.elapsed
+        return self.elapsed + stamp.since(self.stamp)
+
+    def remaining_at(self, stamp: Stamp) -> int:
+        return max(0, self.duration - self.elapsed_at(stamp))
+
+    def to_dict(self) -> dict:
+        data = {name: getattr(self, name) for name in Entry.__slots__}
+        data['stamp'] = list(self.stamp) if self.stamp is not None else None
+        return data
+
+    @staticmethod
+    def from_dict(data: dict) -> 'Entry':
+        stamp = data.get('stamp')
+        return Entry(data['jid'], data['duration'], data['tick'], data.get('group', ''), data.get('commands', ()),
+                     data.get('state', Entry.IDLE), data.get('elapsed', 0),
+                     Stamp(*stamp) if stamp is not None else None, data.get('run', 0), data.get('alarm_at'),
+                     data.get('rule'))
+
+
+class TimerJournal:
+    """
+    타이머 표(jid -> Entry)를 메모리에 두고, 바뀔 때마다 journal-<gen>.jsonl 에 한 줄씩 남긴다.
+    쓰기는 EventLog 의 writer 스레드가 모아서 fsync 한다(group commit).
+
+    snapshot_interval 초마다 checkpoint() 가 표 전체를 snapshot.json 으로 남기고 새 세대의 journal 을 연다.
+    스냅샷 파일 쓰기와 이전 세대 정리는 별도 스레드에서 한다.
+    복원은 snapshot.json 을 읽고 그 세대 이후의 journal 을 순서대로 다시 적용한다.
+    """
+    SNAPSHOT = 'snapshot.json'
+
+    def __init__(self, path: typing.Union[str, pathlib.Path], snapshot_interval: float = 60.0,
+                 commit_interval: float = 0.05):
+        self.__path = pathlib.Path(path)
+        self.__path.mkdir(parents=True, exist_ok=True)
+        self.__snapshot_interval: float = snapshot_interval
+        self.__commit_interval: float = commit_interval
+        self.__engine = None
+        self.__entries: typing.Dict[str, Entry] = dict()
+        self.__gen: int = self.__load()
+        self.__log: typing.Optional[EventLog] = None
+        self.__checkpointed_at: float = time.monotonic()
+        self.__checkpoint_thread: typing.Optional[threading.Thread] = None
+        # 복원한 표를 새 세대의 시작점으로 남겨 둔다.
+        self.checkpoint()
+
+    @property
+    def path(self) -> pathlib.Path:
+        return self.__path
+
+    @property
+    def entries(self) -> typing.Dict[str, Entry]:
+        return self.__entries
+
+    @property
+    def generation(self) -> int:
+        return self.__gen
+
+    def __journal_path(self, gen: int) -> pathlib.Path:
+        return self.__path / f'journal-{gen:08d}.jsonl'
+
+    def __load(self) -> int:
+        gen = 0
+        snapshot = self.__path / TimerJournal.SNAPSHOT
+        if snapshot.exists():
+            with open(snapshot, encoding='utf8') as f:
+                data = json.load(f)
+            gen = data['gen']
+            self.__entries = {item['jid']: Entry.from_dict(item) for item in data['entries']}
+        journals = sorted(self.__path.glob('journal-*.jsonl'))
+        for journal in journals:
+            if int(journal.stem.split('-')[1]) < gen:
+                continue
+            try:
+                for record in EventLog.read(journal):
+                    self.__apply(record)
+            except ValueError:
+                # 비정상 종료로 잘린 마지막 줄은 버린다.
+                sys.stderr.write(f'[TimerJournal] truncated journal: {journal}\n')
+        if journals:
+            gen = max(gen, int(journals[-1].stem.split('-')[1]))
+        return gen
+
+    def __apply(self, record: dict) -> None:
+        kind, jid = record['kind'], record['jid']
+        stamp = Stamp(*record['stamp'])
+        if kind == 'create':
+            self.__entries[jid] = Entry(jid, record['duration'], record['tick'], record.get('group', ''),
+                                        record.get('commands', ()), alarm_at=record.get('alarm_at'),
+                                        rule=record.get('rule'))
+            return
+        entry = self.__entries.get(jid)
+        if entry is None:
+            return
+        if kind == 'start':
+            entry.state, entry.elapsed, entry.stamp = Entry.RUNNING, record.get('elapsed', 0), stamp
+            entry.run = record.get('run') or stamp.wall
+        elif kind == 'pause':
+            entry.elapsed, entry.state, entry.stamp = entry.elapsed_at(stamp), Entry.PAUSED, stamp
+        elif kind == 'resume':
+            if entry.state == Entry.PAUSED:
+                entry.state, entry.stamp = Entry.RUNNING, stamp
+        elif kind == 'update':
+            entry.group = record.get('group', entry.group)
+            entry.commands = list(record.get('commands', entry.commands))
+        elif kind in ('end', 'remove'):
+            del self.__entries[jid]
+
+    def __record(self, kind: str, jid: str, **fields) -> None:
+        stamp = Stamp.now()
+        record = dict(kind=kind, jid=jid, stamp=list(stamp), **fields)
+        self.__apply(record)
+        self.__log.record(kind, jid, stamp=record['stamp'], **fields)
+        if self.__snapshot_interval and time.monotonic() - self.__checkpointed_at >= self.__snapshot_interval:
+            self.checkpoint()
+
+    def create(self, jid: str, duration: int, tick: int = 1_000_000_000, group: str = '',
+               commands: typing.Sequence[str] = (), alarm_at: typing.Optional[int] = None,
+               rule: typing.Optional[dict] = None) -> None:
+        """
+        :param jid:
+        :param duration: ns
+        :param tick: ns
+        :param group:
+        :param commands:
+        :param alarm_at: 벽시계 알람 시각 (epoch ns)
+        :param rule: 반복 규칙 (core.recur 의 to_dict())
+        :return:
+        """
+        self.__record('create', jid, duration=duration, tick=tick, group=group, commands=list(commands),
+                      alarm_at=alarm_at, rule=rule)
+
+    def start(self, jid: str, elapsed: int = 0, run: int = 0) -> None:
+        """
+        :param jid:
+        :param elapsed: 이어서 돌릴 때 이미 지난 시간 (ns)
+        :param run: 이어서 돌릴 때 원래 실행의 시작 시각. 0 이면 새 실행
+        :return:
+        """
+        self.__record('start', jid, elapsed=elapsed, run=run)
+
+    def pause(self, jid: str) -> None:
+        entry = self.__entries.get(jid)
+        if entry is not None and entry.state == Entry.RUNNING:
+            self.__record('pause', jid)
+
+    def resume(self, jid: str) -> None:
+        entry = self.__entries.get(jid)
+        if entry is not None and entry.state == Entry.PAUSED:
+            self.__record('resume', jid)
+
+    def update(self, jid: str, group: str, commands: typing.Sequence[str]) -> None:
+        if jid in self.__entries:
+            self.__record('update', jid, group=group, commands=list(commands))
+
+    def end(self, jid: str, state: int = Constant.FINISHED) -> None:
+        if jid in self.__entries:
+            self.__record('end', jid, state=state)
+
+    def remove(self, jid: str) -> None:
+        if jid in self.__entries:
+            self.__record('remove', jid)
+
+    def checkpoint(self) -> None:
+        """
+        지금의 표를 스냅샷으로 남기고 새 세대 journal 로 넘어간다.
+        직렬화만 부르는 스레드에서 하고, 파일 쓰기는 백그라운드 스레드에서 한다.
+        :return:
+        """
+        if self.__checkpoint_thread is not None and self.__checkpoint_thread.is_alive():
+            return
+        self.__gen += 1
+        payload = json.dumps(dict(gen=self.__gen, entries=[entry.to_dict() for entry in self.__entries.values()]),
+                             separators=(',', ':'))
+        old_log = self.__log
+        self.__log = EventLog(self.__journal_path(self.__gen), max_bytes=0, backups=0,
+                              commit_interval=self.__commit_interval)
+        self.__checkpointed_at = time.monotonic()
+        self.__checkpoint_thread = threading.Thread(
+            target=self.__write_snapshot, args=(self.__gen, payload, old_log), name='TimerJournalCheckpoint',
+            daemon=True)
+        self.__checkpoint_thread.start()
+
+    def __write_snapshot(self, gen: int, payload: str, old_log: typing.Optional[EventLog]) -> None:
+        if old_log is not None:
+            old_log.close()
+        snapshot = self.__path / TimerJournal.SNAPSHOT
+        tmp = snapshot.with_name(snapshot.name + '.tmp')
+        with open(tmp, 'w', encoding='utf8') as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, snapshot)
+        # 스냅샷이 자리 잡은 뒤에야 이전 세대 journal 을 지운다.
+        for journal in self.__path.glob('journal-*.jsonl'):
+            if int(journal.stem.split('-')[1]) < gen:
+                journal.unlink()
+
+    def close(self) -> None:
+        if self.__checkpoint_thread is not None:
+            self.__checkpoint_thread.join()
+        if self.__log is not None:
+            self.__log.close()
+
+    def restore(self) -> typing.List[typing.Tuple[Entry, int]]:
+        """
+        복원할 타이머와 지금까지 지난 시간(ns). RUNNING 이었던 타이머는 재시작 동안 흐른 시간까지 더한다.
+        elapsed >= duration 이면 꺼져 있는 동안 만료된 것이다.
+        :return: [(entry, elapsed), ...]
+        """
+        stamp = Stamp.now()
+        return [(entry, min(entry.duration, entry.elapsed_at(stamp)))
+                for entry in self.__entries.values() if entry.state != Entry.IDLE]
+
+    def restore_engine(self, engine) -> int:
+        """
+        엔진에 같은 jid 로 타이머를 다시 만든다. 일시정지였던 타이머는 일시정지 상태로 둔다.
+        알람은 같은 벽시계 시각에, 반복 타이머는 같은 규칙으로 다시 건다 (꺼져 있는 동안 지난 실행은 건너뛴다).
+        :param engine:
+        :return: 복원한 타이머 수
+        """
+        restored = self.restore()
+        for entry, elapsed in restored:
+            tick = entry.tick / 1_000_000_000
+            if entry.rule is not None:
+                timer = engine.create_recurring(rule_from_dict(entry.rule), jid=entry.jid, tick=tick, start=False)
+                timer.alarm_at = entry.alarm_at
+            elif entry.alarm_at is not None:
+                timer = engine.create_alarm(entry.alarm_at / 1_000_000_000, jid=entry.jid, tick=tick, start=False)
+            else:
+                timer = engine.create_timer(entry.duration / 1_000_000_000, jid=entry.jid, tick=tick, start=False)
+            engine.start(timer.jid, elapsed)
+            if entry.state == Entry.PAUSED:
+                engine.pause(timer.jid)
+        return len(restored)
+
+    def record_data(self, data: Data) -> None:
+        """
+        엔진 리스너. 새 타이머는 붙어 있는 엔진에서 설정 시간과 tick 을 읽는다.
+        :param data:
+        :return:
+        """
+        engine = self.__engine
+        if data.ste == Constant.STARTED:
+            if engine is None:
+                return
+            timer = engine.get(data.jid)
+            entry = self.__entries.get(data.jid)
+            elapsed = max(0, engine.clock() - timer.origin)
+            rule = timer.rule.to_dict() if timer.rule is not None else None
+            if entry is None:
+                self.create(data.jid, timer.duration, timer.tick, alarm_at=timer.alarm_at, rule=rule)
+                self.start(data.jid, elapsed)
+            else:
+                # 복원해서 다시 시작한 타이머는 그룹/명령과 실행 시각을 그대로 둔다.
+                run = entry.run if elapsed else 0
+                self.create(data.jid, timer.duration, timer.tick, entry.group, entry.commands, timer.alarm_at, rule)
+                self.start(data.jid, elapsed, run)
+        elif data.kind == Kind.PAUSE:
+            self.pause(data.jid)
+        elif data.kind == Kind.RESUME:
+            self.resume(data.jid)
+        elif data.ste & (Constant.FINISHED | Constant.STOPPED | Constant.ERROR):
+            self.end(data.jid, data.ste)
+
+    def attach(self, engine) -> None:
+        self.__engine = engine
+        engine.subscribe(self.record_data)
+
+    def detach(self, engine) -> None:
+        engine.unsubscribe(self.record_data)
+        self.__engine = None
+
+
+if __name__ == '__main__':
+    pass
@@ -0,0 +1,233 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# author        : Seongcheol Jeon
+# created date  : 2026.10.19
+# modified date : 2026.10.19
+# description   : 반복 타이머 규칙 (N 초마다, cron 표현식). 다음 실행 시각을 계산한다.
+
+import time
+import typing
+import datetime
+
+
+NSEC_PER_SEC: typing.Final[int] = 1_000_000_000
+
+
+class Every:
+    """
+    anchor 부터 interval 초 간격의 격자. 다음 시각은 격자 위에서 바로 계산하므로
+    늦게 깨어나도 간격이 밀리지 않는다 (drift 없음).
+    """
+    def __init__(self, interval: float, anchor: typing.Optional[int] = None):
+        """
+        :param interval: 초
+        :param anchor: 격자의 기준 벽시계 시각 (epoch ns). 기본값 지금
+        """
+        if interval <= 0:
+            raise ValueError(f'interval must be positive: {interval}')
+        self.__interval: int = int(round(interval * NSEC_PER_SEC))
+        self.__anchor: int = time.time_ns() if anchor is None else anchor
+
+    @property
+    def interval(self) -> int:
+        return self.__interval
+
+    def to_dict(self) -> dict:
+        return dict(every=self.__interval / NSEC_PER_SEC, anchor=self.__anchor)
+
+    def next_after(self, t: int) -> int:
+        """
+        :param t: 벽시계 시각 (epoch ns)
+        :return: t 보다 뒤인 첫 실행 시각 (epoch ns)
+        """
+        if t < self.__anchor:
+            return self.__anchor
+        return self.__anchor + ((t - self.__anchor) // self.__interval + 1) * self.__interval
+
+    def __str__(self):
+        return f'every {self.__interval / NSEC_PER_SEC:g}s'
+
+
+class Cron:
+    """
+    5 필드 cron 표현식 (분 시 일 월 요일, 로컬 시각). *, 목록(,), 범위(-), 간격(/), 월/요일 이름과
+    @hourly, @daily, @weekly, @monthly, @yearly 를 받는다. 일과 요일이 둘 다 * 가 아니면 둘 중 하나만 맞아도 된다.
+
+    next_after() 는 맞지 않는 월/일/시를 통째로 건너뛰며 찾고, 마지막 결과를 (after, next) 구간으로
+    기억해서 그 구간 안의 질의는 다시 계산하지 않는다. 서머타임이 끝나 되풀이되는 시간의 시각은 두 번 다 실행하고,
+    서머타임이 시작되어 없는 시각은 건너뛴 만큼 밀어서 실행한다.
+    """
+    MACROS: typing.Final[typing.Dict[str, str]] = {
+        '@yearly':      '0 0 1 1 *',
+        '@annually':    '0 0 1 1 *',
+        '@monthly':     '0 0 1 * *',
+        '@weekly':      '0 0 * * 0',
+        '@daily':       '0 0 * * *',
+        '@midnight':    '0 0 * * *',
+        '@hourly':      '0 * * * *',
+    }
+    MONTHS: typing.Final[typing.Tuple[str, ...]] = (
+        'jan', 'feb', 'mar', 'apr', 'may', 'jun', 'jul', 'aug', 'sep', 'oct', 'nov', 'dec')
+    WEEKDAYS: typing.Final[typing.Tuple[str, ...]] = ('sun', 'mon', 'tue', 'wed', 'thu', 'fri', 'sat')
+    # 2월 30일처럼 돌아오지 않는 표현식을 끝없이 찾지 않도록 (날 단위 건너뛰기 수)
+    SEARCH_LIMIT = 5 * 366
+
+    def __init__(self, expr: str):
+        self.__expr: str = expr.strip()
+        fields = Cron.MACROS.get(self.__expr.lower(), self.__expr).split()
+        if len(fields) != 5:
+            raise ValueError(f'cron expression needs 5 fields: {expr!r}')
+        self.__minutes: typing.List[int] = sorted(Cron.parse_field(fields[0], 0, 59))
+        self.__hours: typing.List[int] = sorted(Cron.parse_field(fields[1], 0, 23))
+        self.__days: typing.FrozenSet[int] = Cron.parse_field(fields[2], 1, 31)
+        self.__months: typing.FrozenSet[int] = Cron.parse_field(fields[3], 1, 12, Cron.MONTHS, 1)
+        # 7 도 일요일
+        self.__weekdays: typing.FrozenSet[int] = frozenset(
+            day % 7 for day in Cron.parse_field(fields[4], 0, 7, Cron.WEEKDAYS, 0))
+        self.__any_day: bool = fields[2].startswith('*')
+        self.__any_weekday: bool = fields[4].startswith('*')
+        self.__cache: typing.Optional[typing.Tuple[int, int]] = None
+
+    @staticmethod
+    def parse_field(text: str, low: int, high: int, names: typing.Sequence[str] = (),
+                    base: int = 0) -> typing.FrozenSet[int]:
+        """
+        :param text: '*/15', '1-5', 'mon-fri', '0,30' ...
+        :param low:
+        :param high:
+        :param names: 이름으로 쓸 수 있는 값들 (base 부터 차례로)
+        :param base:
+        :return:
+        :raise ValueError:
+        """
+        def value(token: str) -> int:
+            token = token.lower()
+            if token in names:
+                return names.index(token) + base
+            number = int(token)
+            if not low <= number <= high:
+                raise ValueError(f'{number} is out of range {low}-{high}')
+            return number
+
+        values = set()
+        for part in text.split(','):
+            step = 1
+            if '/' in part:
+                part, step_text = part.split('/', 1)
+                step = int(step_text)
+                if step <= 0:
+                    raise ValueError(f'step must be positive: {text!r}')
+            if part == '*':
+                first, last = low, high
+            elif '-' in part:
+                first, last = (value(token) for token in part.split('-', 1))
+            else:
+                # '5/15' 는 5 부터 끝까지 15 간격
+                first = value(part)
+                last = high if step > 1 else first
+            if first > last:
+                raise ValueError(f'empty range: {part!r}')
+            values.update(range(first, last + 1, step))
+        return frozenset(values)
+
+    def __day_ok(self, day: datetime.datetime) -> bool:
+        in_days = day.day in self.__days
+        in_weekdays = (day.weekday() + 1) % 7 in self.__weekdays
+        if self.__any_day or self.__any_weekday:
+            return in_days and in_weekdays
+        return in_days or in_weekdays
+
+    @staticmethod
+    def __first_at_least(values: typing.List[int], value: int) -> typing.Optional[int]:
+        for candidate in values:
+            if candidate >= value:
+                return candidate
+        return None
+
+    @staticmethod
+    def __epochs(local: datetime.datetime) -> typing.List[int]:
+        """
+        로컬 벽시계 시각 하나가 가리키는 epoch 시각들. 서머타임이 끝나 되풀이되는 시간에는 두 개(fold 0, 1),
+        서머타임이 시작되어 건너뛰는 시간에는 그 뒤로 밀린 시각 하나다.
+        :param local: tzinfo 없는 로컬 시각
+        :return: 오름차순 epoch ns
+        """
+        epochs = list()
+        for fold in (0, 1):
+            aware = local.replace(fold=fold).astimezone()
+            if aware.replace(tzinfo=None) == local:
+                epochs.append(int(aware.timestamp()) * NSEC_PER_SEC)
+        if not epochs:
+            # 없는 시각은 두 해석 중 뒤쪽, 건너뛴 만큼 밀린 시각으로 본다.
+            epochs.append(max(int(local.replace(fold=fold).astimezone().timestamp()) for fold in (0, 1)) *
+                          NSEC_PER_SEC)
+        return sorted(set(epochs))
+
+    def next_after(self, t: int) -> int:
+        """
+        :param t: 벽시계 시각 (epoch ns)
+        :return: t 보다 뒤인 첫 실행 시각 (epoch ns)
+        :raise ValueError: SEARCH_LIMIT 안에 실행 시각이 없을 때
+        """
+        cache = self.__cache
+        if cache is not None and cache[0] <= t < cache[1]:
+            return cache[1]
+        # 되풀이되는 시간의 두 번째 시각이면 로컬 시각은 이미 한 번 지나간 값이다. 그래서 찾은 시각이
+        # t 보다 앞서면 (fold 0 쪽) 버리고 다음 분부터 다시 찾는다.
+        day = datetime.datetime.fromtimestamp(t // NSEC_PER_SEC).replace(second=0, microsecond=0, fold=0)
+        day += datetime.timedelta(minutes=1)
+        for _ in range(Cron.SEARCH_LIMIT):
+            if day.month not in self.__months:
+                day = (day.replace(day=1, hour=0, minute=0) + datetime.timedelta(days=32)).replace(day=1)
+                continue
+            if not self.__day_ok(day):
+                day = day.replace(hour=0, minute=0) + datetime.timedelta(days=1)
+                continue
+            hour = Cron.__first_at_least(self.__hours, day.hour)
+            if hour is None:
+                day = day.replace(hour=0, minute=0) + datetime.timedelta(days=1)
+                continue
+            if hour != day.hour:
+                day = day.replace(hour=hour, minute=0)
+            minute = Cron.__first_at_least(self.__minutes, day.minute)
+            if minute is None:
+                day = day.replace(minute=0) + datetime.timedelta(hours=1)
+                continue
+            day = day.replace(minute=minute)
+            later = [epoch for epoch in Cron.__epochs(day) if epoch > t]
+            if not later:
+                day += datetime.timedelta(minutes=1)
+                continue
+            self.__cache = (t, later[0])
+            return later[0]
+        raise ValueError(f'cron expression never fires: {self.__expr!r}')
+
+    def to_dict(self) -> dict:
+        return dict(cron=self.__expr)
+
+    def __str__(self):
+        return f'cron {self.__expr}'
+
+
+def make_rule(every: typing.Optional[float] = None, cron: typing.Optional[str] = None,
+              anchor: typing.Optional[int] = None) -> typing.Union[Every, Cron]:
+    """
+    :param every: 초
+    :param cron: cron 표현식
+    :param anchor: every 격자의 기준 시각 (epoch ns)
+    :return:
+    :raise ValueError: 둘 중 하나만 주어야 한다
+    """
+    if (every is None) == (cron is None):
+        raise ValueError('give exactly one of every or cron')
+    return Every(every, anchor) if every is not None else Cron(cron)
+
+
+def rule_from_dict(data: dict) -> typing.Union[Every, Cron]:
+    # to_dict() 의 반대 (journal 복원용)
+    return make_rule(data.get('every'), data.get('cron'), data.get('anchor'))
+
+
+if __name__ == '__main__':
+    pass
@@ -0,0 +1,554 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# author        : Seongcheol Jeon
+# created date  : 2026.10.19
+# modified date : 2026.10.19
+# description   : Unix 도메인 소켓 위의 JSON-RPC 제어 API (서버 / 클라이언트)
+
+import os
+import json
+import math
+import time
+import socket
+import typing
+import asyncio
+import pathlib
+import itertools
+
+from core.states import state_names
+from core.events import Data
+from core.links import LinkGroups
+from core.engine import NSEC_PER_SEC, NSEC_PER_MSEC
+from core.recur import make_rule
+
+
+class RpcError(Exception):
+    PARSE_ERROR = -32700
+    INVALID_REQUEST = -32600
+    METHOD_NOT_FOUND = -32601
+    INVALID_PARAMS = -32602
+    INTERNAL_ERROR = -32603
+    UNKNOWN_JID = -32001
+
+    def __init__(self, code: int, message: str):
+        super().__init__(f'[{code}] {message}')
+        self.code: int = code
+        self.message: str = message
+
+
+class ControlServer:
+    """
+    AsyncTimerEngine 을 Unix 소켓으로 제어한다. 메시지는 한 줄에 하나씩인 JSON-RPC 2.0 이고,
+    배열로 보내면 batch 로 처리한다. 엔진과 같은 asyncio 루프에서 돌기 때문에 잠금이 없다.
+
+    메서드 (rpc_<name>)
+        create, create_many, start, pause, resume, stop, remove, observe (+ *_many),
+        link, unlink, depend, undepend, dependencies, fail, list, get, subscribe, unsubscribe
+    start/pause/resume/stop 은 linked=True 면 같은 링크 그룹의 타이머에도 적용한다(GUI 와 같다).
+    그룹, *_many 명령과 batch 는 engine.group() 으로 묶어서 모든 대상이 같은 시각에 시작/일시정지/재개/정지한다.
+    subscribe 한 연결에는 {"method": "event", "params": Data} 알림을 보낸다.
+    소켓 송신 버퍼가 MAX_BUFFER 를 넘은 구독자의 알림은 버린다.
+    """
+    MAX_BUFFER = 4 * 1024 * 1024
+    LINE_LIMIT = 64 * 1024 * 1024
+
+    def __init__(self, engine, path: typing.Union[str, pathlib.Path], links: typing.Optional[LinkGroups] = None):
+        self.__engine = engine
+        self.__path = pathlib.Path(path)
+        self.__links: LinkGroups = links if links is not None else LinkGroups()
+        self.__server: typing.Optional[asyncio.AbstractServer] = None
+        self.__sub_ids = itertools.count(1)
+        # 구독 id: (writer, jid 집합 또는 None, 리스너)
+        self.__subscriptions: typing.Dict[int, typing.Tuple[asyncio.StreamWriter, typing.Optional[set],
+                                                            typing.Callable]] = dict()
+        self.__dropped: int = 0
+
+    @property
+    def path(self) -> pathlib.Path:
+        return self.__path
+
+    @property
+    def links(self) -> LinkGroups:
+        return self.__links
+
+    @property
+    def dropped(self) -> int:
+        return self.__dropped
+
+    async def start(self) -> None:
+        if self.__path.exists():
+            self.__path.unlink()
+        self.__server = await asyncio.start_unix_server(self.__handle, path=str(self.__path),
+                                                        limit=ControlServer.LINE_LIMIT)
+        os.chmod(self.__path, 0o600)
+
+    async def serve_forever(self) -> None:
+        if self.__server is None:
+            await self.start()
+        await self.__server.serve_forever()
+
+    def close(self) -> None:
+        for sub_id in list(self.__subscriptions):
+            self.__drop_subscription(sub_id)
+        if self.__server is not None:
+            self.__server.close()
+            self.__server = None
+        if self.__path.exists():
+            self.__path.unlink()
+
+    async def __handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                response = self.dispatch_line(line, writer)
+                if response is not None:
+                    writer.write(response)
+                    await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            for sub_id, (sub_writer, _, _) in list(self.__subscriptions.items()):
+                if sub_writer is writer:
+                    self.__drop_subscription(sub_id)
+            writer.close()
+
+    def dispatch_line(self, line: bytes,
+                      writer: typing.Optional[asyncio.StreamWriter] = None) -> typing.Optional[bytes]:
+        try:
+            message = json.loads(line)
+        except ValueError as err:
+            return self.__encode(self.__error(None, RpcError(RpcError.PARSE_ERROR, str(err))))
+        if isinstance(message, list):
+            if not message:
+                return self.__encode(self.__error(None, RpcError(RpcError.INVALID_REQUEST, 'empty batch')))
+            # batch 안의 명령들은 엔진의 한 시각에 함께 적용된다.
+            with self.__engine.group():
+                responses = [res for res in (self.__dispatch(item, writer) for item in message) if res is not None]
+            return self.__encode(responses) if responses else None
+        response = self.__dispatch(message, writer)
+        return self.__encode(response) if response is not None else None
+
+    @staticmethod
+    def __encode(message) -> bytes:
+        return json.dumps(message, separators=(',', ':')).encode('utf8') + b'\n'
+
+    @staticmethod
+    def __error(req_id, err: RpcError) -> dict:
+        return {'jsonrpc': '2.0', 'id': req_id, 'error': {'code': err.code, 'message': err.message}}
+
+    def __dispatch(self, message, writer) -> typing.Optional[dict]:
+        if not isinstance(message, dict) or not isinstance(message.get('method'), str):
+            return self.__error(None, RpcError(RpcError.INVALID_REQUEST, 'invalid request'))
+        req_id = message.get('id')
+        method = getattr(self, f'rpc_{message["method"]}', None)
+        params = message.get('params') or dict()
+        try:
+            if not isinstance(params, (dict, list)):
+                raise RpcError(RpcError.INVALID_REQUEST, 'params must be an array or an object')
+            if method is None:
+                raise RpcError(RpcError.METHOD_NOT_FOUND, f'unknown method: {message["method"]}')
+            if message['method'] in ('subscribe', 'unsubscribe'):
+                if not isinstance(params, dict):
+                    raise RpcError(RpcError.INVALID_PARAMS, f'{message["method"]} takes named params')
+                params = dict(params, writer=writer)
+            try:
+                result = method(*params) if isinstance(params, list) else method(**params)
+            except TypeError as err:
+                raise RpcError(RpcError.INVALID_PARAMS, str(err))
+            except KeyError as err:
+                raise RpcError(RpcError.UNKNOWN_JID, f'unknown jid: {err}')
+            except ValueError as err:
+                raise RpcError(RpcError.INVALID_PARAMS, str(err))
+            except RpcError:
+                raise
+            except Exception as err:
+                raise RpcError(RpcError.INTERNAL_ERROR, str(err))
+        except RpcError as err:
+            return self.__error(req_id, err) if req_id is not None else None
+        if req_id is None:
+            # notification
+            return None
+        return {'jsonrpc': '2.0', 'id': req_id, 'result': result}
+
+    # --- timers ---
+    def timer_info(self, jid: str) -> dict:
+        engine = self.__engine
+        timer = engine.get(jid)
+        if timer.is_active():
+            end = timer.paused_at if timer.paused_at is not None else engine.clock()
+            elapsed = min(max(0, end - timer.origin), timer.duration)
+        else:
+            elapsed = timer.elapsed()
+        remaining = timer.duration - elapsed
+        group = self.__links.key_of(jid)
+        return dict(jid=jid, state=state_names(timer.bitfield.field), bits=timer.bitfield.field,
+                    duration_msec=timer.duration // NSEC_PER_MSEC, tick_msec=timer.tick // NSEC_PER_MSEC,
+                    remaining_msec=-(-remaining // NSEC_PER_MSEC),
+                    ratio=elapsed * 100 // timer.duration if timer.duration else 0, group=group,
+                    alarm_at=timer.alarm_at / NSEC_PER_SEC if timer.alarm_at is not None else None,
+                    rule=str(timer.rule) if timer.rule is not None else None, fires=timer.fires,
+                    missed=timer.missed)
+
+    def rpc_create(self, duration: float = 0.0, jid: typing.Optional[str] = None, tick: float = 1.0,
+                   start: bool = True, group: typing.Optional[str] = None, elapsed: float = 0.0,
+                   at: typing.Optional[float] = None, every: typing.Optional[float] = None,
+                   cron: typing.Optional[str] = None) -> str:
+        """
+        :param duration: 초 (0 이상)
+        :param jid:
+        :param tick: 초 (0 보다 커야 한다)
+        :param start:
+        :param group: 링크 그룹
+        :param elapsed: 이어서 돌릴 때 이미 지난 시간 (초)
+        :param at: 주어지면 duration 대신 이 벽시계 시각(epoch 초)에 만료되는 알람
+        :param every: 주어지면 이 간격(초)마다 만료되는 반복 타이머
+        :param cron: 주어지면 이 cron 표현식의 시각마다 만료되는 반복 타이머
+        :return:
+        :raise RpcError: INVALID_PARAMS
+        """
+        return self.__create(**self.__check_create(duration, jid, tick, start, group, elapsed, at, every, cron))
+
+    def rpc_create_many(self, items: typing.List[dict]) -> typing.List[str]:
+        """
+        모든 항목을 먼저 검사하고, 하나라도 틀리면 아무것도 만들지 않는다. 만든 타이머들은 같은 시각에 시작한다.
+        :param items: [{"duration": 10, "jid": ..., "tick": ..., "start": ..., "group": ...}, ...]
+        :return: 만들어진 jid 들
+        :raise RpcError: INVALID_PARAMS (message 에 틀린 항목의 번호)
+        """
+        if not isinstance(items, list):
+            raise RpcError(RpcError.INVALID_PARAMS, 'items must be an array')
+        checked = list()
+        jids = set()
+        for idx, item in enumerate(items):
+            try:
+                if not isinstance(item, dict):
+                    raise TypeError('item must be an object')
+                args = self.__check_create(**item)
+            except RpcError as err:
+                raise RpcError(RpcError.INVALID_PARAMS, f'items[{idx}]: {err.message}')
+            except (TypeError, ValueError) as err:
+                raise RpcError(RpcError.INVALID_PARAMS, f'items[{idx}]: {err}')
+            if args['jid'] is not None:
+                if args['jid'] in jids:
+                    raise RpcError(RpcError.INVALID_PARAMS, f'items[{idx}]: duplicate jid {args["jid"]!r}')
+                jids.add(args['jid'])
+            checked.append(args)
+        created = list()
+        try:
+            with self.__engine.group():
+                for args in checked:
+                    created.append(self.__create(**args))
+        except Exception:
+            # 검사를 지나고도 실패하면 만든 것을 되돌려서 주인 없는 타이머를 남기지 않는다.
+            for jid in created:
+                self.rpc_remove(jid)
+            raise
+        return created
+
+    def __check_create(self, duration: float = 0.0, jid: typing.Optional[str] = None, tick: float = 1.0,
+                       start: bool = True, group: typing.Optional[str] = None, elapsed: float = 0.0,
+                       at: typing.Optional[float] = None, every: typing.Optional[float] = None,
+                       cron: typing.Optional[str] = None) -> dict:
+        # rpc_create 의 인자를 엔진에 넘기기 전에 모두 검사한다.
+        def number(name: str, value, positive: bool = False) -> float:
+            if isinstance(value, bool) or not isinstance(value, (int, float)) or not math.isfinite(value):
+                raise RpcError(RpcError.INVALID_PARAMS, f'{name} must be a number: {value!r}')
+            if value < 0 or (positive and not value):
+                raise RpcError(RpcError.INVALID_PARAMS,
+                               f'{name} must be {"positive" if positive else "non-negative"}: {value!r}')
+            return value
+
+        number('duration', duration)
+        number('tick', tick, positive=True)
+        number('elapsed', elapsed)
+        if at is not None:
+            number('at', at)
+        if jid is not None and (not isinstance(jid, str) or not jid):
+            raise RpcError(RpcError.INVALID_PARAMS, f'jid must be a non-empty string: {jid!r}')
+        if group is not None and not isinstance(group, str):
+            raise RpcError(RpcError.INVALID_PARAMS, f'group must be a string: {group!r}')
+        if jid is not None and jid in self.__engine.timers and self.__engine.get(jid).is_active():
+            raise RpcError(RpcError.INVALID_PARAMS, f'[{jid}] timer is running')
+        rule = None
+        if every is not None or cron is not None:
+            if every is not None:
+                number('every', every, positive=True)
+            if cron is not None and not isinstance(cron, str):
+                raise RpcError(RpcError.INVALID_PARAMS, f'cron must be a string: {cron!r}')
+            rule = make_rule(every, cron)
+            # 한 번도 돌지 않는 규칙 (2월 30일 ...) 도 여기서 거른다.
+            rule.next_after(time.time_ns())
+        return dict(duration=duration, jid=jid, tick=tick, start=bool(start), group=group, elapsed=elapsed, at=at,
+                    rule=rule)
+
+    def __create(self, duration: float, jid: typing.Optional[str], tick: float, start: bool,
+                 group: typing.Optional[str], elapsed: float, at: typing.Optional[float], rule) -> str:
+        if rule is not None:
+            timer = self.__engine.create_recurring(rule, jid=jid, tick=tick, start=False)
+        elif at is not None:
+            timer = self.__engine.create_alarm(at, jid=jid, tick=tick, start=False)
+        else:
+            timer = self.__engine.create_timer(duration, jid=jid, tick=tick, start=False)
+        if start:
+            self.__engine.start(timer.jid, int(elapsed * NSEC_PER_SEC))
+        if group is not None:
+            self.__links.set(timer.jid, group)
+        return timer.jid
+
+    def __targets(self, jid: str, linked: bool) -> typing.List[str]:
+        self.__engine.get(jid)
+        return [jid] + (self.__links.linked(jid) if linked else list())
+
+    def rpc_start(self, jid: str, linked: bool = True) -> int:
+        targets = self.__targets(jid, linked)
+        self.__engine.start_group(targets)
+        return len(targets)
+
+    def rpc_pause(self, jid: str, linked: bool = True) -> int:
+        targets = self.__targets(jid, linked)
+        self.__engine.pause_group(targets)
+        return len(targets)
+
+    def rpc_resume(self, jid: str, linked: bool = True) -> int:
+        targets = self.__targets(jid, linked)
+        self.__engine.resume_group(targets)
+        return len(targets)
+
+    def rpc_stop(self, jid: str, linked: bool = True) -> int:
+        targets = self.__targets(jid, linked)
+        self.__engine.stop_group(targets)
+        return len(targets)
+
+    def rpc_observe(self, jid: str, observed: bool = True) -> bool:
+        # 보고 있는 뷰가 없으면 엔진은 만료 시각에만 깨어난다.
+        self.__engine.set_observed(jid, observed)
+        return True
+
+    def rpc_observe_many(self, jids: typing.List[str], observed: bool = True) -> int:
+        return self.__many(self.__engine.set_observed, jids, observed=observed)
+
+    def rpc_remove(self, jid: str) -> bool:
+        self.__links.discard(jid)
+        self.__engine.remove(jid)
+        return True
+
+    def __many(self, method: typing.Callable, jids: typing.List[str], **kwargs) -> int:
+        # 모르는 jid 는 건너뛰고 처리한 수를 돌려준다.
+        count = 0
+        for jid in jids:
+            if jid not in self.__engine.timers:
+                continue
+            method(jid, **kwargs)
+            count += 1
+        return count
+
+    def __group(self, method: typing.Callable, jids: typing.List[str]) -> int:
+        # 모르는 jid 는 건너뛰고 나머지를 같은 시각에 한 번에 처리한다.
+        known = [jid for jid in jids if jid in self.__engine.timers]
+        method(known)
+        return len(known)
+
+    def rpc_start_many(self, jids: typing.List[str]) -> int:
+        return self.__group(self.__engine.start_group, jids)
+
+    def rpc_pause_many(self, jids: typing.List[str]) -> int:
+        return self.__group(self.__engine.pause_group, jids)
+
+    def rpc_resume_many(self, jids: typing.List[str]) -> int:
+        return self.__group(self.__engine.resume_group, jids)
+
+    def rpc_stop_many(self, jids: typing.List[str]) -> int:
+        return self.__group(self.__engine.stop_group, jids)
+
+    def rpc_remove_many(self, jids: typing.List[str]) -> int:
+        return self.__many(self.rpc_remove, jids)
+
+    def rpc_link(self, jids: typing.List[str], group: str) -> int:
+        for jid in jids:
+            self.__engine.get(jid)
+            self.__links.set(jid, group)
+        return len(self.__links.members(group))
+
+    def rpc_unlink(self, jids: typing.List[str]) -> int:
+        for jid in jids:
+            self.__links.discard(jid)
+        return len(jids)
+
+    def rpc_depend(self, src: str, dst: str, on: str = 'finish', delay: float = 0.0) -> dict:
+        """
+        :param src: 선행 타이머
+        :param dst: 후행 타이머 (src 가 on 이 되면 엔진이 시작한다)
+        :param on: 'finish' 또는 'error'
+        :param delay: 초
+        :return:
+        """
+        return self.__engine.add_dependency(src, dst, on, delay).to_dict()
+
+    def rpc_undepend(self, src: str, dst: str) -> bool:
+        return self.__engine.remove_dependency(src, dst)
+
+    def rpc_dependencies(self, jid: typing.Optional[str] = None) -> typing.List[dict]:
+        """
+        :param jid: 주면 그 타이머와 이어진 간선만
+        :return: 위상 순서의 간선들
+        """
+        edges = self.__engine.dependencies.edges()
+        if jid is not None:
+            edges = [edge for edge in edges if jid in (edge.src, edge.dst)]
+        return [edge.to_dict() for edge in edges]
+
+    def rpc_fail(self, jid: str, msg: str = 'Error...') -> bool:
+        self.__engine.fail(jid, msg)
+        return True
+
+    def rpc_list(self, state: typing.Optional[str] = None) -> typing.List[dict]:
+        """
+        :param state: 'running' 처럼 주면 그 비트가 켜진 타이머만
+        :return:
+        """
+        infos = [self.timer_info(jid) for jid in list(self.__engine.timers)]
+        if state is not None:
+            infos = [info for info in infos if state in info['state'].split('|')]
+        return infos
+
+    def rpc_get(self, jid: str) -> dict:
+        return self.timer_info(jid)
+
+    # --- subscriptions ---
+    def rpc_subscribe(self, writer: asyncio.StreamWriter, jids: typing.Optional[typing.List[str]] = None) -> int:
+        if writer is None:
+            raise RpcError(RpcError.INVALID_REQUEST, 'subscribe needs a connection')
+        sub_id = next(self.__sub_ids)
+        wanted = set(jids) if jids is not None else None
+
+        def listener(data: Data) -> None:
+            if wanted is not None and data.jid not in wanted:
+                return
+            if writer.is_closing():
+                return
+            if writer.transport.get_write_buffer_size() > ControlServer.MAX_BUFFER:
+                self.__dropped += 1
+                return
+            writer.write(self.__encode({'jsonrpc': '2.0', 'method': 'event',
+                                        'params': dict(data.to_dict(), subscription=sub_id)}))
+
+        self.__engine.subscribe(listener)
+        self.__subscriptions[sub_id] = (writer, wanted, listener)
+        return sub_id
+
+    def rpc_unsubscribe(self, writer: asyncio.StreamWriter, subscription: int) -> bool:
+        entry = self.__subscriptions.get(subscription)
+        if entry is None or entry[0] is not writer:
+            return False
+        self.__drop_subscription(subscription)
+        return True
+
+    def __drop_subscription(self, sub_id: int) -> None:
+        _, _, listener = self.__subscriptions.pop(sub_id)
+        self.__engine.unsubscribe(listener)
+
+
+class ControlClient:
+    """
+    ControlServer 에 붙는 동기 클라이언트 (스크립트용).
+
+        client = ControlClient('/tmp/timers.sock')
+        jids = client.call('create_many', items=[{'duration': 60}] * 1000)
+        client.call('pause_many', jids=jids)
+    """
+    def __init__(self, path: typing.Union[str, pathlib.Path], timeout: typing.Optional[float] = None):
+        self.__sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.__sock.settimeout(timeout)
+        self.__sock.connect(str(path))
+        self.__file = self.__sock.makefile('rb')
+        self.__ids = itertools.count(1)
+        # 응답을 기다리는 동안 받은 알림
+        self.__events: typing.List[dict] = list()
+
+    def close(self) -> None:
+        self.__file.close()
+        self.__sock.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __send(self, message) -> None:
+        self.__sock.sendall(json.dumps(message, separators=(',', ':')).encode('utf8') + b'\n')
+
+    def __read(self):
+        line = self.__file.readline()
+        if not line:
+            raise ConnectionError('control server closed the connection')
+        return json.loads(line)
+
+    def __read_response(self):
+        while True:
+            message = self.__read()
+            if isinstance(message, dict) and message.get('method') == 'event':
+                self.__events.append(message['params'])
+                continue
+            return message
+
+    @staticmethod
+    def __result(response: dict):
+        if 'error' in response:
+            raise RpcError(response['error']['code'], response['error']['message'])
+        return response['result']
+
+    def call(self, method: str, **params):
+        req_id = next(self.__ids)
+        self.__send({'jsonrpc': '2.0', 'id': req_id, 'method': method, 'params': params})
+        return self.__result(self.__read_response())
+
+    def notify(self, method: str, **params) -> None:
+        # 응답을 받지 않는다.
+        self.__send({'jsonrpc': '2.0', 'method': method, 'params': params})
+
+    def batch(self, calls: typing.Sequence[typing.Tuple[str, dict]]) -> typing.List[typing.Any]:
+        """
+        여러 호출을 한 번에 보낸다. 실패한 호출 자리에는 RpcError 가 들어간다.
+        :param calls: [(method, params), ...]
+        :return:
+        """
+        ids = [next(self.__ids) for _ in calls]
+        self.__send([{'jsonrpc': '2.0', 'id': req_id, 'method': method, 'params': params}
+                     for req_id, (method, params) in zip(ids, calls)])
+        responses = {res['id']: res for res in self.__read_response()}
+        results = list()
+        for req_id in ids:
+            try:
+                results.append(self.__result(responses[req_id]))
+            except RpcError as err:
+                results.append(err)
+        return results
+
+    def events(self) -> typing.Iterator[dict]:
+        """
+        subscribe 한 뒤 받은 알림을 차례로 돌려준다. (블로킹)
+        :return:
+        """
+        while True:
+            while self.__events:
+                yield self.__events.pop(0)
+            message = self.__read()
+            if isinstance(message, dict) and message.get('method') == 'event':
+                yield message['params']
+
+
+async def serve(engine, path: typing.Union[str, pathlib.Path],
+                links: typing.Optional[LinkGroups] = None) -> ControlServer:
+    server = ControlServer(engine, path, links)
+    await server.start()
+    return server
+
+
+if __name__ == '__main__':
+    pass
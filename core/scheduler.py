@@ -0,0 +1,252 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# author        : Seongcheol Jeon
+# created date  : 2026.10.19
+# modified date : 2026.10.19
+# description   : 엔진의 deadline 스케줄러 (binary heap, hierarchical timing wheel)
+
+import heapq
+import typing
+
+
+class HeapScheduler:
+    """
+    binary heap 스케줄러. 취소는 표시만 해 두고 peek/pop 때 버린다(lazy deletion).
+    push O(log n), cancel O(1), pop O(log n)
+    """
+    def __init__(self):
+        # entry: [deadline, seq, payload, alive]
+        self.__heap: typing.List[list] = list()
+        self.__seq: int = 0
+        self.__alive: int = 0
+
+    def __len__(self):
+        return self.__alive
+
+    def push(self, deadline: float, payload: typing.Any) -> list:
+        self.__seq += 1
+        entry = [deadline, self.__seq, payload, True]
+        heapq.heappush(self.__heap, entry)
+        self.__alive += 1
+        return entry
+
+    def cancel(self, entry: list) -> None:
+        if entry[3]:
+            entry[3] = False
+            entry[2] = None
+            self.__alive -= 1
+
+    def peek(self) -> typing.Optional[float]:
+        heap = self.__heap
+        while heap and not heap[0][3]:
+            heapq.heappop(heap)
+        if not heap:
+            return None
+        return heap[0][0]
+
+    def pop_due(self, now: float) -> typing.List[typing.Any]:
+        heap = self.__heap
+        due = list()
+        while heap and heap[0][0] <= now:
+            entry = heapq.heappop(heap)
+            if entry[3]:
+                entry[3] = False
+                self.__alive -= 1
+                due.append(entry[2])
+        return due
+
+
+class WheelEntry:
+    __slots__ = ('deadline', 'tick', 'payload', 'bucket', 'level')
+
+    # level 이 0 이상이면 해당 단계의 버킷, 아래 값들은 특수 위치
+    OVERFLOW = -1
+    CURRENT = -2
+
+    def __init__(self, deadline: float, tick: int, payload: typing.Any):
+        self.deadline: float = deadline
+        self.tick: int = tick
+        self.payload: typing.Any = payload
+        self.bucket: typing.Optional[typing.Union[set, list]] = None
+        self.level: int = WheelEntry.OVERFLOW
+
+    def __lt__(self, other: 'WheelEntry') -> bool:
+        return self.deadline < other.deadline
+
+
+class TimingWheel:
+    """
+    다단계 hashed timing wheel. 기본값은 초(60) / 분(60) / 시(24) / 일(365) 단계이고,
+    그보다 먼 deadline 은 overflow 에 두었다가 최상위 단계가 한 바퀴 돌 때 다시 넣는다.
+
+    - push / cancel 은 O(1) (버킷은 set, entry 가 자신이 속한 버킷을 기억한다.
+      이미 tick 이 도래한 deadline 을 넣을 때만 현재 버킷 heap 에 O(log n) 으로 들어간다)
+    - 상위 단계 버킷은 해당 경계 tick 에 도달했을 때만 아래 단계로 내린다(lazy cascade)
+    - tick 이 도래한 0단계 버킷은 현재 버킷(deadline 순 heap)으로 한 번에(batch) 옮겨지고,
+      현재 버킷 안에서는 실제 deadline 을 비교하므로 만료 시각은 resolution 에 묶이지 않는다.
+    """
+    def __init__(self, resolution: float = 1.0, sizes: typing.Sequence[int] = (60, 60, 24, 365)):
+        self.__resolution: float = resolution
+        self.__sizes: typing.Tuple[int, ...] = tuple(sizes)
+        # 단계별 한 칸의 tick 수
+        self.__units: typing.List[int] = list()
+        unit = 1
+        for size in self.__sizes:
+            self.__units.append(unit)
+            unit *= size
+        self.__span: int = unit
+        self.__levels: typing.List[typing.List[set]] = [[set() for _ in range(size)] for size in self.__sizes]
+        self.__counts: typing.List[int] = [0] * len(self.__sizes)
+        self.__overflow: set = set()
+        # tick <= current 인 entry 들 (deadline 순 heap, 취소된 항목은 bucket 이 None)
+        self.__current_heap: typing.List[WheelEntry] = list()
+        self.__current: typing.Optional[int] = None
+        self.__size: int = 0
+
+    def __len__(self):
+        return self.__size
+
+    @property
+    def resolution(self) -> float:
+        return self.__resolution
+
+    def to_tick(self, deadline: float) -> int:
+        return int(deadline // self.__resolution)
+
+    def push(self, deadline: float, payload: typing.Any) -> WheelEntry:
+        tick = self.to_tick(deadline)
+        if self.__current is None:
+            self.__current = tick
+        entry = WheelEntry(deadline, tick, payload)
+        self.__place(entry)
+        self.__size += 1
+        return entry
+
+    def cancel(self, entry: WheelEntry) -> None:
+        if entry.bucket is None:
+            return
+        if entry.level != WheelEntry.CURRENT:
+            entry.bucket.discard(entry)
+        if entry.level >= 0:
+            self.__counts[entry.level] -= 1
+        entry.bucket = None
+        entry.payload = None
+        self.__size -= 1
+
+    def __place(self, entry: WheelEntry) -> None:
+        tick, current = entry.tick, self.__current
+        if tick <= current:
+            entry.level = WheelEntry.CURRENT
+            entry.bucket = self.__current_heap
+            heapq.heappush(self.__current_heap, entry)
+            return
+        for level, size in enumerate(self.__sizes):
+            upper = self.__units[level] * size
+            # 상위 단계 한 칸을 공유하면 이 단계에서 구분된다.
+            if tick // upper == current // upper:
+                entry.level = level
+                entry.bucket = self.__levels[level][(tick // self.__units[level]) % size]
+                self.__counts[level] += 1
+                break
+        else:
+            entry.level = WheelEntry.OVERFLOW
+            entry.bucket = self.__overflow
+        entry.bucket.add(entry)
+
+    def __step(self, tick: int) -> None:
+        self.__current = tick
+        if tick % self.__span == 0 and self.__overflow:
+            entries = list(self.__overflow)
+            self.__overflow.clear()
+            for entry in entries:
+                self.__place(entry)
+        for level in range(len(self.__sizes) - 1, 0, -1):
+            unit = self.__units[level]
+            if tick % unit or not self.__counts[level]:
+                continue
+            bucket = self.__levels[level][(tick // unit) % self.__sizes[level]]
+            if not bucket:
+                continue
+            entries = list(bucket)
+            bucket.clear()
+            self.__counts[level] -= len(entries)
+            for entry in entries:
+                self.__place(entry)
+        bucket = self.__levels[0][tick % self.__sizes[0]]
+        if bucket:
+            self.__counts[0] -= len(bucket)
+            heap = self.__current_heap
+            for entry in bucket:
+                entry.level = WheelEntry.CURRENT
+                entry.bucket = heap
+                heapq.heappush(heap, entry)
+            bucket.clear()
+
+    def __advance_to(self, target: int) -> None:
+        while self.__current < target:
+            current = self.__current
+            nonempty = [level for level, cnt in enumerate(self.__counts) if cnt]
+            if not nonempty:
+                if not self.__overflow:
+                    self.__current = target
+                    return
+                # overflow 만 남았으면 최상위 단계가 한 바퀴 도는 경계로 건너뛴다.
+                unit = self.__span
+            elif nonempty[0] == 0:
+                self.__step(current + 1)
+                continue
+            else:
+                unit = self.__units[nonempty[0]]
+            # 빈 하위 단계들은 건너뛰고 다음 경계 tick 으로 바로 간다.
+            boundary = (current // unit + 1) * unit
+            if boundary > target:
+                self.__current = target
+                return
+            self.__current = boundary - 1
+            self.__step(boundary)
+
+    def peek(self) -> typing.Optional[float]:
+        """
+        가장 이른 deadline. 상위 단계에만 entry 가 있으면 다음 cascade 경계 시각을 돌려준다.
+        (실제 deadline 보다 늦지 않으므로 드라이버가 그 때 깨어나 다시 물어보면 된다)
+        """
+        heap = self.__current_heap
+        while heap and heap[0].bucket is None:
+            heapq.heappop(heap)
+        if heap:
+            return heap[0].deadline
+        if not self.__size:
+            return None
+        current = self.__current
+        if self.__counts[0]:
+            size = self.__sizes[0]
+            for offset in range(1, size + 1):
+                bucket = self.__levels[0][(current + offset) % size]
+                if bucket:
+                    return min(entry.deadline for entry in bucket)
+        for level in range(1, len(self.__sizes)):
+            if self.__counts[level]:
+                unit = self.__units[level]
+                return (current // unit + 1) * unit * self.__resolution
+        return (current // self.__span + 1) * self.__span * self.__resolution
+
+    def pop_due(self, now: float) -> typing.List[typing.Any]:
+        if self.__current is None:
+            return list()
+        self.__advance_to(self.to_tick(now))
+        heap = self.__current_heap
+        payloads = list()
+        while heap and heap[0].deadline <= now:
+            entry = heapq.heappop(heap)
+            if entry.bucket is None:
+                continue
+            payloads.append(entry.payload)
+            entry.bucket = None
+            entry.payload = None
+        self.__size -= len(payloads)
+        return payloads
+
+
+if __name__ == '__main__':
+    pass
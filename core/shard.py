@@ -0,0 +1,624 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# author        : Seongcheol Jeon
+# created date  : 2026.10.19
+# modified date : 2026.10.19
+# description   : jid 해시로 타이머를 여러 워커 프로세스에 나눠 돌리는 sharded 엔진
+
+import sys
+import time
+import uuid
+import queue
+import typing
+import hashlib
+import itertools
+import threading
+import multiprocessing
+import multiprocessing.connection
+
+from core.engine import TimerEngine, NSEC_PER_SEC, NSEC_PER_MSEC
+from core.events import Data
+from core.states import Constant, state_names
+
+
+def jump_hash(jid: str, buckets: int) -> int:
+    """
+    jump consistent hash (Lamping & Veach). 버킷 수가 n 에서 m 으로 바뀌면
+    |m - n| / max(m, n) 만큼의 jid 만 다른 버킷으로 옮겨진다.
+    :param jid:
+    :param buckets:
+    :return: 0 ~ buckets - 1
+    """
+    key = int.from_bytes(hashlib.blake2b(jid.encode('utf8'), digest_size=8).digest(), 'little')
+    b, j = -1, 0
+    while j < buckets:
+        b = j
+        key = (key * 2862933555777941757 + 1) & 0xFFFFFFFFFFFFFFFF
+        j = int((b + 1) * ((1 << 31) / ((key >> 33) + 1)))
+    return b
+
+
+class ShardStatus(typing.NamedTuple):
+    shards: int
+    total: int
+    # state_names() 별 타이머 수
+    counts: typing.Dict[str, int]
+    # 전체 타이머의 평균 진행률 (%)
+    progress: float
+    # 만료 처리가 deadline 보다 늦은 최대 시간 (ms)
+    late_max_ms: float
+
+
+class Outbox:
+    """
+    워커에서 부모로 보내는 메시지. 송신은 별도 스레드가 하므로 부모가 읽지 않아도 엔진 루프는 막히지 않는다.
+    프레임은 최신 값만 남기고(이벤트는 jid 별로 병합), 응답은 순서대로 모두 보낸다.
+    """
+    def __init__(self, conn: multiprocessing.connection.Connection):
+        self.__conn = conn
+        self.__lock = threading.Lock()
+        self.__wakeup = threading.Event()
+        self.__frame: typing.Optional[tuple] = None
+        self.__events: typing.Dict[str, tuple] = dict()
+        self.__messages: typing.List[tuple] = list()
+        self.__closed: bool = False
+        self.__thread = threading.Thread(target=self.__run, name='shard-outbox', daemon=True)
+        self.__thread.start()
+
+    def frame(self, frame: tuple, events: typing.Dict[str, tuple]) -> None:
+        with self.__lock:
+            self.__frame = frame
+            self.__events.update(events)
+        self.__wakeup.set()
+
+    def send(self, message: tuple) -> None:
+        with self.__lock:
+            self.__messages.append(message)
+        self.__wakeup.set()
+
+    def close(self) -> None:
+        self.__closed = True
+        self.__wakeup.set()
+        self.__thread.join()
+
+    def __run(self) -> None:
+        while True:
+            self.__wakeup.wait()
+            self.__wakeup.clear()
+            with self.__lock:
+                frame, events, messages = self.__frame, self.__events, self.__messages
+                self.__frame, self.__events, self.__messages = None, dict(), list()
+            try:
+                # 프레임을 먼저 보내야 응답을 받은 부모가 그 시점까지의 상태를 본다.
+                if frame is not None:
+                    self.__conn.send(('frame',) + frame + (list(events.values()),))
+                for message in messages:
+                    self.__conn.send(message)
+            except (OSError, EOFError):
+                return
+            if self.__closed:
+                return
+
+
+class ShardWorker:
+    """
+    워커 프로세스 하나. TimerEngine 하나를 sleep 루프로 돌리면서 부모의 명령을 처리하고,
+    frame_interval 마다 상태별 타이머 수와 진행률 합을 프레임으로 보낸다.
+
+    진행률은 타이머마다 계산하지 않는다. 도는 타이머의 진행률은 (now - origin) / duration 이므로
+    Σ 1/duration 과 Σ (origin - epoch) / duration 만 들고 있으면 어느 시각의 합이든 O(1) 로 나온다.
+    멈췄거나 끝난 타이머는 고정값 합에 더한다.
+    """
+    TERMINAL = Constant.FINISHED | Constant.STOPPED | Constant.ERROR
+
+    def __init__(self, idx: int, conn: multiprocessing.connection.Connection, frame_interval: float,
+                 engine_options: dict):
+        self.__idx: int = idx
+        self.__conn = conn
+        self.__engine = TimerEngine(**engine_options)
+        self.__clock = self.__engine.clock
+        self.__epoch: int = self.__clock()
+        self.__frame_interval: int = int(frame_interval * NSEC_PER_SEC)
+        self.__inbox: queue.SimpleQueue = queue.SimpleQueue()
+        self.__outbox = Outbox(conn)
+        # jid -> (bits, 1/duration, (origin - epoch)/duration, 고정 진행률)
+        self.__contrib: typing.Dict[str, typing.Tuple[int, float, float, float]] = dict()
+        self.__counts: typing.Dict[int, int] = dict()
+        self.__inv_sum: float = 0.0
+        self.__off_sum: float = 0.0
+        self.__const_sum: float = 0.0
+        self.__late_max: int = 0
+        self.__events: typing.Dict[str, tuple] = dict()
+        self.__muted: bool = False
+        self.__running: bool = True
+        self.__engine.subscribe(self.__on_data)
+
+    @staticmethod
+    def main(idx: int, conn: multiprocessing.connection.Connection, frame_interval: float,
+             engine_options: dict) -> None:
+        ShardWorker(idx, conn, frame_interval, engine_options).run()
+
+    def run(self) -> None:
+        reader = threading.Thread(target=self.__read, name='shard-inbox', daemon=True)
+        reader.start()
+        engine = self.__engine
+        frame_at = self.__clock() + self.__frame_interval
+        while self.__running:
+            now = self.__clock()
+            deadline = engine.next_deadline()
+            wait = frame_at - now if deadline is None else min(frame_at, deadline) - now
+            try:
+                message = self.__inbox.get(timeout=max(0, wait) / NSEC_PER_SEC)
+                self.__handle(message)
+                while True:
+                    self.__handle(self.__inbox.get_nowait())
+            except queue.Empty:
+                pass
+            deadline = engine.next_deadline()
+            if deadline is not None and deadline <= self.__clock():
+                engine.advance()
+            if self.__clock() >= frame_at:
+                self.__send_frame()
+                frame_at = self.__clock() + self.__frame_interval
+        self.__send_frame()
+        self.__outbox.close()
+
+    def __read(self) -> None:
+        # 부모가 보내는 명령을 계속 받아 둬서 부모의 send 가 막히지 않게 한다.
+        try:
+            while True:
+                self.__inbox.put(self.__conn.recv())
+        except (OSError, EOFError):
+            self.__inbox.put(('cast', 'quit', ()))
+
+    def __send_frame(self) -> None:
+        frame = (self.__idx, dict(self.__counts), self.__inv_sum, self.__off_sum, self.__const_sum,
+                 len(self.__contrib), self.__epoch, self.__late_max)
+        self.__outbox.frame(frame, self.__events)
+        self.__events = dict()
+
+    def __handle(self, message: tuple) -> None:
+        if message[0] == 'call':
+            _, req_id, op, args = message
+            try:
+                result = getattr(self, f'op_{op}')(*args)
+            except Exception as err:
+                self.__send_frame()
+                self.__outbox.send(('reply', req_id, None, f'{type(err).__name__}: {err}'))
+                return
+            self.__send_frame()
+            self.__outbox.send(('reply', req_id, result, None))
+        else:
+            _, op, args = message
+            try:
+                getattr(self, f'op_{op}')(*args)
+            except Exception as err:
+                self.__outbox.send(('error', self.__idx, op, f'{type(err).__name__}: {err}'))
+
+    # --- 진행률 회계 ---
+    def __account(self, jid: str) -> None:
+        old = self.__contrib.pop(jid, None)
+        if old is not None:
+            bits, inv, off, const = old
+            self.__counts[bits] -= 1
+            self.__inv_sum -= inv
+            self.__off_sum -= off
+            self.__const_sum -= const
+        if not self.__contrib:
+            # 누적된 부동소수점 오차를 버린다.
+            self.__inv_sum = self.__off_sum = self.__const_sum = 0.0
+        timer = self.__engine.timers.get(jid)
+        if timer is None:
+            return
+        bits = timer.bitfield.field
+        duration = timer.duration or 1
+        inv = off = const = 0.0
+        if bits & Constant.RUNNING:
+            inv = 1 / duration
+            off = (timer.origin - self.__epoch) / duration
+        elif bits & Constant.WAITING:
+            const = (timer.paused_at - timer.origin) / duration
+        elif bits & Constant.FINISHED:
+            const = 1.0
+        else:
+            const = timer.elapsed() / duration
+        self.__contrib[jid] = (bits, inv, off, const)
+        self.__counts[bits] = self.__counts.get(bits, 0) + 1
+        self.__inv_sum += inv
+        self.__off_sum += off
+        self.__const_sum += const
+
+    def __on_data(self, data: Data) -> None:
+        if self.__muted:
+            return
+        if data.ste & ShardWorker.TERMINAL:
+            self.__account(data.jid)
+            if data.ste == Constant.FINISHED:
+                timer = self.__engine.timers[data.jid]
+                self.__late_max = max(self.__late_max, self.__clock() - timer.origin - timer.duration)
+        elif not self.__engine.timers[data.jid].observed:
+            return
+        self.__events[data.jid] = (data.sec, data.ste, data.accum_num, data.ratio, data.jid, data.msg, data.msec,
+                                 data.kind)
+
+    # --- 명령 ---
+    def op_quit(self) -> None:
+        self.__running = False
+
+    def op_ping(self) -> int:
+        return len(self.__engine)
+
+    def op_create(self, items: typing.List[tuple]) -> None:
+        """
+        :param items: (jid, duration 초, tick 초, start, observed, elapsed 초)
+        :return:
+        """
+        engine = self.__engine
+        for jid, duration, tick, start, observed, elapsed in items:
+            engine.create_timer(duration, jid=jid, tick=tick, start=False)
+            engine.set_observed(jid, observed)
+            if start:
+                engine.start(jid, int(elapsed * NSEC_PER_SEC))
+            self.__account(jid)
+
+    def __each(self, method: typing.Callable[[str], None], jids: typing.List[str]) -> None:
+        timers = self.__engine.timers
+        # 한 메시지로 온 jid 들은 같은 시각에 시작/일시정지/재개한다.
+        with self.__engine.group():
+            for jid in jids:
+                if jid in timers:
+                    method(jid)
+                    self.__account(jid)
+
+    def op_start(self, jids: typing.List[str]) -> None:
+        self.__each(self.__engine.start, jids)
+
+    def op_pause(self, jids: typing.List[str]) -> None:
+        self.__each(self.__engine.pause, jids)
+
+    def op_resume(self, jids: typing.List[str]) -> None:
+        self.__each(self.__engine.resume, jids)
+
+    def op_stop(self, jids: typing.List[str]) -> None:
+        self.__each(self.__engine.stop, jids)
+
+    def op_remove(self, jids: typing.List[str]) -> None:
+        self.__each(self.__engine.remove, jids)
+
+    def op_observe(self, jids: typing.List[str], observed: bool) -> None:
+        self.__each(lambda jid: self.__engine.set_observed(jid, observed), jids)
+
+    def op_export(self, shards: int) -> typing.List[tuple]:
+        """
+        shards 개로 다시 나눴을 때 이 워커의 몫이 아닌 타이머를 떼어내서 돌려준다.
+        도는 타이머는 origin 을 그대로 넘긴다. CLOCK_MONOTONIC 은 프로세스끼리 같으므로 deadline 이 바뀌지 않는다.
+        :param shards:
+        :return: (jid, duration, tick, adaptive, observed, bits, origin, paused_at, num)
+        """
+        engine = self.__engine
+        entries = list()
+        self.__muted = True
+        try:
+            for jid in [jid for jid in engine.timers if jump_hash(jid, shards) != self.__idx]:
+                timer = engine.timers[jid]
+                entries.append((jid, timer.duration, timer.tick, timer.adaptive, timer.observed,
+                                timer.bitfield.field, timer.origin, timer.paused_at, timer.num))
+                engine.remove(jid)
+                self.__account(jid)
+        finally:
+            self.__muted = False
+        return entries
+
+    def op_import(self, entries: typing.List[tuple]) -> int:
+        engine = self.__engine
+        self.__muted = True
+        try:
+            for jid, duration, tick, adaptive, observed, bits, origin, paused_at, num in entries:
+                timer = engine.create_timer(duration / NSEC_PER_SEC, jid=jid, tick=tick / NSEC_PER_SEC, start=False,
+                                            adaptive=adaptive)
+                timer.observed = observed
+                if bits & Constant.RUNNING:
+                    engine.start(jid, self.__clock() - origin)
+                elif bits & Constant.WAITING:
+                    engine.start(jid, paused_at - origin)
+                    engine.pause(jid)
+                elif bits & Constant.FINISHED:
+                    timer.num = timer.total_num
+                    timer.set_ste_finished()
+                else:
+                    timer.num = num
+                self.__account(jid)
+        finally:
+            self.__muted = False
+        return len(entries)
+
+
+class ShardView:
+    __slots__ = ('counts', 'inv_sum', 'off_sum', 'const_sum', 'total', 'epoch', 'late_max')
+
+    def __init__(self):
+        self.counts: typing.Dict[int, int] = dict()
+        self.inv_sum: float = 0.0
+        self.off_sum: float = 0.0
+        self.const_sum: float = 0.0
+        self.total: int = 0
+        self.epoch: int = 0
+        self.late_max: int = 0
+
+
+class ShardedEngine:
+    """
+    타이머를 jump_hash(jid) 로 워커 프로세스들에 나눈다. 한 프로세스의 GIL 에 묶이지 않고
+    만료 처리가 코어 수만큼 나눠진다. jid 로 주인 워커가 정해지므로 부모는 jid 표를 들지 않는다.
+
+        engine = ShardedEngine(4)
+        jids = engine.create_many([(30, 1.0)] * 1_000_000)
+        while engine.poll(0.1) >= 0:
+            print(engine.status())
+
+    - 명령은 주인 워커로 보내고 기다리지 않는다. *_many 는 워커별로 한 메시지에 묶는다.
+    - 워커는 frame_interval 마다 상태별 수와 진행률 합, 그 사이의 이벤트(만료/정지, observed 타이머의 tick)를 보낸다.
+      poll() 이 받은 프레임을 합쳐서 status() 로 보여주고 이벤트는 subscribe() 한 리스너로 보낸다.
+    - resize() 는 워커 수를 바꾸고 주인이 바뀐 타이머만 옮긴다. 도는 타이머의 deadline 은 그대로다.
+    """
+    def __init__(self, shards: int = 0, frame_interval: float = 1 / 30, **engine_options):
+        """
+        :param shards: 워커 프로세스 수. 0 이면 CPU 수
+        :param frame_interval: 워커가 프레임을 보내는 간격 (초)
+        :param engine_options: 워커의 TimerEngine 인자 (display_interval, adaptive, align ...)
+        """
+        # Qt 등 스레드가 있는 부모에서 fork 하지 않도록 spawn 으로 띄운다.
+        self.__ctx = multiprocessing.get_context('spawn')
+        self.__frame_interval: float = frame_interval
+        self.__engine_options: dict = engine_options
+        self.__procs: typing.List[multiprocessing.Process] = list()
+        self.__conns: typing.List[multiprocessing.connection.Connection] = list()
+        self.__views: typing.List[ShardView] = list()
+        self.__ids = itertools.count(1)
+        self.__replies: typing.Dict[int, typing.Tuple[typing.Any, typing.Optional[str]]] = dict()
+        self.__listeners: typing.List[typing.Callable[[Data], None]] = list()
+        self.__errors: typing.List[str] = list()
+        for _ in range(shards or multiprocessing.cpu_count()):
+            self.__spawn()
+
+    def __len__(self):
+        return sum(view.total for view in self.__views)
+
+    @property
+    def shards(self) -> int:
+        return len(self.__procs)
+
+    @property
+    def errors(self) -> typing.List[str]:
+        return self.__errors
+
+    def shard_of(self, jid: str) -> int:
+        return jump_hash(jid, len(self.__procs))
+
+    def subscribe(self, callback: typing.Callable[[Data], None]) -> None:
+        self.__listeners.append(callback)
+
+    def unsubscribe(self, callback: typing.Callable[[Data], None]) -> None:
+        if callback in self.__listeners:
+            self.__listeners.remove(callback)
+
+    def __spawn(self) -> None:
+        parent, child = self.__ctx.Pipe()
+        proc = self.__ctx.Process(target=ShardWorker.main, name=f'timer-shard-{len(self.__procs)}', daemon=True,
+                                  args=(len(self.__procs), child, self.__frame_interval, self.__engine_options))
+        proc.start()
+        child.close()
+        self.__procs.append(proc)
+        self.__conns.append(parent)
+        self.__views.append(ShardView())
+
+    # --- 송수신 ---
+    def __cast(self, idx: int, op: str, *args) -> None:
+        self.__conns[idx].send(('cast', op, args))
+
+    def __call_all(self, op: str, args_by_shard: typing.Sequence[tuple]) -> typing.List[typing.Any]:
+        req_ids = list()
+        for idx, args in enumerate(args_by_shard):
+            req_id = next(self.__ids)
+            self.__conns[idx].send(('call', req_id, op, args))
+            req_ids.append(req_id)
+        results = list()
+        for idx, req_id in enumerate(req_ids):
+            while req_id not in self.__replies:
+                self.__receive(self.__conns[idx])
+            result, error = self.__replies.pop(req_id)
+            if error is not None:
+                raise RuntimeError(f'[shard {idx}] {op}: {error}')
+            results.append(result)
+        return results
+
+    def __receive(self, conn: multiprocessing.connection.Connection) -> None:
+        try:
+            message = conn.recv()
+        except EOFError:
+            raise RuntimeError('timer shard exited') from None
+        kind = message[0]
+        if kind == 'frame':
+            _, idx, counts, inv_sum, off_sum, const_sum, total, epoch, late_max, events = message
+            view = self.__views[idx]
+            view.counts, view.inv_sum, view.off_sum, view.const_sum = counts, inv_sum, off_sum, const_sum
+            view.total, view.epoch, view.late_max = total, epoch, late_max
+            if self.__listeners:
+                for fields in events:
+                    data = Data(*fields)
+                    for callback in self.__listeners:
+                        callback(data)
+        elif kind == 'reply':
+            _, req_id, result, error = message
+            self.__replies[req_id] = (result, error)
+        elif kind == 'error':
+            _, idx, op, error = message
+            self.__errors.append(f'[shard {idx}] {op}: {error}')
+            sys.stderr.write(f'[ShardedEngine] shard {idx} {op}: {error}\n')
+
+    def poll(self, timeout: float = 0.0) -> int:
+        """
+        워커들이 보낸 프레임을 받아서 합친다. GUI 라면 QTimer 로, 스크립트라면 루프에서 부른다.
+        :param timeout: 초. 받을 것이 없을 때 기다리는 최대 시간
+        :return: 받은 메시지 수
+        """
+        received = 0
+        for conn in multiprocessing.connection.wait(self.__conns, timeout):
+            while conn.poll():
+                self.__receive(conn)
+                received += 1
+        return received
+
+    def sync(self) -> None:
+        # 지금까지 보낸 명령이 모두 처리되고 그 뒤의 프레임을 받을 때까지 기다린다.
+        self.__call_all('ping', [()] * len(self.__conns))
+
+    # --- 명령 ---
+    def create_timer(self, duration: float, jid: typing.Optional[str] = None, tick: float = 1.0,
+                     start: bool = True, observed: bool = False, elapsed: float = 0.0) -> str:
+        """
+        :param duration: 초
+        :param jid:
+        :param tick: 초
+        :param start:
+        :param observed: False 면 만료 시각에만 깨어난다. 많은 타이머를 돌릴 때의 기본값
+        :param elapsed: 이미 지난 시간 (초)
+        :return: jid
+        """
+        return self.create_many([(duration, tick)], start=start, observed=observed, elapsed=elapsed,
+                                jids=[jid] if jid else None)[0]
+
+    def create_many(self, items: typing.Sequence[typing.Tuple[float, float]], start: bool = True,
+                    observed: bool = False, elapsed: float = 0.0,
+                    jids: typing.Optional[typing.Sequence[str]] = None, chunk: int = 65536) -> typing.List[str]:
+        """
+        :param items: (duration 초, tick 초)
+        :param start:
+        :param observed:
+        :param elapsed:
+        :param jids: None 이면 새로 만든다.
+        :param chunk: 워커로 보내는 메시지 하나의 최대 타이머 수
+        :return: jid 목록 (items 순서)
+        """
+        shards = len(self.__procs)
+        batches: typing.List[typing.List[tuple]] = [list() for _ in range(shards)]
+        out = list()
+        for i, (duration, tick) in enumerate(items):
+            jid = jids[i] if jids is not None else uuid.uuid4().hex
+            out.append(jid)
+            idx = jump_hash(jid, shards)
+            batch = batches[idx]
+            batch.append((jid, duration, tick, start, observed, elapsed))
+            if len(batch) >= chunk:
+                self.__cast(idx, 'create', batch[:])
+                batch.clear()
+        for idx, batch in enumerate(batches):
+            if batch:
+                self.__cast(idx, 'create', batch)
+        return out
+
+    def __route(self, op: str, jids: typing.Iterable[str], *args) -> int:
+        shards = len(self.__procs)
+        batches: typing.List[typing.List[str]] = [list() for _ in range(shards)]
+        for jid in jids:
+            batches[jump_hash(jid, shards)].append(jid)
+        for idx, batch in enumerate(batches):
+            if batch:
+                self.__cast(idx, op, batch, *args)
+        return sum(map(len, batches))
+
+    def start(self, jid: str) -> None:
+        self.__route('start', (jid,))
+
+    def pause(self, jid: str) -> None:
+        self.__route('pause', (jid,))
+
+    def resume(self, jid: str) -> None:
+        self.__route('resume', (jid,))
+
+    def stop(self, jid: str) -> None:
+        self.__route('stop', (jid,))
+
+    def remove(self, jid: str) -> None:
+        self.__route('remove', (jid,))
+
+    def set_observed(self, jid: str, observed: bool) -> None:
+        self.__route('observe', (jid,), observed)
+
+    def start_many(self, jids: typing.Iterable[str]) -> int:
+        return self.__route('start', jids)
+
+    def pause_many(self, jids: typing.Iterable[str]) -> int:
+        return self.__route('pause', jids)
+
+    def resume_many(self, jids: typing.Iterable[str]) -> int:
+        return self.__route('resume', jids)
+
+    def stop_many(self, jids: typing.Iterable[str]) -> int:
+        return self.__route('stop', jids)
+
+    def remove_many(self, jids: typing.Iterable[str]) -> int:
+        return self.__route('remove', jids)
+
+    def resize(self, shards: int) -> int:
+        """
+        워커 수를 바꾸고 주인이 바뀐 타이머를 옮긴다. 옮기는 동안의 명령은 기다리지 않고 순서대로 처리된다.
+        :param shards:
+        :return: 옮긴 타이머 수
+        """
+        shards = max(1, shards)
+        while len(self.__procs) < shards:
+            self.__spawn()
+        exported = self.__call_all('export', [(shards,)] * len(self.__conns))
+        while len(self.__procs) > shards:
+            self.__retire()
+        batches: typing.List[typing.List[tuple]] = [list() for _ in range(shards)]
+        for entries in exported:
+            for entry in entries:
+                batches[jump_hash(entry[0], shards)].append(entry)
+        self.__call_all('import', [(batch,) for batch in batches])
+        return sum(map(len, batches))
+
+    def __retire(self) -> None:
+        proc, conn = self.__procs.pop(), self.__conns.pop()
+        self.__views.pop()
+        conn.send(('cast', 'quit', ()))
+        # 마지막 프레임까지 비운다.
+        try:
+            while True:
+                conn.recv()
+        except (EOFError, OSError):
+            pass
+        proc.join()
+        conn.close()
+
+    # --- 합친 상태 ---
+    def status(self) -> ShardStatus:
+        now = time.monotonic_ns()
+        total = 0
+        done = 0.0
+        late_max = 0
+        counts: typing.Dict[str, int] = dict()
+        for view in self.__views:
+            total += view.total
+            done += (now - view.epoch) * view.inv_sum - view.off_sum + view.const_sum
+            late_max = max(late_max, view.late_max)
+            for bits, count in view.counts.items():
+                if count:
+                    name = state_names(bits)
+                    counts[name] = counts.get(name, 0) + count
+        progress = min(100.0, max(0.0, done * 100 / total)) if total else 0.0
+        return ShardStatus(len(self.__procs), total, counts, progress, late_max / NSEC_PER_MSEC)
+
+    def active(self) -> int:
+        active = Constant.RUNNING | Constant.WAITING
+        return sum(count for view in self.__views for bits, count in view.counts.items() if bits & active)
+
+    def close(self) -> None:
+        while self.__procs:
+            self.__retire()
+
+
+if __name__ == '__main__':
+    pass
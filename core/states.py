@@ -0,0 +1,83 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# author        : Seongcheol Jeon
+# created date  : 2026.10.19
+# modified date : 2026.10.19
+# description   : 타이머 상태 비트와 상태 전이
+
+import typing
+
+
+class Constant:
+    # read-only로 만들기 위함.
+    __slots__ = ()
+    # bit index
+    RUNNING:    typing.Final[int] = 0x01
+    WAITING:    typing.Final[int] = 0x02
+    STOPPED:    typing.Final[int] = 0x04
+    ERROR:      typing.Final[int] = 0x08
+    STARTED:    typing.Final[int] = 0x10
+    FINISHED:   typing.Final[int] = 0x20
+
+
+Constant = Constant()
+
+
+STATE_NAMES: typing.Final[typing.Dict[int, str]] = {
+    Constant.RUNNING:   'running',
+    Constant.WAITING:   'waiting',
+    Constant.STOPPED:   'stopped',
+    Constant.ERROR:     'error',
+    Constant.STARTED:   'started',
+    Constant.FINISHED:  'finished',
+}
+
+
+def state_name(ste: int) -> str:
+    return STATE_NAMES.get(ste, str(ste))
+
+
+def state_names(bits: int) -> str:
+    # 여러 비트가 켜진 bitfield 를 'started|running' 처럼 표시한다.
+    return '|'.join(name for bit, name in STATE_NAMES.items() if bits & bit) or '-'
+
+
+class StateMixin:
+    """
+    타이머 백엔드들이 공유하는 상태 전이 메서드 (self.bitfield 필요)
+    """
+    def set_ste_started(self) -> None:
+        self.bitfield.empty()
+        self.bitfield.activate(Constant.STARTED)
+
+    def set_ste_running(self) -> None:
+        if self.bitfield.confirm(Constant.RUNNING | Constant.WAITING):
+            self.bitfield.toggle(Constant.RUNNING | Constant.WAITING)
+        else:
+            if not self.bitfield.confirm(Constant.RUNNING):
+                self.bitfield.activate(Constant.RUNNING)
+                self.bitfield.deactivate(Constant.STARTED | Constant.WAITING | Constant.STOPPED | Constant.FINISHED)
+
+    def set_ste_waiting(self) -> None:
+        if self.bitfield.confirm(Constant.RUNNING | Constant.WAITING):
+            self.bitfield.toggle(Constant.RUNNING | Constant.WAITING)
+        else:
+            self.bitfield.activate(Constant.WAITING)
+            self.bitfield.deactivate(Constant.RUNNING | Constant.STOPPED | Constant.FINISHED)
+
+    def set_ste_stopped(self) -> None:
+        self.bitfield.empty()
+        self.bitfield.activate(Constant.STOPPED)
+
+    def set_ste_error(self) -> None:
+        self.bitfield.empty()
+        self.bitfield.activate(Constant.STOPPED | Constant.ERROR)
+
+    def set_ste_finished(self) -> None:
+        self.bitfield.empty()
+        self.bitfield.activate(Constant.FINISHED)
+
+
+if __name__ == '__main__':
+    pass
@@ -0,0 +1,254 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# author        : Seongcheol Jeon
+# created date  : 2026.10.19
+# modified date : 2026.10.19
+# description   : 외부 모니터가 복사 없이 읽는 공유 메모리 타이머 상태 표 (seqlock)
+
+import os
+import sys
+import mmap
+import time
+import struct
+import typing
+import pathlib
+import tempfile
+
+from core.states import Constant, state_names
+from core.events import Data
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+def default_path(name: str) -> pathlib.Path:
+    # 리눅스면 /dev/shm (tmpfs), 아니면 임시 디렉토리
+    shm = pathlib.Path('/dev/shm')
+    return (shm if shm.is_dir() else pathlib.Path(tempfile.gettempdir())) / name
+
+
+class StateTable:
+    """
+    고정 레이아웃의 상태 표를 mmap 파일에 쓴다. 여러 프로세스가 같은 파일을 mmap 해서
+    IPC 왕복 없이 원하는 주기로 읽는다.
+
+    header (64 bytes, little-endian)
+        magic 8s, version I, capacity I, record_size I, used I, overflow Q, created_ns Q, pad
+    record (80 bytes) * capacity
+        seq I       seqlock. 홀수면 쓰는 중, 읽기 전후 값이 같고 짝수여야 일관된 값이다.
+        bits I      상태 비트 (core.states.Constant)
+        remaining q 남은 시간 (ms)
+        ratio f     진행률 (%)
+        pad I
+        updated Q   마지막으로 쓴 시각 (time.monotonic_ns)
+        accum Q     tick 번호
+        jid 32s     ascii, 빈 슬롯은 0 으로 채워진다.
+        deadline q  돌고 있으면 만료 시각 (time.monotonic_ns), 멈췄거나 끝났으면 0
+
+    remaining 은 이벤트를 낼 때만 바뀐다. adaptive 간격이나 보고 있는 뷰가 없는 타이머는 이벤트가 드물어서
+    remaining 이 오래된 값일 수 있으므로, 읽는 쪽은 deadline 이 있으면 그것으로 남은 시간을 직접 계산한다.
+    CLOCK_MONOTONIC 은 프로세스 사이에 같으므로 다른 프로세스에서도 그대로 쓸 수 있다.
+
+    쓰는 쪽은 하나(엔진 또는 GUI 스레드)라고 가정한다.
+    끝난 타이머도 release() 하기 전까지는 마지막 상태로 남아 있고, 표가 가득 차면
+    끝난 타이머의 슬롯부터 다시 쓴다. 그래도 자리가 없으면 overflow 만 센다.
+    """
+    MAGIC = b'TMRSTATE'
+    VERSION = 2
+    HEADER = struct.Struct('<8sIIIIQQ')
+    HEADER_SIZE = 64
+    RECORD = struct.Struct('<IIqfIQQ32sq')
+    RECORD_SIZE = 80
+    SEQ = struct.Struct('<I')
+    DONE = Constant.FINISHED | Constant.STOPPED | Constant.ERROR
+
+    def __init__(self, path: typing.Union[str, pathlib.Path, None] = None, capacity: int = 4096):
+        self.__path = pathlib.Path(path) if path is not None else default_path(f'timer-state-{os.getpid()}')
+        self.__capacity: int = capacity
+        size = StateTable.HEADER_SIZE + StateTable.RECORD_SIZE * capacity
+        with open(self.__path, 'w+b') as f:
+            f.truncate(size)
+            self.__mm = mmap.mmap(f.fileno(), size)
+        self.__slots: typing.Dict[str, int] = dict()
+        self.__free: typing.List[int] = list(range(capacity - 1, -1, -1))
+        self.__done: typing.Dict[str, int] = dict()
+        self.__overflow: int = 0
+        self.__engine = None
+        self.__created_ns: int = time.time_ns()
+        self.__write_header()
+
+    @property
+    def path(self) -> pathlib.Path:
+        return self.__path
+
+    @property
+    def capacity(self) -> int:
+        return self.__capacity
+
+    def __write_header(self) -> None:
+        StateTable.HEADER.pack_into(self.__mm, 0, StateTable.MAGIC, StateTable.VERSION, self.__capacity,
+                                    StateTable.RECORD_SIZE, len(self.__slots), self.__overflow, self.__created_ns)
+
+    def __slot(self, jid: str) -> typing.Optional[int]:
+        slot = self.__slots.get(jid)
+        if slot is not None:
+            return slot
+        if self.__free:
+            slot = self.__free.pop()
+        elif self.__done:
+            # 가장 먼저 끝난 타이머의 자리를 다시 쓴다.
+            old = next(iter(self.__done))
+            del self.__done[old]
+            slot = self.__slots.pop(old)
+        else:
+            self.__overflow += 1
+            self.__write_header()
+            return None
+        self.__slots[jid] = slot
+        self.__write_header()
+        return slot
+
+    def publish(self, data: Data, bits: int, deadline: typing.Optional[int] = None) -> None:
+        """
+        :param data:
+        :param bits: 타이머의 상태 비트 (bitfield.field)
+        :param deadline: 만료 시각 (time.monotonic_ns). None 이면 돌고 있을 때 지금 + data.msec
+        :return:
+        """
+        slot = self.__slot(data.jid)
+        if slot is None:
+            return
+        now = time.monotonic_ns()
+        if not bits & Constant.RUNNING or bits & Constant.WAITING:
+            deadline = 0
+        elif deadline is None:
+            deadline = now + max(0, data.msec) * 1_000_000
+        if bits & StateTable.DONE:
+            self.__done[data.jid] = slot
+        else:
+            self.__done.pop(data.jid, None)
+        mm = self.__mm
+        offset = StateTable.HEADER_SIZE + slot * StateTable.RECORD_SIZE
+        seq = StateTable.SEQ.unpack_from(mm, offset)[0]
+        StateTable.SEQ.pack_into(mm, offset, (seq + 1) & 0xFFFFFFFF)
+        jid = data.jid.encode('ascii', 'replace')[:32]
+        StateTable.RECORD.pack_into(mm, offset, (seq + 1) & 0xFFFFFFFF, bits, data.msec, float(data.ratio), 0,
+                                    now, max(0, data.accum_num), jid, deadline)
+        StateTable.SEQ.pack_into(mm, offset, (seq + 2) & 0xFFFFFFFF)
+
+    def release(self, jid: str) -> None:
+        slot = self.__slots.pop(jid, None)
+        if slot is None:
+            return
+        self.__done.pop(jid, None)
+        offset = StateTable.HEADER_SIZE + slot * StateTable.RECORD_SIZE
+        seq = StateTable.SEQ.unpack_from(self.__mm, offset)[0]
+        StateTable.SEQ.pack_into(self.__mm, offset, (seq + 1) & 0xFFFFFFFF)
+        self.__mm[offset + 4:offset + StateTable.RECORD_SIZE] = bytes(StateTable.RECORD_SIZE - 4)
+        StateTable.SEQ.pack_into(self.__mm, offset, (seq + 2) & 0xFFFFFFFF)
+        self.__free.append(slot)
+        self.__write_header()
+
+    def record_data(self, data: Data) -> None:
+        # 엔진 리스너
+        if self.__engine is None or data.jid not in self.__engine.timers:
+            return
+        engine = self.__engine
+        timer = engine.get(data.jid)
+        # 엔진 시계의 만료 시각을 CLOCK_MONOTONIC 으로 옮긴다.
+        deadline = time.monotonic_ns() + timer.origin + timer.duration - engine.clock()
+        self.publish(data, timer.bitfield.field, deadline)
+
+    def attach(self, engine) -> None:
+        self.__engine = engine
+        engine.subscribe(self.record_data)
+
+    def detach(self, engine) -> None:
+        engine.unsubscribe(self.record_data)
+        self.__engine = None
+
+    def close(self, unlink: bool = True) -> None:
+        self.__mm.close()
+        if unlink:
+            self.__path.unlink(missing_ok=True)
+
+
+class StateTableReader:
+    """
+    다른 프로세스에서 StateTable 을 읽는다. 읽기 전용 mmap 이라 쓰는 쪽을 막지 않는다.
+    """
+    RETRIES = 100
+
+    def __init__(self, path: typing.Union[str, pathlib.Path]):
+        self.__path = pathlib.Path(path)
+        with open(self.__path, 'rb') as f:
+            self.__mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, capacity, record_size, *_ = StateTable.HEADER.unpack_from(self.__mm, 0)
+        if magic != StateTable.MAGIC or version != StateTable.VERSION:
+            raise ValueError(f'{self.__path} is not a timer state table')
+        self.__capacity: int = capacity
+        self.__record_size: int = record_size
+
+    @property
+    def capacity(self) -> int:
+        return self.__capacity
+
+    def header(self) -> dict:
+        _, version, capacity, record_size, used, overflow, created = StateTable.HEADER.unpack_from(self.__mm, 0)
+        return dict(version=version, capacity=capacity, record_size=record_size, used=used, overflow=overflow,
+                    created_ns=created)
+
+    def read(self, slot: int) -> typing.Optional[dict]:
+        """
+        슬롯 하나를 seqlock 으로 일관되게 읽는다. 빈 슬롯이면 None
+        :param slot:
+        :return:
+        """
+        offset = StateTable.HEADER_SIZE + slot * self.__record_size
+        for _ in range(StateTableReader.RETRIES):
+            before = StateTable.SEQ.unpack_from(self.__mm, offset)[0]
+            if before & 1:
+                continue
+            values = StateTable.RECORD.unpack_from(self.__mm, offset)
+            if StateTable.SEQ.unpack_from(self.__mm, offset)[0] != before:
+                continue
+            _, bits, remaining, ratio, _, updated, accum, jid, deadline = values
+            jid = jid.rstrip(b'\0').decode('ascii')
+            if not jid:
+                return None
+            if deadline:
+                remaining = max(0, -(-(deadline - time.monotonic_ns()) // 1_000_000))
+            return dict(jid=jid, bits=bits, remaining_msec=remaining, ratio=ratio, updated_ns=updated,
+                        accum_num=accum, deadline_ns=deadline, seq=before)
+        return None
+
+    def snapshot(self) -> typing.List[dict]:
+        return [row for row in map(self.read, range(self.__capacity)) if row is not None]
+
+    def array(self):
+        """
+        numpy 구조화 배열로 표 전체를 복사 없이 본다. 값이 일관되는지는 seq 를 읽기 전후로 비교해서 확인한다.
+        :return:
+        """
+        if numpy is None:
+            raise RuntimeError('numpy is required for StateTableReader.array()')
+        dtype = numpy.dtype({
+            'names':    ['seq', 'bits', 'remaining', 'ratio', 'updated', 'accum', 'jid', 'deadline'],
+            'formats':  ['<u4', '<u4', '<i8', '<f4', '<u8', '<u8', 'S32', '<i8'],
+            'offsets':  [0, 4, 8, 16, 24, 32, 40, 72],
+            'itemsize': self.__record_size,
+        })
+        return numpy.frombuffer(self.__mm, dtype=dtype, count=self.__capacity, offset=StateTable.HEADER_SIZE)
+
+    def close(self) -> None:
+        self.__mm.close()
+
+
+if __name__ == '__main__':
+    # python -m core.statetable /dev/shm/timer-state-<pid>
+    reader = StateTableReader(sys.argv[1])
+    for row in reader.snapshot():
+        sys.stdout.write(f'{row["jid"]} {state_names(row["bits"])} {row["remaining_msec"]}ms {row["ratio"]:.0f}%\n')
@@ -0,0 +1,391 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# author        : Seongcheol Jeon
+# created date  : 2026.10.19
+# modified date : 2026.10.19
+# description   : 타이머 상태 변화를 Unix 소켓으로 밀어주는 binary delta 스트림 (pub/sub)
+
+import socket
+import struct
+import typing
+import asyncio
+import pathlib
+import collections
+
+from core.events import Data
+from core.states import Constant
+
+
+class Codec:
+    """
+    frame = header '<BI' (type, payload 길이) + payload
+
+    JID      '<IB' (번호, 길이) + ascii jid. 이후 프레임은 jid 대신 번호를 쓴다.
+    DELTA    '<IB' (번호, 바뀐 필드 mask) + mask 순서대로 바뀐 필드만
+    SNAPSHOT 빈 payload. 받는 쪽은 가지고 있던 상태를 버린다. 뒤이어 JID / 전체 DELTA 가 온다.
+    SYNCED   빈 payload. 스냅샷 끝
+    REMOVE   '<I' 번호. 엔진에서 지워진 타이머. 받는 쪽은 그 jid 의 상태를 버리고, 번호는 다시 쓰이지 않는다.
+
+    필드 (mask bit 순서): ste B, sec i, msec q, ratio f, accum_num i, msg (B 길이 + utf8), bits B
+    bits 는 엔진 타이머의 상태 비트라서 받는 쪽이 bitfield 를 그대로 맞출 수 있다.
+    """
+    JID = 1
+    DELTA = 2
+    SNAPSHOT = 3
+    SYNCED = 4
+    REMOVE = 5
+
+    HEADER = struct.Struct('<BI')
+    JID_HEAD = struct.Struct('<IB')
+    DELTA_HEAD = struct.Struct('<IB')
+    REMOVE_HEAD = struct.Struct('<I')
+
+    FIELDS: typing.Final[typing.Tuple[typing.Tuple[str, struct.Struct], ...]] = (
+        ('ste', struct.Struct('<B')),
+        ('sec', struct.Struct('<i')),
+        ('msec', struct.Struct('<q')),
+        ('ratio', struct.Struct('<f')),
+        ('accum_num', struct.Struct('<i')),
+        ('msg', None),
+        ('bits', struct.Struct('<B')),
+    )
+    ALL = (1 << len(FIELDS)) - 1
+
+    @staticmethod
+    def frame(kind: int, payload: bytes = b'') -> bytes:
+        return Codec.HEADER.pack(kind, len(payload)) + payload
+
+    @staticmethod
+    def jid_frame(idx: int, jid: str) -> bytes:
+        raw = jid.encode('ascii', 'replace')[:255]
+        return Codec.frame(Codec.JID, Codec.JID_HEAD.pack(idx, len(raw)) + raw)
+
+    @staticmethod
+    def remove_frame(idx: int) -> bytes:
+        return Codec.frame(Codec.REMOVE, Codec.REMOVE_HEAD.pack(idx))
+
+    @staticmethod
+    def delta_frame(idx: int, values: tuple, prev: typing.Optional[tuple]) -> typing.Optional[bytes]:
+        mask = 0
+        parts = list()
+        for bit, ((name, packer), value) in enumerate(zip(Codec.FIELDS, values)):
+            if prev is not None and prev[bit] == value:
+                continue
+            mask |= 1 << bit
+            if packer is None:
+                # 여러 바이트 문자(한글 등)의 중간에서 자르지 않는다.
+                raw = value.encode('utf8')[:255].decode('utf8', 'ignore').encode('utf8')
+                parts.append(bytes((len(raw),)) + raw)
+            else:
+                parts.append(packer.pack(value))
+        if not mask:
+            return None
+        return Codec.frame(Codec.DELTA, Codec.DELTA_HEAD.pack(idx, mask) + b''.join(parts))
+
+    @staticmethod
+    def values(data: Data, bits: int = 0) -> tuple:
+        return data.ste, data.sec, data.msec, float(data.ratio), data.accum_num, data.msg, bits & 0xFF
+
+    @staticmethod
+    def decode_delta(payload: bytes) -> typing.Tuple[int, typing.Dict[str, typing.Any]]:
+        idx, mask = Codec.DELTA_HEAD.unpack_from(payload, 0)
+        pos = Codec.DELTA_HEAD.size
+        fields = dict()
+        for bit, (name, packer) in enumerate(Codec.FIELDS):
+            if not mask & (1 << bit):
+                continue
+            if packer is None:
+                size = payload[pos]
+                fields[name] = payload[pos + 1:pos + 1 + size].decode('utf8')
+                pos += 1 + size
+            else:
+                fields[name] = packer.unpack_from(payload, pos)[0]
+                pos += packer.size
+        return idx, fields
+
+
+class Subscriber:
+    __slots__ = ('writer', 'queue', 'wakeup', 'resync', 'dropped', 'task')
+
+    def __init__(self, writer: asyncio.StreamWriter):
+        self.writer: asyncio.StreamWriter = writer
+        self.queue: collections.deque = collections.deque()
+        self.wakeup: asyncio.Event = asyncio.Event()
+        # 큐가 넘쳐서 프레임을 버렸으면 다음 송신 때 스냅샷부터 다시 보낸다.
+        self.resync: bool = True
+        self.dropped: int = 0
+        self.task: typing.Optional[asyncio.Task] = None
+
+
+class EventStream:
+    """
+    엔진의 Data 를 한 번만 delta 로 인코딩해서 모든 구독자 큐에 같은 bytes 로 넣는다.
+    구독자마다 인코딩하지 않으므로 구독자가 늘어도 CPU 는 큐에 넣고 소켓에 쓰는 만큼만 는다.
+
+    구독자 큐는 queue_size 프레임까지이고, 넘치면 큐를 비우고(drop) 다음 송신 때
+    현재 상태 전체 스냅샷을 보내서 맞춘다(resync). 느린 구독자가 엔진이나 다른 구독자를 막지 않는다.
+
+    엔진에서 지워진 타이머는 번호와 마지막 값을 버리고 REMOVE 프레임을 보낸다. 끝나는 이벤트(Finished,
+    Stopped, Error) 뒤에 지워졌는지 확인하고, 끝난 뒤 조용히 지워진 타이머는 번호가 살아 있는 타이머의
+    두 배를 넘을 때마다 한꺼번에 걷어낸다. 스냅샷에는 지워진 타이머가 들어가지 않는다.
+    """
+    TERMINAL = Constant.FINISHED | Constant.STOPPED | Constant.ERROR
+    # 이보다 적으면 한꺼번에 걷어내지 않는다.
+    SWEEP_MIN = 64
+
+    def __init__(self, engine, path: typing.Union[str, pathlib.Path], queue_size: int = 4096):
+        self.__engine = engine
+        self.__path = pathlib.Path(path)
+        self.__queue_size: int = queue_size
+        self.__server: typing.Optional[asyncio.AbstractServer] = None
+        self.__subscribers: typing.List[Subscriber] = list()
+        # jid 번호와 마지막으로 보낸 필드 값 (delta 의 기준)
+        self.__ids: typing.Dict[str, int] = dict()
+        self.__last: typing.Dict[int, tuple] = dict()
+        self.__next_idx: int = 0
+        self.__sweep_at: int = EventStream.SWEEP_MIN
+        # 끝나는 이벤트를 보낸 뒤 지워졌는지 확인할 jid
+        self.__ended: typing.List[str] = list()
+        self.__encoded: int = 0
+
+    @property
+    def path(self) -> pathlib.Path:
+        return self.__path
+
+    @property
+    def subscribers(self) -> typing.List[Subscriber]:
+        return self.__subscribers
+
+    @property
+    def encoded(self) -> int:
+        return self.__encoded
+
+    async def start(self) -> None:
+        if self.__path.exists():
+            self.__path.unlink()
+        self.__server = await asyncio.start_unix_server(self.__handle, path=str(self.__path))
+        self.__engine.subscribe(self.publish)
+
+    def close(self) -> None:
+        self.__engine.unsubscribe(self.publish)
+        for sub in list(self.__subscribers):
+            if sub.task is not None:
+                sub.task.cancel()
+            sub.writer.close()
+        self.__subscribers.clear()
+        if self.__server is not None:
+            self.__server.close()
+            self.__server = None
+        if self.__path.exists():
+            self.__path.unlink()
+
+    def publish(self, data: Data) -> None:
+        self.__reap()
+        idx = self.__ids.get(data.jid)
+        frames = b''
+        if idx is None:
+            if len(self.__ids) >= self.__sweep_at:
+                self.__sweep()
+            idx = self.__ids[data.jid] = self.__next_idx
+            self.__next_idx += 1
+            frames = Codec.jid_frame(idx, data.jid)
+        timer = self.__engine.timers.get(data.jid)
+        if data.ste & EventStream.TERMINAL:
+            # engine.remove() 는 마지막 Stopped 를 낸 뒤에 타이머를 지우므로 이벤트를 다 돌린 뒤에 확인한다.
+            if not self.__ended:
+                self.__reap_soon()
+            self.__ended.append(data.jid)
+        values = Codec.values(data, timer.bitfield.field if timer is not None else 0)
+        delta = Codec.delta_frame(idx, values, self.__last.get(idx))
+        self.__last[idx] = values
+        if delta is None:
+            return
+        self.__encoded += 1
+        self.__broadcast(frames + delta)
+
+    def __reap_soon(self) -> None:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # 루프 밖이면 다음 publish() / snapshot() 때 확인한다.
+            return
+        loop.call_soon(self.__reap)
+
+    def __reap(self) -> None:
+        if not self.__ended:
+            return
+        ended, self.__ended = self.__ended, list()
+        timers = self.__engine.timers
+        for jid in ended:
+            if jid not in timers:
+                self.__drop(jid)
+
+    def __sweep(self) -> None:
+        timers = self.__engine.timers
+        for jid in [jid for jid in self.__ids if jid not in timers]:
+            self.__drop(jid)
+        self.__sweep_at = max(EventStream.SWEEP_MIN, len(self.__ids) * 2)
+
+    def __drop(self, jid: str) -> None:
+        idx = self.__ids.pop(jid, None)
+        if idx is None:
+            return
+        del self.__last[idx]
+        self.__broadcast(Codec.remove_frame(idx))
+
+    def __broadcast(self, frames: bytes) -> None:
+        for sub in self.__subscribers:
+            if sub.resync:
+                # 어차피 스냅샷으로 맞출 구독자에게는 쌓지 않는다.
+                continue
+            if len(sub.queue) >= self.__queue_size:
+                sub.queue.clear()
+                sub.resync = True
+                sub.dropped += 1
+            else:
+                sub.queue.append(frames)
+            sub.wakeup.set()
+
+    def snapshot(self) -> bytes:
+        self.__reap()
+        self.__sweep()
+        parts = [Codec.frame(Codec.SNAPSHOT)]
+        for jid, idx in self.__ids.items():
+            parts.append(Codec.jid_frame(idx, jid))
+            parts.append(Codec.delta_frame(idx, self.__last[idx], None))
+        parts.append(Codec.frame(Codec.SYNCED))
+        return b''.join(parts)
+
+    async def __handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        sub = Subscriber(writer)
+        sub.wakeup.set()
+        self.__subscribers.append(sub)
+        sub.task = asyncio.current_task()
+        try:
+            while True:
+                await sub.wakeup.wait()
+                sub.wakeup.clear()
+                if sub.resync:
+                    sub.resync = False
+                    sub.queue.clear()
+                    writer.write(self.snapshot())
+                elif sub.queue:
+                    batch = b''.join(sub.queue)
+                    sub.queue.clear()
+                    writer.write(batch)
+                await writer.drain()
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            if sub in self.__subscribers:
+                self.__subscribers.remove(sub)
+            writer.close()
+
+
+class StreamDecoder:
+    """
+    받은 bytes 를 feed() 로 넘기면 완성된 프레임을 풀어서 jid 별 상태를 맞춘다.
+    소켓을 직접 다루지 않으므로 블로킹 소켓, QLocalSocket 어디서든 쓸 수 있다.
+    """
+    def __init__(self):
+        self.__buffer = bytearray()
+        self.__jids: typing.Dict[int, str] = dict()
+        self.__state: typing.Dict[str, typing.Dict[str, typing.Any]] = dict()
+        self.__synced: bool = False
+        self.__resyncs: int = 0
+
+    @property
+    def state(self) -> typing.Dict[str, typing.Dict[str, typing.Any]]:
+        return self.__state
+
+    @property
+    def synced(self) -> bool:
+        return self.__synced
+
+    @property
+    def resyncs(self) -> int:
+        return self.__resyncs
+
+    def feed(self, chunk: bytes) -> typing.List[typing.Tuple[str, typing.Dict[str, typing.Any]]]:
+        """
+        :param chunk:
+        :return: 이번에 완성된 (jid, 바뀐 필드) 들. 스냅샷 중의 전체 필드도 같은 모양으로 나온다.
+        """
+        buf = self.__buffer
+        buf += chunk
+        events = list()
+        pos = 0
+        head_size = Codec.HEADER.size
+        while len(buf) - pos >= head_size:
+            kind, size = Codec.HEADER.unpack_from(buf, pos)
+            if len(buf) - pos - head_size < size:
+                break
+            payload = bytes(buf[pos + head_size:pos + head_size + size])
+            pos += head_size + size
+            event = self.__apply(kind, payload)
+            if event is not None:
+                events.append(event)
+        del buf[:pos]
+        return events
+
+    def __apply(self, kind: int, payload: bytes) -> typing.Optional[typing.Tuple[str, typing.Dict[str, typing.Any]]]:
+        if kind == Codec.JID:
+            idx, size = Codec.JID_HEAD.unpack_from(payload, 0)
+            self.__jids[idx] = payload[Codec.JID_HEAD.size:Codec.JID_HEAD.size + size].decode('ascii')
+        elif kind == Codec.DELTA:
+            idx, fields = Codec.decode_delta(payload)
+            jid = self.__jids[idx]
+            self.__state.setdefault(jid, dict()).update(fields)
+            return jid, fields
+        elif kind == Codec.REMOVE:
+            idx = Codec.REMOVE_HEAD.unpack_from(payload, 0)[0]
+            jid = self.__jids.pop(idx, None)
+            if jid is not None:
+                self.__state.pop(jid, None)
+        elif kind == Codec.SNAPSHOT:
+            if self.__synced:
+                self.__resyncs += 1
+            self.__synced = False
+            self.__jids.clear()
+            self.__state.clear()
+        elif kind == Codec.SYNCED:
+            self.__synced = True
+        return None
+
+
+class StreamClient(StreamDecoder):
+    """
+    EventStream 구독 클라이언트 (블로킹 소켓).
+
+        client = StreamClient('/tmp/timers.stream')
+        for jid, changed in client.events():
+            print(jid, changed, client.state[jid])
+    """
+    READ_SIZE = 65536
+
+    def __init__(self, path: typing.Union[str, pathlib.Path]):
+        super().__init__()
+        self.__sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.__sock.connect(str(path))
+
+    def settimeout(self, timeout: typing.Optional[float]) -> None:
+        self.__sock.settimeout(timeout)
+
+    def close(self) -> None:
+        self.__sock.close()
+
+    def events(self) -> typing.Iterator[typing.Tuple[str, typing.Dict[str, typing.Any]]]:
+        """
+        (jid, 바뀐 필드) 를 차례로 돌려준다.
+        :return:
+        """
+        while True:
+            chunk = self.__sock.recv(StreamClient.READ_SIZE)
+            if not chunk:
+                raise ConnectionError('event stream closed')
+            yield from self.feed(chunk)
+
+
+if __name__ == '__main__':
+    pass
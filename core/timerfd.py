@@ -0,0 +1,246 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# author        : Seongcheol Jeon
+# created date  : 2026.10.19
+# modified date : 2026.10.19
+# description   : Linux timerfd 로 엔진을 깨우는 드라이버 (ctypes + selectors/epoll)
+
+import os
+import time
+import errno
+import ctypes
+import ctypes.util
+import typing
+import asyncio
+import selectors
+
+from core.clocks import CLOCK_BOOTTIME, boottime_ns
+
+
+TFD_TIMER_ABSTIME: typing.Final[int] = 1
+TFD_TIMER_CANCEL_ON_SET: typing.Final[int] = 2
+TFD_NONBLOCK: typing.Final[int] = os.O_NONBLOCK
+TFD_CLOEXEC: typing.Final[int] = os.O_CLOEXEC
+
+
+class Timespec(ctypes.Structure):
+    _fields_ = [('tv_sec', ctypes.c_long), ('tv_nsec', ctypes.c_long)]
+
+
+class Itimerspec(ctypes.Structure):
+    _fields_ = [('it_interval', Timespec), ('it_value', Timespec)]
+
+
+def _load_libc():
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or None, use_errno=True)
+        libc.timerfd_create.argtypes = (ctypes.c_int, ctypes.c_int)
+        libc.timerfd_create.restype = ctypes.c_int
+        libc.timerfd_settime.argtypes = (ctypes.c_int, ctypes.c_int, ctypes.POINTER(Itimerspec),
+                                         ctypes.POINTER(Itimerspec))
+        libc.timerfd_settime.restype = ctypes.c_int
+    except (OSError, AttributeError):
+        return None
+    return libc
+
+
+_libc = _load_libc()
+
+
+def available() -> bool:
+    # 리눅스가 아니면 timerfd_create 가 없다.
+    return _libc is not None
+
+
+class TimerFd:
+    """
+    timerfd 하나. 만료되면 fd 가 읽기 가능해지므로 select/epoll 루프에 그대로 넣을 수 있다.
+    """
+    def __init__(self, clock_id: int = time.CLOCK_MONOTONIC):
+        if _libc is None:
+            raise OSError(errno.ENOSYS, 'timerfd is not available on this platform')
+        fd = _libc.timerfd_create(clock_id, TFD_NONBLOCK | TFD_CLOEXEC)
+        if fd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err))
+        self.__fd: int = fd
+        self.__clock_id: int = clock_id
+        self.__spec = Itimerspec()
+        self.__spec_ref = ctypes.byref(self.__spec)
+
+    def fileno(self) -> int:
+        return self.__fd
+
+    @property
+    def clock_id(self) -> int:
+        return self.__clock_id
+
+    def arm_at(self, deadline: int, flags: int = 0) -> None:
+        """
+        절대 시각(이 fd 의 시계, ns)에 한 번 만료되도록 건다. 이전 예약은 같은 호출로 바뀐다.
+        :param deadline:
+        :param flags: TFD_TIMER_CANCEL_ON_SET 등 (TFD_TIMER_ABSTIME 은 항상 붙는다)
+        :return:
+        """
+        # it_value 가 0 이면 해제이므로 이미 지난 시각도 1ns 로 건다 (곧바로 만료된다).
+        sec, nsec = divmod(max(1, deadline), 1_000_000_000)
+        self.__spec.it_value.tv_sec = sec
+        self.__spec.it_value.tv_nsec = nsec
+        self.__settime(TFD_TIMER_ABSTIME | flags)
+
+    def disarm(self) -> None:
+        self.__spec.it_value.tv_sec = 0
+        self.__spec.it_value.tv_nsec = 0
+        self.__settime(0)
+
+    def __settime(self, flags: int) -> None:
+        if _libc.timerfd_settime(self.__fd, flags, self.__spec_ref, None) < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err))
+
+    def read(self) -> int:
+        """
+        :return: 지난 read 이후 만료된 횟수. 아직 만료되지 않았으면 0
+        :raise OSError: ECANCELED - CANCEL_ON_SET 으로 건 CLOCK_REALTIME fd 에서 벽시계가 바뀌었을 때
+        """
+        try:
+            return int.from_bytes(os.read(self.__fd, 8), 'little')
+        except BlockingIOError:
+            return 0
+
+    def close(self) -> None:
+        if self.__fd >= 0:
+            os.close(self.__fd)
+            self.__fd = -1
+
+
+class TimerFdDriver:
+    """
+    엔진의 가장 이른 deadline 을 timerfd 하나에 절대 시각으로 건다. deadline 이 바뀔 때마다
+    timerfd_settime 한 번이면 다시 예약되고, 커널 hrtimer 가 깨우므로 sleep 계산의 반올림이 없다.
+
+    engine.clock 과 같은 시계의 timerfd 를 써야 한다. clock_id 를 주지 않으면 엔진 시계가
+    clocks.boottime_ns 면 CLOCK_BOOTTIME (절전 중 만료는 깨어나자마자 처리), 아니면 CLOCK_MONOTONIC
+    (time.monotonic_ns, asyncio loop.time) 으로 본다.
+
+    watch_clock 이면 CLOCK_REALTIME timerfd 를 TFD_TIMER_CANCEL_ON_SET 으로 걸어 두고, 벽시계가 바뀌는 즉시
+    engine.rebase() 로 알람들을 한 번에 다시 계산한다 (주기적 확인 없이).
+
+    selectors(epoll) 루프는 run_forever(), asyncio 루프는 attach(loop) 로 돌린다. asyncio 에 붙이면
+    ControlServer / EventStream 과 같은 루프, 같은 epoll 에서 돈다.
+    """
+    # CANCEL_ON_SET 용 시계는 만료되지 않게 멀리 걸어 둔다.
+    WATCH_SPAN: typing.Final[int] = 365 * 86400 * 1_000_000_000
+
+    def __init__(self, engine, clock_id: typing.Optional[int] = None, watch_clock: bool = True):
+        if clock_id is None:
+            clock_id = CLOCK_BOOTTIME if engine.clock is boottime_ns and CLOCK_BOOTTIME is not None \
+                else time.CLOCK_MONOTONIC
+        self.__engine = engine
+        self.__timerfd: TimerFd = TimerFd(clock_id)
+        self.__watch: typing.Optional[TimerFd] = TimerFd(time.CLOCK_REALTIME) if watch_clock else None
+        self.__selector: typing.Optional[selectors.BaseSelector] = None
+        self.__loop: typing.Optional[asyncio.AbstractEventLoop] = None
+        self.__callbacks: typing.Dict[int, typing.Callable[[], None]] = dict()
+        self.__wakeups: int = 0
+        self.__arm_watch()
+        engine.set_waker(self.__rearm)
+
+    @property
+    def timerfd(self) -> TimerFd:
+        return self.__timerfd
+
+    @property
+    def wakeups(self) -> int:
+        return self.__wakeups
+
+    def __rearm(self, deadline: typing.Optional[int]) -> None:
+        if deadline is None:
+            self.__timerfd.disarm()
+        else:
+            self.__timerfd.arm_at(deadline)
+
+    def __arm_watch(self) -> None:
+        if self.__watch is not None:
+            self.__watch.arm_at(time.time_ns() + TimerFdDriver.WATCH_SPAN, TFD_TIMER_CANCEL_ON_SET)
+
+    def on_timer(self) -> None:
+        # 만료 횟수는 필요 없고 fd 를 비우기만 한다. advance() 가 다음 deadline 을 다시 건다.
+        self.__timerfd.read()
+        self.__wakeups += 1
+        self.__engine.advance()
+
+    def on_clock_set(self) -> None:
+        try:
+            self.__watch.read()
+        except OSError as err:
+            if err.errno != errno.ECANCELED:
+                raise
+        self.__arm_watch()
+        self.__engine.rebase()
+
+    def register(self, fileobj, callback: typing.Callable[[], None]) -> None:
+        """
+        run_forever() 루프에서 같이 기다릴 다른 fd (소켓 등). 읽기 가능해지면 callback() 을 부른다.
+        :param fileobj: fileno() 가 있는 객체 또는 fd
+        :param callback:
+        :return:
+        """
+        fd = fileobj if isinstance(fileobj, int) else fileobj.fileno()
+        self.__callbacks[fd] = callback
+        if self.__selector is not None:
+            self.__selector.register(fd, selectors.EVENT_READ, callback)
+
+    def unregister(self, fileobj) -> None:
+        fd = fileobj if isinstance(fileobj, int) else fileobj.fileno()
+        if self.__callbacks.pop(fd, None) is not None and self.__selector is not None:
+            self.__selector.unregister(fd)
+
+    def run_forever(self, until_idle: bool = True) -> None:
+        """
+        TimerEngine.run_forever() 대신 epoll 로 timerfd 와 등록한 fd 들을 기다린다.
+        :param until_idle: True 면 남은 deadline 이 없을 때 반환
+        :return:
+        """
+        selector = self.__selector = selectors.DefaultSelector()
+        try:
+            selector.register(self.__timerfd.fileno(), selectors.EVENT_READ, self.on_timer)
+            if self.__watch is not None:
+                selector.register(self.__watch.fileno(), selectors.EVENT_READ, self.on_clock_set)
+            for fd, callback in self.__callbacks.items():
+                selector.register(fd, selectors.EVENT_READ, callback)
+            # 이미 지난 deadline 이 있으면 곧바로 만료되도록 한 번 맞춘다.
+            self.__engine.advance()
+            while not (until_idle and self.__engine.next_deadline() is None):
+                for key, _ in selector.select():
+                    key.data()
+        finally:
+            self.__selector = None
+            selector.close()
+
+    def attach(self, loop: asyncio.AbstractEventLoop) -> None:
+        """
+        asyncio 루프의 selector 에 timerfd 를 올린다. 엔진은 loop.call_at 대신 timerfd 로 깨어난다.
+        :param loop:
+        :return:
+        """
+        self.__loop = loop
+        loop.add_reader(self.__timerfd.fileno(), self.on_timer)
+        if self.__watch is not None:
+            loop.add_reader(self.__watch.fileno(), self.on_clock_set)
+
+    def close(self) -> None:
+        self.__engine.set_waker(None)
+        if self.__loop is not None:
+            self.__loop.remove_reader(self.__timerfd.fileno())
+            if self.__watch is not None:
+                self.__loop.remove_reader(self.__watch.fileno())
+            self.__loop = None
+        self.__timerfd.close()
+        if self.__watch is not None:
+            self.__watch.close()
+
+
+if __name__ == '__main__':
+    pass
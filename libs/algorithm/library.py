@@ -7,6 +7,7 @@
 # description   :
 
 import typing
+import collections
 
 
 class _SingletonWrapper:
@@ -100,6 +101,75 @@ class Stack:
         return self.top is None
 
 
+class RingBuffer:
+    """
+    고정 크기 링 버퍼. 가득 차면 가장 오래된 항목을 덮어쓴다.
+    index_keys 로 지정한 키마다 값 -> 일련번호 목록 인덱스를 유지해서
+    전체를 훑지 않고 특정 값(예: level, jid)의 항목만 골라낼 수 있다.
+    덮어쓴 항목은 append 할 때 인덱스에서도 빼고, 남은 항목이 없는 값은 지운다.
+    """
+    def __init__(self, capacity: int, index_keys: typing.Sequence[str] = ()):
+        assert capacity > 0
+        self.__capacity: int = capacity
+        self.__items: typing.List[typing.Any] = [None] * capacity
+        # 칸마다 그 항목의 인덱스 값들 (index_keys 순서)
+        self.__values: typing.List[typing.Optional[tuple]] = [None] * capacity
+        # 버퍼에 남아 있는 가장 오래된 항목과 다음 항목의 일련번호
+        self.__head: int = 0
+        self.__next: int = 0
+        self.__index: typing.Dict[str, typing.Dict[typing.Hashable, collections.deque]] = \
+            {key: dict() for key in index_keys}
+
+    def __len__(self):
+        return self.__next - self.__head
+
+    def __iter__(self):
+        for seq in range(self.__head, self.__next):
+            yield self.__items[seq % self.__capacity]
+
+    @property
+    def capacity(self) -> int:
+        return self.__capacity
+
+    def append(self, item: typing.Any, **keys) -> int:
+        seq = self.__next
+        pos = seq % self.__capacity
+        evicted = self.__values[pos]
+        if evicted is not None:
+            # 덮어쓰는 항목은 그 값의 가장 오래된 일련번호다.
+            for index, value in zip(self.__index.values(), evicted):
+                seqs = index[value]
+                seqs.popleft()
+                if not seqs:
+                    del index[value]
+        self.__items[pos] = item
+        self.__next += 1
+        if self.__next - self.__head > self.__capacity:
+            self.__head = self.__next - self.__capacity
+        values = tuple(keys.get(key) for key in self.__index)
+        for index, value in zip(self.__index.values(), values):
+            index.setdefault(value, collections.deque()).append(seq)
+        self.__values[pos] = values if self.__index else None
+        return seq
+
+    def select(self, key: str, value: typing.Hashable) -> typing.List[typing.Any]:
+        seqs = self.__index[key].get(value)
+        if seqs is None:
+            return list()
+        return [self.__items[seq % self.__capacity] for seq in seqs]
+
+    def index_size(self, key: str) -> int:
+        # key 인덱스에 남아 있는 값의 수
+        return len(self.__index[key])
+
+    def clear(self) -> None:
+        self.__items = [None] * self.__capacity
+        self.__values = [None] * self.__capacity
+        self.__head = self.__next
+        for index in self.__index.values():
+            index.clear()
+
+
 if __name__ == '__main__':
     pass
 
@@ -1,9 +1,14 @@
 import typing
+import asyncio
 import logging
+import logging.handlers
+import collections
 import pathlib
 
 from PySide2 import QtWidgets, QtGui, QtCore
 
+from libs.algorithm.library import RingBuffer
+
 
 class QtLibs:
     @staticmethod
@@ -42,44 +47,248 @@ class QtLibs:
         inst.move((res.width() / 2) - (inst.frameSize().width() / 2),
                   (res.height() / 2) - (inst.frameSize().height() / 2))
 
+    @staticmethod
+    def backend_from_argv(argv: typing.List[str], backends: typing.List[str]) -> str:
+        """
+        --tick, --asyncio 처럼 백엔드 이름을 옵션으로 받는다. 없으면 첫 번째 백엔드
+        :param argv:
+        :param backends:
+        :return:
+        """
+        for name in backends:
+            if f'--{name}' in argv:
+                return name
+        return backends[0]
+
+    @staticmethod
+    def value_from_argv(argv: typing.List[str], option: str) -> typing.Optional[str]:
+        """
+        --event-log PATH 처럼 값을 받는 옵션. 없으면 None
+        :param argv:
+        :param option:
+        :return:
+        """
+        if option in argv:
+            idx = argv.index(option)
+            if idx + 1 < len(argv):
+                return argv[idx + 1]
+        return None
+
     @staticmethod
     def question_dialog(title: str, text: str, parent=None) -> bool:
         btn: QtWidgets.QMessageBox.StandardButton = QtWidgets.QMessageBox.question(parent, title, text)
         return btn == QtWidgets.QMessageBox.StandardButton.Yes
 
 
-class LogHandler(logging.Handler):
-    def __init__(self, out_stream=None):
-        super().__init__()
+class AsyncioBridge(QtCore.QObject):
+    """
+    Qt 이벤트 루프 위에서 asyncio 루프를 돌린다.
+    qasync 가 설치되어 있으면 qasync.QEventLoop 를 쓰고, 없으면 QTimer 로
+    다음 예약 시각에 맞춰 asyncio 루프를 한 번씩 펌프한다.
+    """
+    IDLE_MSEC = 100
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        try:
+            import qasync
+        except ImportError:
+            qasync = None
+        self.__pump: typing.Union[QtCore.QTimer, None] = None
+        if qasync is not None:
+            self.__loop = qasync.QEventLoop(QtWidgets.QApplication.instance())
+        else:
+            self.__loop = asyncio.new_event_loop()
+            self.__pump = QtCore.QTimer(self)
+            self.__pump.setSingleShot(True)
+            self.__pump.setTimerType(QtCore.Qt.PreciseTimer)
+            self.__pump.timeout.connect(self.__slot_pump)
+            self.__pump.start(0)
+        asyncio.set_event_loop(self.__loop)
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        return self.__loop
+
+    def wakeup(self) -> None:
+        # 새로 예약된 콜백이 다음 펌프 전에 실행되도록 깨운다.
+        if self.__pump is not None:
+            self.__pump.start(0)
+
+    @QtCore.Slot()
+    def __slot_pump(self) -> None:
+        self.__loop.call_soon(self.__loop.stop)
+        self.__loop.run_forever()
+        self.__pump.start(self.__next_msec())
+
+    def __next_msec(self) -> int:
+        if getattr(self.__loop, '_ready', None):
+            return 0
+        scheduled = getattr(self.__loop, '_scheduled', None)
+        if not scheduled:
+            return AsyncioBridge.IDLE_MSEC
+        return max(0, min(AsyncioBridge.IDLE_MSEC, int((scheduled[0].when() - self.__loop.time()) * 1000)))
+
+
+class LogView(QtWidgets.QPlainTextEdit):
+    """
+    용량이 정해진 로그 뷰. QPlainTextEdit 의 maximumBlockCount 로 화면의 블록 수를 묶고,
+    같은 용량의 RingBuffer 에 (level, jid, text) 를 보관해 필터를 바꿀 때 인덱스로 다시 그린다.
+    append() 는 버퍼에 쌓기만 하고 화면 반영은 프레임마다 한 번 몰아서 한다.
+    """
+    FRAME_MSEC = 16
+
+    def __init__(self, capacity: int = 1000, parent=None):
+        super().__init__(parent)
+        self.__buffer = RingBuffer(capacity, index_keys=('level', 'jid'))
+        self.__pending: typing.List[str] = list()
+        self.__level: typing.Union[str, None] = None
+        self.__jid: typing.Union[str, None] = None
+        self.__flush_timer = QtCore.QTimer(self)
+        self.__flush_timer.setSingleShot(True)
+        self.__flush_timer.timeout.connect(self.flush)
+
+        self.setReadOnly(True)
+        self.setUndoRedoEnabled(False)
+        self.setMaximumBlockCount(capacity)
+        self.setLineWrapMode(QtWidgets.QPlainTextEdit.NoWrap)
+        self.setFrameShape(QtWidgets.QFrame.NoFrame)
+
+    @property
+    def buffer(self) -> RingBuffer:
+        return self.__buffer
+
+    def append(self, text: str, level: str = 'INFO', jid: str = '') -> None:
+        self.__buffer.append((level, jid, text), level=level, jid=jid)
+        if not self.__match(level, jid):
+            return
+        self.__pending.append(text)
+        if not self.__flush_timer.isActive():
+            self.__flush_timer.start(LogView.FRAME_MSEC)
+
+    def __match(self, level: str, jid: str) -> bool:
+        return (self.__level is None or level == self.__level) and (self.__jid is None or jid == self.__jid)
+
+    @QtCore.Slot()
+    def flush(self) -> None:
+        if not self.__pending:
+            return
+        bar = self.verticalScrollBar()
+        at_bottom = bar.value() >= bar.maximum()
+        self.appendPlainText('\n'.join(self.__pending))
+        self.__pending.clear()
+        if at_bottom:
+            bar.setValue(bar.maximum())
+
+    def set_filter(self, level: typing.Union[str, None] = None, jid: typing.Union[str, None] = None) -> None:
+        """
+        level / jid 가 None 이면 해당 조건은 보지 않는다.
+        :param level:
+        :param jid:
+        :return:
+        """
+        self.__level = level
+        self.__jid = jid
+        self.__pending.clear()
+        if level is None and jid is None:
+            rows = list(self.__buffer)
+        elif jid is None:
+            rows = self.__buffer.select('level', level)
+        else:
+            rows = [row for row in self.__buffer.select('jid', jid) if level is None or row[0] == level]
+        self.setPlainText('\n'.join(row[2] for row in rows))
+        self.verticalScrollBar().setValue(self.verticalScrollBar().maximum())
+
+    def clear(self) -> None:
+        self.__buffer.clear()
+        self.__pending.clear()
+        super().clear()
+
+
+class LogHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler 처럼 로그를 부른 스레드에서는 prepare() 로 메시지를 만들어 큐에 넣기만 하고,
+    GUI 스레드의 QTimer 가 FLUSH_MSEC 마다 최대 MAX_BATCH 개씩 꺼내 한 번에 위젯에 붙인다 (QueueListener 역할).
+    큐가 MAX_QUEUE 를 넘으면 버리고 dropped 를 센다.
+    레코드에 jid 가 있으면 (logger.info(msg, extra={'jid': jid})) LogView 의 jid 필터에 쓴다.
+    """
+    FLUSH_MSEC = 50
+    MAX_BATCH = 500
+    MAX_QUEUE = 10000
+
+    # 레벨별 HTML 템플릿 (미리 바인딩한 format)
+    TEMPLATES = {
+        'debug':        '<font color=#23bcde>{msg}</font>'.format,
+        'info':         '<font color=#dddddd>{msg}</font>'.format,
+        'warning':      '<font color=#cc9900>{msg}</font>'.format,
+        'error':        '<font color=#e32474>{msg}</font>'.format,
+        'critical':     '<font color=#ff0000>{msg}</font>'.format,
+    }
+
+    def __init__(self, out_stream=None, logger: typing.Union[logging.Logger, None] = None,
+                 level: int = logging.DEBUG):
+        # deque.append/popleft 는 스레드 사이에서 안전하다.
+        super().__init__(collections.deque())
         # log text msg format
         self.setFormatter(logging.Formatter('[%(asctime)s] [%(levelname)s] : %(message)s'))
-        logging.getLogger().addHandler(self)
-        # logging level
-        logging.getLogger().setLevel(logging.DEBUG)
+        self.__dropped: int = 0
+        self.__reported_dropped: int = 0
         self.__out_stream = out_stream
+        self.__flush_timer = QtCore.QTimer()
+        self.__flush_timer.timeout.connect(self.flush)
+        self.__flush_timer.start(LogHandler.FLUSH_MSEC)
+        self.__logger = logger or logging.getLogger()
+        self.__logger.addHandler(self)
+        # logging level
+        self.__logger.setLevel(level)
+
+    @property
+    def dropped(self) -> int:
+        return self.__dropped
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        if len(self.queue) >= LogHandler.MAX_QUEUE:
+            self.__dropped += 1
+            return
+        self.queue.append(record)
 
-    def emit(self, record) -> None:
-        msg = self.format(record)
-        self.__out_stream.append(msg)
+    def flush(self) -> None:
+        queue = self.queue
+        if self.__out_stream is None:
+            queue.clear()
+            return
+        lines = list()
+        for _ in range(min(len(queue), LogHandler.MAX_BATCH)):
+            record = queue.popleft()
+            lines.append((record.levelname, getattr(record, 'jid', ''), record.message))
+        if self.__dropped != self.__reported_dropped:
+            lines.append(('WARNING', '', f'[LogHandler] {self.__dropped - self.__reported_dropped} records dropped'))
+            self.__reported_dropped = self.__dropped
+        if not lines:
+            return
+        if isinstance(self.__out_stream, LogView):
+            for levelname, jid, msg in lines:
+                self.__out_stream.append(msg, level=levelname, jid=jid)
+            return
+        template = LogHandler.TEMPLATES
+        self.__out_stream.append('<br>'.join(
+            template.get(levelname.lower(), template['info'])(msg=msg) for levelname, _, msg in lines))
         self.__out_stream.moveCursor(QtGui.QTextCursor.End)
 
+    def close(self) -> None:
+        self.__logger.removeHandler(self)
+        self.__flush_timer.stop()
+        self.flush()
+        super().close()
+
     @classmethod
     def log_msg(cls, method=None, msg: str = '') -> None:
         if method is None:
             return
-        if method.__name__ == 'info':
-            new_msg = '<font color=#dddddd>{msg}</font>'.format(msg=msg)
-        elif method.__name__ == 'debug':
-            new_msg = '<font color=#23bcde>{msg}</font>'.format(msg=msg)
-        elif method.__name__ == 'warning':
-            new_msg = '<font color=#cc9900>{msg}</font>'.format(msg=msg)
-        elif method.__name__ == 'error':
-            new_msg = '<font color=#e32474>{msg}</font>'.format(msg=msg)
-        elif method.__name__ == 'critical':
-            new_msg = '<font color=#ff0000>{msg}</font>'.format(msg=msg)
-        else:
+        template = cls.TEMPLATES.get(method.__name__)
+        if template is None:
             raise TypeError('[log method] unknown type')
-        method(new_msg)
+        method(template(msg=msg))
 
 
 if __name__ == '__main__':
@@ -3,7 +3,7 @@
 
 # author        : Seongcheol Jeon
 # created date  : 2024.02.28
-# modified date : 2024.02.28
+# modified date : 2026.10.19
 # description   :
 
 # HOME WORK
@@ -11,26 +11,47 @@
 # total progress
 
 import sys
+import typing
 import importlib
+import contextlib
 
 from PySide2 import QtWidgets, QtGui, QtCore
 from libs.qt import stylesheet, library as qt_lib
 from libs.algorithm.library import SingletonBitMask
 
 from constants import Constant, Color
+from core.links import LinkGroups
+from core.eventlog import EventLog
+from core.history import HistoryRecorder, HistoryStore
+from core.persist import TimerJournal
+from core.actions import ActionJournal
+from core.statetable import StateTable
+from core.shard import ShardedEngine
 import singleTimer
 
 importlib.reload(singleTimer)
 
 
 class MultipleTimer(QtWidgets.QMainWindow):
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, backend: str = 'tick', event_log: typing.Optional[EventLog] = None,
+                 history: typing.Optional[HistoryRecorder] = None, journal: typing.Optional[TimerJournal] = None,
+                 actions: typing.Optional[ActionJournal] = None, state_table: typing.Optional[StateTable] = None,
+                 shards: typing.Optional[ShardedEngine] = None):
         super().__init__(parent)
         w = QtWidgets.QWidget()
         self.__vbox_layout = QtWidgets.QVBoxLayout()
         self.__grid_layout = QtWidgets.QGridLayout()
 
         # vars
+        self.__backend = backend
+        self.__event_log = event_log
+        self.__history = history
+        self.__journal = journal
+        self.__actions = actions
+        self.__state_table = state_table
+        # 워커 프로세스들에서 도는 타이머. 프레임을 합친 상태를 전체 진행률에 더한다.
+        self.__shards = shards
+        self.__shard_timer = QtCore.QTimer(self)
         self.__widget_data = dict()
         self.__menubar = self.menuBar()
         self.__statusbar = self.statusBar()
@@ -40,6 +61,8 @@ class MultipleTimer(QtWidgets.QMainWindow):
         self.__statusbar.addPermanentWidget(self.__total_progress)
         self.__st_bitfield = SingletonBitMask()
         self.__st_bitfield.empty()
+        # 최소화/숨김 상태에서는 전체 진행률도 다시 그리지 않는다.
+        self.__gate_open: bool = True
 
         self.__setup_ui()
         self.__setup_widgets_ui()
@@ -49,13 +72,52 @@ class MultipleTimer(QtWidgets.QMainWindow):
         self.setCentralWidget(w)
         qt_lib.QtLibs.center_on_screen(self)
 
+        if self.__shards is not None:
+            self.__shard_timer.timeout.connect(self.__slot_poll_shards)
+            self.__shard_timer.start(int(singleTimer.SingleTimer.DISPLAY_INTERVAL * 1000))
+
+    @property
+    def shards(self) -> typing.Optional[ShardedEngine]:
+        return self.__shards
+
+    @QtCore.Slot()
+    def __slot_poll_shards(self):
+        if not self.__shards.poll():
+            return
+        if self.__gate_open:
+            self.render_total_progress()
+
     def closeEvent(self, event):
+        # 각 타이머의 closeEvent 가 스레드를 멈추고 로그 핸들러를 뗀다.
         for w in self.__widget_data.values():
             w: singleTimer.SingleTimer
-            if w.work_thread.isRunning():
-                w.work_thread.stop()
+            w.close()
         event.accept()
 
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.set_update_gate(not self.isMinimized())
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self.set_update_gate(False)
+
+    def changeEvent(self, event):
+        super().changeEvent(event)
+        # 최소화는 자식 위젯에 hideEvent 를 주지 않으므로 창 상태 변화로 판단한다.
+        if event.type() == QtCore.QEvent.WindowStateChange:
+            self.set_update_gate(self.isVisible() and not self.isMinimized())
+
+    def set_update_gate(self, is_open: bool) -> None:
+        if self.__gate_open == is_open:
+            return
+        self.__gate_open = is_open
+        for w in self.__widget_data.values():
+            w: singleTimer.SingleTimer
+            w.set_update_gate(is_open)
+        if is_open:
+            self.render_total_progress()
+
     def __setup_menu_actions(self):
         # menu
         __menu_file = QtWidgets.QMenu('File')
@@ -94,7 +156,7 @@ class MultipleTimer(QtWidgets.QMainWindow):
         self.__spinbox_thread_cnt.valueChanged.connect(self.__slot_spinbox_value_changed)
         # button
         btn_refresh_layout = QtWidgets.QPushButton('Refresh Layout')
-        btn_refresh_layout.setStatusTip('WorkThread 개수에 맞춰 레이아웃 갱신')
+        btn_refresh_layout.setStatusTip('타이머 개수에 맞춰 레이아웃 갱신')
         btn_refresh_layout.clicked.connect(self.__refresh_layout)
 
         # 일괄 적용 관련 버튼
@@ -146,9 +208,10 @@ class MultipleTimer(QtWidgets.QMainWindow):
                 return
             self.__btn_batch_start.setText('Batch Resume')
             self.__btn_batch_start.setIcon(QtGui.QIcon(':/icons/icons/restart.png'))
-        for w in self.__widget_data.values():
-            w: singleTimer.SingleTimer
-            w.slot_start_timer()
+        with self.group():
+            for w in self.__widget_data.values():
+                w: singleTimer.SingleTimer
+                w.slot_start_timer()
 
     @QtCore.Slot(int)
     def __slot_clicked_batch_stop(self):
@@ -156,14 +219,27 @@ class MultipleTimer(QtWidgets.QMainWindow):
         if not qt_lib.QtLibs.question_dialog(
                 'Batch Stop All Threads', f'{cnt_threads}개의 스레드를 일괄적으로 중지할까요?', self):
             return
+        with self.group():
+            for w in self.__widget_data.values():
+                w: singleTimer.SingleTimer
+                w.slot_stop_timer()
+
+    def group(self):
+        """
+        안에서 시작/일시정지/재개/정지하는 타이머들이 한 시각을 함께 쓰도록 묶는다. 모든 위젯이 같은 백엔드라
+        엔진 백엔드면 공유하는 엔진 하나의 group() 이다.
+        :return: context manager
+        """
         for w in self.__widget_data.values():
-            w: singleTimer.SingleTimer
-            w.slot_stop_timer()
+            return w.work_thread.group()
+        return contextlib.nullcontext()
 
-    def __setup_widgets_ui(self):
+    def __setup_widgets_ui(self, jids: typing.Sequence[str] = ()):
         cnt_threads = self.__spinbox_thread_cnt.value()
         for i in range(cnt_threads):
-            widget = singleTimer.SingleTimer(parent=self)
+            widget = singleTimer.SingleTimer(parent=self, backend=self.__backend, event_log=self.__event_log,
+                                             history=self.__history, journal=self.__journal, actions=self.__actions,
+                                             state_table=self.__state_table, jid=jids[i] if i < len(jids) else None)
 
             widget.comboBox__link.addItems(list(map(lambda x: chr(x + 65), range(cnt_threads))))
 
@@ -175,7 +251,7 @@ class MultipleTimer(QtWidgets.QMainWindow):
         self.setMinimumWidth(800)
 
         self.pro_dict = dict()
-        self.combo_dict = dict()
+        self.links = LinkGroups()
         self.get_combo_link_num()
         self.combo_link_btn()
         self.get_signle_ratio()
@@ -188,92 +264,97 @@ class MultipleTimer(QtWidgets.QMainWindow):
     # total_progress 설정
     @QtCore.Slot(singleTimer.Data)
     def average_progress(self, data):
-        # print('id::', data.jid, 'ratio::', data.ratio)
         self.pro_dict[data.jid] = data.ratio
+        if self.__gate_open:
+            self.render_total_progress()
+
+    def render_total_progress(self):
         count = len(self.pro_dict)
-        res = 0
-        for i, num in self.pro_dict.items():
-            res += num
-        self.__total_progress.setValue(res//count)
+        total = sum(self.pro_dict.values())
+        if self.__shards is not None:
+            status = self.__shards.status()
+            count += status.total
+            total += status.progress * status.total
+            self.__statusbar.showMessage(
+                f'{status.shards} shards: ' + ', '.join(f'{name} {n}' for name, n in sorted(status.counts.items())))
+        if not count:
+            return
+        self.__total_progress.setValue(int(total // count))
 
     # combo_link 시그널 연결
     def get_combo_link_num(self):
         for widget in self.__widget_data.values():
             widget.signals.changed_link.connect(self.make_link)
+            self.links.set(widget.jid, widget.comboBox__link.currentIndex())
 
-            if widget.comboBox__link.currentIndex() == 0:
-                self.combo_dict[widget] = 0
-
-    # combo_link 시그널을 combo_dict으로 제작
+    # combo_link 시그널을 링크 그룹에 반영
     @QtCore.Slot(str, int)
     def make_link(self, wid_id, idx):
-        self.combo_dict[self.__widget_data[wid_id]] = idx
+        self.links.set(wid_id, idx)
 
-    # combo_dict에서 실제로 link된 것만 추려서 filter_dict으로 제작
+    # 실제로 link된 것만 추려서 filter_dict으로 제작
     @property
     def filter_combo_link(self):
-        filter_widget_dict = {}
-        for it, idx in enumerate(list(self.combo_dict.values())):
-            if list(self.combo_dict.values()).count(idx) > 1:
-                filter_widget_dict[list(self.__widget_data.values())[it]] = idx
-        return filter_widget_dict
+        return {self.__widget_data[jid]: idx for jid, idx in self.links.filtered().items()}
+
+    def linked_widgets(self, widget: singleTimer.SingleTimer) -> typing.List[singleTimer.SingleTimer]:
+        return [self.__widget_data[jid] for jid in self.links.linked(widget.jid)]
 
     # combo_link와 관련한 시그널
     def combo_link_btn(self):
         for widget in self.__widget_data.values():
+            # 누른 위젯도 링크된 위젯들과 같은 group 안에서 시작/정지하도록 위젯 자신의 연결을 대신한다.
+            widget.pushButton__start.clicked.disconnect(widget.slot_start_timer)
+            widget.pushButton__stop.clicked.disconnect(widget.slot_stop_timer)
             widget.pushButton__start.clicked.connect(self.set_combo_link_btn_start)
             widget.pushButton__stop.clicked.connect(self.set_combo_link_btn_stop)
             widget.timeEdit__timer.timeChanged.connect(self.set_combo_link_timer)
+            widget.checkBox__alarm.toggled.connect(self.set_combo_link_alarm)
 
     # link된 타이머 시간 설정
     def set_combo_link_timer(self):
         sender_widget_timer = self.sender()
-        # print('timer', sender_widget_timer)
-
         for widget in self.__widget_data.values():
             if widget.timeEdit__timer == sender_widget_timer:
-                if widget not in self.filter_combo_link:
-                    pass
-                else:
-                    for wid in self.filter_combo_link:
-                        if self.filter_combo_link[wid] == self.filter_combo_link[widget]:
-                            if wid.timeEdit__timer == sender_widget_timer:
-                                pass
-                            else:
-                                wid.timeEdit__timer.setTime(widget.timeEdit__timer.time())
-                    break
-
-    # link된 타이머 start 버튼 연결
+                for wid in self.linked_widgets(widget):
+                    wid.timeEdit__timer.setTime(widget.timeEdit__timer.time())
+                break
+
+    # link된 타이머 알람(벽시계 시각) 여부 설정
+    def set_combo_link_alarm(self, checked: bool):
+        sender_widget_alarm = self.sender()
+        for widget in self.__widget_data.values():
+            if widget.checkBox__alarm == sender_widget_alarm:
+                for wid in self.linked_widgets(widget):
+                    wid.checkBox__alarm.setChecked(checked)
+                break
+
+    # link된 타이머 start 버튼 연결 (시작/일시정지/재개가 같은 시각에 적용된다)
     def set_combo_link_btn_start(self):
         sender_widget_btn = self.sender()
-
         for widget in self.__widget_data.values():
             if widget.pushButton__start == sender_widget_btn:
-                if widget not in self.filter_combo_link:
-                    pass
-                else:
-                    for wid in self.filter_combo_link:
-                        if self.filter_combo_link[wid] == self.filter_combo_link[widget]:
-                            if wid.pushButton__start == sender_widget_btn:
-                                pass
-                            else:
-                                wid.slot_start_timer()
+                widgets = [widget] + self.linked_widgets(widget)
+                # group 안에서 경고 창이 뜨면 공유 시각이 그만큼 지나 버리므로 먼저 확인한다.
+                for wid in widgets:
+                    if not wid.is_set_timer():
+                        QtWidgets.QMessageBox.warning(self, 'Warning', f'{wid.jid} 타이머 설정을 해야 합니다.')
+                        return
+                with self.group():
+                    for wid in widgets:
+                        wid.slot_start_timer()
+                break
 
     # link된 타이머 stop 버튼 연결
     def set_combo_link_btn_stop(self):
         sender_widget_btn = self.sender()
-
         for widget in self.__widget_data.values():
             if widget.pushButton__stop == sender_widget_btn:
-                if widget not in self.filter_combo_link:
-                    pass
-                else:
-                    for wid in self.filter_combo_link:
-                        if self.filter_combo_link[wid] == self.filter_combo_link[widget]:
-                            if wid.pushButton__stop == sender_widget_btn:
-                                pass
-                            else:
-                                wid.slot_stop_timer()
+                with self.group():
+                    widget.slot_stop_timer()
+                    for wid in self.linked_widgets(widget):
+                        wid.slot_stop_timer()
+                break
 
     @staticmethod
     def get_spacer_item() -> QtWidgets.QSpacerItem:
@@ -287,21 +368,63 @@ class MultipleTimer(QtWidgets.QMainWindow):
                 QtWidgets.QMessageBox.warning(
                     self, 'Warning', f'[{w.jid}] thread is running...')
                 return
+        self.__rebuild_layout()
 
+    def __rebuild_layout(self, jids: typing.Sequence[str] = ()):
         for i in reversed(range(self.__grid_layout.count())):
             # print(i)
             w = self.__grid_layout.itemAt(i).widget()
             if w is None:
                 continue
+            w.close()
             w.setParent(None)
             w.deleteLater()
 
         self.__widget_data.clear()
-        self.__setup_widgets_ui()
+        self.__setup_widgets_ui(jids)
+
+    def restore_timers(self) -> int:
+        """
+        journal 에 남아 있는 타이머를 원래 jid 의 위젯으로 다시 만들어 이어서 돌린다.
+        위젯 수(최대 12)보다 많으면 나머지는 journal 에 그대로 남겨 둔다.
+        :return: 복원한 타이머 수
+        """
+        if self.__journal is None:
+            return 0
+        restored = self.__journal.restore()
+        if not restored:
+            return 0
+        if len(restored) > self.__spinbox_thread_cnt.value():
+            self.__spinbox_thread_cnt.setValue(len(restored))
+        self.__rebuild_layout([entry.jid for entry, _ in restored])
+        for w, (entry, elapsed) in zip(list(self.__widget_data.values()), restored):
+            w: singleTimer.SingleTimer
+            w.restore(entry, elapsed)
+        return min(len(restored), len(self.__widget_data))
+
+    def adopt_remote_timers(self) -> None:
+        """
+        remote 백엔드일 때 엔진 프로세스에서 돌고 있는 타이머들을 위젯으로 다시 붙인다.
+        GUI 를 다시 띄워도 엔진의 타이머는 그대로 이어서 보인다. 목록은 응답이 오는 대로 붙인다.
+        :return:
+        """
+        if self.__backend != 'remote':
+            return
+        singleTimer.RemoteSource().call('list', callback=self.__adopt_listed)
 
-        self.pro_dict.clear()
-        self.combo_dict.clear()
-        self.get_combo_link_num()
+    def __adopt_listed(self, infos: typing.Optional[typing.List[dict]], err: typing.Optional[Exception]) -> None:
+        if err is not None:
+            self.__statusbar.showMessage(f'engine: {err}')
+            return
+        infos = [info for info in infos if info['bits'] & singleTimer.RemoteTimer.ACTIVE]
+        if not infos:
+            return
+        if len(infos) > self.__spinbox_thread_cnt.value():
+            self.__spinbox_thread_cnt.setValue(len(infos))
+        self.__rebuild_layout([info['jid'] for info in infos])
+        for w, info in zip(list(self.__widget_data.values()), infos):
+            w: singleTimer.SingleTimer
+            w.adopt(info)
 
     @QtCore.Slot(int)
     def __slot_spinbox_value_changed(self, val):
@@ -310,7 +433,38 @@ class MultipleTimer(QtWidgets.QMainWindow):
 
 if __name__ == '__main__':
     app = QtWidgets.QApplication(sys.argv)
-    mt = MultipleTimer()
+    singleTimer.RemoteSource.SOCKET_PATH = (qt_lib.QtLibs.value_from_argv(sys.argv, '--engine') or
+                                            singleTimer.RemoteSource.SOCKET_PATH)
+    log_path = qt_lib.QtLibs.value_from_argv(sys.argv, '--event-log')
+    event_log = EventLog(log_path) if log_path else None
+    history_path = qt_lib.QtLibs.value_from_argv(sys.argv, '--history')
+    history = HistoryRecorder(HistoryStore(history_path)) if history_path else None
+    journal_path = qt_lib.QtLibs.value_from_argv(sys.argv, '--journal')
+    journal = TimerJournal(journal_path) if journal_path else None
+    actions_path = qt_lib.QtLibs.value_from_argv(sys.argv, '--actions')
+    actions = ActionJournal(actions_path) if actions_path else None
+    table_path = qt_lib.QtLibs.value_from_argv(sys.argv, '--state-table')
+    state_table = StateTable(table_path) if table_path else None
+    shard_count = qt_lib.QtLibs.value_from_argv(sys.argv, '--shards')
+    shards = ShardedEngine(int(shard_count)) if shard_count else None
+    mt = MultipleTimer(backend=qt_lib.QtLibs.backend_from_argv(sys.argv, list(singleTimer.SingleTimer.BACKENDS)),
+                       event_log=event_log, history=history, journal=journal, actions=actions,
+                       state_table=state_table, shards=shards)
     mt.show()
-    sys.exit(app.exec_())
+    mt.restore_timers()
+    mt.adopt_remote_timers()
+    ret = app.exec_()
+    if event_log is not None:
+        event_log.close()
+    if history is not None:
+        history.store.flush()
+    if journal is not None:
+        journal.close()
+    if actions is not None:
+        actions.close()
+    if state_table is not None:
+        state_table.close()
+    if shards is not None:
+        shards.close()
+    sys.exit(ret)
 
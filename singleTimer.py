@@ -3,25 +3,42 @@
 
 # author        : Seongcheol Jeon
 # created date  : 2024.02.15
-# modified date : 2024.02.15
+# modified date : 2026.10.19
 # description   :
 
 import sys
+import json
+import time
 import uuid
 import typing
+import logging
+import itertools
+import collections
 import pathlib
 import importlib
+import contextlib
 
 import qdarktheme
-from pydantic import BaseModel
-from PySide2 import QtWidgets, QtGui, QtCore
+from PySide2 import QtWidgets, QtCore, QtNetwork
 
 from resources.ui import timer_ui
 from libs.system import library as sys_lib
 from libs.qt import library as qt_lib
 from libs.qt import stylesheet
-from libs.algorithm.library import BitMask
-from constants import Constant, Color
+from libs.algorithm.library import BitMask, singleton
+from constants import Color
+from core.states import Constant, StateMixin
+from core.events import Data
+from core.engine import TimerEngine, NSEC_PER_SEC, NSEC_PER_MSEC
+from core.aio import AsyncTimerEngine
+from core.eventlog import EventLog
+from core.history import HistoryRecorder, HistoryStore
+from core.persist import Entry, TimerJournal
+from core.actions import ActionJournal
+from core.statetable import StateTable
+from core.rpc import RpcError
+from core.stream import StreamDecoder
+from core.clocks import boottime_ns, next_wall_time
 
 importlib.reload(timer_ui)
 importlib.reload(sys_lib)
@@ -29,37 +46,79 @@ importlib.reload(qt_lib)
 importlib.reload(stylesheet)
 
 
-# data class
-class Data(BaseModel):
-    # seconds
-    sec: int
-    ste: int
-    accum_num: int
-    ratio: float
-    jid: str
-    msg: str = ''
+class Signals(QtCore.QObject):
+    sig_data = QtCore.Signal(Data)
+    changed_link = QtCore.Signal(str, int)
+    # 다른 스레드(ActionJournal writer)에서 GUI 스레드로 넘기는 호출
+    sig_call = QtCore.Signal(object)
+
+
+@singleton
+class TickSource(QtCore.QObject):
+    """
+    메인 이벤트 루프의 QTimer 하나로 TimerEngine 을 구동한다.
+    엔진의 가장 이른 deadline 에 맞춰 단발성(single shot) 타이머를 다시 예약한다.
+    """
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        # QTimer 는 절전 시간을 세지 않으므로 CLOCK_BOOTTIME 으로 재고, 복귀는 엔진의 시계 확인이 잡는다.
+        self.engine = TimerEngine(clock=boottime_ns, display_interval=SingleTimer.DISPLAY_INTERVAL, adaptive=True,
+                                  align=SingleTimer.ALIGN_INTERVAL, clock_check=SingleTimer.CLOCK_CHECK_INTERVAL)
+        self.__timer = QtCore.QTimer(self)
+        self.__timer.setSingleShot(True)
+        self.__timer.setTimerType(QtCore.Qt.PreciseTimer)
+        self.__timer.timeout.connect(self.__slot_timeout)
+        self.engine.set_waker(self.__rearm)
+
+    def wakeup(self) -> None:
+        pass
+
+    def __rearm(self, deadline: typing.Optional[float]) -> None:
+        if deadline is None:
+            self.__timer.stop()
+            return
+        self.__timer.start(max(0, -(-(deadline - self.engine.clock()) // NSEC_PER_MSEC)))
 
+    @QtCore.Slot()
+    def __slot_timeout(self) -> None:
+        self.engine.advance()
 
-class KillThreadException(Exception): ...
 
+@singleton
+class AioSource:
+    """
+    AioTimer 들이 공유하는 asyncio 엔진과 Qt 브릿지
+    """
+    def __init__(self):
+        self.bridge = qt_lib.AsyncioBridge()
+        self.engine = AsyncTimerEngine(self.bridge.loop, display_interval=SingleTimer.DISPLAY_INTERVAL,
+                                       adaptive=True, align=SingleTimer.ALIGN_INTERVAL,
+                                       clock_check=SingleTimer.CLOCK_CHECK_INTERVAL)
 
-class Signals(QtCore.QObject):
-    sig_data = QtCore.Signal(Data)
-    changed_link = QtCore.Signal(str, int)
+    def wakeup(self) -> None:
+        self.bridge.wakeup()
 
 
-class WorkThread(QtCore.QThread):
+class EngineTimer(StateMixin, QtCore.QObject):
+    """
+    core 엔진의 타이머를 SingleTimer 가 쓰는 백엔드 인터페이스로 감싼 어댑터.
+    source_class 의 엔진을 모든 인스턴스가 공유한다.
+    """
+    source_class = None
+
     def __init__(self, jid, parent=None):
         super().__init__(parent)
         self.__jid: str = jid
         self.__signals: Signals = Signals()
         self.__bitfield: BitMask = BitMask()
-        self.__total_num: int = 0
-        self.__condition = QtCore.QWaitCondition()
-        self.__mutex = QtCore.QMutex()
+        self.__observed: bool = True
+        self.__source = self.source_class()
 
         # init
         self.__bitfield.activate(Constant.STOPPED)
+        source = self.__source
+        source.engine.subscribe(self.signals.sig_data.emit, jid=self.__jid)
+        self.destroyed.connect(lambda: source.engine.remove(jid))
 
     @property
     def signals(self):
@@ -67,96 +126,349 @@ class WorkThread(QtCore.QThread):
 
     @property
     def bitfield(self):
-        return self.__bitfield
+        timer = self.__source.engine.timers.get(self.__jid)
+        if timer is None:
+            return self.__bitfield
+        return timer.bitfield
+
+    def isRunning(self) -> bool:
+        timer = self.__source.engine.timers.get(self.__jid)
+        return timer is not None and timer.is_active()
+
+    def group(self):
+        # 모든 인스턴스가 같은 엔진을 쓰므로 안에서 내린 명령들은 엔진의 한 시각에 함께 적용된다.
+        return self.__source.engine.group()
+
+    def run_start(self, duration_msec: int, tick_msec: int = 1000, elapsed_msec: int = 0,
+                  alarm_at: typing.Optional[int] = None):
+        if alarm_at is not None:
+            self.__source.engine.create_alarm(alarm_at / NSEC_PER_SEC, jid=self.__jid, tick=tick_msec / 1000,
+                                              start=False)
+        else:
+            self.__source.engine.create_timer(duration_msec / 1000, jid=self.__jid, tick=tick_msec / 1000,
+                                              start=False)
+        self.__source.engine.set_observed(self.__jid, self.__observed)
+        self.__source.engine.start(self.__jid, elapsed_msec * NSEC_PER_MSEC)
+        self.__source.wakeup()
+
+    def set_observed(self, observed: bool) -> None:
+        # 보이지 않는 동안 엔진은 만료 시각에만 깨어난다.
+        self.__observed = observed
+        if self.__jid in self.__source.engine.timers:
+            self.__source.engine.set_observed(self.__jid, observed)
+            self.__source.wakeup()
+
+    def set_ste_waiting(self) -> None:
+        # 엔진이 상태 비트를 직접 바꾸므로 일시정지/재개 명령으로 바꿔 전달한다.
+        if self.bitfield.confirm(Constant.RUNNING):
+            self.__source.engine.pause(self.__jid)
+        elif self.bitfield.confirm(Constant.WAITING):
+            self.resume()
 
     def resume(self):
-        self.__condition.wakeAll()
-
-    def run(self):
-        num = 0
-        ratio = 0
-        seconds = 0
-        self.signals.sig_data.emit(
-            Data(sec=-1, ste=Constant.STARTED, accum_num=-1, ratio=-1, jid=self.__jid, msg='Started...'))
-        try:
-            while num <= self.__total_num:
-                seconds = self.__total_num - num
-                if self.bitfield.confirm(Constant.STOPPED):
-                    raise KillThreadException(f'Killed Thread: {self.__jid}')
-
-                self.__mutex.lock()
-                if self.bitfield.confirm(Constant.WAITING):
-                    self.signals.sig_data.emit(Data(sec=seconds, ste=Constant.RUNNING,
-                                                    accum_num=num, ratio=ratio, jid=self.__jid, msg='Waiting...'))
-                    self.__condition.wait(self.__mutex)
-                self.__mutex.unlock()
-
-                try:
-                    ratio = int((num / self.__total_num) * 100)
-                except ZeroDivisionError as err:
-                    ratio = 0
-                self.signals.sig_data.emit(Data(sec=seconds, ste=Constant.RUNNING,
-                                                accum_num=num, ratio=ratio, jid=self.__jid, msg='Running...'))
-                self.sleep(1)
-                num += 1
-        except KillThreadException as err:
-            self.set_ste_stopped()
-            self.signals.sig_data.emit(Data(sec=seconds, ste=Constant.STOPPED,
-                                            accum_num=num, ratio=ratio, jid=self.__jid, msg='Stopped...'))
-            sys.stderr.write(str(err) + '\n')
-        except Exception as err:
-            self.set_ste_error()
-            self.signals.sig_data.emit(Data(sec=seconds, ste=Constant.ERROR,
-                                            accum_num=num, ratio=ratio, jid=self.__jid, msg='Error...' + str(err)))
-            sys.stderr.write(str(err) + '\n')
-        else:
-            self.set_ste_finished()
-            self.signals.sig_data.emit(Data(sec=seconds, ste=Constant.FINISHED,
-                                            accum_num=num, ratio=ratio, jid=self.__jid, msg='Finished...'))
+        self.__source.engine.resume(self.__jid)
+        self.__source.wakeup()
 
     def stop(self):
-        self.bitfield.activate(Constant.STOPPED)
-        if self.bitfield.confirm(Constant.WAITING):
-            self.resume()
-        self.set_ste_stopped()
-        self.quit()
-        self.wait(10000)
+        if self.__jid in self.__source.engine.timers:
+            self.__source.engine.stop(self.__jid)
+
+
+class TickTimer(EngineTimer):
+    # 스레드 없이 메인 이벤트 루프의 QTimer 하나로 구동
+    source_class = TickSource
+
+
+class AioTimer(EngineTimer):
+    # asyncio 루프 위의 AsyncTimerEngine 으로 구동
+    source_class = AioSource
+
+
+@singleton
+class RemoteSource(QtCore.QObject):
+    """
+    별도 프로세스에서 도는 엔진에 붙는 얇은 클라이언트.
+        python -m core --serve /tmp/timers.sock --stream /tmp/timers.sock.stream --cpu 3
+    명령은 JSON-RPC 소켓으로, 화면에 그릴 상태는 delta 스트림으로 둘 다 QLocalSocket 위에서 주고받고
+    jid 별 RemoteTimer 에 나눠 준다. GUI 스레드는 응답을 기다리지 않고, 응답은 callback 으로 돌아온다.
+    연결이 끊기면 점점 늘어나는 간격으로 다시 붙고, 스트림은 새로 받은 SNAPSHOT 으로 상태를 다시 맞춘다.
+    GUI 가 멈추거나 다시 떠도 엔진의 타이머는 계속 돈다.
+    """
+    SOCKET_PATH = '/tmp/timers.sock'
+    STREAM_SUFFIX = '.stream'
+    # 다시 붙기 전에 기다리는 시간 (ms). 실패할 때마다 두 배로 늘린다.
+    RETRY_MIN = 100
+    RETRY_MAX = 5000
+    # 제어 소켓이 붙기 전에 쌓아 둘 수 있는 최대 명령 수
+    MAX_OUTBOX = 1024
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.__decoder = StreamDecoder()
+        self.__listeners: typing.Dict[str, typing.Callable[[Data, int], None]] = dict()
+        # 끊기기 전에 스트림으로 보고 있던 jid. 다시 맞춘 스냅샷에 없으면 엔진이 잃어버린 타이머다.
+        self.__known: typing.Set[str] = set()
+        self.__ids = itertools.count(1)
+        self.__callbacks: typing.Dict[int, typing.Callable[[typing.Any, typing.Optional[Exception]], None]] = dict()
+        self.__outbox: typing.Deque[bytes] = collections.deque()
+
+        self.__socket = QtNetwork.QLocalSocket(self)
+        self.__socket.readyRead.connect(self.__slot_ready_read)
+        self.__socket.connected.connect(self.__slot_stream_connected)
+        self.__socket.disconnected.connect(self.__slot_stream_lost)
+        self.__socket.errorOccurred.connect(self.__slot_stream_lost)
+        self.__stream_retry = RemoteSource.__make_retry_timer(self, self.__connect_stream)
+        self.__stream_delay: int = RemoteSource.RETRY_MIN
+
+        self.__control = QtNetwork.QLocalSocket(self)
+        self.__control.readyRead.connect(self.__slot_control_read)
+        self.__control.connected.connect(self.__slot_control_connected)
+        self.__control.disconnected.connect(self.__slot_control_lost)
+        self.__control.errorOccurred.connect(self.__slot_control_lost)
+        self.__control_retry = RemoteSource.__make_retry_timer(self, self.__connect_control)
+        self.__control_delay: int = RemoteSource.RETRY_MIN
+
+        # init
+        self.__connect_control()
+        self.__connect_stream()
+
+    @staticmethod
+    def __make_retry_timer(parent: QtCore.QObject, slot: typing.Callable[[], None]) -> QtCore.QTimer:
+        timer = QtCore.QTimer(parent)
+        timer.setSingleShot(True)
+        timer.timeout.connect(slot)
+        return timer
+
+    def wakeup(self) -> None:
+        pass
+
+    def register(self, jid: str, listener: typing.Callable[[Data, int], None]) -> None:
+        self.__listeners[jid] = listener
+        fields = self.__decoder.state.get(jid)
+        if fields is not None:
+            listener(RemoteSource.make_data(jid, fields), fields['bits'])
+
+    def unregister(self, jid: str) -> None:
+        self.__listeners.pop(jid, None)
+
+    def call(self, method: str,
+             callback: typing.Optional[typing.Callable[[typing.Any, typing.Optional[Exception]], None]] = None,
+             **params) -> bool:
+        """
+        명령을 보내고 바로 돌아온다. 제어 소켓이 아직 붙지 않았으면 붙을 때까지 쌓아 둔다.
+        :param method:
+        :param callback: 응답이 오면 GUI 스레드에서 callback(result, None) 또는 callback(None, err) 로 불린다.
+            None 이면 응답을 받지 않는 알림으로 보낸다.
+        :param params:
+        :return: 보냈거나 쌓아 뒀으면 True
+        """
+        message = {'jsonrpc': '2.0', 'method': method, 'params': params}
+        if callback is not None:
+            message['id'] = req_id = next(self.__ids)
+        if len(self.__outbox) >= RemoteSource.MAX_OUTBOX:
+            err = ConnectionError('engine is not reachable')
+            sys.stderr.write(f'[RemoteSource] {method}: {err}\n')
+            if callback is not None:
+                callback(None, err)
+            return False
+        if callback is not None:
+            self.__callbacks[req_id] = callback
+        self.__outbox.append(json.dumps(message, separators=(',', ':')).encode('utf8') + b'\n')
+        self.__flush()
+        return True
+
+    def send(self, method: str, **params) -> bool:
+        # 응답을 기다리지 않는 명령. 결과는 스트림으로 돌아온다.
+        return self.call(method, **params)
+
+    @staticmethod
+    def make_data(jid: str, fields: typing.Dict[str, typing.Any]) -> Data:
+        return Data(fields['sec'], fields['ste'], fields['accum_num'], fields['ratio'], jid, fields['msg'],
+                    fields['msec'])
+
+    def __flush(self) -> None:
+        if self.__control.state() != QtNetwork.QLocalSocket.ConnectedState:
+            return
+        while self.__outbox:
+            self.__control.write(self.__outbox.popleft())
+        self.__control.flush()
+
+    def __connect_control(self) -> None:
+        self.__control.abort()
+        self.__control.connectToServer(RemoteSource.SOCKET_PATH)
+
+    def __connect_stream(self) -> None:
+        self.__socket.abort()
+        self.__socket.connectToServer(RemoteSource.SOCKET_PATH + RemoteSource.STREAM_SUFFIX)
+
+    @QtCore.Slot()
+    def __slot_control_connected(self) -> None:
+        self.__control_delay = RemoteSource.RETRY_MIN
+        self.__flush()
+
+    def __slot_control_lost(self, *args) -> None:
+        if self.__control_retry.isActive():
+            return
+        # 보낸 뒤 응답을 못 받은 명령은 엔진에 닿았는지 알 수 없으므로 실패로 돌려준다.
+        callbacks, self.__callbacks = self.__callbacks, dict()
+        for callback in callbacks.values():
+            callback(None, ConnectionError('engine connection lost'))
+        self.__control_retry.start(self.__control_delay)
+        self.__control_delay = min(self.__control_delay * 2, RemoteSource.RETRY_MAX)
+
+    @QtCore.Slot()
+    def __slot_control_read(self) -> None:
+        while self.__control.canReadLine():
+            line = bytes(self.__control.readLine())
+            try:
+                message = json.loads(line)
+            except ValueError:
+                continue
+            if not isinstance(message, dict):
+                continue
+            callback = self.__callbacks.pop(message.get('id'), None)
+            if callback is None:
+                continue
+            if 'error' in message:
+                callback(None, RpcError(message['error']['code'], message['error']['message']))
+            else:
+                callback(message.get('result'), None)
+
+    @QtCore.Slot()
+    def __slot_stream_connected(self) -> None:
+        self.__stream_delay = RemoteSource.RETRY_MIN
+        # 끊긴 연결에서 받다 만 프레임과 jid 번호는 버린다. 서버가 새 연결에 SNAPSHOT 부터 보낸다.
+        self.__decoder = StreamDecoder()
+
+    def __slot_stream_lost(self, *args) -> None:
+        if self.__stream_retry.isActive():
+            return
+        if self.__decoder.synced:
+            self.__known = set(self.__decoder.state)
+        sys.stderr.write(f'[RemoteSource] engine stream lost, retrying in {self.__stream_delay} ms\n')
+        self.__stream_retry.start(self.__stream_delay)
+        self.__stream_delay = min(self.__stream_delay * 2, RemoteSource.RETRY_MAX)
+
+    @QtCore.Slot()
+    def __slot_ready_read(self) -> None:
+        was_synced = self.__decoder.synced
+        events = self.__decoder.feed(bytes(self.__socket.readAll()))
+        state = self.__decoder.state
+        for jid, _ in events:
+            listener = self.__listeners.get(jid)
+            fields = state.get(jid)
+            # 같은 묶음 안에서 REMOVE 가 왔으면 상태가 이미 없다.
+            if listener is None or fields is None:
+                continue
+            listener(RemoteSource.make_data(jid, fields), fields['bits'])
+        if self.__decoder.synced and not was_synced:
+            self.__notify_lost()
+
+    def __notify_lost(self) -> None:
+        # 다시 붙은 스냅샷에 없는 타이머는 엔진이 다시 뜨면서 잃어버린 것이다.
+        lost, self.__known = self.__known - set(self.__decoder.state), set()
+        for jid in lost:
+            listener = self.__listeners.get(jid)
+            if listener is not None:
+                listener(Data(-1, Constant.ERROR, -1, 0, jid, 'Lost by the engine'), Constant.ERROR)
+
+
+class RemoteTimer(StateMixin, QtCore.QObject):
+    """
+    RemoteSource 엔진의 타이머를 EngineTimer 와 같은 인터페이스로 감싼 어댑터.
+    bitfield 는 스트림으로 받은 엔진의 상태 비트를 비춘 사본이고, 명령을 보낸 직후에는 먼저 바꿔 둔다.
+    위젯이 사라져도 돌고 있는 타이머는 엔진에 남겨 둔다.
+    """
+    ACTIVE = Constant.RUNNING | Constant.WAITING
+
+    def __init__(self, jid, parent=None):
+        super().__init__(parent)
+        self.__jid: str = jid
+        self.__signals: Signals = Signals()
+        self.__bitfield: BitMask = BitMask()
+        self.__observed: bool = True
+        self.__source = RemoteSource()
+
+        # init
+        self.__bitfield.activate(Constant.STOPPED)
+        self.__source.register(jid, self.__on_data)
+        source, bitfield = self.__source, self.__bitfield
+        self.destroyed.connect(lambda: RemoteTimer.__release(source, jid, bitfield))
+
+    @staticmethod
+    def __release(source: RemoteSource, jid: str, bitfield: BitMask) -> None:
+        source.unregister(jid)
+        if not bitfield.confirm(RemoteTimer.ACTIVE):
+            source.send('remove', jid=jid)
+
+    @property
+    def signals(self):
+        return self.__signals
+
+    @property
+    def bitfield(self):
+        return self.__bitfield
 
-    def run_start(self, total_num: int):
+    def __on_data(self, data: Data, bits: int) -> None:
+        was_active = self.__bitfield.confirm(RemoteTimer.ACTIVE | Constant.STARTED)
+        self.__bitfield.empty()
+        self.__bitfield.activate(bits)
+        # 스냅샷으로 다시 받은 종료 상태는 이미 처리했거나 이 위젯이 시작하지 않은 실행이다.
+        if data.ste & (Constant.FINISHED | Constant.STOPPED | Constant.ERROR) and not was_active:
+            return
+        self.signals.sig_data.emit(data)
+
+    def isRunning(self) -> bool:
+        return self.__bitfield.confirm(RemoteTimer.ACTIVE)
+
+    def group(self):
+        # 명령이 하나씩 따로 가므로 엔진 프로세스에서 같은 시각으로 묶이지 않는다 (rpc 의 batch/linked 를 쓴다).
+        return contextlib.nullcontext()
+
+    def adopt(self, bits: int) -> None:
+        """
+        엔진에서 이미 돌고 있는 타이머를 이어받는다.
+        :param bits: 엔진 타이머의 상태 비트
+        :return:
+        """
+        self.__bitfield.empty()
+        self.__bitfield.activate(bits)
+
+    def run_start(self, duration_msec: int, tick_msec: int = 1000, elapsed_msec: int = 0,
+                  alarm_at: typing.Optional[int] = None):
+        # 응답을 기다리지 않고 바로 RUNNING 으로 두고, 엔진이 거절하면 callback 에서 ERROR 로 바꾼다.
+        self.__source.call('create', callback=self.__on_created, duration=duration_msec / 1000, jid=self.__jid,
+                           tick=tick_msec / 1000, start=True, elapsed=elapsed_msec / 1000,
+                           at=alarm_at / NSEC_PER_SEC if alarm_at is not None else None)
         self.set_ste_running()
-        self.__total_num = total_num
-        self.start()
+        if not self.__observed:
+            self.__source.send('observe', jid=self.__jid, observed=False)
 
-    def set_ste_started(self) -> None:
-        self.bitfield.empty()
-        self.bitfield.activate(Constant.STARTED)
+    def __on_created(self, _, err: typing.Optional[Exception]) -> None:
+        if err is None:
+            return
+        self.set_ste_error()
+        self.signals.sig_data.emit(Data(-1, Constant.ERROR, -1, 0, self.__jid, f'Engine error: {err}'))
 
-    def set_ste_running(self) -> None:
-        if self.bitfield.confirm(Constant.RUNNING | Constant.WAITING):
-            self.bitfield.toggle(Constant.RUNNING | Constant.WAITING)
-        else:
-            if not self.bitfield.confirm(Constant.RUNNING):
-                self.bitfield.activate(Constant.RUNNING)
-                self.bitfield.deactivate(Constant.STARTED | Constant.WAITING | Constant.STOPPED | Constant.FINISHED)
+    def set_observed(self, observed: bool) -> None:
+        self.__observed = observed
+        if self.isRunning():
+            self.__source.send('observe', jid=self.__jid, observed=observed)
 
     def set_ste_waiting(self) -> None:
-        if self.bitfield.confirm(Constant.RUNNING | Constant.WAITING):
-            self.bitfield.toggle(Constant.RUNNING | Constant.WAITING)
-        else:
-            self.bitfield.activate(Constant.WAITING)
-            self.bitfield.deactivate(Constant.RUNNING | Constant.STOPPED | Constant.FINISHED)
-
-    def set_ste_stopped(self) -> None:
-        self.bitfield.empty()
-        self.bitfield.activate(Constant.STOPPED)
+        if self.__bitfield.confirm(Constant.RUNNING):
+            self.__source.send('pause', jid=self.__jid, linked=False)
+            super().set_ste_waiting()
+        elif self.__bitfield.confirm(Constant.WAITING):
+            self.resume()
 
-    def set_ste_error(self) -> None:
-        self.bitfield.empty()
-        self.bitfield.activate(Constant.STOPPED | Constant.ERROR)
+    def resume(self):
+        if self.__bitfield.confirm(Constant.WAITING):
+            self.__source.send('resume', jid=self.__jid, linked=False)
+            super().set_ste_waiting()
 
-    def set_ste_finished(self) -> None:
-        self.bitfield.empty()
-        self.bitfield.activate(Constant.FINISHED)
+    def stop(self):
+        self.__source.send('stop', jid=self.__jid, linked=False)
 
 
 class ComboBoxItem(QtWidgets.QListWidgetItem):
@@ -193,39 +505,132 @@ class SingleTimer(QtWidgets.QWidget, timer_ui.Ui_Form__timer):
         'Run Houdini':          '/opt/hfs19.5/bin/houdini'
     }
 
-    def __init__(self, parent=None):
+    # 타이머 엔진 백엔드. 모두 core 의 TimerEngine 을 쓰고, 첫 번째가 기본값이다.
+    BACKENDS = {
+        'tick':                 TickTimer,
+        'asyncio':              AioTimer,
+        'remote':               RemoteTimer,
+    }
+
+    MIN_TICK_MSEC = 10
+    # comboBox__tick 의 tick 간격 (표시 이름: 밀리초). 1초보다 짧으면 밀리초까지 입력/표시한다.
+    TICK_CHOICES = {
+        '1 s':      1000,
+        '100 ms':   100,
+        '10 ms':    10,
+    }
+    # logView__debug 에 남기는 최대 줄 수
+    LOG_CAPACITY = 1000
+    # UI 로 보내는 Running 이벤트의 최소 간격 (초). tick 이 더 촘촘해도 이 주기로 병합된다.
+    DISPLAY_INTERVAL = 1 / 30
+    # 1초 이상 tick 을 가진 타이머들의 중간 tick 을 벽시계 초 경계에 모은다 (엔진 백엔드)
+    ALIGN_INTERVAL = 1.0
+    # 벽시계 이동과 절전 복귀를 확인하는 주기 (초, 엔진 백엔드). 모든 타이머를 한 번에 다시 계산한다.
+    CLOCK_CHECK_INTERVAL = 1.0
+
+    def __init__(self, parent=None, backend: str = 'tick', event_log: typing.Optional[EventLog] = None,
+                 history: typing.Optional[HistoryRecorder] = None, journal: typing.Optional[TimerJournal] = None,
+                 actions: typing.Optional[ActionJournal] = None, state_table: typing.Optional[StateTable] = None,
+                 jid: typing.Optional[str] = None):
         super().__init__(parent)
         self.setupUi(self)
         qdarktheme.setup_theme()
         self.setAutoFillBackground(True)
-        self.__jid = uuid.uuid4().hex
+        # 복원한 타이머는 원래 jid 를 그대로 쓴다.
+        self.__jid = jid or uuid.uuid4().hex
+        # 이번 실행을 시작한 벽시계 시각 (ns). 만료 명령의 (jid, run) 키가 된다.
+        self.__run: int = 0
+        self.__tick_msec: int = 1000
+        # 보이지 않는 동안 tick 마다의 다시 그리기를 미루고 마지막 Data 만 보관한다.
+        self.__gate_open: bool = True
+        self.__pending_data: typing.Optional[Data] = None
+        # 상태 전이, 만료, 명령 실행을 남긴다. 쓰기는 EventLog 의 writer 스레드에서 한다.
+        self.__event_log: typing.Optional[EventLog] = event_log
+        # 끝난 타이머를 컬럼 저장소에 한 행으로 남긴다.
+        self.__history: typing.Optional[HistoryRecorder] = history
+        # 비정상 종료 뒤에도 이어서 돌릴 수 있도록 시작/일시정지/재개/종료를 journal 에 남긴다.
+        self.__journal: typing.Optional[TimerJournal] = journal
+        # 만료 명령을 (jid, run) 마다 한 번만 실행한다.
+        self.__actions: typing.Optional[ActionJournal] = actions
+        # 외부 모니터가 읽는 공유 메모리 상태 표. 이벤트가 올 때만 쓰므로 이벤트가 뜸한 동안에는
+        # 읽는 쪽이 표의 만료 시각(deadline)으로 남은 시간을 계산한다.
+        self.__state_table: typing.Optional[StateTable] = state_table
         self.signals = Signals()
 
         # init
         self.__init_set_ui()
         self.__init_set()
-        self.__work_thread = WorkThread(jid=self.__jid, parent=self)
+        self.__work_thread = SingleTimer.BACKENDS[backend](jid=self.__jid, parent=self)
 
         # connections
         self.pushButton__start.clicked.connect(self.slot_start_timer)
         self.pushButton__stop.clicked.connect(self.slot_stop_timer)
         self.__work_thread.signals.sig_data.connect(self.slot_update_ui)
         self.comboBox__link.currentIndexChanged.connect(self.slot_idx_changed_cmb_link)
+        self.signals.sig_call.connect(self.slot_call)
 
         self.pushButton__add_item.clicked.connect(self.slot_add_item)
         self.pushButton__del_item.clicked.connect(self.slot_del_item)
         self.listWidget__command.doubleClicked.connect(self.slot_double_clk_item)
 
+    @QtCore.Slot(object)
+    def slot_call(self, fn: typing.Callable[[], None]) -> None:
+        fn()
+
     @QtCore.Slot(str, int)
     def slot_idx_changed_cmb_link(self, idx):
         self.signals.changed_link.emit(self.jid, idx)
+        if self.__journal is not None:
+            self.__journal.update(self.__jid, self.comboBox__link.currentText(), self.get_commands())
 
     def closeEvent(self, event):
         if self.__work_thread.isRunning():
             self.__work_thread.stop()
+        self.__log_handler.close()
         event.accept()
 
+    def showEvent(self, event):
+        self.set_update_gate(True)
+        super().showEvent(event)
+
+    def hideEvent(self, event):
+        self.set_update_gate(False)
+        super().hideEvent(event)
+
+    def set_update_gate(self, is_open: bool) -> None:
+        """
+        닫혀 있으면 Running tick 의 다시 그리기를 건너뛰고, 열리면 마지막 상태를 한 번에 그린다.
+        상태 전이(시작/일시정지/정지/완료)와 명령 실행은 닫혀 있어도 그대로 처리한다.
+        :param is_open:
+        :return:
+        """
+        self.__work_thread.set_observed(is_open)
+        self.__gate_open = is_open
+        if is_open and self.__pending_data is not None:
+            data, self.__pending_data = self.__pending_data, None
+            self.slot_update_ui(data)
+
     def __init_set_ui(self):
+        # 계속 커지는 textEdit__debug 대신 용량이 정해진 로그 뷰를 같은 자리에 둔다.
+        self.logView__debug = qt_lib.LogView(capacity=SingleTimer.LOG_CAPACITY, parent=self)
+        self.verticalLayout_3.replaceWidget(self.textEdit__debug, self.logView__debug)
+        self.textEdit__debug.deleteLater()
+        # 타이머마다 로거 하나. 부른 스레드에서는 큐에 넣기만 하고 GUI 스레드에서 몰아서 로그 뷰에 붙인다.
+        self.__logger = logging.getLogger(f'{__name__}.{self.__jid}')
+        self.__log_handler = qt_lib.LogHandler(self.logView__debug, logger=self.__logger)
+        # 체크하면 timeEdit__timer 를 기간이 아니라 다음에 돌아오는 벽시계 시각으로 본다.
+        self.checkBox__alarm = QtWidgets.QCheckBox('Alarm', self)
+        self.checkBox__alarm.setToolTip('Expire at this wall-clock time instead of after this duration')
+        self.horizontalLayout_3.insertWidget(self.horizontalLayout_3.indexOf(self.timeEdit__timer),
+                                             self.checkBox__alarm)
+        # tick 간격 (정밀도). 1초보다 짧으면 timeEdit__timer 와 남은 시간을 밀리초까지 보여 준다.
+        self.comboBox__tick = QtWidgets.QComboBox(self)
+        self.comboBox__tick.setToolTip('Tick interval (display precision)')
+        for text, msec in SingleTimer.TICK_CHOICES.items():
+            self.comboBox__tick.addItem(text, msec)
+        self.horizontalLayout_3.insertWidget(self.horizontalLayout_3.indexOf(self.timeEdit__timer) + 1,
+                                             self.comboBox__tick)
+        self.comboBox__tick.currentIndexChanged.connect(self.slot_idx_changed_cmb_tick)
         self.progressBar__remaining.setValue(0)
         self.lcdNumber__remaining.display('00:00:00')
         self.label__jid.setText(self.__jid)
@@ -236,18 +641,61 @@ class SingleTimer(QtWidgets.QWidget, timer_ui.Ui_Form__timer):
     def __init_set(self):
         self.pushButton__start.setText('Start')
         self.timeEdit__timer.setEnabled(True)
+        self.checkBox__alarm.setEnabled(True)
+        self.comboBox__tick.setEnabled(True)
+
+    @QtCore.Slot(int)
+    def slot_idx_changed_cmb_tick(self, idx: int) -> None:
+        self.tick_msec = self.comboBox__tick.itemData(idx)
 
     @property
     def work_thread(self):
         return self.__work_thread
 
+    @property
+    def tick_msec(self) -> int:
+        return self.__tick_msec
+
+    @tick_msec.setter
+    def tick_msec(self, msec: int) -> None:
+        """
+        타이머의 tick 간격. 1초보다 짧으면 밀리초까지 입력/표시한다.
+        :param msec: 10 ms 이상
+        :return:
+        """
+        self.__tick_msec = max(SingleTimer.MIN_TICK_MSEC, msec)
+        # 복원/붙인 타이머의 tick 이 목록에 없으면 항목을 더한다.
+        idx = self.comboBox__tick.findData(self.__tick_msec)
+        if idx < 0:
+            self.comboBox__tick.addItem(f'{self.__tick_msec} ms', self.__tick_msec)
+            idx = self.comboBox__tick.count() - 1
+        self.comboBox__tick.blockSignals(True)
+        self.comboBox__tick.setCurrentIndex(idx)
+        self.comboBox__tick.blockSignals(False)
+        if self.__tick_msec < 1000:
+            self.timeEdit__timer.setDisplayFormat('hh:mm:ss.zzz')
+            self.lcdNumber__remaining.setDigitCount(12)
+            self.lcdNumber__remaining.display('00:00:00.000')
+        else:
+            self.timeEdit__timer.setDisplayFormat('hh:mm:ss')
+            self.lcdNumber__remaining.setDigitCount(8)
+            self.lcdNumber__remaining.display('00:00:00')
+
+    def remaining_text(self, data: Data) -> str:
+        if self.__tick_msec < 1000 and data.msec >= 0:
+            return SingleTimer.msec2qtime(data.msec).toString('hh:mm:ss.zzz')
+        return SingleTimer.sec2qtime(data.sec).toString()
+
     @property
     def jid(self) -> str:
         return self.__jid
 
-    def append2textbrowser(self, msg) -> None:
-        self.textEdit__debug.append(msg)
-        self.textEdit__debug.moveCursor(QtGui.QTextCursor.End)
+    @property
+    def logger(self) -> logging.Logger:
+        return self.__logger
+
+    def append2textbrowser(self, msg, level: str = 'INFO') -> None:
+        self.__logger.log(logging.getLevelName(level), msg, extra=dict(jid=self.__jid))
 
     @QtCore.Slot(QtCore.QModelIndex)
     def slot_double_clk_item(self, item: QtCore.QModelIndex):
@@ -284,13 +732,22 @@ class SingleTimer(QtWidgets.QWidget, timer_ui.Ui_Form__timer):
 
     @QtCore.Slot(Data)
     def slot_update_ui(self, data: Data) -> None:
+        if self.__event_log is not None:
+            self.__event_log.record_data(data)
+        if self.__state_table is not None:
+            self.__state_table.publish(data, self.__work_thread.bitfield.field)
+        if not self.__gate_open and data.ste == Constant.RUNNING and \
+                self.__work_thread.bitfield.confirm(Constant.RUNNING):
+            self.__pending_data = data
+            return
+        self.__pending_data = None
         if self.__work_thread.bitfield.confirm(Constant.STARTED | Constant.RUNNING):
             if self.__work_thread.bitfield.confirm(Constant.STARTED):
                 self.label__status.setText(data.msg)
             elif self.__work_thread.bitfield.confirm(Constant.RUNNING):
                 self.progressBar__remaining.setValue(data.ratio)
                 Color.set_color_progressbar(self.progressBar__remaining, Color.status.get(Constant.RUNNING))
-                self.lcdNumber__remaining.display(SingleTimer.sec2qtime(data.sec).toString())
+                self.lcdNumber__remaining.display(self.remaining_text(data))
                 self.listWidget__command.setEnabled(False)
         elif self.__work_thread.bitfield.confirm(Constant.WAITING):
             Color.set_color_progressbar(self.progressBar__remaining, Color.status.get(Constant.WAITING))
@@ -300,54 +757,169 @@ class SingleTimer(QtWidgets.QWidget, timer_ui.Ui_Form__timer):
                 Color.set_color_progressbar(self.progressBar__remaining, Color.status.get(Constant.ERROR))
             self.listWidget__command.setEnabled(True)
             self.__init_set()
+            ste = Constant.ERROR if self.__work_thread.bitfield.confirm(Constant.ERROR) else Constant.STOPPED
+            if self.__history is not None:
+                self.__history.end(self.__jid, ste)
+            if self.__journal is not None:
+                self.__journal.end(self.__jid, ste)
         elif self.__work_thread.bitfield.confirm(Constant.FINISHED):
             self.listWidget__command.setEnabled(True)
             self.__init_set()
             Color.set_color_progressbar(self.progressBar__remaining, Color.status.get(Constant.FINISHED))
+            end = None
+            if self.__journal is not None:
+                jid, journal = self.__jid, self.__journal
+                end = lambda: journal.end(jid, Constant.FINISHED)
             if data.sec <= 0:
-                self.run_commands()
+                # 만료 명령이 있으면 end 는 due 가 디스크에 남은 뒤에 남긴다.
+                end = self.run_commands(end)
+            if self.__history is not None:
+                self.__history.end(self.__jid, Constant.FINISHED)
+            if end is not None:
+                end()
         self.label__status.setText(data.msg)
         if self.__work_thread.bitfield.confirm(Constant.ERROR):
-            self.append2textbrowser(f'{data.msg} {int(data.ratio)}%')
+            self.append2textbrowser(f'{data.msg} {int(data.ratio)}%', level='ERROR')
         else:
             self.append2textbrowser(f'{data.msg} {int(data.ratio)}%')
 
-    def run_commands(self):
+    def run_commands(self, on_durable: typing.Optional[typing.Callable[[], None]] = None):
+        """
+        :param on_durable: ActionJournal 을 쓰면 due 가 디스크에 남은 뒤 GUI 스레드에서 부를 함수
+        :return: 넘겨받지 않은 on_durable (호출하는 쪽이 바로 부른다)
+        """
         cmds = self.get_commands()
         if not len(cmds):
-            return
+            return on_durable
+        if self.__actions is not None:
+            paths = [SingleTimer.CMDS_SET.get(cmd) for cmd in cmds]
+            notify = None if on_durable is None else lambda: self.signals.sig_call.emit(on_durable)
+            # 실제 실행은 due 가 디스크에 남은 뒤 ActionJournal 이 한다.
+            if self.__actions.due(self.__jid, self.__run, paths, notify):
+                for path in paths:
+                    if self.__event_log is not None:
+                        self.__event_log.record('command', self.__jid, cmd=path)
+                    if self.__history is not None:
+                        self.__history.add_command(self.__jid, path)
+                    self.append2textbrowser(f'{path} 명령 실행!')
+            return None
         for cmd in cmds:
             sys_lib.System.open_file_using_thread(
                 pathlib.Path(SingleTimer.CMDS_SET.get(cmd)), None, False)
+            if self.__event_log is not None:
+                self.__event_log.record('command', self.__jid, cmd=SingleTimer.CMDS_SET.get(cmd))
+            if self.__history is not None:
+                self.__history.add_command(self.__jid, SingleTimer.CMDS_SET.get(cmd))
             self.append2textbrowser(f'{SingleTimer.CMDS_SET.get(cmd)} 명령 실행!')
+        return on_durable
 
     def get_commands(self):
         cnt_items = self.listWidget__command.count()
         return [self.listWidget__command.item(i).current_text for i in range(cnt_items)]
 
     def is_set_timer(self) -> bool:
-        return SingleTimer.qtime2sec(self.timeEdit__timer.time()) > 0
+        # 알람은 00:00:00 (자정) 도 올바른 시각이다.
+        return self.checkBox__alarm.isChecked() or SingleTimer.qtime2msec(self.timeEdit__timer.time()) > 0
+
+    def alarm_at(self) -> typing.Optional[int]:
+        """
+        :return: 알람이면 timeEdit__timer 의 시각이 다음에 돌아오는 벽시계 시각 (epoch ns), 아니면 None
+        """
+        if not self.checkBox__alarm.isChecked():
+            return None
+        qtime = self.timeEdit__timer.time()
+        return next_wall_time(qtime.hour(), qtime.minute(), qtime.second(), qtime.msec())
 
     def slot_start_timer(self):
         if not self.is_set_timer():
             QtWidgets.QMessageBox.warning(self, 'Warning', '타이머 설정을 해야 합니다.')
             return
         if not self.__work_thread.isRunning():
-            self.__work_thread.set_ste_started()
-            # start
-            self.__work_thread.run_start(self.qtime2sec(self.timeEdit__timer.time()))
-            self.timeEdit__timer.setEnabled(False)
-            if self.__work_thread.bitfield.confirm(Constant.RUNNING | Constant.WAITING):
-                self.pushButton__start.setText('Pause')
-                if self.__work_thread.bitfield.confirm(Constant.WAITING):
-                    self.pushButton__start.setText('Start')
+            self.__start()
         else:
             self.__work_thread.set_ste_waiting()
             if not self.__work_thread.bitfield.confirm(Constant.WAITING):
                 self.__work_thread.resume()
                 self.pushButton__start.setText('Pause')
+                if self.__history is not None:
+                    self.__history.resume(self.__jid)
+                if self.__journal is not None:
+                    self.__journal.resume(self.__jid)
             else:
                 self.pushButton__start.setText('Resume')
+                if self.__history is not None:
+                    self.__history.pause(self.__jid)
+                if self.__journal is not None:
+                    self.__journal.pause(self.__jid)
+
+    def __start(self, elapsed_msec: int = 0, run: int = 0, alarm_at: typing.Optional[int] = None) -> None:
+        duration_msec = self.qtime2msec(self.timeEdit__timer.time())
+        if alarm_at is None:
+            alarm_at = self.alarm_at()
+        self.__run = run or time.time_ns()
+        if alarm_at is not None:
+            duration_msec = max(0, (alarm_at - self.__run) // NSEC_PER_MSEC)
+        self.__work_thread.set_ste_started()
+        if self.__history is not None:
+            self.__history.begin(self.__jid, duration_msec * NSEC_PER_MSEC, self.comboBox__link.currentText())
+        if self.__journal is not None:
+            self.__journal.create(self.__jid, duration_msec * NSEC_PER_MSEC, self.__tick_msec * NSEC_PER_MSEC,
+                                  self.comboBox__link.currentText(), self.get_commands(), alarm_at=alarm_at)
+            self.__journal.start(self.__jid, elapsed_msec * NSEC_PER_MSEC, self.__run)
+        # start
+        self.__work_thread.run_start(duration_msec, self.__tick_msec, elapsed_msec, alarm_at)
+        self.timeEdit__timer.setEnabled(False)
+        self.checkBox__alarm.setEnabled(False)
+        self.comboBox__tick.setEnabled(False)
+        if self.__work_thread.bitfield.confirm(Constant.RUNNING | Constant.WAITING):
+            self.pushButton__start.setText('Pause')
+            if self.__work_thread.bitfield.confirm(Constant.WAITING):
+                self.pushButton__start.setText('Start')
+
+    def restore(self, entry: Entry, elapsed: int) -> None:
+        """
+        journal 에서 복원한 타이머를 이 위젯에서 이어서 돌린다. jid 가 다르면 새 jid 로 다시 기록되므로 이전 항목은 지운다.
+        :param entry:
+        :param elapsed: 지금까지 지난 시간 (ns)
+        :return:
+        """
+        self.tick_msec = entry.tick // NSEC_PER_MSEC
+        if entry.alarm_at is not None:
+            # 알람은 기록된 벽시계 시각 그대로 이어서 돈다. 꺼져 있는 동안 지났으면 바로 끝난다.
+            self.checkBox__alarm.setChecked(True)
+            self.timeEdit__timer.setTime(QtCore.QDateTime.fromMSecsSinceEpoch(entry.alarm_at // NSEC_PER_MSEC).time())
+        else:
+            self.checkBox__alarm.setChecked(False)
+            self.timeEdit__timer.setTime(SingleTimer.msec2qtime(entry.duration // NSEC_PER_MSEC))
+        idx = self.comboBox__link.findText(entry.group)
+        if idx >= 0:
+            self.comboBox__link.setCurrentIndex(idx)
+        for cmd in entry.commands:
+            if cmd not in SingleTimer.CMDS_SET:
+                continue
+            self.slot_add_item()
+            item: ComboBoxItem = self.listWidget__command.item(self.listWidget__command.count() - 1)
+            item.combobox.setCurrentText(cmd)
+        if self.__journal is not None and entry.jid != self.__jid:
+            self.__journal.remove(entry.jid)
+        self.__start(elapsed // NSEC_PER_MSEC, entry.run, entry.alarm_at)
+        if entry.state == Entry.PAUSED:
+            self.slot_start_timer()
+
+    def adopt(self, info: dict) -> None:
+        """
+        엔진 프로세스에서 이미 돌고 있는 타이머를 이 위젯에 붙인다 (remote 백엔드). 엔진에는 명령을 보내지 않는다.
+        :param info: ControlServer.timer_info() 의 결과
+        :return:
+        """
+        self.tick_msec = info['tick_msec']
+        self.timeEdit__timer.setTime(SingleTimer.msec2qtime(info['duration_msec']))
+        self.timeEdit__timer.setEnabled(False)
+        self.checkBox__alarm.setEnabled(False)
+        self.comboBox__tick.setEnabled(False)
+        self.__run = time.time_ns()
+        self.__work_thread.adopt(info['bits'])
+        self.pushButton__start.setText('Resume' if info['bits'] & Constant.WAITING else 'Pause')
 
     def slot_stop_timer(self):
         if self.__work_thread.isRunning():
@@ -359,6 +931,14 @@ class SingleTimer(QtWidgets.QWidget, timer_ui.Ui_Form__timer):
         total_sec = h * 3600 + m * 60 + s
         return total_sec
 
+    @staticmethod
+    def qtime2msec(qtime) -> int:
+        return SingleTimer.qtime2sec(qtime) * 1000 + qtime.msec()
+
+    @staticmethod
+    def msec2qtime(msec: int) -> QtCore.QTime:
+        return QtCore.QTime(0, 0).addMSecs(msec)
+
     @staticmethod
     def sec2qtime(sec: int) -> QtCore.QTime:
         h, m = divmod(sec, 3600)
@@ -369,6 +949,33 @@ class SingleTimer(QtWidgets.QWidget, timer_ui.Ui_Form__timer):
 
 if __name__ == '__main__':
     app = QtWidgets.QApplication(sys.argv)
-    timer = SingleTimer()
+    RemoteSource.SOCKET_PATH = qt_lib.QtLibs.value_from_argv(sys.argv, '--engine') or RemoteSource.SOCKET_PATH
+    log_path = qt_lib.QtLibs.value_from_argv(sys.argv, '--event-log')
+    event_log = EventLog(log_path) if log_path else None
+    history_path = qt_lib.QtLibs.value_from_argv(sys.argv, '--history')
+    history = HistoryRecorder(HistoryStore(history_path)) if history_path else None
+    journal_path = qt_lib.QtLibs.value_from_argv(sys.argv, '--journal')
+    journal = TimerJournal(journal_path) if journal_path else None
+    actions_path = qt_lib.QtLibs.value_from_argv(sys.argv, '--actions')
+    actions = ActionJournal(actions_path) if actions_path else None
+    table_path = qt_lib.QtLibs.value_from_argv(sys.argv, '--state-table')
+    state_table = StateTable(table_path) if table_path else None
+    restored = journal.restore() if journal is not None else list()
+    timer = SingleTimer(backend=qt_lib.QtLibs.backend_from_argv(sys.argv, list(SingleTimer.BACKENDS)),
+                        event_log=event_log, history=history, journal=journal, actions=actions,
+                        state_table=state_table, jid=restored[0][0].jid if restored else None)
     timer.show()
-    sys.exit(app.exec_())
+    if restored:
+        timer.restore(*restored[0])
+    ret = app.exec_()
+    if event_log is not None:
+        event_log.close()
+    if history is not None:
+        history.store.flush()
+    if journal is not None:
+        journal.close()
+    if actions is not None:
+        actions.close()
+    if state_table is not None:
+        state_table.close()
+    sys.exit(ret)
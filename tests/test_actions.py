@@ -0,0 +1,124 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# author        : Seongcheol Jeon
+# created date  : 2026.10.19
+# modified date : 2026.10.19
+# description   : ActionJournal 의 한 번만 실행과 TimerJournal end 의 순서
+
+import json
+import threading
+
+from core.actions import ActionJournal
+from core.persist import TimerJournal, Entry
+from core.states import Constant
+
+
+SEC = 1_000_000_000
+
+
+def records(path):
+    with open(path, encoding='utf8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def expire(tmp_path, launched, on_durable=None, run=1):
+    # 타이머 하나를 시작하고 만료 명령의 due 를 남긴다.
+    journal = TimerJournal(tmp_path / 'journal', snapshot_interval=0, commit_interval=0.01)
+    actions = ActionJournal(tmp_path / 'actions', launcher=launched.append, commit_interval=0.01)
+    journal.create('a', SEC, SEC, commands=['/bin/true'])
+    journal.start('a', 0, run)
+    actions.due('a', run, ['/bin/true'], on_durable)
+    return journal, actions
+
+
+def test_end_is_written_only_after_due_is_durable(tmp_path):
+    launched = list()
+    done = threading.Event()
+    seen = dict()
+    holder = dict()
+
+    def on_durable():
+        seen['due'] = [r['kind'] for r in records(tmp_path / 'actions' / ActionJournal.FILE)]
+        holder['journal'].end('a', Constant.FINISHED)
+        done.set()
+
+    journal, actions = expire(tmp_path, launched, None)
+    holder['journal'] = journal
+    # 같은 만료를 다시 받아도 due 가 이미 디스크에 있으니 한 번만 실행된다.
+    assert actions.due('a', 1, ['/bin/true'], on_durable) is False
+    assert done.wait(5)
+    assert 'due' in seen['due']
+    actions.close()
+    journal.close()
+    assert launched == ['/bin/true']
+
+    # 다시 열면 끝난 타이머도, 남은 명령도 없다.
+    journal = TimerJournal(tmp_path / 'journal', snapshot_interval=0)
+    actions = ActionJournal(tmp_path / 'actions', launcher=launched.append)
+    assert journal.restore() == []
+    assert actions.pending() == []
+    actions.close()
+    journal.close()
+    assert launched == ['/bin/true']
+
+
+def test_crash_after_due_before_end_runs_command_once(tmp_path):
+    launched = list()
+    done = threading.Event()
+    # end 를 남기기 전에 죽은 것처럼 on_durable 에서 아무것도 하지 않는다.
+    journal, actions = expire(tmp_path, launched, done.set)
+    assert done.wait(5)
+    actions.close()
+    journal.close()
+
+    journal = TimerJournal(tmp_path / 'journal', snapshot_interval=0)
+    actions = ActionJournal(tmp_path / 'actions', launcher=launched.append)
+    restored = journal.restore()
+    assert [(entry.jid, entry.state) for entry, _ in restored] == [('a', Entry.RUNNING)]
+    entry, _ = restored[0]
+    # 복원한 타이머가 다시 만료되어도 같은 (jid, run) 이라 명령은 다시 실행되지 않는다.
+    again = threading.Event()
+    assert actions.due('a', entry.run, ['/bin/true'], again.set) is False
+    assert again.wait(5)
+    actions.close()
+    journal.close()
+    assert launched == ['/bin/true']
+
+
+def test_crash_before_due_reaches_disk_replays_expiry(tmp_path):
+    launched = list()
+    journal = TimerJournal(tmp_path / 'journal', snapshot_interval=0, commit_interval=0.01)
+    journal.create('a', SEC, SEC, commands=['/bin/true'])
+    journal.start('a', 0, 7)
+    journal.close()
+    # due 가 남지 않았으면 end 도 남지 않았으므로 타이머가 복원되고 만료를 다시 처리한다.
+    journal = TimerJournal(tmp_path / 'journal', snapshot_interval=0)
+    (entry, _), = journal.restore()
+    done = threading.Event()
+    actions = ActionJournal(tmp_path / 'actions', launcher=launched.append, commit_interval=0.01)
+    assert actions.due('a', entry.run, ['/bin/true'], done.set) is True
+    assert done.wait(5)
+    actions.close()
+    journal.close()
+    assert entry.run == 7
+    assert launched == ['/bin/true']
+
+
+def test_reopen_drops_truncated_tail_and_launches_missed(tmp_path):
+    path = tmp_path / 'actions'
+    path.mkdir()
+    with open(path / ActionJournal.FILE, 'w', encoding='utf8') as f:
+        f.write(json.dumps(dict(ts=1, kind='due', jid='a', run=1, commands=['x', 'y'])) + '\n')
+        f.write(json.dumps(dict(ts=1, kind='launched', jid='a', run=1, idx=0)) + '\n')
+        f.write('{"ts":1,"kind":"completed","jid":"a"')
+    launched = list()
+    actions = ActionJournal(path, launcher=launched.append, commit_interval=0.01)
+    actions.close()
+    # 0 번은 launched 만 있어서 결과를 모르고, 1 번은 due 만 있어서 한 번 실행한다.
+    assert launched == ['y']
+    assert [idx for _, idx in actions.uncertain] == [0]
+
+
+if __name__ == '__main__':
+    pass
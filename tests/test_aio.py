@@ -0,0 +1,77 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# author        : Seongcheol Jeon
+# created date  : 2026.10.19
+# modified date : 2026.10.19
+# description   : await 할 수 있는 asyncio 타이머 엔진
+
+import asyncio
+
+import pytest
+
+from core.aio import AsyncTimerEngine
+from core.states import Constant
+
+
+def test_awaiting_timers_returns_their_finished_data():
+    async def main():
+        engine = AsyncTimerEngine(asyncio.get_running_loop())
+        loop = asyncio.get_running_loop()
+        began = loop.time()
+        short = engine.create_timer(0.05, tick=0.01)
+        long = engine.create_timer(0.1, tick=0.05)
+        results = await asyncio.gather(short, long)
+        took = loop.time() - began
+        engine.close()
+        return results, took
+
+    results, took = asyncio.run(main())
+    assert [data.ste for data in results] == [Constant.FINISHED] * 2
+    assert 0.1 <= took < 1.0
+
+
+def test_stopped_timer_cancels_its_awaiters():
+    async def main():
+        engine = AsyncTimerEngine(asyncio.get_running_loop())
+        timer = engine.create_timer(10)
+        asyncio.get_running_loop().call_later(0.01, engine.stop, timer.jid)
+        try:
+            with pytest.raises(asyncio.CancelledError):
+                await timer
+        finally:
+            engine.close()
+
+    asyncio.run(main())
+
+
+def test_restarted_and_recurring_runs_get_a_fresh_future():
+    async def main():
+        engine = AsyncTimerEngine(asyncio.get_running_loop())
+        timer = engine.create_timer(0.01, tick=0.01)
+        await timer
+        first = timer.future
+        engine.start(timer.jid)
+        assert timer.future is not first and not timer.future.done()
+        await timer
+        engine.close()
+
+    asyncio.run(main())
+
+
+def test_dependents_started_by_the_engine_are_awaitable():
+    async def main():
+        engine = AsyncTimerEngine(asyncio.get_running_loop())
+        first = engine.create_timer(0.02, tick=0.01, start=False)
+        second = engine.create_timer(0.02, tick=0.01, start=False)
+        engine.add_dependency(first.jid, second.jid)
+        engine.start(first.jid)
+        data = await asyncio.wait_for(second, 2.0)
+        engine.close()
+        return data
+
+    assert asyncio.run(main()).ste == Constant.FINISHED
+
+
+if __name__ == '__main__':
+    pass
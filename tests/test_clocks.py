@@ -0,0 +1,140 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# author        : Seongcheol Jeon
+# created date  : 2026.10.19
+# modified date : 2026.10.19
+# description   : 벽시계 알람과 벽시계 이동/절전 복귀 rebase
+
+import time
+import datetime
+
+import pytest
+
+from core import engine as engine_module
+from core.clocks import next_wall_time, parse_wall_time
+from core.engine import TimerEngine
+from core.states import Constant
+
+
+SEC = 1_000_000_000
+
+
+class ManualClock:
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self):
+        return self.now
+
+
+class Clocks:
+    # 엔진 시계(monotonic), 벽시계, boottime 을 따로 움직인다.
+    def __init__(self, monkeypatch):
+        self.engine = ManualClock()
+        self.wall = 1_800_000_000 * SEC
+        self.boot = 0
+        monkeypatch.setattr(time, 'time_ns', lambda: self.wall)
+        monkeypatch.setattr(time, 'time', lambda: self.wall / SEC)
+        monkeypatch.setattr(engine_module, 'boottime_ns', lambda: self.boot)
+
+    def sleep(self, ns: int) -> None:
+        self.engine.now += ns
+        self.wall += ns
+        self.boot += ns
+
+
+@pytest.fixture
+def clocks(monkeypatch):
+    return Clocks(monkeypatch)
+
+
+def finished_of(engine):
+    finished = list()
+    engine.subscribe(lambda data: finished.append(data.jid) if data.ste == Constant.FINISHED else None)
+    return finished
+
+
+def test_alarm_follows_a_wall_clock_jump(clocks):
+    engine = TimerEngine(clock=clocks.engine)
+    finished = finished_of(engine)
+    engine.create_alarm((clocks.wall + 60 * SEC) / SEC, jid='alarm', tick=60)
+    engine.create_timer(60, jid='countdown', tick=60)
+    clocks.sleep(10 * SEC)
+    # 벽시계만 20 초 앞으로 옮겨진다 (NTP, 수동 변경).
+    clocks.wall += 20 * SEC
+    assert engine.rebase() == 1
+    # 벽시계로 30 초가 지났으므로 엔진 시계로 40 초에 울린다.
+    engine.advance(40 * SEC - 1)
+    assert finished == []
+    engine.advance(40 * SEC)
+    assert finished == ['alarm']
+    engine.advance(60 * SEC)
+    assert finished == ['alarm', 'countdown']
+
+
+def test_suspend_advances_running_countdowns_but_not_paused_ones(clocks):
+    engine = TimerEngine(clock=clocks.engine)
+    finished = finished_of(engine)
+    engine.create_timer(60, jid='running', tick=60)
+    engine.create_timer(60, jid='paused', tick=60)
+    engine.pause('paused')
+    # 엔진 시계(monotonic)는 멈춰 있고 벽시계와 boottime 만 45 초 흐른다.
+    clocks.wall += 45 * SEC
+    clocks.boot += 45 * SEC
+    assert engine.rebase() == 1
+    clocks.engine.now = 15 * SEC
+    engine.advance(clocks.engine.now)
+    assert finished == ['running']
+    # 일시정지 중인 카운트다운은 엔진 시계로 멈춰 있던 만큼만 밀린다.
+    engine.resume('paused')
+    assert engine.get('paused').origin == 15 * SEC
+
+
+def test_small_drift_is_not_a_jump(clocks):
+    engine = TimerEngine(clock=clocks.engine, jump_threshold=0.05)
+    engine.create_alarm((clocks.wall + 60 * SEC) / SEC, jid='alarm')
+    origin = engine.get('alarm').origin
+    clocks.wall += 10_000_000
+    clocks.boot += 10_000_000
+    assert engine.rebase() == 0
+    assert engine.get('alarm').origin == origin
+
+
+@pytest.fixture
+def new_york(monkeypatch):
+    # 서머타임이 있는 시간대. 2026-03-08 02:00 -> 03:00, 2026-11-01 02:00 -> 01:00
+    monkeypatch.setenv('TZ', 'America/New_York')
+    time.tzset()
+    yield
+    monkeypatch.undo()
+    time.tzset()
+
+
+def local_ns(*args, fold: int = 0) -> int:
+    return int(datetime.datetime(*args, fold=fold).timestamp()) * SEC
+
+
+def test_wall_time_parsing(new_york):
+    now = datetime.datetime(2026, 10, 19, 12, 0)
+    assert next_wall_time(13, 0, now=now) == local_ns(2026, 10, 19, 13)
+    # 이미 지난 시각은 내일. tzinfo 가 있는 기준 시각은 로컬 시각으로 옮겨서 본다.
+    assert next_wall_time(11, 30, now=now) == local_ns(2026, 10, 20, 11, 30)
+    assert next_wall_time(11, 30, now=now.replace(tzinfo=datetime.timezone.utc)) == local_ns(2026, 10, 19, 11, 30)
+    assert parse_wall_time('2026-10-19T12:00:00.250+00:00') == local_ns(2026, 10, 19, 8) + 250_000_000
+    with pytest.raises(ValueError):
+        parse_wall_time('noon')
+
+
+def test_next_wall_time_uses_the_offset_of_the_target_day(new_york):
+    # 전날 밤 (EST) 에 맞춘 알람이 서머타임이 시작된 다음 날 (EDT) 09:00 에 울린다.
+    assert next_wall_time(9, 0, now=datetime.datetime(2026, 3, 7, 23, 0)) == local_ns(2026, 3, 8, 9)
+    assert next_wall_time(9, 0, now=datetime.datetime(2026, 10, 31, 23, 0).astimezone()) == local_ns(2026, 11, 1, 9)
+    # 건너뛴 02:30 은 03:30 EDT, 되풀이되는 01:30 은 첫 번째 (EDT)
+    assert next_wall_time(2, 30, now=datetime.datetime(2026, 3, 7, 23, 0)) == local_ns(2026, 3, 8, 3, 30)
+    assert next_wall_time(1, 30, now=datetime.datetime(2026, 10, 31, 23, 0)) == local_ns(2026, 11, 1, 1, 30)
+    assert parse_wall_time('2026-03-08T09:00') == local_ns(2026, 3, 8, 9)
+
+
+if __name__ == '__main__':
+    pass
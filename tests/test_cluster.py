@@ -0,0 +1,140 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# author        : Seongcheol Jeon
+# created date  : 2026.10.19
+# modified date : 2026.10.19
+# description   : 메모리 transport 위의 클러스터 failover 와 만료 명령 한 번 실행
+
+import asyncio
+import collections
+
+import pytest
+
+from core.cluster import ClusterNode, ClusterError, MemoryHub, MemoryTransport
+
+
+NODES = ('n1', 'n2', 'n3')
+SHARDS = 4
+LEASE = 0.3
+
+
+async def wait_for(predicate, timeout: float) -> bool:
+    loop = asyncio.get_running_loop()
+    until = loop.time() + timeout
+    while not predicate():
+        if loop.time() >= until:
+            return False
+        await asyncio.sleep(0.02)
+    return True
+
+
+async def start_cluster(tmp_path, launched):
+    hub = MemoryHub()
+    loop = asyncio.get_running_loop()
+    nodes = dict()
+    for node_id in NODES:
+        # 노드마다 어디서 실행했는지 남긴다.
+        nodes[node_id] = ClusterNode(node_id, {n: '' for n in NODES}, tmp_path, transport=MemoryTransport(hub),
+                                     shards=SHARDS, lease=LEASE, loop=loop,
+                                     launcher=lambda cmd, node_id=node_id: launched.append((node_id, cmd)))
+    for node in nodes.values():
+        await node.start()
+    owned = lambda: sorted(shard for node in nodes.values() for shard in node.owned())
+    assert await wait_for(lambda: owned() == list(range(SHARDS)), 10 * LEASE)
+    return hub, nodes
+
+
+def test_failover_fires_each_action_exactly_once(tmp_path):
+    launched = list()
+
+    async def main():
+        hub, nodes = await start_cluster(tmp_path, launched)
+        try:
+            jids = [await nodes['n1'].create_timer(1.0, jid=f't{i}', commands=[f'cmd-{i}']) for i in range(8)]
+            # 가장 많은 shard 를 가진 노드가 죽는다 (메시지를 주고받지 못한다).
+            victim = max(nodes.values(), key=lambda node: len(node.owned()))
+            victim_shards = set(victim.owned())
+            hub.down.add(victim.id)
+            survivors = [node for node in nodes.values() if node is not victim]
+            moved = lambda: victim_shards <= {shard for node in survivors for shard in node.owned()}
+            assert await wait_for(moved, 20 * LEASE)
+            assert await wait_for(lambda: len({cmd for _, cmd in launched}) == len(jids), 3.0)
+            # 늦게 도는 명령이 없는지 lease 몇 번 더 기다린다.
+            await asyncio.sleep(3 * LEASE)
+            return jids, victim.id
+        finally:
+            for node in nodes.values():
+                await node.close()
+
+    jids, victim = asyncio.run(main())
+    counts = collections.Counter(cmd for _, cmd in launched)
+    assert counts == {f'cmd-{i}': 1 for i in range(len(jids))}
+    # 죽은 노드는 과반수를 얻지 못하므로 아무것도 실행하지 않는다.
+    assert all(node != victim for node, _ in launched)
+
+
+def test_replicas_agree_after_pause_and_resume(tmp_path):
+    launched = list()
+
+    async def main():
+        hub, nodes = await start_cluster(tmp_path, launched)
+        try:
+            node = nodes['n2']
+            await node.create_timer(60.0, jid='long')
+            assert await node.pause('long')
+            assert not await node.pause('long')
+            shard = node.shard_of('long')
+            # 과반수가 같은 위치에 있고 같은 상태를 갖는다.
+            states = [n.replicas[shard].entries['long'].state for n in nodes.values()
+                      if 'long' in n.replicas[shard].entries]
+            assert len(states) >= 2 and set(states) == {'paused'}
+            assert await node.resume('long')
+            assert await node.stop('long')
+            assert await wait_for(lambda: all('long' not in n.replicas[shard].entries for n in nodes.values()), 1.0)
+        finally:
+            for node in nodes.values():
+                await node.close()
+
+    asyncio.run(main())
+    assert launched == []
+
+
+def test_pause_that_misses_the_quorum_changes_nothing(tmp_path):
+    launched = list()
+
+    async def main():
+        hub, nodes = await start_cluster(tmp_path, launched)
+        try:
+            await nodes['n1'].create_timer(60.0, jid='long')
+            shard = nodes['n1'].shard_of('long')
+            holder = next(node for node in nodes.values() if shard in node.owned())
+            # 주인만 남고 나머지가 끊긴다. lease 는 아직 남아 있지만 과반수에 쓸 수 없다.
+            hub.down.update(node.id for node in nodes.values() if node is not holder)
+            with pytest.raises(ClusterError):
+                await holder.pause('long')
+            # 주인의 엔진도 replica 도 일시정지되지 않았다 (shard 는 내려놓았다).
+            assert holder.replicas[shard].entries['long'].state == 'running'
+            assert 'long' not in holder.engine.timers or holder.engine.get('long').paused_at is None
+            assert shard not in holder.owned()
+
+            hub.down.clear()
+            owner = lambda: next((node for node in nodes.values() if shard in node.owned()), None)
+            running = lambda: owner() is not None and 'long' in owner().engine.timers and \
+                owner().engine.get('long').is_active()
+            assert await wait_for(running, 20 * LEASE)
+            assert await owner().pause('long')
+            assert owner().engine.get('long').paused_at is not None
+            states = [n.replicas[shard].entries['long'].state for n in nodes.values()
+                      if 'long' in n.replicas[shard].entries]
+            assert states.count('paused') >= 2
+        finally:
+            for node in nodes.values():
+                await node.close()
+
+    asyncio.run(main())
+    assert launched == []
+
+
+if __name__ == '__main__':
+    pass
@@ -0,0 +1,95 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# author        : Seongcheol Jeon
+# created date  : 2026.10.19
+# modified date : 2026.10.19
+# description   : 엔진 안에서 풀리는 타이머 의존 관계
+
+import pytest
+
+from core.deps import CycleError, ON_ERROR
+from core.engine import TimerEngine
+from core.events import Data
+from core.states import Constant
+
+
+SEC = 1_000_000_000
+
+
+def make_engine():
+    clock = [0]
+    engine = TimerEngine(clock=lambda: clock[0])
+    started = dict()
+
+    def on_data(data: Data):
+        if data.ste == Constant.STARTED:
+            started[data.jid] = engine.get(data.jid).origin
+
+    engine.subscribe(on_data)
+    return engine, clock, started
+
+
+def test_unknown_jid_raises_key_error():
+    engine, _, _ = make_engine()
+    engine.create_timer(1, jid='a', start=False)
+    with pytest.raises(KeyError, match='nope'):
+        engine.add_dependency('a', 'nope')
+    with pytest.raises(KeyError, match='nope'):
+        engine.add_dependency('nope', 'a')
+    assert not engine.dependencies.has_successors('a')
+
+
+def test_cycle_is_rejected():
+    engine, _, _ = make_engine()
+    for jid in 'abc':
+        engine.create_timer(1, jid=jid, start=False)
+    engine.add_dependency('a', 'b')
+    engine.add_dependency('b', 'c')
+    with pytest.raises(CycleError):
+        engine.add_dependency('c', 'a')
+
+
+def test_join_waits_for_every_predecessor_and_starts_at_the_scheduled_expiry():
+    engine, clock, started = make_engine()
+    engine.create_timer(1, jid='a')
+    engine.create_timer(3, jid='b')
+    engine.create_timer(1, jid='c', start=False)
+    engine.add_dependency('a', 'c')
+    engine.add_dependency('b', 'c', delay=0.5)
+    clock[0] = 2 * SEC
+    engine.advance()
+    assert 'c' not in started
+    # 늦게 깨어나도 c 는 b 의 예정 만료 시각 + delay 에서 시작한 것으로 센다.
+    clock[0] = 10 * SEC
+    engine.advance()
+    assert started['c'] == 3 * SEC + SEC // 2
+
+
+def test_chain_does_not_accumulate_latency():
+    engine, clock, started = make_engine()
+    jids = [f't{i}' for i in range(50)]
+    for i, jid in enumerate(jids):
+        engine.create_timer(1, jid=jid, start=i == 0)
+    for src, dst in zip(jids, jids[1:]):
+        engine.add_dependency(src, dst)
+    for step in range(1, 51):
+        clock[0] = step * SEC + 123
+        engine.advance()
+    assert [started[jid] for jid in jids] == [i * SEC for i in range(50)]
+
+
+def test_error_edge_starts_only_on_failure():
+    engine, _, started = make_engine()
+    engine.create_timer(5, jid='job')
+    engine.create_timer(1, jid='cleanup', start=False)
+    engine.add_dependency('job', 'cleanup', on=ON_ERROR)
+    engine.stop('job')
+    assert 'cleanup' not in started
+    engine.start('job')
+    engine.fail('job')
+    assert 'cleanup' in started
+
+
+if __name__ == '__main__':
+    pass
@@ -0,0 +1,312 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# author        : Seongcheol Jeon
+# created date  : 2026.10.19
+# modified date : 2026.10.19
+# description   : 가짜 시계로 돌리는 TimerEngine 의 tick, 일시정지, adaptive, 관찰 여부
+
+import time
+
+import pytest
+
+from core.engine import TimerEngine, MIN_TICK, adaptive_cadence
+from core.events import Data, Kind
+from core.states import Constant
+
+
+SEC = 1_000_000_000
+
+
+class Recorder:
+    # 엔진 리스너. (시계, 상태, 남은 초) 를 모은다.
+    def __init__(self, engine: TimerEngine, clock: list):
+        self.clock = clock
+        self.events = list()
+        engine.subscribe(self)
+
+    def __call__(self, data: Data):
+        self.events.append((self.clock[0], data.ste, data.sec))
+
+    def running(self):
+        return [(at, sec) for at, ste, sec in self.events if ste == Constant.RUNNING]
+
+    def at(self, ste):
+        return [at for at, kind, _ in self.events if kind == ste]
+
+
+def make_engine(**kwargs):
+    clock = [0]
+    engine = TimerEngine(clock=lambda: clock[0], **kwargs)
+    return engine, clock, Recorder(engine, clock)
+
+
+def run(engine, clock, until, step=SEC):
+    # 드라이버 대신 지금, 그리고 step 마다 깨어난다.
+    engine.advance()
+    while clock[0] < until:
+        clock[0] += step
+        engine.advance()
+
+
+def test_ticks_and_expiry_on_time():
+    engine, clock, rec = make_engine()
+    engine.create_timer(3, jid='a')
+    run(engine, clock, 5 * SEC)
+    assert rec.running() == [(0, 3), (SEC, 2), (2 * SEC, 1), (3 * SEC, 0)]
+    assert rec.at(Constant.FINISHED) == [3 * SEC]
+    assert not engine.get('a').is_active()
+
+
+def test_fractional_duration_ends_exactly_on_duration():
+    engine, clock, rec = make_engine()
+    engine.create_timer(2.5, jid='a')
+    assert engine.next_deadline() == 0
+    engine.advance()
+    assert engine.next_deadline() == SEC
+    run(engine, clock, 2 * SEC)
+    assert engine.next_deadline() == 2 * SEC + SEC // 2
+
+
+def test_late_wakeup_emits_one_tick_and_keeps_the_deadline():
+    engine, clock, rec = make_engine()
+    engine.create_timer(10, jid='a')
+    engine.advance()
+    clock[0] = 4 * SEC + 300
+    engine.advance()
+    # 밀린 tick 들을 몰아서 내지 않고 하나만 내보낸 뒤 현재 위치의 다음 tick 으로 건너뛴다.
+    assert rec.running() == [(0, 10), (4 * SEC + 300, 9)]
+    assert engine.next_deadline() == 5 * SEC
+
+
+def test_pause_shifts_the_expiry_by_the_paused_time():
+    engine, clock, rec = make_engine()
+    engine.create_timer(3, jid='a')
+    run(engine, clock, SEC)
+    clock[0] = SEC + SEC // 2
+    engine.pause('a')
+    assert engine.next_deadline() is None
+    clock[0] = 11 * SEC + SEC // 2
+    engine.resume('a')
+    run(engine, clock, 20 * SEC, SEC // 4)
+    assert rec.at(Constant.FINISHED) == [13 * SEC]
+    assert engine.get('a').paused_at is None
+
+
+def test_pause_and_resume_are_idempotent():
+    engine, clock, rec = make_engine()
+    engine.create_timer(3, jid='a')
+    engine.resume('a')
+    engine.pause('a')
+    clock[0] = SEC
+    engine.pause('a')
+    clock[0] = 2 * SEC
+    engine.resume('a')
+    engine.resume('a')
+    run(engine, clock, 6 * SEC)
+    assert rec.at(Constant.FINISHED) == [5 * SEC]
+
+
+def test_events_carry_their_kind():
+    engine, clock, _ = make_engine()
+    events = list()
+    engine.subscribe(lambda data: events.append((data.ste, data.kind)))
+    engine.create_timer(3, jid='a')
+    engine.advance()
+    engine.pause('a')
+    engine.resume('a')
+    engine.stop('a')
+    # 일시정지, 재개, tick 은 모두 RUNNING 으로 오고 kind 로만 구분된다.
+    assert events == [(Constant.STARTED, ''), (Constant.RUNNING, Kind.TICK), (Constant.RUNNING, Kind.PAUSE),
+                      (Constant.RUNNING, Kind.RESUME), (Constant.STOPPED, '')]
+
+
+def test_stop_cancels_and_restart_begins_again():
+    engine, clock, rec = make_engine()
+    engine.create_timer(2, jid='a')
+    run(engine, clock, SEC)
+    engine.stop('a')
+    assert engine.next_deadline() is None
+    assert rec.at(Constant.STOPPED) == [SEC]
+    engine.start('a')
+    run(engine, clock, 5 * SEC)
+    assert rec.at(Constant.FINISHED) == [3 * SEC]
+
+
+def test_start_with_elapsed_continues_a_restored_timer():
+    engine, clock, rec = make_engine()
+    engine.create_timer(10, jid='a', start=False)
+    engine.start('a', 7 * SEC)
+    run(engine, clock, 5 * SEC)
+    assert rec.at(Constant.FINISHED) == [3 * SEC]
+
+
+def test_duplicate_running_jid_is_rejected():
+    engine, _, _ = make_engine()
+    engine.create_timer(3, jid='a')
+    with pytest.raises(ValueError):
+        engine.create_timer(3, jid='a')
+
+
+@pytest.mark.parametrize('tick', [0, 1e-9, 0.001])
+def test_tick_is_raised_to_the_minimum(tick):
+    engine, clock, rec = make_engine()
+    assert engine.create_timer(0.3, jid='a', tick=tick).tick == MIN_TICK
+    run(engine, clock, SEC, step=MIN_TICK // 10)
+    # 0.3 초 동안 10 ms 마다 한 번, 시작 때 한 번
+    assert len(rec.running()) == 31
+    assert rec.at(Constant.FINISHED) == [300_000_000]
+
+
+def test_adaptive_timer_wakes_rarely_far_from_expiry():
+    engine, clock, rec = make_engine()
+    engine.create_timer(12 * 3600, jid='a', adaptive=True)
+    run(engine, clock, 12 * 3600 * SEC, SEC)
+    ticks = rec.running()
+    # tick 마다 깨어나는 것은 마지막 1분 정도뿐이다.
+    assert len(ticks) < 2000
+    assert rec.at(Constant.FINISHED) == [12 * 3600 * SEC]
+    gaps = [b - a for (a, _), (b, _) in zip(ticks, ticks[1:])]
+    assert max(gaps) <= 12 * 3600 * SEC // 100
+    assert gaps[-1] == SEC
+
+
+def test_adaptive_cadence_bounds():
+    engine, _, _ = make_engine()
+    timer = engine.create_timer(100, jid='a', start=False)
+    assert adaptive_cadence(timer) == SEC
+    timer = engine.create_timer(12 * 3600, jid='b', start=False)
+    assert adaptive_cadence(timer) == 12 * 3600 * SEC // 100
+
+
+def test_unobserved_timer_wakes_only_at_expiry():
+    engine, clock, rec = make_engine()
+    engine.create_timer(100, jid='a')
+    engine.advance()
+    engine.set_observed('a', False)
+    assert engine.next_deadline() == 100 * SEC
+    clock[0] = 40 * SEC + 1
+    engine.advance()
+    assert len(rec.running()) == 1
+    # 다시 보이면 현재 위치를 곧바로 내보내고 tick 마다 깨어난다.
+    engine.set_observed('a', True)
+    engine.advance()
+    assert rec.running()[-1] == (40 * SEC + 1, 60)
+    assert engine.next_deadline() == 41 * SEC
+
+
+def test_display_interval_coalesces_running_events():
+    engine, clock, rec = make_engine(display_interval=1.0)
+    engine.create_timer(2, jid='a', tick=0.1)
+    run(engine, clock, 3 * SEC, SEC // 10)
+    ticks = [at for at, _ in rec.running()]
+    assert ticks == [0, SEC, 2 * SEC]
+    assert rec.at(Constant.FINISHED) == [2 * SEC]
+
+
+def test_waker_gets_the_earliest_deadline_only_when_it_changes():
+    engine, clock, _ = make_engine()
+    armed = list()
+    engine.set_waker(armed.append)
+    engine.create_timer(5, jid='a', start=False)
+    engine.create_timer(3, jid='b', start=False)
+    engine.start('a')
+    engine.start('b')
+    assert armed == [0]
+    engine.advance()
+    assert armed[-1] == SEC
+    engine.remove('a')
+    engine.remove('b')
+    # 취소는 깨우기를 다시 잡지 않는다. 예약해 둔 시각에 한 번 헛깨어나고 끝난다.
+    clock[0] = SEC
+    assert engine.advance() == 0
+    assert engine.next_deadline() is None
+    assert armed == [0, SEC]
+
+
+if __name__ == '__main__':
+    pass
+
+
+MSEC = 1_000_000
+
+
+def make_aligned(monkeypatch, **kwargs):
+    # 엔진 시계 0 이 벽시계 x.3 초라서 벽시계 정각 경계는 엔진 시계의 0.7, 1.7, ... 초이다.
+    monkeypatch.setattr(time, 'time_ns', lambda: 300 * MSEC)
+    clock = [0]
+    engine = TimerEngine(clock=lambda: clock[0], **kwargs)
+    events = list()
+    engine.subscribe(lambda data: events.append((clock[0], data.jid, data.ste)))
+    return engine, clock, events
+
+
+def run_deadlines(engine, clock, until):
+    # 엔진이 고른 시각에만 깨어난다.
+    engine.advance()
+    while engine.next_deadline() is not None and engine.next_deadline() <= until:
+        clock[0] = engine.next_deadline()
+        engine.advance()
+
+
+def times(events, jid, ste):
+    return [at for at, event_jid, kind in events if event_jid == jid and kind == ste]
+
+
+def test_aligned_ticks_of_different_timers_share_boundaries(monkeypatch):
+    engine, clock, events = make_aligned(monkeypatch, align=1.0)
+    engine.create_timer(5, jid='a')
+    engine.advance()
+    clock[0] = 250 * MSEC
+    engine.create_timer(5, jid='b')
+    run_deadlines(engine, clock, 10 * SEC)
+    boundaries = [1700 * MSEC, 2700 * MSEC, 3700 * MSEC, 4700 * MSEC]
+    assert times(events, 'a', Constant.RUNNING) == [0] + boundaries + [5 * SEC]
+    assert times(events, 'b', Constant.RUNNING) == [250 * MSEC] + boundaries + [5250 * MSEC]
+    # 두 타이머의 중간 tick 은 같은 경계에서 한 번에 깨어난다.
+    assert sorted({at for at, _, _ in events}) == [0, 250 * MSEC] + boundaries + [5 * SEC, 5250 * MSEC]
+
+
+def test_ticks_further_than_slack_from_a_boundary_are_not_aligned(monkeypatch):
+    engine, clock, events = make_aligned(monkeypatch, align=1.0, slack=0.5)
+    # a 의 tick 은 경계까지 0.7 초를 미뤄야 하므로 그대로, b 는 0.4 초라서 경계로 간다.
+    engine.create_timer(4, jid='a')
+    engine.advance()
+    clock[0] = 300 * MSEC
+    engine.create_timer(4, jid='b')
+    run_deadlines(engine, clock, 10 * SEC)
+    assert times(events, 'a', Constant.RUNNING) == [0, SEC, 2 * SEC, 3 * SEC, 4 * SEC]
+    assert times(events, 'b', Constant.RUNNING) == [300 * MSEC, 1700 * MSEC, 2700 * MSEC, 3700 * MSEC,
+                                                    4300 * MSEC]
+
+
+def test_timers_with_a_tick_below_align_are_not_aligned(monkeypatch):
+    engine, clock, events = make_aligned(monkeypatch, align=1.0)
+    engine.create_timer(1, jid='a', tick=0.25)
+    run_deadlines(engine, clock, 2 * SEC)
+    assert times(events, 'a', Constant.RUNNING) == [0, 250 * MSEC, 500 * MSEC, 750 * MSEC, SEC]
+
+
+@pytest.mark.parametrize('duration', [2.5, 3.9, 4.0])
+def test_alignment_never_moves_the_expiry(monkeypatch, duration):
+    engine, clock, events = make_aligned(monkeypatch, align=1.0)
+    engine.create_timer(duration, jid='a')
+    run_deadlines(engine, clock, 10 * SEC)
+    expiry = round(duration * SEC)
+    assert times(events, 'a', Constant.FINISHED) == [expiry]
+    assert max(at for at, _, _ in events) == expiry
+
+
+def test_alignment_keeps_the_expiry_after_a_pause(monkeypatch):
+    engine, clock, events = make_aligned(monkeypatch, align=1.0)
+    engine.create_timer(3, jid='a')
+    run_deadlines(engine, clock, SEC)
+    clock[0] = 1200 * MSEC
+    engine.pause('a')
+    clock[0] = 1450 * MSEC
+    engine.resume('a')
+    run_deadlines(engine, clock, 10 * SEC)
+    # 경계는 그대로 벽시계 정각이고, 만료만 멈춘 0.25 초만큼 늦어진다.
+    ticks = [at for at in times(events, 'a', Constant.RUNNING) if at > 1450 * MSEC]
+    assert ticks == [1700 * MSEC, 2700 * MSEC, 3250 * MSEC]
+    assert times(events, 'a', Constant.FINISHED) == [3250 * MSEC]
@@ -0,0 +1,102 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# author        : Seongcheol Jeon
+# created date  : 2026.10.19
+# modified date : 2026.10.19
+# description   : group commit 이벤트 로그와 로테이션
+
+import os
+import time
+import errno
+
+import pytest
+
+from core import eventlog as eventlog_module
+
+from core.eventlog import EventLog
+from core.events import Data, Kind
+from core.states import Constant
+
+
+@pytest.mark.parametrize('fmt', EventLog.FORMATS)
+def test_records_round_trip(tmp_path, fmt):
+    log = EventLog(tmp_path / 'events.log', fmt=fmt, commit_interval=0.01, fsync=False)
+    log.record('cmd', 'a', cmd='echo 한글')
+    log.record('state', 'b', state='paused')
+    log.close()
+    records = list(EventLog.read(log.path, fmt))
+    assert [(r['kind'], r['jid']) for r in records] == [('cmd', 'a'), ('state', 'b')]
+    assert records[0]['cmd'] == 'echo 한글'
+    assert all(r['ts'] > 0 for r in records)
+
+
+def test_group_commit_writes_a_burst_at_once(tmp_path):
+    log = EventLog(tmp_path / 'events.log', commit_interval=0.05, fsync=False)
+    committed = list()
+    log.add_commit_listener(committed.append)
+    for num in range(500):
+        log.record('cmd', f't{num}')
+    log.close()
+    assert log.written == 500
+    # 한 번에 몰린 레코드는 레코드마다가 아니라 몇 번의 commit 으로 쓰인다.
+    assert log.commits <= 3
+    assert committed[-1] == 500
+
+
+def test_failed_commit_is_retried_without_losing_or_doubling_records(tmp_path, monkeypatch):
+    fsync = os.fsync
+    failures = [2]
+
+    def flaky_fsync(fd):
+        # 처음 두 번은 디스크가 가득 찼다.
+        if failures[0]:
+            failures[0] -= 1
+            raise OSError(errno.ENOSPC, 'No space left on device')
+        fsync(fd)
+
+    monkeypatch.setattr(eventlog_module.os, 'fsync', flaky_fsync)
+    log = EventLog(tmp_path / 'events.log', commit_interval=0.01)
+    committed = list()
+    log.add_commit_listener(committed.append)
+    log.record('due', 'a')
+    log.record('launched', 'a')
+    until = time.monotonic() + 5.0
+    while not committed and time.monotonic() < until:
+        time.sleep(0.01)
+    assert committed == [2]
+    log.record('completed', 'a')
+    log.close()
+    assert log.failures == 2
+    assert committed[-1] == 3
+    assert [r['kind'] for r in EventLog.read(log.path)] == ['due', 'launched', 'completed']
+
+
+def test_running_ticks_are_not_recorded(tmp_path):
+    log = EventLog(tmp_path / 'events.log', commit_interval=0.01, fsync=False)
+    log.record_data(Data(9, Constant.RUNNING, 0, 0.1, 'a', 'Running...', kind=Kind.TICK))
+    # 문구가 아니라 kind 로 구분하므로 일시정지는 문구가 같아도 남는다.
+    log.record_data(Data(8, Constant.RUNNING, 1, 0.2, 'a', 'Running...', kind=Kind.PAUSE))
+    log.record_data(Data(0, Constant.FINISHED, 0, 1.0, 'a', 'Finished'))
+    log.close()
+    records = list(EventLog.read(log.path))
+    assert [r['kind'] for r in records] == ['state', 'expired']
+
+
+def test_rotation_keeps_compressed_backups(tmp_path):
+    path = tmp_path / 'events.log'
+    log = EventLog(path, max_bytes=200, backups=2, compress=True, commit_interval=0.0, fsync=False)
+    for num in range(5):
+        log.record('cmd', f't{num}', cmd='x' * 200)
+        # commit 마다 로테이트되도록 하나씩 쓰고 기다린다.
+        until = time.monotonic() + 2.0
+        while log.written <= num and time.monotonic() < until:
+            time.sleep(0.005)
+    log.close()
+    backups = sorted(p.name for p in tmp_path.iterdir() if p.name != 'events.log')
+    assert backups == ['events.log.1.gz', 'events.log.2.gz']
+    assert all(r['kind'] == 'cmd' for r in EventLog.read(tmp_path / 'events.log.1.gz'))
+
+
+if __name__ == '__main__':
+    pass
@@ -0,0 +1,94 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# author        : Seongcheol Jeon
+# created date  : 2026.10.19
+# modified date : 2026.10.19
+# description   : 묶인 타이머들을 한 시각에 시작/일시정지/재개/정지
+
+from core.engine import TimerEngine
+from core.events import Data
+from core.states import Constant
+
+
+SEC = 1_000_000_000
+
+
+class CreepingClock:
+    # 읽을 때마다 1 us 씩 흐르는 시계. 명령마다 시계를 다시 읽으면 기준 시각이 어긋난다.
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self):
+        self.now += 1000
+        return self.now
+
+
+def make_engine(count):
+    clock = CreepingClock()
+    engine = TimerEngine(clock=clock)
+    jids = [f't{i}' for i in range(count)]
+    for jid in jids:
+        engine.create_timer(5, jid=jid, start=False)
+    return engine, clock, jids
+
+
+def test_group_start_shares_one_origin_and_one_wakeup():
+    engine, clock, jids = make_engine(200)
+    armed = list()
+    engine.set_waker(armed.append)
+    with engine.group() as instant:
+        for jid in jids:
+            engine.start(jid)
+    assert {engine.get(jid).origin for jid in jids} == {instant}
+    assert armed == [instant]
+
+
+def test_ungrouped_starts_drift_apart():
+    engine, clock, jids = make_engine(3)
+    for jid in jids:
+        engine.start(jid)
+    assert len({engine.get(jid).origin for jid in jids}) == 3
+
+
+def test_group_pause_and_resume_keep_timers_in_step():
+    engine, clock, jids = make_engine(50)
+    engine.start_group(jids)
+    clock.now += 2 * SEC
+    engine.pause_group(jids)
+    assert len({engine.get(jid).paused_at for jid in jids}) == 1
+    clock.now += 3 * SEC
+    engine.resume_group(jids)
+    assert len({engine.get(jid).origin for jid in jids}) == 1
+    finished = list()
+    engine.subscribe(lambda data: finished.append(data.jid) if data.ste == Constant.FINISHED else None)
+    # 다섯 번째 tick 에 모두 함께 끝난다.
+    deadline = engine.get(jids[0]).origin + 5 * SEC
+    engine.advance(deadline - 1)
+    assert finished == []
+    assert engine.advance(deadline) == len(jids)
+    assert sorted(finished) == sorted(jids)
+
+
+def test_group_stop_emits_every_stop_and_nested_groups_reuse_the_outer_instant():
+    engine, clock, jids = make_engine(4)
+    stopped = list()
+
+    def on_data(data: Data):
+        if data.ste == Constant.STOPPED:
+            stopped.append(data.jid)
+
+    engine.subscribe(on_data)
+    with engine.group() as outer:
+        engine.start(jids[0])
+        with engine.group() as inner:
+            engine.start_group(jids[1:])
+    assert inner == outer
+    assert {engine.get(jid).origin for jid in jids} == {outer}
+    engine.stop_group(jids)
+    assert stopped == jids
+    assert engine.next_deadline() is None
+
+
+if __name__ == '__main__':
+    pass
@@ -0,0 +1,106 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# author        : Seongcheol Jeon
+# created date  : 2026.10.19
+# modified date : 2026.10.19
+# description   : 컬럼 저장소 실행 이력과 분석 API
+
+from core import engine as engine_module
+from core.engine import TimerEngine
+from core.history import HistoryStore, History, HistoryRecorder
+from core.states import Constant
+
+
+SEC = 1_000_000_000
+
+
+class ManualClock:
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self):
+        return self.now
+
+
+def test_chunks_survive_reopen_with_buffered_rows(tmp_path):
+    store = HistoryStore(tmp_path)
+    for num in range(10):
+        store.append(f't{num}', Constant.FINISHED, SEC, SEC + num, group='g' if num % 2 else '',
+                     commands=['echo'] if num == 0 else ())
+    store.flush()
+    store.append('late', Constant.STOPPED, SEC, 1)
+    assert len(store) == 11
+    assert list(store.column('actual'))[-2:] == [SEC + 9, 1]
+
+    reopened = HistoryStore(tmp_path)
+    assert len(reopened) == 10
+    assert [reopened.strings[code] for code in reopened.column('jid')] == [f't{num}' for num in range(10)]
+    assert reopened.strings[reopened.column('commands')[0]] == 'echo'
+
+
+def test_analysis_matches_the_rows(tmp_path):
+    store = HistoryStore(tmp_path)
+    for num in range(1, 101):
+        store.append(f't{num}', Constant.FINISHED, 0, num, lateness=num * 1_000_000, group='g' if num <= 40 else '')
+    store.append('stopped', Constant.STOPPED, 0, 10_000)
+    history = History(store)
+    percentiles = history.percentiles('actual', (0, 50, 100), state=Constant.FINISHED)
+    assert percentiles == {0: 1.0, 50: 50.5, 100: 100.0}
+    totals = history.group_totals('actual', state=Constant.FINISHED)
+    assert totals == {'g': (40, sum(range(1, 41))), '': (60, sum(range(41, 101)))}
+    counts, edges = history.lateness_histogram((0, 10_000_000, 50_000_000))
+    # 1..9 ms, 10..49 ms, 50..100 ms
+    assert counts == [9, 40, 51]
+
+
+def test_group_totals_are_exact_past_float_precision(tmp_path):
+    store = HistoryStore(tmp_path)
+    # 2^53 ns (약 104 일) 를 넘는 합계도 float 로 반올림되지 않는다.
+    for num in range(3):
+        store.append(f't{num}', Constant.FINISHED, 0, 2 ** 62 + num + 1, group='g')
+    assert History(store).group_totals('actual') == {'g': (3, 3 * 2 ** 62 + 6)}
+
+
+def test_recorder_ignores_origin_moved_by_rebase(tmp_path, monkeypatch):
+    clock = ManualClock()
+    boot = [0]
+    monkeypatch.setattr(engine_module, 'boottime_ns', lambda: boot[0])
+    engine = TimerEngine(clock=clock)
+    store = HistoryStore(tmp_path)
+    HistoryRecorder(store).attach(engine)
+    engine.create_timer(60, jid='a', tick=60)
+    clock.now = 10 * SEC
+    # 엔진 시계가 멈춘 채로 50 초 절전했다가 깨어난다. rebase() 가 기준 시각을 50 초 앞당긴다.
+    boot[0] = 60 * SEC
+    assert engine.rebase() == 1
+    engine.advance(clock.now)
+    assert list(store.column('state')) == [Constant.FINISHED]
+    assert list(store.column('paused')) == [0]
+    assert list(store.column('pauses')) == [0]
+
+
+def test_recorder_subtracts_pauses_from_lateness(tmp_path):
+    clock = ManualClock()
+    engine = TimerEngine(clock=clock)
+    store = HistoryStore(tmp_path)
+    recorder = HistoryRecorder(store)
+    recorder.attach(engine)
+    engine.create_timer(3, jid='a', tick=1)
+    clock.now = 1 * SEC
+    engine.advance(clock.now)
+    engine.pause('a')
+    clock.now = 5 * SEC
+    engine.resume('a')
+    clock.now = 7 * SEC
+    engine.advance(clock.now)
+    assert len(store) == 1
+    assert list(store.column('state')) == [Constant.FINISHED]
+    assert list(store.column('actual')) == [7 * SEC]
+    assert list(store.column('paused')) == [4 * SEC]
+    assert list(store.column('pauses')) == [1]
+    assert list(store.column('lateness')) == [0]
+
+
+if __name__ == '__main__':
+    pass
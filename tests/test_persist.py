@@ -0,0 +1,132 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# author        : Seongcheol Jeon
+# created date  : 2026.10.19
+# modified date : 2026.10.19
+# description   : TimerJournal 의 기록과 복원
+
+import time
+
+from core.engine import TimerEngine
+from core.persist import TimerJournal, Entry
+from core.recur import Every, Cron
+
+
+SEC = 1_000_000_000
+
+
+def reopen(tmp_path, journal):
+    journal.close()
+    return TimerJournal(tmp_path, snapshot_interval=0)
+
+
+def test_reopen_replays_journal_and_drops_a_truncated_tail(tmp_path):
+    journal = TimerJournal(tmp_path, snapshot_interval=0)
+    journal.create('a', 10 * SEC, SEC, 'g', ['/bin/true'])
+    journal.start('a', 2 * SEC)
+    journal.create('b', 5 * SEC, SEC)
+    journal.start('b')
+    journal.pause('b')
+    journal.create('c', 5 * SEC, SEC)
+    journal.start('c')
+    journal.end('c')
+    journal.close()
+    # 비정상 종료로 마지막 줄이 반만 쓰였다.
+    path = sorted(tmp_path.glob('journal-*.jsonl'))[-1]
+    with open(path, 'a', encoding='utf8') as f:
+        f.write('{"kind":"remove","jid":"a","sta')
+
+    journal = TimerJournal(tmp_path, snapshot_interval=0)
+    entries = journal.entries
+    assert set(entries) == {'a', 'b'}
+    assert entries['a'].state == Entry.RUNNING
+    assert (entries['a'].group, entries['a'].commands) == ('g', ['/bin/true'])
+    assert entries['b'].state == Entry.PAUSED
+    restored = dict((entry.jid, elapsed) for entry, elapsed in journal.restore())
+    assert restored['a'] >= 2 * SEC
+    assert restored['b'] < SEC
+    journal.close()
+
+
+def test_reopen_after_a_checkpoint_uses_the_snapshot(tmp_path):
+    journal = TimerJournal(tmp_path, snapshot_interval=0)
+    journal.create('a', 10 * SEC, SEC)
+    journal.start('a')
+    journal.checkpoint()
+    journal.create('b', 10 * SEC, SEC)
+    journal.start('b')
+    journal.remove('a')
+    journal.close()
+    # 이전 세대 journal 은 스냅샷이 자리 잡은 뒤 지워진다.
+    assert len(list(tmp_path.glob('journal-*.jsonl'))) == 1
+
+    journal = TimerJournal(tmp_path, snapshot_interval=0)
+    assert set(journal.entries) == {'b'}
+    journal.close()
+
+
+def test_alarm_and_rules_are_restored_as_such(tmp_path):
+    engine = TimerEngine()
+    journal = TimerJournal(tmp_path, snapshot_interval=0)
+    journal.attach(engine)
+    at = time.time() + 3600
+    engine.create_alarm(at, jid='alarm')
+    every = Every(60.0)
+    engine.create_recurring(every, jid='every')
+    engine.create_recurring(Cron('0 9 * * mon-fri'), jid='cron')
+    expected = {jid: engine.get(jid).alarm_at for jid in ('alarm', 'every', 'cron')}
+    journal.detach(engine)
+
+    journal = reopen(tmp_path, journal)
+    assert journal.entries['alarm'].alarm_at == expected['alarm']
+    assert journal.entries['every'].rule == every.to_dict()
+    assert journal.entries['cron'].rule == dict(cron='0 9 * * mon-fri')
+
+    restored = TimerEngine()
+    assert journal.restore_engine(restored) == 3
+    journal.close()
+    # 알람은 같은 벽시계 시각에, 반복 타이머는 같은 규칙과 다음 시각으로 다시 걸린다.
+    assert restored.get('alarm').alarm_at == expected['alarm']
+    assert restored.get('alarm').rule is None
+    assert isinstance(restored.get('every').rule, Every)
+    assert restored.get('every').alarm_at == expected['every']
+    assert isinstance(restored.get('cron').rule, Cron)
+    assert restored.get('cron').alarm_at == expected['cron']
+
+
+def test_paused_alarm_is_restored_paused(tmp_path):
+    engine = TimerEngine()
+    journal = TimerJournal(tmp_path, snapshot_interval=0)
+    journal.attach(engine)
+    engine.create_alarm(time.time() + 3600, jid='alarm')
+    engine.pause('alarm')
+    journal.detach(engine)
+
+    journal = reopen(tmp_path, journal)
+    assert journal.entries['alarm'].state == Entry.PAUSED
+    restored = TimerEngine()
+    journal.restore_engine(restored)
+    journal.close()
+    assert restored.get('alarm').paused_at is not None
+    assert restored.get('alarm').alarm_at is not None
+
+
+def test_resume_is_recorded_without_waiting_for_a_tick(tmp_path):
+    engine = TimerEngine()
+    journal = TimerJournal(tmp_path, snapshot_interval=0)
+    journal.attach(engine)
+    engine.create_timer(3600, jid='a')
+    engine.pause('a')
+    assert journal.entries['a'].state == Entry.PAUSED
+    # 재개 뒤 tick 이 오기 전에 닫혀도 재개가 남는다.
+    engine.resume('a')
+    journal.detach(engine)
+
+    journal = reopen(tmp_path, journal)
+    assert journal.entries['a'].state == Entry.RUNNING
+    journal.close()
+
+
+if __name__ == '__main__':
+    pass
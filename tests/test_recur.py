@@ -0,0 +1,128 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# author        : Seongcheol Jeon
+# created date  : 2026.10.19
+# modified date : 2026.10.19
+# description   : 반복 규칙 (Every, Cron) 과 반복 타이머
+
+import time
+import datetime
+
+import pytest
+
+from core.engine import TimerEngine
+from core.events import Data
+from core.recur import Every, Cron, make_rule, rule_from_dict
+from core.states import Constant
+
+
+SEC = 1_000_000_000
+
+
+def ns(*args) -> int:
+    # 로컬 시각 -> epoch ns
+    return int(datetime.datetime(*args).timestamp()) * SEC
+
+
+@pytest.fixture
+def new_york(monkeypatch):
+    # 서머타임이 있는 시간대. 2026-03-08 02:00 -> 03:00, 2026-11-01 02:00 -> 01:00
+    monkeypatch.setenv('TZ', 'America/New_York')
+    time.tzset()
+    yield
+    monkeypatch.undo()
+    time.tzset()
+
+
+def test_every_stays_on_its_grid():
+    rule = Every(10.0, anchor=100 * SEC)
+    assert rule.next_after(0) == 100 * SEC
+    assert rule.next_after(100 * SEC) == 110 * SEC
+    assert rule.next_after(113 * SEC) == 120 * SEC
+
+
+def test_cron_finds_the_next_leap_day():
+    rule = Cron('0 0 29 2 *')
+    assert rule.next_after(ns(2025, 3, 1)) == ns(2028, 2, 29)
+    assert rule.next_after(ns(2028, 2, 29)) == ns(2032, 2, 29)
+
+
+def test_cron_rolls_over_short_months():
+    rule = Cron('30 12 31 * *')
+    assert rule.next_after(ns(2026, 4, 15)) == ns(2026, 5, 31, 12, 30)
+    assert rule.next_after(ns(2026, 5, 31, 12, 30)) == ns(2026, 7, 31, 12, 30)
+    assert Cron('59 23 * * *').next_after(ns(2026, 12, 31, 23, 59, 30)) == ns(2027, 1, 1, 23, 59)
+
+
+def test_cron_day_or_weekday():
+    # 일과 요일이 둘 다 있으면 하나만 맞아도 된다. 2026-10-19 는 월요일
+    rule = Cron('0 9 1 * mon')
+    assert rule.next_after(ns(2026, 10, 18)) == ns(2026, 10, 19, 9)
+    assert rule.next_after(ns(2026, 10, 27)) == ns(2026, 11, 1, 9)
+
+
+def test_cron_that_never_fires_raises():
+    with pytest.raises(ValueError):
+        Cron('0 0 30 2 *').next_after(ns(2026, 1, 1))
+
+
+def test_cron_never_goes_back_in_the_repeated_fall_back_hour(new_york):
+    # 두 번째 01:30 (EST) 는 첫 번째 01:30 (EDT) 보다 한 시간 뒤다.
+    first = ns(2026, 11, 1, 1, 30)
+    second = int(datetime.datetime(2026, 11, 1, 1, 30, fold=1).timestamp()) * SEC
+    assert second - first == 3600 * SEC
+    assert Cron('* * * * *').next_after(second) == second + 60 * SEC
+    assert Cron('45 1 * * *').next_after(second) == second + 15 * 60 * SEC
+    assert Cron('45 1 * * *').next_after(first) == first + 15 * 60 * SEC
+    # 되풀이되는 시간을 지나면 다음 날로 넘어간다.
+    assert Cron('45 1 * * *').next_after(second + 15 * 60 * SEC) == ns(2026, 11, 2, 1, 45)
+    t = first
+    for _ in range(200):
+        following = Cron('*/7 * * * *').next_after(t)
+        assert following > t
+        t = following
+
+
+def test_cron_in_the_skipped_spring_forward_hour(new_york):
+    # 02:30 은 없는 시각이라 건너뛴 만큼 밀린 03:30 EDT 에 실행한다.
+    assert Cron('30 2 * * *').next_after(ns(2026, 3, 8, 0, 30)) == ns(2026, 3, 8, 3, 30)
+    assert Cron('* * * * *').next_after(ns(2026, 3, 8, 1, 59)) == ns(2026, 3, 8, 3, 0)
+
+
+def test_rules_round_trip_through_dict():
+    every = Every(2.5, anchor=7 * SEC)
+    assert rule_from_dict(every.to_dict()).next_after(8 * SEC) == every.next_after(8 * SEC)
+    assert str(rule_from_dict(Cron('@daily').to_dict())) == 'cron @daily'
+    with pytest.raises(ValueError):
+        make_rule()
+
+
+def test_pause_and_resume_keep_a_recurring_timer_on_its_grid():
+    clock = [0]
+    engine = TimerEngine(clock=lambda: clock[0])
+    fired = list()
+
+    def on_data(data: Data):
+        if data.ste == Constant.FINISHED:
+            fired.append(clock[0] // SEC)
+
+    engine.subscribe(on_data)
+    # 격자의 기준은 지금 (엔진 시계 0 바로 뒤) 이라서 첫 실행은 첫 advance() 에서 난다.
+    timer = engine.create_recurring(Every(10.0), jid='r')
+    first = timer.alarm_at
+    for step in range(1, 60):
+        clock[0] = step * SEC
+        if step == 22:
+            engine.pause('r')
+        if step == 25:
+            engine.resume('r')
+        engine.advance()
+    # 3 초 멈췄다가 이어도 다음 실행은 밀리지 않는다.
+    assert fired == [1, 11, 21, 31, 41, 51]
+    assert {b - a for a, b in zip(fired, fired[1:])} == {10}
+    assert timer.alarm_at % (10 * SEC) == first % (10 * SEC)
+
+
+if __name__ == '__main__':
+    pass
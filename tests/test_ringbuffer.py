@@ -0,0 +1,47 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# author        : Seongcheol Jeon
+# created date  : 2026.10.19
+# modified date : 2026.10.19
+# description   : 값 인덱스가 있는 링 버퍼
+
+from libs.algorithm.library import RingBuffer
+
+
+def test_select_returns_only_live_items():
+    buffer = RingBuffer(3, index_keys=('jid',))
+    for i, jid in enumerate('abab'):
+        buffer.append(i, jid=jid)
+    assert list(buffer) == [1, 2, 3]
+    assert buffer.select('jid', 'a') == [2]
+    assert buffer.select('jid', 'b') == [1, 3]
+    assert buffer.select('jid', 'c') == []
+
+
+def test_index_does_not_grow_with_old_values():
+    buffer = RingBuffer(8, index_keys=('level', 'jid'))
+    for i in range(10_000):
+        buffer.append(i, level=i % 2, jid=f'job-{i}')
+    # 덮어쓴 값은 select() 를 부르지 않아도 인덱스에서 빠진다.
+    assert buffer.index_size('jid') == 8
+    assert buffer.index_size('level') == 2
+    assert buffer.select('jid', 'job-9999') == [9999]
+    assert buffer.select('level', 0) == [9992, 9994, 9996, 9998]
+
+
+def test_clear_then_wrap_around():
+    buffer = RingBuffer(2, index_keys=('jid',))
+    buffer.append('x', jid='a')
+    buffer.append('y', jid='a')
+    buffer.clear()
+    assert len(buffer) == 0
+    assert buffer.index_size('jid') == 0
+    for item in 'pqr':
+        buffer.append(item, jid='b')
+    assert buffer.select('jid', 'b') == ['q', 'r']
+    assert buffer.index_size('jid') == 1
+
+
+if __name__ == '__main__':
+    pass
@@ -0,0 +1,176 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# author        : Seongcheol Jeon
+# created date  : 2026.10.19
+# modified date : 2026.10.19
+# description   : JSON-RPC 제어 API 의 batch, 오류 코드, 링크 그룹
+
+import json
+import asyncio
+
+import pytest
+
+from core.engine import TimerEngine
+from core.rpc import ControlServer, ControlClient, RpcError
+
+
+SEC = 1_000_000_000
+
+
+class CreepingClock:
+    # 읽을 때마다 1 us 씩 흐르는 시계
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self):
+        self.now += 1000
+        return self.now
+
+
+def make_server(tmp_path):
+    engine = TimerEngine(clock=CreepingClock())
+    return engine, ControlServer(engine, tmp_path / 'rpc.sock')
+
+
+def call(server, message):
+    response = server.dispatch_line(json.dumps(message).encode('utf8'))
+    return json.loads(response) if response is not None else None
+
+
+def request(method, req_id=1, **params):
+    return {'jsonrpc': '2.0', 'id': req_id, 'method': method, 'params': params}
+
+
+def test_create_get_and_list(tmp_path):
+    engine, server = make_server(tmp_path)
+    jid = call(server, request('create', duration=10, jid='a', tick=0.5))['result']
+    assert jid == 'a'
+    info = call(server, request('get', jid='a'))['result']
+    assert (info['duration_msec'], info['tick_msec'], info['state']) == (10_000, 500, 'running')
+    call(server, request('create', duration=5, jid='b', start=False))
+    assert [info['jid'] for info in call(server, request('list', state='running'))['result']] == ['a']
+
+
+@pytest.mark.parametrize('line, code', [
+    (b'{"jsonrpc": "2.0", "id": 1, "method"', RpcError.PARSE_ERROR),
+    (b'[]', RpcError.INVALID_REQUEST),
+    (b'{"jsonrpc": "2.0", "id": 1}', RpcError.INVALID_REQUEST),
+    (b'{"jsonrpc": "2.0", "id": 1, "method": "explode"}', RpcError.METHOD_NOT_FOUND),
+    (b'{"jsonrpc": "2.0", "id": 1, "method": "get", "params": {"jid": "nope"}}', RpcError.UNKNOWN_JID),
+    (b'{"jsonrpc": "2.0", "id": 1, "method": "create", "params": {"color": "red"}}', RpcError.INVALID_PARAMS),
+    (b'{"jsonrpc": "2.0", "id": 1, "method": "create", "params": {"cron": "0 0 30 2 * *"}}',
+     RpcError.INVALID_PARAMS),
+    (b'{"jsonrpc": "2.0", "id": 1, "method": "subscribe"}', RpcError.INVALID_REQUEST),
+    (b'{"jsonrpc": "2.0", "id": 1, "method": "subscribe", "params": ["a"]}', RpcError.INVALID_PARAMS),
+    (b'{"jsonrpc": "2.0", "id": 1, "method": "list", "params": 3}', RpcError.INVALID_REQUEST),
+    (b'{"jsonrpc": "2.0", "id": 1, "method": "create", "params": {"duration": -5}}', RpcError.INVALID_PARAMS),
+    (b'{"jsonrpc": "2.0", "id": 1, "method": "create", "params": {"duration": 1, "tick": 0}}',
+     RpcError.INVALID_PARAMS),
+    (b'{"jsonrpc": "2.0", "id": 1, "method": "create", "params": {"duration": "1"}}', RpcError.INVALID_PARAMS),
+])
+def test_error_codes(tmp_path, line, code):
+    _, server = make_server(tmp_path)
+    response = json.loads(server.dispatch_line(line))
+    assert response['error']['code'] == code
+
+
+def test_notifications_get_no_response_even_on_error(tmp_path):
+    engine, server = make_server(tmp_path)
+    assert call(server, {'jsonrpc': '2.0', 'method': 'create', 'params': {'duration': 3, 'jid': 'a'}}) is None
+    assert 'a' in engine.timers
+    assert call(server, {'jsonrpc': '2.0', 'method': 'get', 'params': {'jid': 'nope'}}) is None
+
+
+def test_batch_shares_one_instant_and_reports_errors_in_place(tmp_path):
+    engine, server = make_server(tmp_path)
+    batch = [request('create', 1, duration=10, jid='a'),
+             request('create', 2, duration=10, jid='b'),
+             request('get', 3, jid='nope'),
+             {'jsonrpc': '2.0', 'method': 'create', 'params': {'duration': 10, 'jid': 'c'}}]
+    responses = {res['id']: res for res in call(server, batch)}
+    assert set(responses) == {1, 2, 3}
+    assert responses[1]['result'] == 'a'
+    assert responses[3]['error']['code'] == RpcError.UNKNOWN_JID
+    # batch 안의 명령은 엔진의 한 시각에 적용된다.
+    assert len({engine.get(jid).origin for jid in 'abc'}) == 1
+
+
+def test_batch_of_notifications_has_no_response(tmp_path):
+    _, server = make_server(tmp_path)
+    assert server.dispatch_line(b'[{"jsonrpc": "2.0", "method": "list"}]') is None
+
+
+def test_many_skips_unknown_jids(tmp_path):
+    engine, server = make_server(tmp_path)
+    jids = call(server, request('create_many', items=[{'duration': 10, 'jid': f't{i}'} for i in range(5)]))['result']
+    assert call(server, request('pause_many', jids=jids + ['nope']))['result'] == 5
+    assert len({engine.get(jid).paused_at for jid in jids}) == 1
+    assert call(server, request('remove_many', jids=['t0', 'nope']))['result'] == 1
+    assert 't0' not in engine.timers
+
+
+def test_create_many_creates_nothing_when_an_item_is_invalid(tmp_path):
+    engine, server = make_server(tmp_path)
+    items = [{'duration': 10, 'jid': 'a'}, {'duration': 10, 'jid': 'b'}, {'duration': 10, 'tick': 0}]
+    response = call(server, request('create_many', items=items))
+    assert response['error']['code'] == RpcError.INVALID_PARAMS
+    assert 'items[2]' in response['error']['message']
+    assert len(engine) == 0
+    duplicated = [{'duration': 10, 'jid': 'a'}, {'duration': 5, 'jid': 'a'}]
+    assert call(server, request('create_many', items=duplicated))['error']['code'] == RpcError.INVALID_PARAMS
+    assert len(engine) == 0
+    jids = call(server, request('create_many', items=items[:2]))['result']
+    assert jids == ['a', 'b']
+    assert engine.get('a').origin == engine.get('b').origin
+
+
+def test_linked_commands_reach_the_whole_group(tmp_path):
+    engine, server = make_server(tmp_path)
+    for jid in 'abc':
+        call(server, request('create', duration=10, jid=jid, start=False, group='g' if jid != 'c' else None))
+    assert call(server, request('start', jid='a'))['result'] == 2
+    assert engine.get('a').origin == engine.get('b').origin
+    assert not engine.get('c').is_active()
+    assert call(server, request('stop', jid='a', linked=False))['result'] == 1
+    assert engine.get('b').is_active()
+
+
+def test_depend_reports_cycles_as_invalid_params(tmp_path):
+    _, server = make_server(tmp_path)
+    for jid in 'ab':
+        call(server, request('create', duration=1, jid=jid, start=False))
+    assert call(server, request('depend', src='a', dst='b'))['result']['dst'] == 'b'
+    response = call(server, request('depend', src='b', dst='a'))
+    assert response['error']['code'] == RpcError.INVALID_PARAMS
+    assert call(server, request('depend', src='a', dst='nope'))['error']['code'] == RpcError.UNKNOWN_JID
+
+
+def test_client_over_the_socket(tmp_path):
+    async def main():
+        engine, server = make_server(tmp_path)
+        await server.start()
+        loop = asyncio.get_running_loop()
+
+        def client_side():
+            with ControlClient(server.path, timeout=5) as client:
+                jid = client.call('create', duration=10, jid='a')
+                results = client.batch([('get', dict(jid='a')), ('get', dict(jid='nope'))])
+                with pytest.raises(RpcError) as err:
+                    client.call('pause', jid='nope')
+                return jid, results, err.value.code
+
+        try:
+            return await loop.run_in_executor(None, client_side)
+        finally:
+            server.close()
+
+    jid, results, code = asyncio.run(main())
+    assert jid == 'a'
+    assert results[0]['jid'] == 'a'
+    assert isinstance(results[1], RpcError) and results[1].code == RpcError.UNKNOWN_JID
+    assert code == RpcError.UNKNOWN_JID
+
+
+if __name__ == '__main__':
+    pass
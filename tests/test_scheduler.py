@@ -0,0 +1,87 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# author        : Seongcheol Jeon
+# created date  : 2026.10.19
+# modified date : 2026.10.19
+# description   : HeapScheduler 와 TimingWheel 이 같은 순서로 내보내는지
+
+import random
+
+import pytest
+
+from core.engine import TimerEngine
+from core.events import Data
+from core.scheduler import HeapScheduler, TimingWheel
+from core.states import Constant
+
+
+SEC = 1_000_000_000
+
+
+def drain(scheduler, until, step):
+    # step 간격으로 깨어나면서 나온 payload 를 (깨어난 시각, payload) 로 모은다.
+    popped = list()
+    now = 0
+    while now <= until:
+        popped.extend((now, payload) for payload in scheduler.pop_due(now))
+        now += step
+    return popped
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_wheel_pops_in_the_same_order_as_the_heap(seed):
+    rng = random.Random(seed)
+    heap = HeapScheduler()
+    wheel = TimingWheel(SEC, sizes=(8, 8, 4))
+    entries = list()
+    # 마지막 단계를 넘는 deadline (overflow) 도 섞는다.
+    deadlines = rng.sample(range(1, 400 * SEC), 2000)
+    for i, deadline in enumerate(deadlines):
+        entries.append((heap.push(deadline, i), wheel.push(deadline, i)))
+    for heap_entry, wheel_entry in rng.sample(entries, 300):
+        heap.cancel(heap_entry)
+        wheel.cancel(wheel_entry)
+    assert len(heap) == len(wheel) == 1700
+
+    expected = drain(heap, 400 * SEC, SEC // 3)
+    assert drain(wheel, 400 * SEC, SEC // 3) == expected
+    assert len(expected) == 1700
+    assert len(heap) == len(wheel) == 0
+
+
+def test_wheel_peek_is_never_later_than_the_next_deadline():
+    wheel = TimingWheel(SEC, sizes=(4, 4))
+    wheel.push(0, 'now')
+    wheel.pop_due(0)
+    wheel.push(37 * SEC + 5, 'late')
+    peek = wheel.peek()
+    assert peek <= 37 * SEC + 5
+    assert wheel.pop_due(peek) in ([], ['late'])
+    assert wheel.pop_due(37 * SEC + 5) == ['late']
+
+
+@pytest.mark.parametrize('scheduler', [HeapScheduler, lambda: TimingWheel(SEC)])
+def test_engine_expires_at_the_same_instant_on_either_scheduler(scheduler):
+    clock = [0]
+    engine = TimerEngine(clock=lambda: clock[0], scheduler=scheduler())
+    finished = dict()
+
+    def on_data(data: Data):
+        if data.ste == Constant.FINISHED:
+            finished[data.jid] = clock[0]
+
+    engine.subscribe(on_data)
+    engine.create_timer(2.5, jid='a', tick=1.0)
+    engine.create_timer(1.0, jid='b', tick=0.5)
+    engine.pause('a')
+    clock[0] = SEC
+    engine.resume('a')
+    for step in range(1, 40):
+        clock[0] = step * SEC // 4
+        engine.advance()
+    assert finished == {'a': 3 * SEC + SEC // 2, 'b': SEC}
+
+
+if __name__ == '__main__':
+    pass
@@ -0,0 +1,74 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# author        : Seongcheol Jeon
+# created date  : 2026.10.19
+# modified date : 2026.10.19
+# description   : 워커 프로세스로 나눈 타이머 엔진과 jump hash
+
+import time
+
+import pytest
+
+from core.shard import ShardedEngine, jump_hash
+from core.states import Constant
+
+
+JIDS = [f't{num}' for num in range(3000)]
+
+
+def test_jump_hash_moves_only_the_new_buckets_share():
+    before = [jump_hash(jid, 4) for jid in JIDS]
+    after = [jump_hash(jid, 5) for jid in JIDS]
+    assert set(before) == set(range(4))
+    moved = [b for a, b in zip(before, after) if a != b]
+    # 옮겨지는 jid 는 모두 새 버킷으로 가고, 그 수는 약 1/5 이다.
+    assert set(moved) == {4}
+    assert 0.15 < len(moved) / len(JIDS) < 0.25
+
+
+@pytest.fixture
+def engine():
+    engine = ShardedEngine(2, frame_interval=0.01)
+    yield engine
+    engine.close()
+
+
+def poll_until(engine, predicate, timeout: float = 5.0) -> bool:
+    until = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() >= until:
+            return False
+        engine.poll(0.01)
+    return True
+
+
+def test_status_and_expiry_events_across_shards(engine):
+    finished = list()
+    engine.subscribe(lambda data: finished.append(data.jid) if data.ste == Constant.FINISHED else None)
+    jids = engine.create_many([(60, 1.0)] * 100 + [(0.05, 0.05)] * 10)
+    engine.sync()
+    assert poll_until(engine, lambda: len(engine) == 110)
+    assert {engine.shard_of(jid) for jid in jids} == {0, 1}
+    assert poll_until(engine, lambda: len(finished) == 10)
+    assert sorted(finished) == sorted(jids[100:])
+    assert poll_until(engine, lambda: engine.active() == 100)
+    assert engine.errors == []
+
+
+def test_resize_moves_timers_without_losing_them(engine):
+    jids = engine.create_many([(60, 1.0)] * 200, jids=JIDS[:200])
+    engine.sync()
+    moved = engine.resize(3)
+    assert engine.shards == 3
+    assert moved == sum(1 for jid in jids if jump_hash(jid, 3) == 2)
+    engine.sync()
+    assert poll_until(engine, lambda: len(engine) == 200 and engine.active() == 200)
+    engine.resize(1)
+    engine.sync()
+    assert poll_until(engine, lambda: engine.status().total == 200)
+    assert engine.errors == []
+
+
+if __name__ == '__main__':
+    pass
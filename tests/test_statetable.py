@@ -0,0 +1,85 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# author        : Seongcheol Jeon
+# created date  : 2026.10.19
+# modified date : 2026.10.19
+# description   : 공유 메모리 상태 표의 seqlock, 슬롯 재사용, 만료 시각
+
+import time
+
+from core.engine import TimerEngine
+from core.events import Data
+from core.states import Constant
+from core.statetable import StateTable, StateTableReader
+
+
+MSEC = 1_000_000
+
+
+def data(jid, ste=Constant.RUNNING, msec=5000):
+    return Data(sec=-(-msec // 1000), ste=ste, accum_num=1, ratio=10, jid=jid, msg='', msec=msec)
+
+
+def test_reader_computes_remaining_from_the_deadline(tmp_path):
+    clock = [0]
+    engine = TimerEngine(clock=lambda: clock[0])
+    table = StateTable(tmp_path / 'table', capacity=4)
+    table.attach(engine)
+    engine.create_timer(3600, jid='a', adaptive=True)
+    engine.set_observed('a', False)
+    reader = StateTableReader(tmp_path / 'table')
+    row = reader.snapshot()[0]
+    # 이벤트가 없어도 남은 시간은 지금 시각으로 계산된다.
+    assert row['deadline_ns'] > 0
+    assert abs(row['remaining_msec'] - (row['deadline_ns'] - time.monotonic_ns()) // MSEC) <= 1
+    assert 3599_000 <= row['remaining_msec'] <= 3600_000
+
+    engine.pause('a')
+    row = reader.snapshot()[0]
+    assert row['deadline_ns'] == 0
+    assert row['bits'] & Constant.WAITING
+    reader.close()
+    table.close()
+
+
+def test_seq_wraps_and_stays_even(tmp_path):
+    table = StateTable(tmp_path / 'table', capacity=1)
+    table.publish(data('a'), Constant.RUNNING)
+    reader = StateTableReader(tmp_path / 'table')
+    offset = StateTable.HEADER_SIZE
+    # 32 비트 seq 가 넘쳐도 짝수로 끝나고 읽을 수 있어야 한다.
+    StateTable.SEQ.pack_into(table._StateTable__mm, offset, 0xFFFFFFFE)
+    table.publish(data('a', msec=4000), Constant.RUNNING)
+    row = reader.read(0)
+    assert row['seq'] == 0
+    assert row['jid'] == 'a'
+    table.publish(data('a', msec=3000), Constant.RUNNING)
+    assert reader.read(0)['seq'] == 2
+    reader.close()
+    table.close()
+
+
+def test_full_table_reuses_finished_slots_first(tmp_path):
+    table = StateTable(tmp_path / 'table', capacity=2)
+    reader = StateTableReader(tmp_path / 'table')
+    table.publish(data('a'), Constant.RUNNING)
+    table.publish(data('b', Constant.FINISHED, 0), Constant.FINISHED)
+    table.publish(data('c'), Constant.RUNNING)
+    assert sorted(row['jid'] for row in reader.snapshot()) == ['a', 'c']
+    # 끝난 타이머가 없으면 넘친 것만 센다.
+    table.publish(data('d'), Constant.RUNNING)
+    assert reader.header()['overflow'] == 1
+    assert sorted(row['jid'] for row in reader.snapshot()) == ['a', 'c']
+
+    table.release('a')
+    assert [row['jid'] for row in reader.snapshot()] == ['c']
+    table.publish(data('d'), Constant.RUNNING)
+    assert sorted(row['jid'] for row in reader.snapshot()) == ['c', 'd']
+    assert reader.header()['used'] == 2
+    reader.close()
+    table.close()
+
+
+if __name__ == '__main__':
+    pass
@@ -0,0 +1,90 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# author        : Seongcheol Jeon
+# created date  : 2026.10.19
+# modified date : 2026.10.19
+# description   : delta 스트림 인코딩, 지워진 타이머 정리
+
+from core.engine import TimerEngine
+from core.events import Data
+from core.stream import Codec, EventStream, StreamDecoder, Subscriber
+
+
+def test_msg_is_cut_on_a_character_boundary():
+    values = (1, 2, 3, 0.5, 4, '가' * 200, 0)
+    decoder = StreamDecoder()
+    events = decoder.feed(Codec.jid_frame(0, 'a') + Codec.delta_frame(0, values, None))
+    msg = events[0][1]['msg']
+    assert msg == '가' * 85
+    assert len(msg.encode('utf8')) <= 255
+
+
+def test_snapshot_leaves_out_removed_timers(tmp_path):
+    engine = TimerEngine()
+    stream = EventStream(engine, tmp_path / 'stream')
+    engine.subscribe(stream.publish)
+    engine.create_timer(10, jid='a')
+    engine.create_timer(10, jid='b')
+    decoder = StreamDecoder()
+    decoder.feed(stream.snapshot())
+    assert set(decoder.state) == {'a', 'b'}
+
+    engine.remove('a')
+    decoder = StreamDecoder()
+    decoder.feed(stream.snapshot())
+    assert set(decoder.state) == {'b'}
+
+
+def test_removal_frame_reaches_live_subscribers(tmp_path):
+    engine = TimerEngine()
+    stream = EventStream(engine, tmp_path / 'stream')
+    engine.subscribe(stream.publish)
+    # 소켓 없이 큐만 보는 구독자
+    sub = Subscriber(None)
+    stream.subscribers.append(sub)
+    decoder = StreamDecoder()
+    engine.create_timer(10, jid='a')
+    engine.create_timer(10, jid='b')
+    decoder.feed(stream.snapshot())
+    sub.resync = False
+    assert set(decoder.state) == {'a', 'b'}
+
+    engine.remove('a')
+    engine.pause('b')
+    decoder.feed(b''.join(sub.queue))
+    assert set(decoder.state) == {'b'}
+
+
+def test_ids_stay_bounded_under_churn(tmp_path):
+    engine = TimerEngine()
+    stream = EventStream(engine, tmp_path / 'stream')
+    engine.subscribe(stream.publish)
+    peak = 0
+    for i in range(1000):
+        engine.create_timer(0, jid=f't{i}')
+        engine.advance()
+        # 끝난 뒤에 지우므로 지울 때는 이벤트가 없다.
+        engine.remove(f't{i}')
+        peak = max(peak, len(stream._EventStream__ids))
+    assert peak <= EventStream.SWEEP_MIN + 1
+    decoder = StreamDecoder()
+    decoder.feed(stream.snapshot())
+    assert decoder.state == dict()
+    engine.create_timer(10, jid='live')
+    decoder.feed(stream.snapshot())
+    assert set(decoder.state) == {'live'}
+    assert len(stream._EventStream__ids) == 1
+
+
+def test_decoder_drops_state_on_remove():
+    decoder = StreamDecoder()
+    data = Data(sec=1, ste=1, accum_num=0, ratio=0, jid='a', msg='', msec=1000)
+    decoder.feed(Codec.jid_frame(7, 'a') + Codec.delta_frame(7, Codec.values(data), None))
+    assert 'a' in decoder.state
+    assert decoder.feed(Codec.remove_frame(7)) == []
+    assert decoder.state == dict()
+
+
+if __name__ == '__main__':
+    pass
@@ -0,0 +1,64 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# author        : Seongcheol Jeon
+# created date  : 2026.10.19
+# modified date : 2026.10.19
+# description   : timerfd 드라이버 (리눅스)
+
+import time
+import asyncio
+
+import pytest
+
+from core import timerfd
+from core.aio import AsyncTimerEngine
+from core.engine import TimerEngine
+from core.states import Constant
+
+
+pytestmark = pytest.mark.skipif(not timerfd.available(), reason='timerfd needs Linux')
+
+
+def test_run_forever_wakes_at_most_once_per_deadline():
+    engine = TimerEngine()
+    finished = list()
+    engine.subscribe(lambda data: finished.append(time.monotonic_ns()) if data.ste == Constant.FINISHED else None)
+    driver = timerfd.TimerFdDriver(engine)
+    began = time.monotonic_ns()
+    engine.create_timer(0.05, tick=0.01)
+    driver.run_forever()
+    driver.close()
+    # 0 초의 tick 은 run_forever() 가 바로 처리하고, 나머지는 tick 마다 많아야 한 번 timerfd 로 깨어난다.
+    assert 1 <= driver.wakeups <= 5
+    assert len(finished) == 1
+    assert finished[0] - began >= 50_000_000
+
+
+def test_disarmed_timerfd_does_not_fire():
+    fd = timerfd.TimerFd()
+    fd.arm_at(time.monotonic_ns() + 1_000_000)
+    fd.disarm()
+    time.sleep(0.005)
+    assert fd.read() == 0
+    fd.arm_at(time.monotonic_ns())
+    time.sleep(0.001)
+    assert fd.read() == 1
+    fd.close()
+
+
+def test_asyncio_engine_on_timerfd():
+    async def main():
+        engine = AsyncTimerEngine(asyncio.get_running_loop(), timerfd=True)
+        data = await engine.create_timer(0.03, tick=0.01)
+        wakeups = engine.driver.wakeups
+        engine.close()
+        return data, wakeups
+
+    data, wakeups = asyncio.run(main())
+    assert data.ste == Constant.FINISHED
+    assert wakeups >= 3
+
+
+if __name__ == '__main__':
+    pass